@@ -0,0 +1,135 @@
+"""
+Benchmark of the adaptive concurrency limiter against a local mock server that degrades under load.
+
+The mock server answers within `--latency` seconds while at most `--capacity` requests are in
+flight. Above that, its latency grows with the load, and above twice the capacity it throttles
+with 429. The benchmark sends `--requests` requests through `--workers` concurrent workers, once
+with a fixed concurrency (the workers) and once gated by an AdaptiveConcurrencyLimiter, and
+reports the throughput, the latency and the number of throttled requests.
+
+Usage:
+    python benchmarks/adaptive_concurrency.py --capacity 16 --workers 128 --requests 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import aiohttp
+from aiohttp import web
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sygra.core.models.adaptive_concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyLimiter,
+)
+
+
+def build_server(capacity: int, latency: float) -> web.Application:
+    in_flight = 0
+
+    async def handle(request: web.Request) -> web.Response:
+        nonlocal in_flight
+        in_flight += 1
+        try:
+            if in_flight > 2 * capacity:
+                return web.Response(status=429)
+            overload = max(0, in_flight - capacity) / capacity
+            await asyncio.sleep(latency * (1 + 4 * overload))
+            return web.json_response({"choices": [{"message": {"content": "ok"}}]})
+        finally:
+            in_flight -= 1
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", handle)
+    return app
+
+
+async def run_load(
+    url: str, workers: int, requests: int, limiter: Optional[AdaptiveConcurrencyLimiter]
+) -> dict:
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+    latencies: list[float] = []
+    throttled = 0
+
+    async def worker(session: aiohttp.ClientSession):
+        nonlocal throttled
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            # retry throttled requests, like the model clients do
+            while True:
+                in_flight = await limiter.acquire() if limiter else 0
+                start = time.perf_counter()
+                async with session.post(url, json={"messages": []}) as response:
+                    await response.read()
+                    status = response.status
+                elapsed = time.perf_counter() - start
+                if limiter:
+                    limiter.release(in_flight, elapsed, status)
+                if status == 200:
+                    latencies.append(elapsed)
+                    break
+                throttled += 1
+
+    connector = aiohttp.TCPConnector(limit=workers)
+    start = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(worker(session) for _ in range(workers)))
+    total = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "throughput": requests / total,
+        "p50": statistics.median(latencies) * 1e3,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1e3,
+        "throttled": throttled,
+        "limit": limiter.limit if limiter else workers,
+    }
+
+
+async def main_async(args: argparse.Namespace):
+    runner = web.AppRunner(build_server(args.capacity, args.latency), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    url = f"http://127.0.0.1:{port}/v1/chat/completions"
+
+    try:
+        fixed = await run_load(url, args.workers, args.requests, None)
+        limiter = AdaptiveConcurrencyLimiter(
+            "benchmark", AdaptiveConcurrencyConfig(enabled=True, initial_limit=args.workers)
+        )
+        adaptive = await run_load(url, args.workers, args.requests, limiter)
+    finally:
+        await runner.cleanup()
+
+    print(f"{'':>10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'429s':>6} {'final limit':>12}")
+    for label, result in (("fixed", fixed), ("adaptive", adaptive)):
+        print(
+            f"{label:>10} {result['throughput']:>8.1f} {result['p50']:>8.1f} "
+            f"{result['p99']:>8.1f} {result['throttled']:>6} {result['limit']:>12}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--capacity", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=128)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
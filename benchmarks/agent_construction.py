@@ -0,0 +1,119 @@
+"""
+Benchmark of the per-record cost of AgentNode with a fake chat model.
+
+Compares compiling a ReAct agent graph for every record, as AgentNode did before agent graphs
+were reused, with the compiled graph cache of the node. The fake model answers instantly, so
+the timings are the framework overhead per record.
+
+Usage:
+    python benchmarks/agent_construction.py --records 10 100 1000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from sygra.core.graph.nodes import agent_node
+from sygra.core.graph.nodes.agent_node import AgentNode
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model answering every request instantly, without tool calls."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "FakeChatModel":
+        return self
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("done"))])
+
+
+@tool
+def lookup(query: str) -> str:
+    """Look up a query."""
+    return query
+
+
+def build_node() -> AgentNode:
+    with (
+        patch.object(AgentNode, "_initialize_model"),
+        patch("sygra.core.graph.nodes.llm_node.utils.get_graph_properties", return_value={}),
+    ):
+        node = AgentNode(
+            "benchmark_agent",
+            {
+                "node_type": "agent",
+                "model": {},
+                "prompt": [{"system": "You are a {persona}."}, {"user": "{question}"}],
+            },
+        )
+    node.model = FakeChatModel()
+    node.tools = [lookup]
+    return node
+
+
+async def run_records(node: AgentNode, records: int, rebuild: bool) -> tuple[float, float]:
+    """Run the records, return the total and the graph construction time per record in ms."""
+    state = {"persona": "researcher", "question": "What is new?", "messages": []}
+    construction = 0.0
+
+    def timed_create_react_agent(*args, **kwargs):
+        nonlocal construction
+        start = time.perf_counter()
+        agent = create_react_agent(*args, **kwargs)
+        construction += time.perf_counter() - start
+        return agent
+
+    node._agents.clear()
+    start = time.perf_counter()
+    with patch.object(agent_node, "create_react_agent", timed_create_react_agent):
+        for _ in range(records):
+            if rebuild:
+                # compile a new agent for the record, as before the compiled graphs were reused
+                node._agents.clear()
+            await node._exec_wrapper(dict(state))
+    total = time.perf_counter() - start
+    return total / records * 1e3, construction / records * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+
+    node = build_node()
+    print("ms/record: total (graph construction)")
+    print(f"{'records':>8} {'rebuilt per record':>22} {'reused':>22} {'speedup':>8}")
+    with patch.object(AgentNode, "_record_execution_metadata"):
+        for records in args.records:
+            rebuilt, rebuilt_build = asyncio.run(run_records(node, records, rebuild=True))
+            reused, reused_build = asyncio.run(run_records(node, records, rebuild=False))
+            print(
+                f"{records:>8} {rebuilt:>12.2f} ({rebuilt_build:>6.3f}) "
+                f"{reused:>12.2f} ({reused_build:>6.3f}) {rebuilt / reused:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
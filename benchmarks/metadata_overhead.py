@@ -0,0 +1,122 @@
+"""
+Benchmark of the metadata collector overhead per model request.
+
+Runs many concurrent asyncio tasks calling a zero-latency mock model, without tracking, with
+@track_model_request the way it worked before (a deep copy of the model config and the collector
+lock on every request) and with per-task buffers and config snapshots, and reports the overhead
+per request (best of --repeat runs) against a budget. Pricing lookups are stubbed out, they are
+not collector overhead.
+
+Usage:
+    python benchmarks/metadata_overhead.py --requests 200000 --concurrency 1000 --budget-us 20
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sygra.core.models.model_response import ModelResponse
+from sygra.metadata import metadata_integration
+from sygra.metadata.metadata_collector import get_metadata_collector
+from sygra.metadata.metadata_integration import track_model_request
+
+
+class MockModel:
+    def __init__(self):
+        self.model_name = "mock_model"
+        self.model_type = "mock"
+        self.model_config = {
+            "type": "mock",
+            "url": "http://localhost:8000",
+            "parameters": {"temperature": 0.7, "max_tokens": 256, "stop": ["\n\n", "###"]},
+            "api_version": "2024-02-01",
+        }
+        self._last_request_usage = {
+            "prompt_tokens": 120,
+            "completion_tokens": 40,
+            "total_tokens": 160,
+        }
+
+    async def generate(self):
+        await asyncio.sleep(0)
+        return ModelResponse(llm_response="ok", response_code=200)
+
+    tracked_generate = track_model_request(generate)
+
+
+def uncached_snapshot(model):
+    """Config snapshot taken on every request, as before."""
+    model.__dict__.pop(metadata_integration._SNAPSHOT_ATTRIBUTE, None)
+    return snapshot(model)
+
+
+snapshot = metadata_integration._model_config_snapshot
+
+
+async def run(requests: int, concurrency: int, tracked: bool) -> float:
+    model = MockModel()
+    call = model.tracked_generate if tracked else model.generate
+    per_worker = requests // concurrency
+
+    async def worker():
+        for _ in range(per_worker):
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+def measure(requests: int, concurrency: int, mode: str, repeat: int) -> float:
+    """Return the best time per request in microseconds."""
+    return min(measure_once(requests, concurrency, mode) for _ in range(repeat))
+
+
+def measure_once(requests: int, concurrency: int, mode: str) -> float:
+    collector = get_metadata_collector()
+    collector.reset()
+    scope = collector.buffered() if mode == "buffered" else nullcontext()
+    snapshot_patch = (
+        patch.object(metadata_integration, "_model_config_snapshot", uncached_snapshot)
+        if mode == "before"
+        else nullcontext()
+    )
+    with scope, snapshot_patch:
+        elapsed = asyncio.run(run(requests, concurrency, tracked=mode != "untracked"))
+    recorded = collector.get_metadata_summary()["aggregate_statistics"]["requests"]
+    if mode != "untracked":
+        assert recorded["total_requests"] == requests // concurrency * concurrency
+    return elapsed / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--budget-us", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent tasks")
+    with patch.object(metadata_integration, "calculate_cost", lambda *args: 0.0):
+        baseline = measure(args.requests, args.concurrency, "untracked", args.repeat)
+        print(f"{'mode':>9} {'us/request':>11} {'overhead us':>12}")
+        print(f"{'untracked':>9} {baseline:>11.2f} {'':>12}")
+        for mode in ("before", "buffered"):
+            per_request = measure(args.requests, args.concurrency, mode, args.repeat)
+            print(f"{mode:>9} {per_request:>11.2f} {per_request - baseline:>12.2f}")
+
+    overhead = per_request - baseline
+    within = "within" if overhead <= args.budget_us else "OVER"
+    print(f"collector overhead {overhead:.2f} us/request, {within} the {args.budget_us} us budget")
+    sys.exit(0 if overhead <= args.budget_us else 1)
+
+
+if __name__ == "__main__":
+    main()
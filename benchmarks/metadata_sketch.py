@@ -0,0 +1,76 @@
+"""
+Benchmark of latency tracking in the metadata collector.
+
+Records request latencies the way ModelMetrics did before (a list of every sample, summarized
+with statistics.quantiles) and with the quantile sketch, and reports the memory held by the
+samples, the time to record them, the time to compute a summary and the p50/p99 (exact for the
+list).
+
+Usage:
+    python benchmarks/metadata_sketch.py --requests 100000 1000000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Union
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sygra.metadata.metadata_collector import calculate_latency_statistics
+from sygra.metadata.sketch import QuantileSketch
+
+
+def measure(requests: int, use_sketch: bool) -> tuple[float, float, float, dict[str, float]]:
+    """Return the memory in MB, the recording and the summary time in ms, and the summary."""
+
+    def record_all() -> Union[list[float], QuantileSketch]:
+        # latencies are generated on the fly, each sample is a new float like in a real run
+        rng = random.Random(0)
+        samples: Union[list[float], QuantileSketch] = QuantileSketch() if use_sketch else []
+        for _ in range(requests):
+            latency = rng.lognormvariate(0, 0.8)
+            if isinstance(samples, QuantileSketch):
+                samples.add(latency)
+            else:
+                samples.append(latency)
+        return samples
+
+    start = time.perf_counter()
+    samples = record_all()
+    record = time.perf_counter() - start
+
+    del samples
+    tracemalloc.start()
+    samples = record_all()
+    memory = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    summary = calculate_latency_statistics(samples)
+    return memory, record * 1e3, (time.perf_counter() - start) * 1e3, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, nargs="+", default=[100000, 1000000])
+    args = parser.parse_args()
+
+    print(
+        f"{'requests':>9} {'mode':>7} {'memory MB':>10} {'record ms':>10} {'summary ms':>11} "
+        f"{'p50':>7} {'p99':>7}"
+    )
+    for requests in args.requests:
+        for label, use_sketch in (("list", False), ("sketch", True)):
+            memory, record, summary_time, summary = measure(requests, use_sketch)
+            print(
+                f"{requests:>9} {label:>7} {memory:>10.2f} {record:>10.1f} {summary_time:>11.2f} "
+                f"{summary['p50']:>7.3f} {summary['p99']:>7.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
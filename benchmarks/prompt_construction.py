@@ -0,0 +1,89 @@
+"""
+Micro-benchmark of the per-record prompt construction cost of an LLM node.
+
+Compares building the prompt template from the node config for every record, as LLMNode did
+before templates were precompiled, with formatting the precompiled template of the node.
+
+Usage:
+    python benchmarks/prompt_construction.py --records 2000 --state-keys 50
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langchain_core.messages import HumanMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+from sygra.core.graph.nodes.llm_node import LLMNode
+from sygra.utils import utils
+
+PROMPT = [
+    {"system": "You are a {persona}. Answer in {language}, in at most {max_words} words."},
+    {"user": "Context:\n{context}\n\nQuestion: {question}"},
+]
+
+
+def build_node() -> LLMNode:
+    with patch.object(LLMNode, "_initialize_model"):
+        return LLMNode("benchmark_node", {"node_type": "llm", "model": {}, "prompt": PROMPT})
+
+
+def build_state(state_keys: int) -> dict[str, Any]:
+    state: dict[str, Any] = {
+        "persona": "helpful assistant",
+        "language": "English",
+        "max_words": 100,
+        "context": "lorem ipsum " * 200,
+        "question": "What is the answer?",
+        "messages": [HumanMessage("previous turn")],
+    }
+    # unrelated columns of the record, carried in the graph state
+    state.update({f"column_{i}": "value " * 50 for i in range(state_keys)})
+    return state
+
+
+def per_record_template(node: LLMNode, state: dict[str, Any]):
+    """Prompt construction as done before precompilation."""
+    messages = utils.convert_messages_from_config_to_chat_format(node.node_config["prompt"])
+    lc_messages = utils.convert_messages_from_chat_format_to_langchain(messages)
+    prompt = ChatPromptTemplate.from_messages(
+        [*lc_messages, MessagesPlaceholder(variable_name=node.input_key)]
+    )
+    return prompt.partial(**state).invoke(state)
+
+
+def measure(fn: Callable[[], Any], records: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(records):
+        fn()
+    return (time.perf_counter() - start) / records * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=2000, help="Records to format")
+    parser.add_argument("--state-keys", type=int, default=50, help="Unrelated keys in the state")
+    args = parser.parse_args()
+
+    node = build_node()
+    state = build_state(args.state_keys)
+    assert (
+        per_record_template(node, state).to_messages() == node._format_prompt(state).to_messages()
+    )
+
+    before = measure(lambda: per_record_template(node, state), args.records)
+    after = measure(lambda: node._format_prompt(state), args.records)
+    print(f"records: {args.records}, state keys: {len(state)}")
+    print(f"per-record template:  {before:9.1f} us/record")
+    print(f"precompiled template: {after:9.1f} us/record ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark of the pacing of model requests against a zero-latency mock server.
+
+Sends `--requests` requests through `--concurrency` concurrent workers to a BaseCustomModel
+backed by an in-process mock server that answers immediately. The requests go through the full
+model call path (url choice, retries, stats), once with the fixed `--delay` sleep before every
+call the way it worked before, once with the delay only applied before retries, and once paced
+by a `--rpm` rate limit. Reports the throughput and the mean latency per request.
+
+Usage:
+    python benchmarks/request_pacing.py --requests 2000 --concurrency 50 --delay 100 --rpm 60000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
+
+from sygra.core.models.custom_models import BaseCustomModel, ModelParams
+from sygra.core.models.model_response import ModelResponse
+from sygra.core.models.rate_limiter import RateLimiter
+from sygra.utils import constants
+
+
+class MockServerModel(BaseCustomModel):
+    """Model whose server answers immediately, optionally after the former pre-request sleep."""
+
+    pre_request_delay = 0.0
+
+    async def _generate_response(
+        self, input: ChatPromptValue, model_params: ModelParams, **kwargs: Any
+    ) -> ModelResponse:
+        if self.pre_request_delay:
+            await asyncio.sleep(self.pre_request_delay)
+        return ModelResponse(llm_response="ok", response_code=200)
+
+
+async def run_load(model: MockServerModel, requests: int, concurrency: int) -> dict:
+    prompt = ChatPromptValue(messages=[HumanMessage(content="hello")])
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+    latencies: list[float] = []
+
+    async def worker():
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            await model(prompt)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    total = time.perf_counter() - start
+    return {
+        "throughput": requests / total,
+        "latency": sum(latencies) / len(latencies) * 1e3,
+    }
+
+
+def build_model(delay: float, rpm: Optional[float], pre_request_delay: float) -> MockServerModel:
+    config: dict[str, Any] = {
+        "name": "mock_model",
+        "url": "http://localhost:8000",
+        "auth_token": "token",
+        "parameters": {},
+        "delay": delay,
+    }
+    if rpm:
+        config["rate_limit"] = {"requests_per_minute": rpm}
+    model = MockServerModel(config)
+    model.pre_request_delay = pre_request_delay
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=100, help="delay in ms")
+    parser.add_argument("--rpm", type=float, default=60000, help="rate limit in requests/minute")
+    args = parser.parse_args()
+
+    # the mock server is never down, skip the circuit breakers
+    constants.HANDLE_SERVER_DOWN = False
+    runs = (
+        ("sleep before every call", build_model(args.delay, None, args.delay / 1000)),
+        ("delay before retries", build_model(args.delay, None, 0.0)),
+        (f"rate limit {args.rpm:.0f}/min", build_model(args.delay, args.rpm, 0.0)),
+    )
+    print(f"{'':>26} {'req/s':>10} {'mean ms':>9}")
+    for label, model in runs:
+        result = asyncio.run(run_load(model, args.requests, args.concurrency))
+        RateLimiter.reset()
+        print(f"{label:>26} {result['throughput']:>10.1f} {result['latency']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark of output schema validation.
+
+Validates generated records against a `fields` schema (with an additional rule) and against a
+pydantic schema class, the way DatasetProcessor did before schemas were compiled (a validator and
+one TypeAdapter per field built for every record) and with the compiled validator checking whole
+checkpoint slices.
+
+Usage:
+    python benchmarks/schema_validation.py --records 100000 --checkpoint-interval 100
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from pydantic import BaseModel, TypeAdapter
+
+from sygra.validators import schema_validator_base
+from sygra.validators.schema_validator_base import SchemaValidator
+
+FIELDS_CONFIG = {
+    "fields": [
+        {"name": "id", "type": "str"},
+        {"name": "conversation", "type": "list[dict[str, str]]"},
+        {"name": "tags", "type": "list[str]"},
+        {"name": "score", "type": "float", "is_greater_than": 0},
+    ]
+}
+
+
+class RecordSchema(BaseModel):
+    id: str
+    conversation: list[dict[str, str]]
+    tags: list[str]
+    score: float
+
+
+def make_records(count: int) -> list[dict]:
+    return [
+        {
+            "id": f"record-{i}",
+            "conversation": [
+                {"role": "user", "content": f"question {i}"},
+                {"role": "assistant", "content": f"answer {i}"},
+            ],
+            "tags": ["synthetic", "qa"],
+            "score": 0.5 + i % 10,
+        }
+        for i in range(count)
+    ]
+
+
+def graph_config(schema_config: dict) -> MagicMock:
+    config = MagicMock()
+    config.schema_config = schema_config
+    return config
+
+
+def per_record(schema_config: dict, records: list[dict]) -> float:
+    """Validate every record with a fresh validator and fresh TypeAdapters, as before."""
+
+    def uncached_validate_type(self, field_name, field_value, expected_type):
+        TypeAdapter(expected_type).validate_python(field_value)
+        return True
+
+    start = time.perf_counter()
+    with patch.object(SchemaValidator, "validate_type", uncached_validate_type):
+        for record in records:
+            validator = SchemaValidator(graph_config(schema_config))
+            if validator.schema_class:
+                validator.schema_class(**record)
+            else:
+                validator.validateYAML(record)
+    return time.perf_counter() - start
+
+
+def compiled(schema_config: dict, records: list[dict], checkpoint_interval: int) -> float:
+    """Validate checkpoint slices with a validator compiled once for the run."""
+    start = time.perf_counter()
+    validator = SchemaValidator(graph_config(schema_config))
+    for offset in range(0, len(records), checkpoint_interval):
+        valid = validator.validate_batch(records[offset : offset + checkpoint_interval])
+        assert all(valid)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--checkpoint-interval", type=int, default=100)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    records = make_records(args.records)
+    schemas: dict[str, dict] = {
+        "fields": FIELDS_CONFIG,
+        "schema class": {"schema": "benchmarks.schema_validation.RecordSchema"},
+    }
+
+    print(f"{args.records} records, checkpoints of {args.checkpoint_interval}")
+    print(f"{'schema':>14} {'per record (s)':>16} {'compiled (s)':>14} {'speedup':>8}")
+    with patch.object(schema_validator_base, "resolve_schema_class", return_value=RecordSchema):
+        for label, schema_config in schemas.items():
+            before = per_record(schema_config, records)
+            after = compiled(schema_config, records, args.checkpoint_interval)
+            print(f"{label:>14} {before:>16.2f} {after:>14.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@
 ########################################################################################################################
 
 # Define code paths for various operations
-CODE_PATHS = sygra tests
+CODE_PATHS = sygra tests benchmarks
 LINT_MYPY_PATHS = sygra
 
 # Define paths for JSON files
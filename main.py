@@ -80,6 +80,13 @@ if __name__ == "__main__":
         default=100,
         help="Num of records after which an output file checkpoint is saved",
     )
+    parser.add_argument(
+        "--fsync_interval",
+        "-fi",
+        type=int,
+        default=1,
+        help="Num of output checkpoints after which the output file is fsynced (0: only at the end)",
+    )
     parser.add_argument(
         "--debug",
         "-d",
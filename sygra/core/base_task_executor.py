@@ -1,6 +1,4 @@
 import ast
-import copy
-import hashlib
 import json
 import os
 from abc import ABC
@@ -9,7 +7,6 @@ from typing import Any, Optional, Union, cast
 
 import datasets  # type: ignore[import-untyped]
 import numpy as np
-import pandas as pd  # type: ignore[import-untyped]
 from langgraph.graph import StateGraph
 from PIL import Image
 
@@ -22,15 +19,26 @@ from sygra.core.dataset.dataset_config import (
 from sygra.core.dataset.dataset_processor import DatasetProcessor
 from sygra.core.dataset.file_handler import FileHandler
 from sygra.core.dataset.huggingface_handler import HuggingFaceHandler
+from sygra.core.dataset.record_id import content_id
 from sygra.core.dataset.servicenow_handler import ServiceNowHandler
+from sygra.core.dataset.source_join import (
+    SecondarySource,
+    join_sources,
+    joined_size,
+    lazy_dataset,
+    stacked_size,
+    vstack_sources,
+)
 from sygra.core.graph.graph_config import GraphConfig
 from sygra.core.graph.langgraph.graph_builder import LangGraphBuilder
 from sygra.core.graph.sygra_state import SygraState
 from sygra.logger.logger_config import logger
 from sygra.metadata.metadata_collector import get_metadata_collector
+from sygra.processors.data_transform import TransformPipeline
 from sygra.processors.output_record_generator import BaseOutputGenerator
 from sygra.tools.toolkits.data_quality.processor import DataQuality
 from sygra.utils import constants, utils
+from sygra.utils.config_registry import ConfigRegistry, thaw
 
 
 class BaseTaskExecutor(ABC):
@@ -44,6 +52,8 @@ class BaseTaskExecutor(ABC):
         # Store metadata and source configs per alias for multi-dataset scenarios
         self._dataset_metadata_by_alias: dict[str, dict] = {}
         self._source_configs_by_alias: dict[str, DataSourceConfig] = {}
+        # number of records of a lazy join of multiple sources, counted without joining them
+        self._joined_num_records: Optional[int] = None
 
         config_file_path = utils.get_file_in_task_dir(self.task_name, "graph_config.yaml")
         self.config = graph_config_dict or utils.load_yaml_file(filepath=config_file_path)
@@ -51,6 +61,7 @@ class BaseTaskExecutor(ABC):
         data_config = self.config.get("data_config", {})
         config_resumable = data_config.get("resumable", False)
         self.id_column = data_config.get("id_column") or None
+        self.id_fields = data_config.get("id_fields") or None
 
         self.resumable = self._configure_resume_behavior(args, config_resumable)
 
@@ -288,10 +299,15 @@ class BaseTaskExecutor(ABC):
         If select_columns is not defined, then return all fields
         Also perform data transformation for unsupported datatype, which fails to write because of serialization error
         Currently supported non-serialized data type: ndarray
+        Streaming datasets stay lazy, their records are processed as they are read.
         """
-        select_columns = select_columns or []
-        final_data = []
-        filter_column = select_columns is not None and len(select_columns) > 0
+        if isinstance(data, datasets.IterableDataset):
+            return lazy_dataset(self._select_fields, data=data, select_columns=select_columns)
+        return list(self._select_fields(data, select_columns))
+
+    def _select_fields(self, data, select_columns: Optional[list] = None):
+        select_columns = list(select_columns or [])
+        filter_column = len(select_columns) > 0
         # make sure id column is preserved, if filter_column are defined
         if filter_column and "id" not in select_columns:
             select_columns.append("id")
@@ -307,12 +323,10 @@ class BaseTaskExecutor(ABC):
                     v = v.tolist()
                 # store the updated key-value
                 new_record[k] = v
-            # now add into final dataset
             # Allow empty records through when no field filtering is applied
             # (empty records are valid for tasks with no data source that use samplers)
             if len(new_record) > 0 or not filter_column:
-                final_data.append(new_record)
-        return final_data
+                yield new_record
 
     # Initialize and return the dataset for the task
     def init_dataset(
@@ -326,7 +340,9 @@ class BaseTaskExecutor(ABC):
         # Configure and load source data
         data = self._load_source_data(data_config)
         # get select fields if defined
-        select_fields = data_config.get("source", {}).get("fields", [])
+        # (fields can only be selected from a single source)
+        source_config = data_config.get("source")
+        select_fields = source_config.get("fields", []) if isinstance(source_config, dict) else []
         # select only required fields
         data = self._process_feilds(data, select_fields)
 
@@ -514,56 +530,6 @@ class BaseTaskExecutor(ABC):
                 logger.error("Duplicate alias in sink data config list.")
         return True
 
-    # Rename columns with alias prefix
-    def _rename_dataframe(self, df: pd.DataFrame, alias: str) -> pd.DataFrame:
-        column_names = list(df.columns)
-        # check if anyone column has alias prefix, skip it
-        for column_name in column_names:
-            if column_name.startswith(alias + constants.ALIAS_JOINER):
-                return df
-
-        column_rename_map = {c: constants.ALIAS_JOINER.join([alias, c]) for c in list(df.columns)}
-        df = df.rename(columns=column_rename_map)
-        return df
-
-    # merge dataframes horizontally with repeated secondary rows sequentially if secondary is small
-    # if secondary is large, trim to max length of primary and merge
-    # primary: a columns, secondary: b columns, merged: a+b columns
-    def _repeat_to_merge_sequentially(
-        self, primary_df: pd.DataFrame, secondary_df: pd.DataFrame
-    ) -> pd.DataFrame:
-        # primary: [1,2,3,4,5] secondary: [a,b] merged[[1,a], [2,b], [3,a], [4,b],[5,a]]
-        # primary: [1,2,3] secondary: [a,b,c,d,e] merged[[1,a], [2,b], [3,c]]
-        primary_length = len(primary_df)
-        secondary_length = len(secondary_df)
-        repeats = (primary_length // secondary_length) + 1
-        # repeat the dataset till max length(primary dataset)
-        df_repeated = pd.concat([secondary_df] * repeats, ignore_index=True).iloc[:primary_length]
-        # now both dataset are same length, merge and return
-        return pd.concat([primary_df, df_repeated], axis=1)
-
-    # merge the primary and secondary dataframe horizontally by randomlly picking one and adding into primary
-    # primary : M rows(a columns), secondary: N rows(b columns), merged: M rows(a+b columns)
-    def _shuffle_and_extend(
-        self, primary_df: pd.DataFrame, secondary_df: pd.DataFrame
-    ) -> pd.DataFrame:
-        max_len = len(primary_df)
-        # Shuffle the secondary dataframe
-        shuffled_secondary = secondary_df.sample(frac=1).reset_index(drop=True)
-        # If already at or above max length, just return the truncated shuffled df
-        if len(shuffled_secondary) >= max_len:
-            final_secondary = shuffled_secondary.iloc[:max_len].reset_index(drop=True)
-        else:
-            # Number of additional rows needed
-            needed = max_len - len(shuffled_secondary)
-            # Sample duplicate rows randomly (with replacement)
-            extra_rows = shuffled_secondary.sample(needed, replace=True).reset_index(drop=True)
-            # Concatenate original + duplicates to make is same length as primary dataset
-            final_secondary = pd.concat([shuffled_secondary, extra_rows], ignore_index=True)
-
-        # now both dataset are same length, merge and return
-        return cast(pd.DataFrame, pd.concat([primary_df, final_secondary], axis=1))
-
     def _load_source_data(
         self, data_config: dict
     ) -> Union[list[dict], datasets.Dataset, datasets.IterableDataset]:
@@ -589,107 +555,12 @@ class BaseTaskExecutor(ABC):
             full_data = self.apply_transforms(source_config_obj, full_data)
         elif isinstance(source_config, list):
             # if multiple dataset configured as list
-            dataset_list: list[dict[str, Any]] = []
-            primary_df: Optional[pd.DataFrame] = None
-            primary_config = None
-            # if multiple dataset, verify if join_type and alias is defined in each config(@source and @sink)
-            if isinstance(source_config, list):
-                sink_config = data_config.get("sink", [])
-                if not self.validate_data_config(source_config, sink_config if sink_config else []):
-                    logger.error("Invalid source or sink config.")
-                    return []
-
-            # Read primary and secondary dataset into dataframes
-            is_vstack = False
-            for conf in source_config:
-                join_type = conf.get(constants.DATASET_JOIN_TYPE)
-                alias = conf.get(constants.DATASET_ALIAS)
-                conf_obj = DataSourceConfig.from_dict(conf)
-                reader = self._get_data_reader(conf_obj)
-                # store if join type is vstack(all should be vstack, so checking last element only)
-                is_vstack = join_type == constants.JOIN_TYPE_VSTACK
-                if join_type == constants.JOIN_TYPE_PRIMARY:
-                    primary_config = conf
-                    # read the dataset
-                    primary_dataset = self._read_data(reader, conf_obj)
-                    # Capture metadata for this dataset keyed by alias
-                    self._capture_dataset_metadata_for_alias(
-                        primary_dataset, reader, alias, conf_obj
-                    )
-                    # Apply transformations to the dataset
-                    primary_dataset = self.apply_transforms(conf_obj, primary_dataset)
-                    # convert to dataframe
-                    primary_df = pd.DataFrame(primary_dataset)
-                    # add alias prefix in the column name(join_type cant be vstack if it is set to primary)
-                    primary_df = self._rename_dataframe(primary_df, alias)
-                else:
-                    # read the dataset
-                    sec_dataset = self._read_data(reader, conf_obj)
-                    # Capture metadata for this dataset keyed by alias
-                    self._capture_dataset_metadata_for_alias(sec_dataset, reader, alias, conf_obj)
-                    # Apply transformations to the dataset
-                    sec_dataset = self.apply_transforms(conf_obj, sec_dataset)
-                    # convert to dataframe
-                    sec_df = pd.DataFrame(sec_dataset)
-                    # add alias prefix in the column name (avoid column rename for join_type==vstack)
-                    sec_df = self._rename_dataframe(sec_df, alias) if is_vstack is False else sec_df
-                    # store the dataframe in to the list
-                    dataset_list.append({"conf": conf, "dataset": sec_df})
-
-            # if join type is vstack
-            if len(dataset_list) > 0 and is_vstack:
-                logger.info("All datasets are vertically stacking.")
-                # fetch all dataframes
-                all_df = [ds.get("dataset") for ds in dataset_list]
-                vmerged_df = pd.concat(all_df, axis=0, join="inner")
-                # now convert dataframe to list of dict (full_data)
-                full_data = vmerged_df.to_dict(orient="records")
-            elif primary_df is None or len(primary_dataset) == 0:
-                logger.error("Primary dataset is not defined for horizontal stack/concatenation.")
-            else:
-                # merge datasets into primary
-                for ds in dataset_list:
-                    ds_conf: dict[str, Any] = ds.get("conf", {})
-                    join_type = ds_conf.get(constants.DATASET_JOIN_TYPE)
-                    current_df = ds.get("dataset")
-                    if current_df is None or not isinstance(current_df, pd.DataFrame):
-                        logger.error("Dataset is missing or not a dataframe")
-                        continue
-                    if join_type == constants.JOIN_TYPE_COLUMN:
-                        sec_alias_name = ds_conf.get(constants.DATASET_ALIAS)
-                        pri_alias_name = (
-                            primary_config.get(constants.DATASET_ALIAS) if primary_config else None
-                        )
-                        # convert the keys with alias prefix (table1.column1)
-                        primary_column = constants.ALIAS_JOINER.join(
-                            [pri_alias_name or "", ds_conf.get(constants.PRIMARY_KEY, "")]
-                        )
-                        join_column = constants.ALIAS_JOINER.join(
-                            [sec_alias_name or "", ds_conf.get(constants.JOIN_KEY, "")]
-                        )
-                        # where_clause = ds.get("conf").get("where_clause")
-                        primary_df = pd.merge(
-                            primary_df,
-                            cast(pd.DataFrame, current_df),
-                            left_on=primary_column,
-                            right_on=join_column,
-                            how="left",
-                        )
-                    elif join_type == constants.JOIN_TYPE_SEQUENTIAL:
-                        primary_df = self._repeat_to_merge_sequentially(
-                            primary_df, cast(pd.DataFrame, current_df)
-                        )
-                    elif join_type == constants.JOIN_TYPE_CROSS:
-                        primary_df = primary_df.merge(cast(pd.DataFrame, current_df), how="cross")
-                    elif join_type == constants.JOIN_TYPE_RANDOM:
-                        primary_df = self._shuffle_and_extend(
-                            primary_df, cast(pd.DataFrame, current_df)
-                        )
-                    else:
-                        logger.error("Not implemented join_type")
-
-                # now convert dataframe to list of dict (full_data)
-                full_data = cast(list[dict[str, Any]], primary_df.to_dict(orient="records"))
+            sink_config = data_config.get("sink", [])
+            # verify if join_type and alias is defined in each config(@source and @sink)
+            if not self.validate_data_config(source_config, sink_config if sink_config else []):
+                logger.error("Invalid source or sink config.")
+                return []
+            full_data = self._join_sources(source_config)
         else:
             logger.error("Unsupported source config type.")
 
@@ -702,6 +573,75 @@ class BaseTaskExecutor(ABC):
 
         return full_data
 
+    def _join_sources(
+        self, source_config: list[dict[str, Any]]
+    ) -> Union[list[dict[str, Any]], datasets.IterableDataset]:
+        """
+        Join multiple configured sources into one dataset.
+
+        The sources are either all stacked vertically (vstack), or joined horizontally into the
+        primary source. The joined dataset is a lazy streaming dataset: the records are joined one
+        at a time in primary order as the dataset is iterated, instead of materialising the join
+        (see sygra.core.dataset.source_join). Secondary sources are read into memory-mapped stores.
+        """
+        primary_data: Optional[Union[list[dict[str, Any]], datasets.IterableDataset]] = None
+        primary_alias = ""
+        stacked: list[Union[list[dict[str, Any]], datasets.IterableDataset]] = []
+        secondaries: list[SecondarySource] = []
+        for conf in source_config:
+            join_type = conf.get(constants.DATASET_JOIN_TYPE)
+            # alias and join_type are set on every source, see validate_data_config
+            alias = conf[constants.DATASET_ALIAS]
+            conf_obj = DataSourceConfig.from_dict(conf)
+            reader = self._get_data_reader(conf_obj)
+            # read the dataset
+            dataset = self._read_data(reader, conf_obj)
+            # Capture metadata for this dataset keyed by alias
+            self._capture_dataset_metadata_for_alias(dataset, reader, alias, conf_obj)
+            # Apply transformations to the dataset
+            dataset = self.apply_transforms(conf_obj, dataset)
+            if join_type == constants.JOIN_TYPE_PRIMARY:
+                primary_data, primary_alias = dataset, alias
+            elif join_type == constants.JOIN_TYPE_VSTACK:
+                # vstack columns are not prefixed with the alias
+                stacked.append(dataset)
+            elif join_type in SecondarySource.JOIN_TYPES:
+                secondaries.append(
+                    SecondarySource(
+                        dataset,
+                        alias,
+                        join_type,
+                        primary_key=conf.get(constants.PRIMARY_KEY),
+                        join_key=conf.get(constants.JOIN_KEY),
+                    )
+                )
+            else:
+                logger.error("Not implemented join_type")
+
+        if stacked:
+            logger.info("All datasets are vertically stacking.")
+            joined = lazy_dataset(vstack_sources, sources=stacked)
+            size = stacked_size(stacked)
+        elif primary_data is None or (isinstance(primary_data, list) and len(primary_data) == 0):
+            logger.error("Primary dataset is not defined for horizontal stack/concatenation.")
+            return []
+        else:
+            joined = lazy_dataset(
+                join_sources,
+                primary=primary_data,
+                primary_alias=primary_alias,
+                secondaries=secondaries,
+            )
+            size = joined_size(primary_data, primary_alias, secondaries)
+
+        if size is None and not self.args.num_records:
+            # a join of streamed sources has no known size: without a target number of records,
+            # the run processes all of them
+            logger.info("Reading the joined streaming sources, no number of records is set.")
+            return list(joined)
+        self._joined_num_records = size
+        return joined
+
     def _capture_dataset_metadata(self, dataset: Any, reader: Any) -> None:
         """Capture dataset version and hash before transformations."""
         try:
@@ -842,11 +782,12 @@ class BaseTaskExecutor(ABC):
         """
         Apply each transformation in source_config.transformations
         (the default_transformations from config are applied first)
-          - If `data` is a list of dicts, run transform(list, params) in‐memory.
-          - If `data` is an IterableDataset, apply each transform one record at a time.
+        The transformations run as one pipeline, in a single pass over the records:
+          - If `data` is a list of dicts, the transformed records are collected into a new list.
+          - If `data` is an IterableDataset, the records are transformed lazily as they are read.
         """
-        config = utils.load_yaml_file(constants.SYGRA_CONFIG)
-        default_cfgs = (config or {}).get("default_transformations", [])
+        config = ConfigRegistry.load_yaml(constants.SYGRA_CONFIG) or {}
+        default_cfgs = thaw(config.get("default_transformations") or [])
         custom_cfgs = [cfg.model_dump() for cfg in (source_config.transformations or [])]
         all_transforms = default_cfgs + custom_cfgs
 
@@ -858,61 +799,20 @@ class BaseTaskExecutor(ABC):
         )
 
         if isinstance(data, list):
-            return self._apply_transform_sequence(all_transforms, data)
+            return TransformPipeline.from_config(all_transforms).apply(data)
 
         elif isinstance(data, datasets.IterableDataset):
-            return self._apply_transforms_iterable(all_transforms, data)
+            pipeline = TransformPipeline.from_config(all_transforms, streaming=True)
+            return lazy_dataset(pipeline.stream, records=data)
 
         else:
             raise TypeError(f"Unsupported dataset type: {type(data)}")
 
-    def _get_transform_instances(
-        self, transform_cfgs: list[dict[str, Any]]
-    ) -> list[tuple[Any, dict[str, Any]]]:
-        """
-        Get instances of transformation functions based on the provided configuration.
-        """
-        instances = []
-        for cfg in transform_cfgs:
-            if "transform" not in cfg:
-                raise ValueError(f"Missing 'transform' key in transformation config: {cfg}")
-            transform_fn = utils.get_func_from_str(cfg["transform"])()
-            params = cfg.get("params", {})
-            instances.append((transform_fn, params))
-        return instances
-
-    def _apply_transform_sequence(
-        self, transform_cfgs: list[dict[str, Any]], data: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
-        """
-        Apply a sequence of transformations to a list of records.
-        """
-        transform_instances = self._get_transform_instances(transform_cfgs)
-        data_input = copy.deepcopy(data)
-        for instance, params in transform_instances:
-            logger.info(f"Applying transform: {instance.name}")
-            data_input = instance.transform(data_input, params)
-        return data_input
-
-    def _apply_transforms_iterable(
-        self, transform_cfgs: list[dict[str, Any]], data: datasets.IterableDataset
-    ) -> datasets.IterableDataset:
-        """
-        Apply a sequence of transformations to an IterableDataset.
-        """
-        transform_instances = self._get_transform_instances(transform_cfgs)
-
-        def _apply_transform_record(record: dict[str, Any]) -> dict[str, Any]:
-            for instance, params in transform_instances:
-                record = instance.transform([record], params)[0]  # Apply transform to single record
-            return record
-
-        return data.map(_apply_transform_record)
-
     def add_id(self, record: dict[str, Any]) -> dict[str, Any]:
         """
         Add an "id" to the record. If the id_column is specified, use that value.
-        If the id_column is not specified and the record does not have an "id", generate a hash of the record.
+        If the record has no id, use the content id of the record (or of its id_fields), so the id
+        is computed once here and carried through the pipeline.
 
         Args:
             record: The input record (dict) to which the id will be added.
@@ -920,19 +820,11 @@ class BaseTaskExecutor(ABC):
             dict: The record with the added "id" field.
         """
 
-        if self.id_column:
-            id_column = self.id_column
-            if id_column in record and record[id_column] is not None:
-                record["id"] = record[id_column]
-            return record
-        elif "id" in record and record["id"] is not None:
-            return record
-        else:
-            record_for_hash = record.copy()
-            record_str = json.dumps(record_for_hash, sort_keys=True)
-            content_hash = hashlib.sha256(record_str.encode()).hexdigest()
-            record["id"] = content_hash
-            return record
+        if self.id_column and record.get(self.id_column) is not None:
+            record["id"] = record[self.id_column]
+        elif record.get("id") is None:
+            record["id"] = content_id(record, self.id_fields)
+        return record
 
     # Function to assign "id" to every record of full_data
     def assign_ids(self, full_data, features: Optional[datasets.Features] = None):
@@ -1012,6 +904,11 @@ class BaseTaskExecutor(ABC):
                 if self.args.num_records
                 else len(self.dataset)
             )
+        elif self._joined_num_records is not None:
+            num_joined = max(0, self._joined_num_records - self.args.start_index)
+            num_records_total = (
+                min(self.args.num_records, num_joined) if self.args.num_records else num_joined
+            )
 
         metadata_path = utils.get_file_in_task_dir(self.args.task, "metadata.json")
 
@@ -1051,6 +948,8 @@ class BaseTaskExecutor(ABC):
             if os.path.exists(metadata_path):
                 logger.info(f"Removing metadata file: {metadata_path}")
                 utils.delete_file(metadata_path)
+            journal_path = os.path.join(os.path.dirname(metadata_path), constants.META_JOURNAL_FILE)
+            utils.delete_file(journal_path)
 
         if self.args.start_index != 0:
             logger.info(
@@ -1075,6 +974,9 @@ class BaseTaskExecutor(ABC):
             start_index=self.args.start_index,
             batch_size=self.args.batch_size,
             checkpoint_interval=self.args.checkpoint_interval,
+            fsync_interval=getattr(
+                self.args, "fsync_interval", constants.DEFAULT_OUTPUT_FSYNC_INTERVAL
+            ),
             debug=self.args.debug,
             input_record_generator=self.input_record_generator,
             output_record_generator=self.output_record_generator,
@@ -0,0 +1,77 @@
+"""Background writer for dataset checkpoints.
+
+Converting, post-processing and appending a checkpoint is synchronous work. Run on the event loop,
+it stalls every in-flight model request for its duration. The checkpoint writer runs these jobs in
+a single dedicated thread instead: jobs run one at a time in submission order, so checkpoints are
+appended to the output files in the order they were taken. The number of queued jobs is bounded;
+when the writer falls behind, submitting a checkpoint waits for the oldest one to finish.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Optional
+
+from sygra.logger.logger_config import logger
+from sygra.utils import constants
+
+
+class CheckpointWriter:
+    """Runs checkpoint jobs in order in a dedicated thread, with a bounded queue.
+
+    Args:
+        max_pending (int): Number of submitted jobs, including the running one, above which
+            submit waits for the oldest job to finish.
+    """
+
+    def __init__(self, max_pending: int = constants.CHECKPOINT_WRITER_MAX_PENDING):
+        self.max_pending = max(1, max_pending)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Deque[asyncio.Future] = deque()
+
+    @property
+    def pending(self) -> int:
+        """Number of submitted jobs not finished yet."""
+        self._discard_finished()
+        return len(self._pending)
+
+    async def submit(self, job: Callable[..., Any], *args: Any) -> asyncio.Future:
+        """Queue a job for the writer thread, waiting while the queue is full.
+
+        The job is queued before waiting, so jobs run in the order of the submit calls.
+
+        Args:
+            job (Callable[..., Any]): Function to run in the writer thread.
+            *args (Any): Arguments of the job.
+
+        Returns:
+            asyncio.Future: Future of the result of the job.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="sygra-checkpoint-writer"
+            )
+        future = asyncio.wrap_future(self._executor.submit(job, *args))
+        self._pending.append(future)
+
+        while self.pending > self.max_pending:
+            logger.debug(f"Checkpoint writer is behind by {self.pending} checkpoints, waiting")
+            await asyncio.wait([self._pending[0]])
+        return future
+
+    async def drain(self) -> None:
+        """Wait for every submitted job to finish. Job errors are left to their futures."""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+            self._discard_finished()
+
+    def shutdown(self) -> None:
+        """Wait for the queued jobs in the calling thread and stop the writer thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._pending.clear()
+
+    def _discard_finished(self) -> None:
+        while self._pending and self._pending[0].done():
+            self._pending.popleft()
@@ -1,4 +1,6 @@
 import asyncio
+import heapq
+import itertools
 import json
 import os
 import signal
@@ -11,7 +13,16 @@ import datasets  # type: ignore[import-untyped]
 import tqdm  # type: ignore[import-untyped]
 from langgraph.graph.state import CompiledStateGraph
 
+from sygra.core.dataset.checkpoint_writer import CheckpointWriter
+from sygra.core.dataset.output_writer import OutputWriter, get_output_writer
+from sygra.core.dataset.record_id import has_id
 from sygra.core.graph.graph_config import GraphConfig
+from sygra.core.models.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from sygra.core.models.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBudgetExhaustedError,
+    CircuitOpenError,
+)
 from sygra.core.resumable_execution import ResumableExecutionManager
 from sygra.data_mapper.mapper import DataMapper
 from sygra.logger.logger_config import logger
@@ -37,6 +48,7 @@ class DatasetProcessor:
         resumable: bool = False,
         task_name: Optional[str] = None,
         execution_callbacks: Optional[Any] = None,  # ExecutionCallbacks for node-level tracking
+        fsync_interval: int = constants.DEFAULT_OUTPUT_FSYNC_INTERVAL,
     ):
         assert (
             checkpoint_interval % batch_size == 0
@@ -54,6 +66,21 @@ class DatasetProcessor:
         self.output_record_generator = output_record_generator
         self.is_valid_schema = True
         self.execution_callbacks = execution_callbacks
+        self.fsync_interval = fsync_interval
+
+        # append-only writers for the output (and intermediate) files, kept open for the run
+        self._output_writers: dict[str, OutputWriter] = {}
+        # checkpoints are written off the event loop, in order
+        self._checkpoint_writer = CheckpointWriter()
+        # the custom output schema is compiled once per run and checked on whole checkpoints
+        self._schema_validator: Optional[SchemaValidator] = None
+        if not self._is_oasst_mapper_required():
+            self._schema_validator = SchemaValidator(graph_config)
+        # generated media are written to files next to the output, from a pool of writers
+        self._media_extractor = multimodal_processor.MediaExtractor(
+            Path(".".join(self.output_file.split(".")[:-1])),
+            media_fields=multimodal_processor.media_fields_from_graph_config(graph_config),
+        )
 
         # initialize the state variables
         self.dataset_indx = start_index
@@ -61,6 +88,10 @@ class DatasetProcessor:
         self.batch_start = time.time()
         self.num_records_processed = 0
         self.failed_records = 0
+        # records parked while the circuit of a model endpoint is open:
+        # (retry time, seq, record, dataset index)
+        self._parked_records: list[tuple[float, int, dict[str, Any], int]] = []
+        self._park_seq = itertools.count()
 
         # Resumable execution settings
         self.resumable = resumable
@@ -84,6 +115,9 @@ class DatasetProcessor:
         # Initialize the tqdm progress bar with the correct number of records to process
         self.pbar = tqdm.tqdm(total=self.num_records_total)
         self.graph_results: list[dict[str, Any]] = []
+        # input records and dataset positions of graph_results, marked as processed for
+        # resumable execution once their checkpoint is written
+        self._checkpoint_records: list[tuple[dict[str, Any], int]] = []
 
         # Initialize input dataset iterator
         self.input_dataset = iter(input_dataset)
@@ -152,7 +186,7 @@ class DatasetProcessor:
             record = next(self.input_dataset)
 
             # Ensure record has an ID
-            if "id" not in record or not record["id"]:
+            if not has_id(record):
                 record["id"] = str(uuid.uuid4())
 
             # For resumable execution, skip already processed records
@@ -174,7 +208,9 @@ class DatasetProcessor:
 
     def process_and_store_results(self):
         """Main entry point to process the dataset and store results."""
-        asyncio.run(self._process_and_store_results())
+        # record the run's metrics in a buffer of this task instead of locking per request
+        with get_metadata_collector().buffered():
+            asyncio.run(self._process_and_store_results())
 
     @staticmethod
     def is_error_code_in_output(output_record: dict[str, Any]) -> bool:
@@ -192,13 +228,16 @@ class DatasetProcessor:
                 return True
         return False
 
-    async def _add_graph_result(self, output: dict[str, Any], record: dict[str, Any]) -> None:
+    async def _add_graph_result(
+        self, output: dict[str, Any], record: dict[str, Any], record_index: Optional[int] = None
+    ) -> None:
         """
         Add a result from graph execution to the results list and handle resumable state.
 
         Args:
             output: The output from graph execution
             record: The input record that was processed
+            record_index: Dataset index of the record, the last record read if not set
         """
         # Check if execution had an error - don't mark as processed if it did
         if self.is_error_code_in_output(output):
@@ -220,35 +259,19 @@ class DatasetProcessor:
                 )
             return
 
-        # Schema validation for custom output schema runs when oasst_mapper is set to false
-        is_oasst_mapper_required = (
-            True
-            if (
-                isinstance(self.graph_config.oasst_mapper, dict)
-                and self.graph_config.oasst_mapper.get("required") == "yes"
-            )
-            else False
-        )
-
-        # Validate schema if needed
-        if not is_oasst_mapper_required:
-            logger.info("Starting custom schema validation")
-            schema_validator = SchemaValidator(self.graph_config)
-            self.is_valid_schema = schema_validator.validate(output)
-            if not self.is_valid_schema:
-                logger.error("Output data validation failed, skipping record")
-                if self.resumable and self.resume_manager:
-                    record_id = self.resume_manager.get_record_id(record)
-                    self.resume_manager.in_process_records.discard(record_id)
-                return
+        is_oasst_mapper_required = self._is_oasst_mapper_required()
 
-        # Add result to batch
+        # Add result to batch, the custom output schema is validated with the whole checkpoint
         self.graph_results.append(output)
+        self._checkpoint_records.append(
+            (record, self.dataset_indx - 1 if record_index is None else record_index)
+        )
         self.num_records_processed += 1
 
-        # Record successful record in metadata collector
-        collector = get_metadata_collector()
-        collector.record_processed_record(success=True)
+        # Record successful record in metadata collector, once validated if there is a schema
+        if not self._validates_schema():
+            collector = get_metadata_collector()
+            collector.record_processed_record(success=True)
 
         # all the code below should refer total_records_with_error(not self.num_records_processed)
         total_records_with_error = self.num_records_processed + self.failed_records
@@ -256,12 +279,9 @@ class DatasetProcessor:
         if total_records_with_error >= self.num_records_total:
             logger.info(f"Reached target of {self.num_records_total} records. Stopping.")
 
-        # For resumable execution, mark record as fully processed
+        # For resumable execution, records are marked as processed once their checkpoint is
+        # written; force an immediate state save every few records
         if self.resumable and self.resume_manager:
-            # Set the current dataset position when marking the record as processed
-            self.resume_manager.mark_record_processed(record, self.dataset_indx - 1)
-
-            # Force an immediate state save every few records
             if total_records_with_error % self.batch_size == 0:
                 self.resume_manager.force_save_state()
 
@@ -285,26 +305,75 @@ class DatasetProcessor:
             )
             await self._write_checkpoint(is_oasst_mapper_required)
 
+    def _is_oasst_mapper_required(self) -> bool:
+        """Whether output records are mapped with the OASST mapper."""
+        return (
+            isinstance(self.graph_config.oasst_mapper, dict)
+            and self.graph_config.oasst_mapper.get("required") == "yes"
+        )
+
+    def _validates_schema(self) -> bool:
+        """Whether checkpoints are validated against a custom output schema."""
+        return self._schema_validator is not None and self._schema_validator.enabled
+
     async def _write_checkpoint(self, is_oasst_mapper_required: bool) -> None:
         """
-        Write the current results to the output file and save resumable state.
+        Hand the current results over to the checkpoint writer.
+
+        The results are converted, post-processed and appended to the output file in the
+        checkpoint writer thread, so the event loop keeps serving in-flight records. For
+        resumable execution, the records are marked as processed only after their checkpoint is
+        written, so a record is never reported as done before it is in the output file.
 
         Args:
             is_oasst_mapper_required: Whether OASST mapping is required
         """
+        graph_results = self.graph_results
+        checkpoint_records = self._checkpoint_records
+        # Clear the batch, the writer owns these results from now on
+        self.graph_results = []
+        self._checkpoint_records = []
+
+        future = await self._checkpoint_writer.submit(
+            self._write_checkpoint_records, graph_results, is_oasst_mapper_required
+        )
+        future.add_done_callback(lambda f: self._on_checkpoint_written(checkpoint_records, f))
+
+    def _write_checkpoint_records(
+        self, graph_results: list[dict[str, Any]], is_oasst_mapper_required: bool
+    ) -> list[bool]:
+        """
+        Validate graph results against the custom output schema, convert the valid ones to
+        output records and append them to the output file.
+        Runs in the checkpoint writer thread.
+
+        Args:
+            graph_results: Graph outputs of the checkpoint
+            is_oasst_mapper_required: Whether OASST mapping is required
+
+        Returns:
+            Whether each graph result passed schema validation and was written
+        """
         file_write_start = time.time()
 
+        valid = [True] * len(graph_results)
+        if self._schema_validator is not None and self._validates_schema():
+            valid = self._schema_validator.validate_batch(graph_results)
+            if not all(valid):
+                logger.error(
+                    f"Output data validation failed for {valid.count(False)} records, "
+                    "skipping them"
+                )
+                graph_results = [result for result, ok in zip(graph_results, valid) if ok]
+
         # Convert graph outputs to records
         output_records = graph_utils.convert_graph_output_to_records(
-            self.graph_results, self.output_record_generator
+            graph_results, self.output_record_generator
         )
 
         # Process multimodal data: save base64 data URLs to files and replace with file paths
         try:
-            multimodal_output_dir = ".".join(self.output_file.split(".")[:-1])
-            output_records = multimodal_processor.process_batch_multimodal_data(
-                output_records, Path(multimodal_output_dir)
-            )
+            output_records = self._media_extractor.process_batch(output_records)
         except Exception as e:
             logger.warning(
                 f"Failed to process multimodal data: {e}. Continuing with original records."
@@ -322,10 +391,7 @@ class DatasetProcessor:
                 + self.output_file.split(".")[-1]
             )
             logger.info(f"Writing intermediate file: {intermediate_write_path}")
-            if ".jsonl" in self.output_file:
-                utils.append_to_jsonl_file(intermediate_write_path, output_records)
-            else:
-                utils.append_to_json_file(intermediate_write_path, output_records)
+            self._append_to_output(intermediate_write_path, output_records)
 
         # Apply OASST mapping if required
         if is_oasst_mapper_required:
@@ -341,22 +407,84 @@ class DatasetProcessor:
             oasst_mapped_output = output_records
 
         # Write to output file
-        if ".jsonl" in self.output_file:
-            utils.append_to_jsonl_file(self.output_file, oasst_mapped_output)
-        else:
-            utils.append_to_json_file(self.output_file, oasst_mapped_output)
+        self._append_to_output(self.output_file, oasst_mapped_output)
 
         logger.info(
-            f"Updated {self.output_file} with the latest {len(self.graph_results)} records "
+            f"Updated {self.output_file} with the latest {len(graph_results)} records "
             f"in {(time.time() - file_write_start):0.2f} secs"
         )
+        return valid
 
-        # Clear the processed results after writing to the file
-        self.graph_results = []
+    def _on_checkpoint_written(
+        self, checkpoint_records: list[tuple[dict[str, Any], int]], future: asyncio.Future
+    ) -> None:
+        """
+        Mark the records of a written checkpoint as processed and save the resumable state.
+        Records of a failed checkpoint, and records which failed schema validation, are left
+        unprocessed, to be run again on resume.
+
+        Args:
+            checkpoint_records: Input records and dataset positions of the checkpoint
+            future: Future of the checkpoint job
+        """
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(
+                f"Failed to write checkpoint of {len(checkpoint_records)} records: {error}"
+            )
+            valid = [False] * len(checkpoint_records)
+        else:
+            valid = future.result()
+
+        if self._validates_schema():
+            collector = get_metadata_collector()
+            for ok in valid:
+                collector.record_processed_record(success=ok)
+            if valid:
+                self.is_valid_schema = valid[-1]
+            # records failing validation are not part of the successful records
+            invalid = valid.count(False) if error is None else 0
+            self.num_records_processed -= invalid
+            self.failed_records += invalid
 
         # Force save the resume state if enabled
         if self.resumable and self.resume_manager:
-            self.resume_manager.force_save_state()
+            for (record, position), ok in zip(checkpoint_records, valid):
+                if ok:
+                    # Set the dataset position of the record when marking it as processed
+                    self.resume_manager.mark_record_processed(record, position)
+                else:
+                    record_id = self.resume_manager.get_record_id(record)
+                    self.resume_manager.in_process_records.discard(record_id)
+            if error is None:
+                self.resume_manager.force_save_state()
+
+    def _append_to_output(self, filepath: str, records: list[dict[str, Any]]) -> None:
+        """
+        Append records to an output file through its append-only writer.
+
+        Args:
+            filepath: Path of the output file
+            records: Records to append
+        """
+        writer = self._output_writers.get(filepath)
+        if writer is None:
+            writer = get_output_writer(filepath, self.fsync_interval)
+            self._output_writers[filepath] = writer
+        writer.append(records)
+
+    def _close_output_writers(self) -> None:
+        """Stop the checkpoint writer, then flush, fsync and close all open output writers."""
+        self._checkpoint_writer.shutdown()
+        self._media_extractor.close()
+        for filepath, writer in self._output_writers.items():
+            try:
+                writer.close()
+            except Exception as e:
+                logger.error(f"Failed to close output file {filepath}: {e}")
+        self._output_writers = {}
 
     def _handle_signal(self, signum, frame):
         """
@@ -372,9 +500,28 @@ class DatasetProcessor:
             logger.info("Saving resume state before shutdown")
             self.resume_manager.force_save_state()
 
+        self._close_output_writers()
+
         signal.signal(signum, signal.SIG_DFL)
         os.kill(os.getpid(), signum)
 
+    def _get_concurrency_limit(self) -> int:
+        """
+        Number of records processed concurrently.
+
+        This is batch_size, lowered to the sum of the adaptive concurrency limits of the models
+        when adaptive concurrency is enabled, so the pool follows what the models can serve.
+        Records waiting on a model still hold a slot, hence the sum: every model can be kept
+        busy when records are spread over several models.
+
+        Returns:
+            Maximum number of records in flight
+        """
+        adaptive_limit = AdaptiveConcurrencyLimiter.total_limit()
+        if adaptive_limit is None:
+            return self.batch_size
+        return max(1, min(self.batch_size, adaptive_limit))
+
     async def _process_and_store_results(self):
         """Main processing loop for dataset records."""
         # Register signal handlers for graceful shutdown if resumable
@@ -382,46 +529,82 @@ class DatasetProcessor:
             for sig in [signal.SIGTERM, signal.SIGINT]:
                 signal.signal(sig, lambda s, f: self._handle_signal(s, f))
 
-        # Use asyncio tasks to process records in parallel up to batch_size
+        # Use asyncio tasks to process records in parallel up to the concurrency limit
         pending_tasks: set[asyncio.Task] = set()
         # Track how many records we've started processing to limit total for streaming datasets
         records_started = 0
 
+        budget_exhausted = False
+
+        def start(record: Optional[dict[str, Any]], record_index: int) -> None:
+            task = asyncio.create_task(self._process_record(record, record_index))
+            pending_tasks.add(task)
+            task.add_done_callback(
+                lambda t: pending_tasks.discard(t) if t in pending_tasks else None
+            )
+
         try:
             while True:
-                # Fill the pending tasks pool up to batch_size, but only if we haven't
-                # already started processing our target number of records
+                if CircuitBreaker.budget_exhausted():
+                    # stop starting records; the records in flight end or get parked
+                    budget_exhausted = True
+                    if pending_tasks:
+                        await asyncio.wait(pending_tasks)
+                    break
+
+                concurrency_limit = self._get_concurrency_limit()
+                # Parked records go first, once the circuit which parked them lets requests through
+                now = time.time()
+                while (
+                    len(pending_tasks) < concurrency_limit
+                    and self._parked_records
+                    and self._parked_records[0][0] <= now
+                ):
+                    _, _, parked, parked_index = heapq.heappop(self._parked_records)
+                    start(parked, parked_index)
+
+                # Fill the pending tasks pool up to the concurrency limit, but only if we haven't
+                # already started processing our target number of records, and no record waits
+                # for a model endpoint to come back
                 while (
-                    len(pending_tasks) < self.batch_size
+                    len(pending_tasks) < concurrency_limit
                     and records_started < self.num_records_total
+                    and not self._parked_records
                 ):
                     try:
                         record = self._get_record()
-                        task = asyncio.create_task(self._process_record(record))
-                        pending_tasks.add(task)
-                        task.add_done_callback(
-                            lambda t: pending_tasks.discard(t) if t in pending_tasks else None
-                        )
+                        start(record, self.dataset_indx - 1)
                         # Increment count of records we've started processing
                         records_started += 1
                     except StopIteration:
                         # No more records to process
                         break
 
+                # wake up for the next parked record, if any
+                retry_in = (
+                    max(0.0, self._parked_records[0][0] - time.time())
+                    if self._parked_records
+                    else None
+                )
+
                 # Exit loop if no pending tasks
                 if not pending_tasks:
-                    break
+                    if retry_in is None:
+                        break
+                    await asyncio.sleep(retry_in)
+                    continue
 
                 # Wait for at least one task to complete
                 done, pending_tasks = await asyncio.wait(
-                    pending_tasks, return_when=asyncio.FIRST_COMPLETED
+                    pending_tasks, timeout=retry_in, return_when=asyncio.FIRST_COMPLETED
                 )
 
-                # Update progress bar for completed tasks
+                # Update progress bar for completed tasks, parked records count once retried
                 for task in done:
                     try:
-                        task.result()  # This will raise any exceptions from the task
-                        self.pbar.update(1)
+                        # This will raise any exceptions from the task
+                        if not task.result():
+                            self.pbar.update(1)
                     except Exception as e:
                         logger.error(f"Task failed with error: {e}")
 
@@ -431,6 +614,13 @@ class DatasetProcessor:
         finally:
             # Close the progress bar
             self.pbar.close()
+            # Write any remaining results, when the dataset ends or the run stops before the
+            # next checkpoint
+            if self.graph_results:
+                logger.info(f"Writing {len(self.graph_results)} remaining results")
+                await self._write_checkpoint(self._is_oasst_mapper_required())
+            # Wait for the queued checkpoints before reading or closing the output file
+            await self._checkpoint_writer.drain()
             # Run Graph post Processors
             post_processors = self.graph_config.config.get("graph_post_process", [])
             if post_processors:
@@ -480,31 +670,59 @@ class DatasetProcessor:
                 logger.info("Saving final execution state")
                 self.resume_manager.force_save_state()
 
-                # Write any remaining results
-                if self.graph_results:
-                    logger.info(f"Writing {len(self.graph_results)} remaining results")
-                    is_oasst_mapper_required = (
-                        self.graph_config.oasst_mapper is not None
-                        and self.graph_config.oasst_mapper.get("required") == "yes"
-                    )
-                    await self._write_checkpoint(is_oasst_mapper_required)
+            self._close_output_writers()
 
-    async def _process_record(self, record: Optional[dict[str, Any]]) -> None:
+        if budget_exhausted:
+            raise CircuitBudgetExhaustedError(
+                f"Run stopped as model endpoints stayed down: circuit breaker budget of "
+                f"{CircuitBreaker.budget()} exhausted, {len(self._parked_records)} parked records "
+                f"and {self.num_records_total - records_started} records not started"
+            )
+
+    def _park_record(
+        self, record: dict[str, Any], record_index: int, error: CircuitOpenError
+    ) -> None:
+        """
+        Park a record whose model endpoint has an open circuit, to retry it once the circuit lets
+        a trial request through. It stays in process for resumable execution meanwhile.
+
+        Args:
+            record: Input record to retry
+            record_index: Dataset index of the record
+            error: Error raised by the model endpoint
+        """
+        retry_at = max(
+            error.retry_after or 0.0, time.time() + constants.CIRCUIT_BREAKER_MIN_PARK_SECONDS
+        )
+        logger.warning(
+            f"Parking record {record.get('id')} for {retry_at - time.time():.1f}s: {error}"
+        )
+        heapq.heappush(self._parked_records, (retry_at, next(self._park_seq), record, record_index))
+
+    async def _process_record(
+        self, record: Optional[dict[str, Any]], record_index: Optional[int] = None
+    ) -> bool:
         """
         Process a single record through the graph.
 
         Args:
             record: Input record to process
+            record_index: Dataset index of the record, the last record read if not set
+
+        Returns:
+            bool: True if the record was parked to be retried, False once it is done
         """
+        if record_index is None:
+            record_index = self.dataset_indx - 1
         try:
             if record is None:
                 logger.warning("Received None record, skipping")
-                return
+                return False
             if self.num_records_processed >= self.num_records_total:
                 logger.debug(
                     f"Already processed target number of records. Skipping record {record.get('id')}"
                 )
-                return
+                return False
 
             graph_result = await graph_utils.execute_graph(
                 record,
@@ -512,11 +730,15 @@ class DatasetProcessor:
                 debug=self.debug,
                 input_record_generator=self.input_record_generator,
                 execution_callbacks=self.execution_callbacks,
-                record_index=self.dataset_indx - 1,
+                record_index=record_index,
             )
 
             if self.num_records_processed < self.num_records_total:
-                await self._add_graph_result(graph_result, record)
+                await self._add_graph_result(graph_result, record, record_index)
+
+        except CircuitOpenError as e:
+            self._park_record(cast(dict[str, Any], record), record_index, e)
+            return True
 
         except Exception as e:
             rec_id_str = "unknown"
@@ -531,3 +753,4 @@ class DatasetProcessor:
                 if self.resume_manager.position_tracker is not None:
                     self.resume_manager.position_tracker.mark_position(self.dataset_indx)
                 self.resume_manager.save_state()
+        return False
@@ -0,0 +1,185 @@
+"""Append-only output writers for dataset checkpoints.
+
+The writers keep the output file open for the whole run and only append the records of each
+checkpoint, so the cost of a checkpoint depends on the size of the batch and not on the number of
+records already written. JSONL files are appended natively; JSON files are kept a valid JSON array
+after every checkpoint by overwriting the closing bracket in place.
+"""
+
+import json
+import os
+import textwrap
+from abc import ABC, abstractmethod
+from typing import IO, Any, Optional
+
+from sygra.data_mapper.helper import JSONEncoder
+from sygra.logger.logger_config import logger
+from sygra.utils import constants
+
+_WHITESPACE = b" \t\r\n"
+
+
+class OutputWriter(ABC):
+    """Base class for append-only output writers.
+
+    Args:
+        filepath (str): Path of the output file. Existing content is preserved and appended to.
+        fsync_interval (int): Number of appends between two fsyncs of the file. Data is flushed to
+            the OS after every append; 0 disables the periodic fsync, the file is still fsynced on
+            close.
+    """
+
+    def __init__(
+        self, filepath: str, fsync_interval: int = constants.DEFAULT_OUTPUT_FSYNC_INTERVAL
+    ):
+        self.filepath = filepath
+        self.fsync_interval = fsync_interval
+        self._file: Optional[IO[bytes]] = None
+        self._appends_since_fsync = 0
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def append(self, records: list[dict[str, Any]]) -> None:
+        """Append records to the output file, opening it on first use.
+
+        Args:
+            records (list[dict[str, Any]]): Records to append.
+        """
+        if self._file is None:
+            self._file = self._open()
+        self._write(self._file, records)
+        self._file.flush()
+        self._appends_since_fsync += 1
+        if self.fsync_interval > 0 and self._appends_since_fsync >= self.fsync_interval:
+            self._fsync()
+
+    def close(self) -> None:
+        """Flush, fsync and close the output file."""
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            self._fsync()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def _fsync(self) -> None:
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+        self._appends_since_fsync = 0
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @staticmethod
+    def _dumps(record: dict[str, Any], indent: Optional[int] = None) -> str:
+        return json.dumps(record, indent=indent, ensure_ascii=False, cls=JSONEncoder)
+
+    @abstractmethod
+    def _open(self) -> IO[bytes]:
+        """Open the output file and position it for appending."""
+
+    @abstractmethod
+    def _write(self, f: IO[bytes], records: list[dict[str, Any]]) -> None:
+        """Write the serialized records to the open file."""
+
+
+class JsonlOutputWriter(OutputWriter):
+    """Appends records as JSON lines."""
+
+    def _open(self) -> IO[bytes]:
+        return open(self.filepath, "ab")
+
+    def _write(self, f: IO[bytes], records: list[dict[str, Any]]) -> None:
+        if records:
+            f.write("".join(self._dumps(r) + "\n" for r in records).encode("utf-8"))
+
+
+class JsonArrayOutputWriter(OutputWriter):
+    """Appends records to a JSON array, keeping the file a valid JSON document after every append.
+
+    Records are written with the same layout as `json.dump(records, f, indent=4)`. The writer
+    remembers the offset of the closing bracket and overwrites it with the new records followed by
+    a new closing bracket, so earlier records are never read back or rewritten.
+    """
+
+    def __init__(
+        self, filepath: str, fsync_interval: int = constants.DEFAULT_OUTPUT_FSYNC_INTERVAL
+    ):
+        super().__init__(filepath, fsync_interval)
+        # offset right after the last record (or the opening bracket of an empty array)
+        self._insert_pos = 0
+        self._has_records = False
+
+    def _open(self) -> IO[bytes]:
+        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
+            f = open(self.filepath, "w+b")
+            f.write(b"[]")
+            self._insert_pos = 1
+            self._has_records = False
+            return f
+
+        f = open(self.filepath, "r+b")
+        try:
+            end = f.seek(0, os.SEEK_END)
+            close_pos, char = self._last_non_whitespace(f, end)
+            if char != b"]":
+                raise ValueError(f"Output file {self.filepath} is not a JSON array")
+            self._insert_pos, char = self._last_non_whitespace(f, close_pos)
+            self._insert_pos += 1
+            self._has_records = char != b"["
+        except Exception:
+            f.close()
+            raise
+        logger.debug(f"Appending to existing JSON array in {self.filepath}")
+        return f
+
+    @staticmethod
+    def _last_non_whitespace(f: IO[bytes], end: int, chunk_size: int = 4096) -> tuple[int, bytes]:
+        """Return the offset and value of the last non-whitespace byte before `end`."""
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            chunk = f.read(end - start)
+            stripped = chunk.rstrip(_WHITESPACE)
+            if stripped:
+                pos = start + len(stripped) - 1
+                return pos, stripped[-1:]
+            end = start
+        return -1, b""
+
+    def _write(self, f: IO[bytes], records: list[dict[str, Any]]) -> None:
+        if not records:
+            return
+        body = ",\n".join(textwrap.indent(self._dumps(r, indent=4), "    ") for r in records)
+        prefix = ",\n" if self._has_records else "\n"
+        f.seek(self._insert_pos)
+        f.write((prefix + body).encode("utf-8"))
+        self._insert_pos = f.tell()
+        f.write(b"\n]")
+        f.truncate()
+        self._has_records = True
+
+
+def get_output_writer(
+    filepath: str, fsync_interval: int = constants.DEFAULT_OUTPUT_FSYNC_INTERVAL
+) -> OutputWriter:
+    """Create the output writer matching the format of the output file.
+
+    Args:
+        filepath (str): Path of the output file; `.jsonl` files are written as JSON lines and
+            everything else as a JSON array.
+        fsync_interval (int): Number of appends between two fsyncs of the file.
+
+    Returns:
+        OutputWriter: Append-only writer for the file.
+    """
+    if ".jsonl" in filepath:
+        return JsonlOutputWriter(filepath, fsync_interval)
+    return JsonArrayOutputWriter(filepath, fsync_interval)
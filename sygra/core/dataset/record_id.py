@@ -0,0 +1,113 @@
+"""Stable identity of dataset records.
+
+Every record gets an `id` once, when the dataset is loaded: its explicit id (or `id_column`) if
+set, else a content id. The id is carried in the record through the pipeline, so the resumable
+execution reads it instead of hashing the record again.
+
+Content ids are the 128-bit xxh3 hash (32 hex characters) of a canonical binary encoding of the
+record, or of a subset of its fields (`id_fields`) for very large records; records which have none
+of the `id_fields` (or only None in them) are hashed whole. The encoding is
+independent of the key order of mappings, distinguishes the types of the values (1, 1.0, "1" and
+True differ) and, unlike a JSON dump, covers binary values such as bytes, numpy arrays and images.
+"""
+
+import struct
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+import xxhash
+
+ID_FIELD = "id"
+
+_LENGTH = struct.Struct("<Q")
+_FLOAT = struct.Struct("<d")
+
+
+def _update_sized(update: Callable[[bytes], Any], tag: bytes, payload: bytes) -> None:
+    update(tag + _LENGTH.pack(len(payload)))
+    update(payload)
+
+
+def _encode(value: Any, update: Callable[[bytes], Any]) -> None:
+    """Feed the canonical encoding of a value to `update`: a type tag, then a sized payload."""
+    if value is None:
+        update(b"n")
+    elif isinstance(value, bool):
+        update(b"t" if value else b"f")
+    elif isinstance(value, str):
+        _update_sized(update, b"s", value.encode("utf-8", "surrogatepass"))
+    elif isinstance(value, int):
+        _update_sized(update, b"i", str(value).encode())
+    elif isinstance(value, float):
+        # all NaNs are the same value
+        update(b"g" + (b"nan" if value != value else _FLOAT.pack(value)))
+    elif isinstance(value, dict):
+        update(b"d" + _LENGTH.pack(len(value)))
+        for key in sorted(value, key=str):
+            _update_sized(update, b"k", str(key).encode("utf-8", "surrogatepass"))
+            _encode(value[key], update)
+    elif isinstance(value, (list, tuple)):
+        update(b"l" + _LENGTH.pack(len(value)))
+        for item in value:
+            _encode(item, update)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        _update_sized(update, b"b", bytes(value))
+    elif isinstance(value, np.ndarray):
+        _update_sized(update, b"a", f"{value.dtype.str}{value.shape}".encode())
+        _update_sized(update, b"b", np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        _encode(value.item(), update)
+    elif hasattr(value, "tobytes") and hasattr(value, "mode") and hasattr(value, "size"):
+        # PIL images
+        _update_sized(update, b"p", f"{value.mode}{value.size}".encode())
+        _update_sized(update, b"b", value.tobytes())
+    else:
+        _update_sized(
+            update, b"o", f"{type(value).__qualname__}:{value}".encode("utf-8", "surrogatepass")
+        )
+
+
+def content_id(record: dict[str, Any], id_fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Content id of a record, the 128-bit xxh3 hash of its canonical encoding.
+
+    Args:
+        record: The record
+        id_fields: Fields identifying the record, all fields (except `id`) if not set or if the
+            record has none of them
+
+    Returns:
+        32 hex characters
+    """
+    content = {}
+    if id_fields:
+        # missing and None fields are left out, so records without any of them do not all share
+        # the id of an empty record
+        content = {field: record[field] for field in id_fields if record.get(field) is not None}
+    if not content:
+        content = {field: value for field, value in record.items() if field != ID_FIELD}
+    hasher = xxhash.xxh3_128()
+    _encode(content, hasher.update)
+    return hasher.hexdigest()
+
+
+def has_id(record: dict[str, Any]) -> bool:
+    """Whether the record carries an id (0 is an id, None and "" are not)."""
+    value = record.get(ID_FIELD)
+    return value is not None and value != ""
+
+
+def record_id(record: dict[str, Any], id_fields: Optional[Sequence[str]] = None) -> str:
+    """
+    Id of a record: the id it carries, else its content id.
+
+    Args:
+        record: The record
+        id_fields: Fields identifying the record, for the content id
+
+    Returns:
+        Record id
+    """
+    if has_id(record):
+        return str(record[ID_FIELD])
+    return content_id(record, id_fields)
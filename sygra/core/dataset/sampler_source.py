@@ -0,0 +1,220 @@
+"""Indexed data sources for the weighted sampler.
+
+A sampler data source reads a dataset once and materialises each sampled column into a
+memory-mapped column store, so every draw is an O(1) lookup instead of a scan of the dataset.
+Streaming (iterable) datasets are unbounded in general, so only their first `buffer_size` records
+are buffered in the store. Sources are shared process-wide per data source config and keep a
+cursor which moves sequentially over the records and loops back to the start; the cursors are
+saved in the resumable execution metadata.
+"""
+
+import mmap
+import pickle
+import tempfile
+import threading
+from array import array
+from itertools import islice
+from typing import IO, Any, Iterable, Iterator, Optional
+
+from datasets import IterableDataset  # type: ignore[import-untyped]
+
+from sygra.logger.logger_config import logger
+from sygra.utils import constants, utils
+
+
+class ColumnStore:
+    """Immutable store of the values of one column, kept in a memory-mapped temporary file.
+
+    Values are pickled one after the other and located through an offset index, so reading the
+    i-th value only unpickles that value and the store does not keep the column in memory.
+
+    Args:
+        values (Iterable[Any]): Values of the column, in record order.
+    """
+
+    def __init__(self, values: Iterable[Any]):
+        self._file: IO[bytes] = tempfile.TemporaryFile(prefix="sygra_sampler_")
+        self._offsets = array("Q", [0])
+        for value in values:
+            self._offsets.append(
+                self._offsets[-1] + self._file.write(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            )
+        self._file.flush()
+        # an empty file cannot be memory-mapped
+        self._mm: Optional[mmap.mmap] = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._offsets[-1] > 0
+            else None
+        )
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < len(self) or self._mm is None:
+            raise IndexError(f"Index {index} is out of range for a column of {len(self)} values")
+        return pickle.loads(self._mm[self._offsets[index] : self._offsets[index + 1]])
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+
+class SamplerSource:
+    """A data source of the weighted sampler, read sequentially by one or more columns.
+
+    Args:
+        datasrc (dict): Data source configuration, as given to `utils.get_dataset`.
+        pointer (int): Index of the next record to read, restored on resume.
+        buffer_size (int): Maximum number of records buffered from a streaming dataset.
+    """
+
+    def __init__(
+        self,
+        datasrc: dict,
+        pointer: int = 0,
+        buffer_size: int = constants.SAMPLER_STREAM_BUFFER_SIZE,
+    ):
+        self.datasrc = datasrc
+        self.buffer_size = buffer_size
+        self._pointer = pointer
+        self._dataset: Any = None
+        self._columns: dict[str, ColumnStore] = {}
+        # guards the cursor only, draws never wait on a column being materialised
+        self._pointer_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def pointer(self) -> int:
+        return self._pointer
+
+    def _rows(self) -> Iterator[dict[str, Any]]:
+        if self._dataset is None:
+            logger.info(f"Loading sampler data source: {self.datasrc}")
+            self._dataset = utils.get_dataset(self.datasrc)
+        if isinstance(self._dataset, IterableDataset):
+            return islice(iter(self._dataset), self.buffer_size)
+        return iter(self._dataset)
+
+    def column(self, column: str) -> ColumnStore:
+        """Get the column store of a column, materialising it on first use.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            ColumnStore: Values of the column.
+        """
+        store = self._columns.get(column)
+        if store is not None:
+            return store
+        with self._load_lock:
+            store = self._columns.get(column)
+            if store is None:
+                store = ColumnStore(row.get(column) for row in self._rows())
+                logger.info(f"Materialised {len(store)} values of column '{column}' for sampler")
+                self._columns[column] = store
+            return store
+
+    def seek(self, pointer: int) -> None:
+        """Move the cursor to a record index."""
+        with self._pointer_lock:
+            self._pointer = pointer
+
+    def next_value(self, column: str) -> Any:
+        """Read the value of a column at the cursor and move the cursor to the next record.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            Any: The column value, None if the data source is empty.
+        """
+        store = self.column(column)
+        if len(store) == 0:
+            return None
+        with self._pointer_lock:
+            # if the pointer reached the end, loop back to the start
+            index = self._pointer % len(store)
+            self._pointer = index + 1
+        return store[index]
+
+    def close(self) -> None:
+        for store in self._columns.values():
+            store.close()
+        self._columns.clear()
+        self._dataset = None
+
+
+# sampler sources keyed by the data source dictionary in string format
+_sources: dict[str, SamplerSource] = {}
+# pointers restored from resumable execution metadata, for sources not created yet
+_restored_pointers: dict[str, int] = {}
+_sources_lock = threading.Lock()
+
+
+def get_sampler_source(
+    datasrc: dict, buffer_size: int = constants.SAMPLER_STREAM_BUFFER_SIZE
+) -> SamplerSource:
+    """Get the shared sampler source of a data source config, creating it on first use.
+
+    Args:
+        datasrc (dict): Data source configuration.
+        buffer_size (int): Maximum number of records buffered from a streaming dataset.
+
+    Returns:
+        SamplerSource: The sampler source.
+    """
+    key = str(datasrc)
+    source = _sources.get(key)
+    if source is None:
+        with _sources_lock:
+            source = _sources.get(key)
+            if source is None:
+                source = SamplerSource(datasrc, _restored_pointers.pop(key, 0), buffer_size)
+                _sources[key] = source
+    return source
+
+
+def fetch_next_value(datasrc: dict, column: str) -> Any:
+    """Read the next value of a column from a sampler data source.
+
+    Args:
+        datasrc (dict): Data source configuration.
+        column (str): Column name.
+
+    Returns:
+        Any: The column value.
+    """
+    return get_sampler_source(datasrc).next_value(column)
+
+
+def get_pointers() -> dict[str, int]:
+    """Get the cursor of every sampler data source, keyed by data source."""
+    with _sources_lock:
+        pointers = dict(_restored_pointers)
+        pointers.update({key: source.pointer for key, source in _sources.items()})
+    return pointers
+
+
+def restore_pointers(pointers: dict[str, int]) -> None:
+    """Restore the cursors of sampler data sources, as saved by `get_pointers`."""
+    with _sources_lock:
+        for key, pointer in pointers.items():
+            logger.info(f"Loading sampler pointer for data source {key}: {pointer}")
+            source = _sources.get(key)
+            if source is not None:
+                source.seek(pointer)
+            else:
+                _restored_pointers[key] = pointer
+
+
+def reset() -> None:
+    """Close and forget every sampler data source."""
+    with _sources_lock:
+        for source in _sources.values():
+            source.close()
+        _sources.clear()
+        _restored_pointers.clear()
@@ -0,0 +1,286 @@
+"""Lazy joins of multiple data sources.
+
+A list of data sources is joined horizontally into a primary source (column, sequential, cross
+and random joins) or stacked vertically (vstack). The joined records are produced lazily, one
+record at a time in the order of the primary source, so memory does not grow with the size of the
+joined dataset: a cross join of two sources of 100k records has 10^10 records. Secondary sources
+are kept in a memory-mapped `ColumnStore` of whole records and read through positional lookups,
+or through a key index for column joins.
+"""
+
+import random
+from array import array
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, Optional, Sized
+
+from datasets import IterableDataset  # type: ignore[import-untyped]
+from datasets.iterable_dataset import ExamplesIterable  # type: ignore[import-untyped]
+
+from sygra.core.dataset.sampler_source import ColumnStore
+from sygra.utils import constants
+
+
+def alias_record(record: dict[str, Any], alias: str) -> dict[str, Any]:
+    """Prefix the fields of a record with the alias of its source (alias->field).
+
+    Records which already have an aliased field are returned as they are.
+    """
+    prefix = alias + constants.ALIAS_JOINER
+    if any(key.startswith(prefix) for key in record):
+        return record
+    return {prefix + key: value for key, value in record.items()}
+
+
+class SecondarySource:
+    """A secondary data source joined horizontally into the primary source.
+
+    Join types:
+        column: left join on `primary_key` of the primary and `join_key` of this source; a record
+            is joined with every matching record, or with None fields if none matches.
+        sequential: the i-th record is joined with the i-th record of this source, looping back to
+            the start of this source when it is shorter.
+        cross: every record is joined with every record of this source.
+        random: records are joined with the records of this source in random order, and with
+            randomly picked ones once all of them were used.
+
+    Args:
+        records (Iterable[dict]): Records of the source, read once into the store.
+        alias (str): Alias of the source, prefixed to its fields.
+        join_type (str): One of the join types above.
+        primary_key (Optional[str]): Field of the primary source, for column joins.
+        join_key (Optional[str]): Field of this source, for column joins.
+        rng (Optional[random.Random]): Random generator for random joins.
+    """
+
+    JOIN_TYPES = (
+        constants.JOIN_TYPE_COLUMN,
+        constants.JOIN_TYPE_SEQUENTIAL,
+        constants.JOIN_TYPE_CROSS,
+        constants.JOIN_TYPE_RANDOM,
+    )
+
+    def __init__(
+        self,
+        records: Iterable[dict[str, Any]],
+        alias: str,
+        join_type: str,
+        primary_key: Optional[str] = None,
+        join_key: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        if join_type not in self.JOIN_TYPES:
+            raise ValueError(f"Unsupported join_type '{join_type}' for dataset '{alias}'")
+        self.alias = alias
+        self.join_type = join_type
+        self.primary_key = primary_key or ""
+        self.join_column = constants.ALIAS_JOINER.join([alias, join_key or ""])
+        self._rng = rng or random.Random()
+        # fields of the source, in order of appearance, and record indices per join key
+        self._fields: dict[str, None] = {}
+        self._index: dict[Any, list[int]] = {}
+        self._store = ColumnStore(self._prepare(records))
+        if not len(self._store) and join_type in (
+            constants.JOIN_TYPE_SEQUENTIAL,
+            constants.JOIN_TYPE_RANDOM,
+        ):
+            raise ValueError(f"Dataset '{alias}' is empty, it cannot be joined {join_type}")
+
+    def _prepare(self, records: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        index_keys = self.join_type == constants.JOIN_TYPE_COLUMN
+        for position, record in enumerate(records):
+            record = alias_record(record, self.alias)
+            self._fields.update(dict.fromkeys(record))
+            if index_keys:
+                self._index.setdefault(record.get(self.join_column), []).append(position)
+            yield record
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def fan_out(self, record: dict[str, Any], primary_alias: str) -> int:
+        """Number of joined records a record of the stream gives, with aliased fields."""
+        if self.join_type == constants.JOIN_TYPE_COLUMN:
+            primary_column = constants.ALIAS_JOINER.join([primary_alias, self.primary_key])
+            return max(1, len(self._index.get(record.get(primary_column), ())))
+        if self.join_type == constants.JOIN_TYPE_CROSS:
+            return len(self._store)
+        return 1
+
+    def join(
+        self, stream: Iterable[dict[str, Any]], primary_alias: str
+    ) -> Iterator[dict[str, Any]]:
+        """Join the records of a stream with this source.
+
+        Args:
+            stream (Iterable[dict]): Records joined so far, with aliased fields.
+            primary_alias (str): Alias of the primary source, for the primary key of column joins.
+
+        Returns:
+            Iterator[dict]: Joined records.
+        """
+        if self.join_type == constants.JOIN_TYPE_COLUMN:
+            primary_column = constants.ALIAS_JOINER.join([primary_alias, self.primary_key])
+            return self._join_column(stream, primary_column)
+        if self.join_type == constants.JOIN_TYPE_SEQUENTIAL:
+            return self._join_sequential(stream)
+        if self.join_type == constants.JOIN_TYPE_CROSS:
+            return self._join_cross(stream)
+        return self._join_random(stream)
+
+    def _join_column(
+        self, stream: Iterable[dict[str, Any]], primary_column: str
+    ) -> Iterator[dict[str, Any]]:
+        unmatched = dict.fromkeys(self._fields)
+        for record in stream:
+            matches = self._index.get(record.get(primary_column))
+            if not matches:
+                yield {**record, **unmatched}
+                continue
+            for position in matches:
+                yield {**record, **self._store[position]}
+
+    def _join_sequential(self, stream: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        size = len(self._store)
+        for position, record in enumerate(stream):
+            yield {**record, **self._store[position % size]}
+
+    def _join_cross(self, stream: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for record in stream:
+            for position in range(len(self._store)):
+                yield {**record, **self._store[position]}
+
+    def _join_random(self, stream: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        size = len(self._store)
+        # shuffle the source lazily (Fisher-Yates), one pick per joined record
+        order = array("Q", range(size))
+        for position, record in enumerate(stream):
+            if position < size:
+                pick = self._rng.randrange(position, size)
+                order[position], order[pick] = order[pick], order[position]
+                index = order[position]
+            else:
+                index = self._rng.randrange(size)
+            yield {**record, **self._store[index]}
+
+    def close(self) -> None:
+        self._store.close()
+
+
+def join_sources(
+    primary: Iterable[dict[str, Any]], primary_alias: str, secondaries: list[SecondarySource]
+) -> Iterator[dict[str, Any]]:
+    """Lazily join secondary sources into a primary source, in the order of the secondaries.
+
+    Args:
+        primary (Iterable[dict]): Records of the primary source, e.g. a streaming dataset.
+        primary_alias (str): Alias of the primary source, prefixed to its fields.
+        secondaries (list[SecondarySource]): Secondary sources to join.
+
+    Returns:
+        Iterator[dict]: Joined records.
+    """
+    stream: Iterable[dict[str, Any]] = (alias_record(record, primary_alias) for record in primary)
+    for secondary in secondaries:
+        stream = secondary.join(stream, primary_alias)
+    return iter(stream)
+
+
+def joined_size(
+    primary: Iterable[dict[str, Any]], primary_alias: str, secondaries: list[SecondarySource]
+) -> Optional[int]:
+    """Number of records of a join, without joining them.
+
+    Sequential and random joins keep the size of the primary source, cross joins multiply it by
+    the size of the secondary source, and column joins count the matches of each record.
+
+    Args:
+        primary (Iterable[dict]): Records of the primary source.
+        primary_alias (str): Alias of the primary source.
+        secondaries (list[SecondarySource]): Secondary sources to join.
+
+    Returns:
+        Optional[int]: Number of joined records, None if the primary source has no length (a
+            streaming dataset).
+    """
+    if not isinstance(primary, Sized):
+        return None
+    size = len(primary)
+    if any(secondary.join_type == constants.JOIN_TYPE_COLUMN for secondary in secondaries):
+        # column joins use primary fields only, so the fan-outs of a record multiply
+        size = 0
+        for record in primary:
+            count = 1
+            aliased = alias_record(record, primary_alias)
+            for secondary in secondaries:
+                count *= secondary.fan_out(aliased, primary_alias)
+            size += count
+        return size
+    for secondary in secondaries:
+        size *= secondary.fan_out({}, primary_alias)
+    return size
+
+
+def stacked_size(sources: list[Iterable[dict[str, Any]]]) -> Optional[int]:
+    """Number of records of vertically stacked sources, None if one of them has no length."""
+    if not all(isinstance(source, Sized) for source in sources):
+        return None
+    return sum(len(source) for source in sources if isinstance(source, Sized))
+
+
+def _source_fields(records: Iterable[dict[str, Any]]) -> list[str]:
+    column_names = getattr(records, "column_names", None)
+    if column_names:
+        return list(column_names)
+    if isinstance(records, IterableDataset):
+        # fields of a streaming dataset without schema, from its first record
+        return list(next(iter(records), {}))
+    fields: dict[str, None] = {}
+    for record in records:
+        fields.update(dict.fromkeys(record))
+    return list(fields)
+
+
+def vstack_sources(sources: list[Iterable[dict[str, Any]]]) -> Iterator[dict[str, Any]]:
+    """Lazily stack sources vertically, keeping the fields common to all of them.
+
+    Args:
+        sources (list[Iterable[dict]]): Records of the sources.
+
+    Returns:
+        Iterator[dict]: Records of every source in turn, with the common fields only.
+    """
+    if not sources:
+        return
+    first_fields = _source_fields(sources[0])
+    common = set(first_fields)
+    for source in sources[1:]:
+        common.intersection_update(_source_fields(source))
+    fields = [field for field in first_fields if field in common]
+    for source in sources:
+        for record in source:
+            yield {field: record.get(field) for field in fields}
+
+
+def _keyed_examples(generate: Callable[[], Iterable[dict[str, Any]]]):
+    for key, record in enumerate(generate()):
+        yield key, record
+
+
+def lazy_dataset(
+    generate: Callable[..., Iterable[dict[str, Any]]], **kwargs: Any
+) -> IterableDataset:
+    """Streaming dataset of the records of a generator function, called again on every iteration.
+
+    Unlike `IterableDataset.from_generator`, the generator arguments are not hashed, so they can
+    hold large in-memory sources.
+
+    Args:
+        generate (Callable): Function returning the records.
+        **kwargs: Arguments of the function.
+
+    Returns:
+        IterableDataset: Dataset of the records, without features.
+    """
+    return IterableDataset(
+        ExamplesIterable(_keyed_examples, {"generate": partial(generate, **kwargs)})
+    )
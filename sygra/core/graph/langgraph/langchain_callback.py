@@ -6,6 +6,7 @@ from uuid import UUID
 from langchain_core.callbacks import AsyncCallbackHandler
 from langchain_core.outputs import LLMResult
 
+from sygra.core.models.pricing import lookup_pricing
 from sygra.logger.logger_config import logger
 from sygra.metadata.metadata_collector import get_metadata_collector
 
@@ -14,8 +15,9 @@ def calculate_cost(model_name: str, prompt_tokens: int, completion_tokens: int)
     """
     Calculate the cost of a model request based on token usage.
 
-    Uses LangChain Community's official pricing data only. Returns 0.0 if pricing
-    is not available for the model (no fallback estimates to avoid stale data).
+    Uses LangChain Community's official pricing data only, looked up once per model (see
+    `lookup_pricing`). Returns 0.0 if pricing is not available for the model (no fallback
+    estimates to avoid stale data).
 
     Supports:
     - OpenAI models (direct API)
@@ -30,53 +32,10 @@ def calculate_cost(model_name: str, prompt_tokens: int, completion_tokens: int)
     Returns:
         Total cost in USD, or 0.0 if pricing not available
     """
-    try:
-        # This also works for Azure OpenAI since they use the same model names and pricing
-        from langchain_community.callbacks.openai_info import (
-            TokenType,
-            get_openai_token_cost_for_model,
-        )
-
-        try:
-            prompt_cost = get_openai_token_cost_for_model(
-                model_name, prompt_tokens, token_type=TokenType.PROMPT
-            )
-            completion_cost = get_openai_token_cost_for_model(
-                model_name, completion_tokens, token_type=TokenType.COMPLETION
-            )
-            return prompt_cost + completion_cost
-        except (KeyError, ValueError):
-            # Not an OpenAI/Azure model or not in pricing table
-            pass
-
-        # Try Bedrock Anthropic models (Claude on AWS)
-        from langchain_community.callbacks.bedrock_anthropic_callback import (
-            _get_anthropic_claude_token_cost,
-        )
-
-        if "claude" in model_name.lower() or "anthropic" in model_name.lower():
-            try:
-                return _get_anthropic_claude_token_cost(
-                    prompt_tokens, completion_tokens, model_name
-                )
-            except (KeyError, ValueError, IndexError):
-                # Claude model but not in Bedrock pricing table
-                pass
-
-    except ImportError:
-        logger.warning(
-            "langchain-community not available for cost calculation. "
-            "Install with: pip install langchain-community"
-        )
+    pricing = lookup_pricing(model_name)
+    if pricing is None:
         return 0.0
-
-    # No pricing available - log and return 0.0
-    logger.debug(
-        f"No pricing information available for model '{model_name}'. "
-        f"Cost will be reported as $0.00. "
-        f"Supported models: OpenAI (GPT-4, GPT-3.5, etc.), Azure OpenAI and Anthropic Claude on Bedrock."
-    )
-    return 0.0
+    return pricing.cost(prompt_tokens, completion_tokens)
 
 
 class MetadataTrackingCallback(AsyncCallbackHandler):
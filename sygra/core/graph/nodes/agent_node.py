@@ -1,8 +1,9 @@
 import time
 from inspect import isclass, signature
-from typing import Any
+from typing import Any, Optional
 
-from langchain_core.messages import AIMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.prebuilt import create_react_agent
 
 from sygra.core.graph.langgraph.langchain_callback import MetadataTrackingCallback
@@ -21,10 +22,15 @@ class AgentNode(LLMNode):
 
     REQUIRED_KEYS: list[str] = ["model", "prompt"]
 
+    # configurable key carrying the system prompt of the record to the compiled agent
+    AGENT_PROMPT_KEY: str = "sygra_agent_prompt"
+
     def __init__(self, node_name: str, config: dict):
         super().__init__(node_name, config)
 
         self.inject_system_messages = self.node_config.get("inject_system_messages", [])
+        # compiled agent graphs, keyed by agent name; model and tools are fixed for the node
+        self._agents: dict[Optional[str], Any] = {}
 
     def _initialize_model(self):
         """
@@ -54,11 +60,9 @@ class AgentNode(LLMNode):
                 if isclass(self.pre_process)
                 else self.pre_process(state)
             )
-            chat_history_enabled = self.node_config.get("chat_history", False)
 
             # Generate and inject prompt
-            prompt_tmpl = self._generate_prompt(state)
-            prompt = prompt_tmpl.invoke(state)
+            prompt = self._format_prompt(state)
             prompt = self._inject_history(state, prompt)
 
             request_msgs = graph_factory.convert_to_chat_format(prompt.to_messages())
@@ -72,21 +76,19 @@ class AgentNode(LLMNode):
                 model_name=self._get_model_name(self.model) or "unknown"
             )
 
-            # Create the ReAct agent
-            agent = create_react_agent(
-                model=self.model,
-                tools=self.tools,
-                prompt=full_agent_prompt,
-                name=state.get("_agent_name"),
-            )
+            agent = self._get_agent(state.get("_agent_name"))
 
             # Remove redundant system message at the beginning
             if isinstance(prompt.messages[0], SystemMessage):
                 prompt.messages = prompt.messages[1:]
 
-            # Run the agent with callback to track LLM calls
+            # Run the agent with callback to track LLM calls, the system prompt is passed per record
             response = await agent.ainvoke(
-                {"messages": prompt.to_messages()}, config={"callbacks": [callback]}  # type: ignore
+                {"messages": prompt.to_messages()},
+                config={
+                    "callbacks": [callback],
+                    "configurable": {self.AGENT_PROMPT_KEY: full_agent_prompt},
+                },
             )
 
             # Capture tokens after agent execution
@@ -119,7 +121,7 @@ class AgentNode(LLMNode):
                 )
 
             # Store chat history
-            if chat_history_enabled:
+            if self.chat_history_enabled:
                 if not updated_state.get(constants.VAR_CHAT_HISTORY):
                     updated_state[constants.VAR_CHAT_HISTORY] = []
                 updated_state[constants.VAR_CHAT_HISTORY].append(
@@ -138,6 +140,37 @@ class AgentNode(LLMNode):
         finally:
             self._record_execution_metadata(start_time, success, self.model, captured_tokens)
 
+    def _get_agent(self, name: Optional[str]) -> Any:
+        """
+        Get the ReAct agent graph for an agent name, compiling it on first use.
+
+        The graph only depends on the model, the tools and the name, so it is compiled once and
+        reused for every record; the system prompt of each record is read from the run config.
+
+        Args:
+            name: Name of the agent, None for an unnamed agent
+
+        Returns:
+            Compiled agent graph
+        """
+        agent = self._agents.get(name)
+        if agent is None:
+            agent = create_react_agent(
+                model=self.model,
+                tools=self.tools,
+                prompt=RunnableLambda(self._agent_prompt_messages),
+                name=name,
+            )
+            self._agents[name] = agent
+        return agent
+
+    def _agent_prompt_messages(
+        self, state: dict[str, Any], config: RunnableConfig
+    ) -> list[BaseMessage]:
+        """Prepend the system prompt of the record to the messages of the agent."""
+        system_prompt = config.get("configurable", {}).get(self.AGENT_PROMPT_KEY, "")
+        return [SystemMessage(content=system_prompt), *state["messages"]]
+
     def _compose_agent_prompt(self, state: dict[str, Any], prompt) -> str:
         """
         Combines the base agent prompt with conditional injections based on chat history length.
@@ -201,30 +201,24 @@ class BaseNode(ABC):
             return str(name) if name is not None else None
         return None
 
-    def _capture_token_usage(self, model: Any) -> dict[str, int]:
+    def _capture_token_usage(self, model: Any, response: Optional[Any] = None) -> dict[str, int]:
         """
-        Capture token usage from a model's last request.
+        Capture token usage of a model request.
 
         Args:
-            model: The model instance to capture tokens from
+            model: The model instance the request was made with
+            response: Optional response of the request, with the token usage of that request
 
         Returns:
             Dictionary with prompt, completion, and total tokens
         """
         tokens = {"prompt": 0, "completion": 0, "total": 0}
 
-        # Unwrap if model is wrapped
-        actual_model = model
-        if hasattr(model, "afunc"):
-            actual_model = model.afunc
-        elif hasattr(model, "bound"):
-            actual_model = model.bound
-
-        # Capture tokens if available
-        if hasattr(actual_model, "_last_request_usage") and actual_model._last_request_usage:
-            tokens["prompt"] = actual_model._last_request_usage.get("prompt_tokens", 0)
-            tokens["completion"] = actual_model._last_request_usage.get("completion_tokens", 0)
-            tokens["total"] = actual_model._last_request_usage.get("total_tokens", 0)
+        usage = getattr(response, "token_usage", None)
+        if usage:
+            tokens["prompt"] = usage.get("prompt_tokens", 0)
+            tokens["completion"] = usage.get("completion_tokens", 0)
+            tokens["total"] = usage.get("total_tokens", 0)
 
         return tokens
 
@@ -1,8 +1,10 @@
+import asyncio
 import time
 from inspect import isclass
-from typing import Any
+from typing import Any, Optional
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.prompt_values import PromptValue
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_openai.chat_models.base import _convert_message_to_dict
 
@@ -64,6 +66,11 @@ class LLMNode(BaseNode):
 
         self.task_name = utils.current_task
         self.graph_properties = utils.get_graph_properties(self.task_name)
+        self.chat_history_enabled = self.node_config.get("chat_history", False)
+
+        # the prompt is compiled once on first use, records only fill in the variables it references
+        self._prompt_messages: Optional[list[dict]] = None
+        self._prompt_tmpl: Optional[ChatPromptTemplate] = None
 
         # Currently we support direct passing of tools which have decorator @tool and of type Langgraph's BaseTool Class.
         tool_paths = self.node_config.get("tools", [])
@@ -105,10 +112,59 @@ class LLMNode(BaseNode):
             output_dict["tool_calls"] = response.tool_calls if response.tool_calls else []
         return output_dict
 
-    def _generate_prompt(self, state: dict[str, Any]):
-        messages = utils.convert_messages_from_config_to_chat_format(self.node_config["prompt"])
+    @staticmethod
+    def _prompt_needs_expansion(chat_frmt_messages: list[dict]) -> bool:
+        """
+        Check if the prompt has image or audio items, which are expanded from the state of each
+        record and so cannot be compiled ahead of time.
+        """
+        for message in chat_frmt_messages:
+            contents = message["content"]
+            if isinstance(contents, str) or message.get("role", "") == "tool":
+                continue
+            if any(item.get("type") in ("image_url", "audio_url") for item in contents):
+                return True
+        return False
+
+    def _build_prompt_tmpl(self, chat_frmt_messages: list[dict]) -> ChatPromptTemplate:
+        messages = utils.convert_messages_from_chat_format_to_langchain(chat_frmt_messages)
+        return ChatPromptTemplate.from_messages(
+            [*messages, MessagesPlaceholder(variable_name=self.input_key)],
+        )
+
+    def _generate_prompt(self, state: dict[str, Any]) -> ChatPromptTemplate:
+        """
+        Get the prompt template for a record: the precompiled template of the node, or a template
+        built from the state when the prompt has image or audio items to expand.
+        """
+        if self._prompt_tmpl is not None:
+            return self._prompt_tmpl
+        if self._prompt_messages is None:
+            self._prompt_messages = utils.convert_messages_from_config_to_chat_format(
+                self.node_config["prompt"]
+            )
+            if not self._prompt_needs_expansion(self._prompt_messages):
+                self._prompt_tmpl = self._build_prompt_tmpl(self._prompt_messages)
+                return self._prompt_tmpl
+        # expansion replaces message contents, keep the node's messages untouched
+        messages = [dict(message) for message in self._prompt_messages]
         return self._generate_prompt_tmpl_from_msg(state, messages)
 
+    def _format_prompt(self, state: dict[str, Any]) -> PromptValue:
+        """
+        Format the prompt of the node for a record, passing only the variables it references.
+
+        Args:
+            state: full graph state
+
+        Returns:
+            PromptValue with the formatted messages
+        """
+        prompt_tmpl = self._generate_prompt(state)
+        return prompt_tmpl.invoke(
+            {var: state[var] for var in prompt_tmpl.input_variables if var in state}
+        )
+
     def _inject_history_multiturn(self, state: dict[str, Any], msg_list, window_size: int = 5):
         updated_msg_list: list[BaseMessage] = []
         chat_history = state.get(constants.VAR_CHAT_HISTORY, [])
@@ -161,11 +217,9 @@ class LLMNode(BaseNode):
             else:
                 logger.debug(f"Invalid role in chat history {entry}")
 
-        cur_ind = -1
         system_message = None
         remaining_messages = []
         for msg in msg_list:
-            cur_ind += 1
             if isinstance(msg, SystemMessage):
                 system_message = msg
             else:
@@ -212,15 +266,14 @@ class LLMNode(BaseNode):
         updated_msg_list = msg_list
         chat_conversation = self.graph_properties.get("chat_conversation", None)
         chat_history_window_size = self.graph_properties.get("chat_history_window_size", 5)
-        chat_history_enabled = self.node_config.get("chat_history", False)
         # Inject Chat history into msg_list
         if chat_conversation == constants.CHAT_CONVERSATION_MULTITURN:
-            if chat_history_enabled and len(state[constants.VAR_CHAT_HISTORY]) > 0:
+            if self.chat_history_enabled and len(state[constants.VAR_CHAT_HISTORY]) > 0:
                 updated_msg_list = self._inject_history_multiturn(
                     state, msg_list, chat_history_window_size
                 )
         elif chat_conversation == constants.CHAT_CONVERSATION_SINGLETURN:
-            if chat_history_enabled and len(state[constants.VAR_CHAT_HISTORY]) > 0:
+            if self.chat_history_enabled and len(state[constants.VAR_CHAT_HISTORY]) > 0:
                 updated_msg_list = self._inject_history_singleturn(
                     state, msg_list, chat_history_window_size
                 )
@@ -253,11 +306,7 @@ class LLMNode(BaseNode):
 
             message["content"] = expanded_contents
 
-        messages = utils.convert_messages_from_chat_format_to_langchain(chat_frmt_messages)
-        prompt = ChatPromptTemplate.from_messages(
-            [*messages, MessagesPlaceholder(variable_name=self.input_key)],
-        )
-        return prompt.partial(**state)
+        return self._build_prompt_tmpl(chat_frmt_messages)
 
     async def _exec_wrapper(self, state: dict[str, Any]) -> dict[str, Any]:
         """
@@ -282,10 +331,8 @@ class LLMNode(BaseNode):
                 if isclass(self.pre_process)
                 else self.pre_process(state)
             )
-            chat_history_enabled = self.node_config.get("chat_history", False)
-            prompt_tmpl = self._generate_prompt(state)
             # get the prompt from template
-            prompt = prompt_tmpl.invoke(state)
+            prompt = self._format_prompt(state)
             prompt = self._inject_history(state, prompt)
 
             # convert the request into chat format to store for multi turn
@@ -301,7 +348,7 @@ class LLMNode(BaseNode):
             response: ModelResponse = await self.model.ainvoke(prompt, **kwargs)
 
             # Capture tokens after model call
-            captured_tokens = self._capture_token_usage(self.model)
+            captured_tokens = self._capture_token_usage(self.model, response)
 
             # Extract AIMessage from ModelResponse
             ai_message = (
@@ -339,7 +386,7 @@ class LLMNode(BaseNode):
                 )
 
             # Store chat history if enabled for this node
-            if chat_history_enabled:
+            if self.chat_history_enabled:
                 if not updated_state.get(constants.VAR_CHAT_HISTORY):
                     updated_state[constants.VAR_CHAT_HISTORY] = []
                 updated_state[constants.VAR_CHAT_HISTORY].append(
@@ -352,7 +399,8 @@ class LLMNode(BaseNode):
 
             return updated_state
 
-        except Exception:
+        except (Exception, asyncio.CancelledError):
+            # cancelled calls, e.g. a slow model of a multi_llm node, are not successful either
             success = False
             raise
         finally:
@@ -1,15 +1,20 @@
+import asyncio
 import time
 from inspect import isclass
-from typing import Any
+from typing import Any, Optional
 
 from sygra.core.graph.nodes.base_node import BaseNode
 from sygra.core.graph.nodes.llm_node import LLMNode
+from sygra.logger.logger_config import logger
 from sygra.utils import constants, utils
 
 
 class MultiLLMNode(BaseNode):
     REQUIRED_KEYS: list[str] = ["models", "prompt"]
 
+    # wait for every model, for the first k responses, or for a majority of the models
+    COMPLETION_POLICIES: list[str] = ["wait_all", "first_k", "quorum"]
+
     def __init__(self, node_name: str, config: dict):
         """
         MultiLLMNode constructor.
@@ -39,6 +44,20 @@ class MultiLLMNode(BaseNode):
             if isclass(self.multi_llm_post_process):
                 self.multi_llm_post_process = self.multi_llm_post_process().apply
 
+        # all models are called concurrently, at most max_concurrency at a time for a record
+        self.max_concurrency = self.node_config.get("max_concurrency") or len(self.llm_dict)
+        self.completion_policy = self.node_config.get("completion_policy", "wait_all")
+        self.timeout: Optional[float] = self.node_config.get("timeout")
+        self.required_responses = self._get_required_responses()
+
+    def _get_required_responses(self) -> int:
+        """Number of model responses the completion policy waits for."""
+        if self.completion_policy == "first_k":
+            return int(self.node_config["k"])
+        if self.completion_policy == "quorum":
+            return int(self.node_config.get("k", len(self.llm_dict) // 2 + 1))
+        return len(self.llm_dict)
+
     def _default_multi_llm_post_process(self, model_outputs: dict[str, Any]) -> dict[str, Any]:
         updated_model_outputs = {}
         for model, messages in model_outputs.items():
@@ -61,9 +80,7 @@ class MultiLLMNode(BaseNode):
 
         try:
             # Execute all LLM nodes (they will track themselves)
-            model_outputs = {}
-            for model_label, llm_node in self.llm_dict.items():
-                model_outputs[model_label] = await llm_node._exec_wrapper(state)
+            model_outputs = await self._fan_out(state)
 
             # Apply post-processing
             result = self.multi_llm_post_process(model_outputs)
@@ -74,6 +91,73 @@ class MultiLLMNode(BaseNode):
         finally:
             self._record_execution_metadata(start_time, success)
 
+    async def _fan_out(self, state: dict[str, Any]) -> dict[str, Any]:
+        """
+        Call all models concurrently and collect their outputs as per the completion policy.
+
+        Calls still running once the policy is satisfied, or when the timeout expires, are
+        cancelled. With `wait_all` a failing model call fails the node; with `first_k` and
+        `quorum` failures are skipped as long as enough models respond.
+
+        Args:
+            state: State of the node.
+
+        Returns:
+            Outputs of the models which responded, keyed by model label in configuration order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def call_model(llm_node: LLMNode) -> dict[str, Any]:
+            async with semaphore:
+                # each model gets its own copy of the state, as pre and post processors update it
+                return await llm_node._exec_wrapper(dict(state))
+
+        tasks = {
+            asyncio.create_task(call_model(llm_node)): model_label
+            for model_label, llm_node in self.llm_dict.items()
+        }
+        pending = set(tasks)
+        outputs: dict[str, Any] = {}
+        errors: list[BaseException] = []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout if self.timeout is not None else None
+        timed_out = False
+        try:
+            while pending and len(outputs) < self.required_responses:
+                timeout = max(0.0, deadline - loop.time()) if deadline is not None else None
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    timed_out = True
+                    break
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        outputs[tasks[task]] = task.result()
+                    elif self.completion_policy == "wait_all":
+                        raise error
+                    else:
+                        logger.warning(f"[{self.name}] Model {tasks[task]} failed: {error}")
+                        errors.append(error)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if len(outputs) < self.required_responses:
+            if not timed_out:
+                # too many failures to satisfy the policy
+                raise errors[0]
+            if not outputs:
+                raise asyncio.TimeoutError(f"[{self.name}] No model responded in {self.timeout}s")
+            logger.warning(
+                f"[{self.name}] Timed out after {self.timeout}s with {len(outputs)} of "
+                f"{self.required_responses} model responses"
+            )
+        return {label: outputs[label] for label in self.llm_dict if label in outputs}
+
     def to_backend(self) -> Any:
         """
         Convert the Node object to backend platform specific Runnable object.
@@ -81,9 +165,7 @@ class MultiLLMNode(BaseNode):
         Returns:
              Any: platform specific runnable object like Runnable in LangGraph.
         """
-        return utils.backend_factory.create_multi_llm_runnable(
-            self.llm_dict, self.multi_llm_post_process
-        )
+        return utils.backend_factory.create_llm_runnable(self._exec_wrapper)
 
     def validate_node(self):
         """
@@ -94,3 +176,15 @@ class MultiLLMNode(BaseNode):
             None
         """
         self.validate_config_keys(self.REQUIRED_KEYS, self.node_type, self.node_config)
+
+        policy = self.node_config.get("completion_policy", "wait_all")
+        if policy not in self.COMPLETION_POLICIES:
+            raise ValueError(
+                f"completion_policy must be one of {self.COMPLETION_POLICIES}, got '{policy}'"
+            )
+        num_models = len(self.node_config["models"])
+        if policy == "first_k" and "k" not in self.node_config:
+            raise ValueError("'k' is required with completion_policy 'first_k'")
+        k = self.node_config.get("k")
+        if policy != "wait_all" and k is not None and not 0 < int(k) <= num_models:
+            raise ValueError(f"'k' must be between 1 and the number of models ({num_models})")
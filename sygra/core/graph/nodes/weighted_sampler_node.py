@@ -1,9 +1,11 @@
 import random
 import time
+from itertools import accumulate
 from typing import Any
 
+from sygra.core.dataset.sampler_source import get_sampler_source
 from sygra.core.graph.nodes.base_node import BaseNode
-from sygra.utils import utils
+from sygra.utils import constants, utils
 
 
 class WeightedSamplerNode(BaseNode):
@@ -27,6 +29,16 @@ class WeightedSamplerNode(BaseNode):
         # add weighted sampler variables into node state variables
         self._process_weighted_sampler(self.node_config)
 
+        # random generator of the node, seeded with 'seed' to make the sampling reproducible
+        self.rng = random.Random(self.node_config.get("seed"))
+        # cumulative weights of static value lists, computed once instead of for every record
+        self._cum_weights: dict[str, list[float]] = {}
+        for attr, attr_config in self.node_config["attributes"].items():
+            attr_values = attr_config["values"]
+            if not isinstance(attr_values, dict):
+                weights = attr_config.get("weights", [1] * len(attr_values))
+                self._cum_weights[attr] = list(accumulate(weights))
+
     def _weighted_sampler(self, attr_configs, state: dict[str, Any]):
         sampled_values = {}
         for attr, attr_config in attr_configs.items():
@@ -49,17 +61,21 @@ class WeightedSamplerNode(BaseNode):
             Only difference is the 'values' field, it was static list, now it contains a dictionary
             """
             if isinstance(attr_values, dict):
-                column = attr_config["values"]["column"]
+                column = attr_values["column"]
                 # if list of columns are given, select one column randomly
                 if isinstance(column, list):
                     # randomly select a column
-                    column = random.choice(column)
-                datasrc = attr_config["values"]["source"]
-                sampled_values[attr] = utils.fetch_next_record(datasrc, column)
+                    column = self.rng.choice(column)
+                source = get_sampler_source(
+                    attr_values["source"],
+                    attr_values.get("buffer_size", constants.SAMPLER_STREAM_BUFFER_SIZE),
+                )
+                sampled_values[attr] = source.next_value(column)
             else:
                 # else if static value list
-                weights = attr_config.get("weights", [1] * len(attr_values))
-                sampled_values[attr] = random.choices(population=attr_values, weights=weights)[0]
+                sampled_values[attr] = self.rng.choices(
+                    population=attr_values, cum_weights=self._cum_weights[attr]
+                )[0]
         return sampled_values
 
     def _process_weighted_sampler(self, node_config: dict) -> None:
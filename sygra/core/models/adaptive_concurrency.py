@@ -0,0 +1,210 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from sygra.logger.logger_config import logger
+from sygra.utils import constants
+from sygra.utils.config_registry import ConfigRegistry
+
+
+class AdaptiveConcurrencyConfig(BaseModel):
+    """Configuration model for the adaptive concurrency limit of a model"""
+
+    enabled: bool = Field(default=False, description="Adapt the number of concurrent requests")
+    initial_limit: int = Field(default=16, ge=1, description="Concurrent requests at start")
+    min_limit: int = Field(default=1, ge=1, description="Lower bound of the limit")
+    max_limit: int = Field(default=1000, ge=1, description="Upper bound of the limit")
+    increase: float = Field(
+        default=1.0, gt=0, description="Additive increase of the limit per window of successes"
+    )
+    decrease_factor: float = Field(
+        default=0.7, gt=0, lt=1, description="Multiplicative decrease of the limit on overload"
+    )
+    latency_tolerance: Optional[float] = Field(
+        default=2.0,
+        gt=1,
+        description="Overload when the recent latency exceeds the baseline by this factor, "
+        "None to only react to errors",
+    )
+
+    model_config = ConfigDict(extra="ignore")
+
+    @classmethod
+    def from_model_config(cls, model_config: Dict[str, Any]) -> "AdaptiveConcurrencyConfig":
+        """
+        Build the limiter configuration from the `adaptive_concurrency` section of a model config,
+        on top of the defaults in configuration.yaml.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            AdaptiveConcurrencyConfig for the model
+        """
+        defaults = (
+            ConfigRegistry.load_yaml(constants.SYGRA_CONFIG)
+            .get("model_config", {})
+            .get("adaptive_concurrency")
+        )
+        return cls(**{**(defaults or {}), **(model_config.get("adaptive_concurrency") or {})})
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on the number of concurrent requests to a model.
+
+    The limit grows additively (by `increase` per window of `limit` successful requests) while
+    requests succeed, and is cut multiplicatively when the model shows overload: a throttling or
+    availability error code, or a recent latency well above the latency baseline of the model.
+    After a decrease, the limit is not decreased again until a full window of requests has
+    completed, so the requests already in flight during an overload only count once.
+
+    Limiters are shared process-wide per model name. The dataset processor reads their limits to
+    size the pool of records processed concurrently.
+
+    Args:
+        name: Model name
+        config: Limiter configuration
+    """
+
+    _lock = threading.Lock()
+    _limiters: Dict[str, "AdaptiveConcurrencyLimiter"] = {}
+
+    # smoothing of the recent and baseline latency averages
+    SHORT_ALPHA = 0.3
+    LONG_ALPHA = 0.02
+
+    def __init__(self, name: str, config: AdaptiveConcurrencyConfig):
+        self.name = name
+        self.config = config
+        self._limit = float(min(max(config.initial_limit, config.min_limit), config.max_limit))
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._short_latency: Optional[float] = None
+        self._long_latency: Optional[float] = None
+        self._since_decrease = self.limit
+
+    @classmethod
+    def from_model_config(
+        cls, model_config: Dict[str, Any]
+    ) -> Optional["AdaptiveConcurrencyLimiter"]:
+        """
+        Get the shared limiter of a model, or None if adaptive concurrency is disabled for it.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            AdaptiveConcurrencyLimiter for the model, None when disabled
+        """
+        config = AdaptiveConcurrencyConfig.from_model_config(model_config)
+        if not config.enabled:
+            return None
+        name = model_config.get("name", "")
+        with cls._lock:
+            limiter = cls._limiters.get(name)
+            if limiter is None:
+                limiter = cls(name, config)
+                cls._limiters[name] = limiter
+            return limiter
+
+    @classmethod
+    def total_limit(cls) -> Optional[int]:
+        """Sum of the limits of all models, None if no model has adaptive concurrency."""
+        with cls._lock:
+            if not cls._limiters:
+                return None
+            return sum(limiter.limit for limiter in cls._limiters.values())
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget every limiter."""
+        with cls._lock:
+            cls._limiters.clear()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> int:
+        """
+        Wait for a free request slot and take it.
+
+        Returns:
+            Number of requests in flight, including this one
+        """
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # pass the wake up on to the next waiter
+                    self._wake_waiters()
+                else:
+                    self._waiters.remove(waiter)
+                raise
+        self._in_flight += 1
+        return self._in_flight
+
+    def release(self, in_flight: int, latency: float, response_code: Optional[int]) -> None:
+        """
+        Release a request slot and adapt the limit to the outcome of the request.
+
+        Args:
+            in_flight: Requests in flight when the slot was acquired, as returned by acquire
+            latency: Latency of the request in seconds
+            response_code: Response code of the request, None if it raised an exception
+        """
+        self._in_flight -= 1
+        if response_code is not None:
+            self._update_limit(in_flight, latency, response_code)
+        self._wake_waiters()
+
+    def _update_limit(self, in_flight: int, latency: float, response_code: int) -> None:
+        overloaded = response_code in constants.ADAPTIVE_CONCURRENCY_OVERLOAD_CODES
+        if response_code == 200:
+            self._short_latency = self._ewma(self._short_latency, latency, self.SHORT_ALPHA)
+            self._long_latency = self._ewma(self._long_latency, latency, self.LONG_ALPHA)
+            tolerance = self.config.latency_tolerance
+            overloaded = (
+                tolerance is not None
+                and self._long_latency is not None
+                and self._short_latency > tolerance * self._long_latency
+            )
+
+        self._since_decrease += 1
+        if overloaded:
+            if self._since_decrease >= self.limit:
+                previous = self.limit
+                self._limit = max(self.config.min_limit, self._limit * self.config.decrease_factor)
+                self._since_decrease = 0
+                logger.info(
+                    f"[{self.name}] Overload detected (code {response_code}, latency "
+                    f"{latency:.2f}s), concurrency limit {previous} -> {self.limit}"
+                )
+        elif response_code == 200 and in_flight * 2 >= self.limit:
+            # only grow while the limit is actually used
+            self._limit = min(
+                self.config.max_limit, self._limit + self.config.increase / max(self._limit, 1)
+            )
+
+    @staticmethod
+    def _ewma(average: Optional[float], value: float, alpha: float) -> float:
+        return value if average is None else average + alpha * (value - average)
+
+    def _wake_waiters(self) -> None:
+        free_slots = self.limit - self._in_flight
+        while free_slots > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done() and not waiter.get_loop().is_closed():
+                waiter.set_result(None)
+                free_slots -= 1
@@ -0,0 +1,246 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from sygra.logger.logger_config import logger
+from sygra.utils import constants
+from sygra.utils.config_registry import ConfigRegistry
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request to an endpoint whose circuit is open.
+
+    Args:
+        name: Model name
+        url: Url of the endpoint
+        retry_after: Time (epoch seconds) the circuit lets a trial request through, None once the
+            circuit breaker budget is exhausted
+    """
+
+    def __init__(self, name: str, url: str, retry_after: Optional[float]):
+        self.name = name
+        self.url = url
+        self.retry_after = retry_after
+        super().__init__(f"Circuit of model {name} is open for {url}")
+
+
+class CircuitBudgetExhaustedError(RuntimeError):
+    """Raised by the dataset processor, once its state is saved, when the run cannot go on."""
+
+
+class CircuitBreakerConfig(BaseModel):
+    """Configuration model for the circuit breakers of the endpoints of a model"""
+
+    failure_threshold: int = Field(
+        default_factory=lambda: constants.MAX_FAILED_ERROR,
+        ge=1,
+        description="Server errors within failure_window that open the circuit",
+    )
+    failure_window: float = Field(
+        default_factory=lambda: constants.MODEL_FAILURE_WINDOW_IN_SEC,
+        gt=0,
+        description="Window in seconds of the server errors opening the circuit",
+    )
+    open_timeout: float = Field(
+        default=30.0, gt=0, description="Seconds an open circuit waits before a trial request"
+    )
+    half_open_requests: int = Field(
+        default=1, ge=1, description="Trial requests let through by a half-open circuit"
+    )
+
+    model_config = ConfigDict(extra="ignore")
+
+    @classmethod
+    def from_model_config(cls, model_config: Dict[str, Any]) -> "CircuitBreakerConfig":
+        """
+        Build the circuit breaker configuration from the `circuit_breaker` section of a model
+        config, on top of the defaults in configuration.yaml.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            CircuitBreakerConfig for the model
+        """
+        return cls(**{**_default_config(), **(model_config.get("circuit_breaker") or {})})
+
+
+def _default_config() -> Dict[str, Any]:
+    defaults = (
+        ConfigRegistry.load_yaml(constants.SYGRA_CONFIG)
+        .get("model_config", {})
+        .get("circuit_breaker")
+    )
+    return defaults or {}
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one endpoint (url) of a model.
+
+    A closed circuit lets every request through and counts the server errors
+    (SERVER_DOWN_ERROR_CODE) of the endpoint. When `failure_threshold` of them happen within
+    `failure_window` seconds, the circuit opens: requests raise CircuitOpenError without reaching
+    the endpoint, for `open_timeout` seconds. The circuit is then half-open and lets
+    `half_open_requests` trial requests through: a successful one closes the circuit, a server
+    error opens it again.
+
+    Every opening spends one unit of a budget shared by all circuits of the process, `budget` in
+    the circuit_breaker defaults of configuration.yaml. Once it is exhausted, every circuit
+    rejects requests and the dataset processor stops the run after saving its state.
+
+    Circuit breakers are shared process-wide per model name and url.
+
+    Args:
+        name: Model name
+        url: Url of the endpoint
+        config: Circuit breaker configuration
+    """
+
+    _lock = threading.Lock()
+    _breakers: Dict[Tuple[str, str], "CircuitBreaker"] = {}
+    _trips = 0
+    _budget: Optional[int] = None
+
+    def __init__(self, name: str, url: str, config: CircuitBreakerConfig):
+        self.name = name
+        self.url = url
+        self.config = config
+        self._state = CircuitState.CLOSED
+        self._failures: Deque[float] = deque(maxlen=config.failure_threshold)
+        self._opened_at = 0.0
+        self._trials = 0
+
+    @classmethod
+    def for_endpoint(cls, model_config: Dict[str, Any], url: str) -> Optional["CircuitBreaker"]:
+        """
+        Get the shared circuit breaker of a model endpoint, None if HANDLE_SERVER_DOWN is off.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+            url: Url of the endpoint
+
+        Returns:
+            CircuitBreaker of the endpoint, None when server down handling is disabled
+        """
+        if not constants.HANDLE_SERVER_DOWN:
+            return None
+        key = (str(model_config.get("name", "")), url)
+        with cls._lock:
+            breaker = cls._breakers.get(key)
+            if breaker is None:
+                breaker = cls(key[0], url, CircuitBreakerConfig.from_model_config(model_config))
+                cls._breakers[key] = breaker
+            return breaker
+
+    @classmethod
+    def budget(cls) -> int:
+        """Circuit openings allowed in the run, across all endpoints."""
+        if cls._budget is None:
+            cls._budget = int(_default_config().get("budget", constants.CIRCUIT_BREAKER_BUDGET))
+        return cls._budget
+
+    @classmethod
+    def budget_exhausted(cls) -> bool:
+        """True once circuits opened more often than the budget allows."""
+        return cls._trips > cls.budget()
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget every circuit breaker and restore the budget."""
+        with cls._lock:
+            cls._breakers.clear()
+            cls._trips = 0
+            cls._budget = None
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state(time.time())
+
+    def before_request(self) -> bool:
+        """
+        Let a request through, or raise CircuitOpenError if the circuit is open.
+
+        Returns:
+            True if the request is a trial request of a half-open circuit, to be passed to
+            after_request
+
+        Raises:
+            CircuitOpenError: The request must not be sent to the endpoint
+        """
+        if self.budget_exhausted():
+            raise CircuitOpenError(self.name, self.url, None)
+        with self._lock:
+            state = self._current_state(time.time())
+            if state == CircuitState.CLOSED:
+                return False
+            if state == CircuitState.HALF_OPEN and self._trials < self.config.half_open_requests:
+                self._trials += 1
+                return True
+            raise CircuitOpenError(self.name, self.url, self._opened_at + self.config.open_timeout)
+
+    def after_request(self, response_code: Optional[int], trial: bool = False) -> None:
+        """
+        Record the outcome of a request let through by before_request.
+
+        Args:
+            response_code: Response code of the request, None if it raised an exception
+            trial: Value returned by before_request for the request
+        """
+        with self._lock:
+            now = time.time()
+            if trial:
+                self._trials -= 1
+            if response_code is None:
+                return
+            failed = response_code in constants.SERVER_DOWN_ERROR_CODE
+            if trial and self._state != CircuitState.CLOSED:
+                if failed:
+                    self._open(now, f"trial request returned {response_code}")
+                else:
+                    self._state = CircuitState.CLOSED
+                    self._failures.clear()
+                    logger.info(f"[{self.name}][{self.url}] Circuit closed, the endpoint is back")
+            elif failed and self._state == CircuitState.CLOSED:
+                self._failures.append(now)
+                if (
+                    len(self._failures) >= self.config.failure_threshold
+                    and now - self._failures[0] < self.config.failure_window
+                ):
+                    self._open(
+                        now,
+                        f"{len(self._failures)} server errors in {now - self._failures[0]:.1f}s",
+                    )
+
+    def _current_state(self, now: float) -> CircuitState:
+        if self._state == CircuitState.OPEN and now >= self._opened_at + self.config.open_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def _open(self, now: float, reason: str) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._failures.clear()
+        CircuitBreaker._trips += 1
+        logger.warning(
+            f"[{self.name}][{self.url}] Circuit opened for {self.config.open_timeout:.0f}s: "
+            f"{reason} (opening {CircuitBreaker._trips} of a budget of {self.budget()})"
+        )
+        if self.budget_exhausted():
+            logger.error(
+                f"[{self.name}][{self.url}] Circuit breaker budget exhausted, the dependant model "
+                "is down for longer period. Stopping the run once its state is saved."
+            )
@@ -1,11 +1,10 @@
 from enum import Enum
 from typing import Any, Dict, Optional
 
-import httpx
-from httpx import Timeout
 from mistralai_azure import MistralAzure
 from mistralai_azure.utils.retries import BackoffStrategy, RetryConfig
 
+from sygra.core.models.client.connection_pool import ConnectionPoolConfig, HttpConnectionPool
 from sygra.core.models.client.http_client import HttpClient
 from sygra.core.models.client.ollama_client import OllamaClient
 from sygra.core.models.client.openai_azure_client import OpenAIAzureClient
@@ -190,10 +189,12 @@ class ClientFactory:
         utils.validate_required_keys(["url", "auth_token"], model_config, "model")
         ssl_verify: bool = bool(model_config.get("ssl_verify", True))
         ssl_cert = model_config.get("ssl_cert")
-        httpx_client = (
-            httpx.AsyncClient(http1=True, verify=ssl_verify, cert=ssl_cert)
-            if async_client
-            else httpx.Client(http1=True, verify=ssl_verify, cert=ssl_cert)
+        httpx_client = HttpConnectionPool.get_httpx_client(
+            url,
+            async_client=async_client,
+            ssl_verify=ssl_verify,
+            ssl_cert=ssl_cert,
+            pool_config=ConnectionPoolConfig.from_model_config(model_config),
         )
 
         client_kwargs = {
@@ -232,17 +233,18 @@ class ClientFactory:
         )
         ssl_verify: bool = bool(model_config.get("ssl_verify", True))
         ssl_cert = model_config.get("ssl_cert")
-        httpx_client = (
-            httpx.AsyncClient(http1=True, verify=ssl_verify, cert=ssl_cert)
-            if async_client
-            else httpx.Client(http1=True, verify=ssl_verify, cert=ssl_cert)
+        httpx_client = HttpConnectionPool.get_httpx_client(
+            url,
+            async_client=async_client,
+            ssl_verify=ssl_verify,
+            ssl_cert=ssl_cert,
+            pool_config=ConnectionPoolConfig.from_model_config(model_config),
         )
 
         client_kwargs = {
             "azure_deployment": model_config.get("model"),
             "azure_endpoint": url,
             "api_version": model_config.get("api_version"),
-            "default_headers": {"Connection": "close"},
             "api_key": auth_token,
             "timeout": model_config.get("timeout", constants.DEFAULT_TIMEOUT),
             "max_retries": model_config.get("max_retries", 3),
@@ -274,20 +276,13 @@ class ClientFactory:
         utils.validate_required_keys(["url", "auth_token"], model_config, "model")
         ssl_verify: bool = bool(model_config.get("ssl_verify", True))
         ssl_cert = model_config.get("ssl_cert")
-        httpx_client = (
-            httpx.AsyncClient(
-                http1=True,
-                verify=ssl_verify,
-                cert=ssl_cert,
-                timeout=Timeout(timeout=model_config.get("timeout", constants.DEFAULT_TIMEOUT)),
-            )
-            if async_client
-            else httpx.Client(
-                http1=True,
-                verify=ssl_verify,
-                cert=ssl_cert,
-                timeout=Timeout(timeout=model_config.get("timeout", constants.DEFAULT_TIMEOUT)),
-            )
+        httpx_client = HttpConnectionPool.get_httpx_client(
+            url,
+            async_client=async_client,
+            ssl_verify=ssl_verify,
+            ssl_cert=ssl_cert,
+            pool_config=ConnectionPoolConfig.from_model_config(model_config),
+            timeout=model_config.get("timeout", constants.DEFAULT_TIMEOUT),
         )
         # Configure retry settings
         retry_config = RetryConfig(
@@ -363,6 +358,7 @@ class ClientFactory:
             ssl_verify=ssl_verify,
             ssl_cert=ssl_cert,
             json_payload=json_payload,
+            connection_pool=ConnectionPoolConfig.from_model_config(model_config),
         )
 
     @staticmethod
@@ -388,11 +384,17 @@ class ClientFactory:
         """
         # Ollama doesn't need auth token, so we don't validate it
 
-        client_kwargs = {
+        client_kwargs: Dict[str, Any] = {
             "timeout": model_config.get("timeout", constants.DEFAULT_TIMEOUT),
         }
         if url is not None:
             client_kwargs.update({"host": url})
+            # ollama builds its own httpx client, hand it the shared transport of this endpoint
+            client_kwargs["transport"] = HttpConnectionPool.get_httpx_transport(
+                url,
+                async_client=async_client,
+                pool_config=ConnectionPoolConfig.from_model_config(model_config),
+            )
 
         stop = model_config.get("stop", None)
 
@@ -0,0 +1,275 @@
+import asyncio
+import importlib.util
+import threading
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpx
+from pydantic import BaseModel, ConfigDict, Field
+
+from sygra.logger.logger_config import logger
+from sygra.utils import constants
+
+
+class ConnectionPoolConfig(BaseModel):
+    """Configuration model for a pooled HTTP connection to a single endpoint"""
+
+    max_connections: int = Field(
+        default=constants.DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        description="Maximum number of concurrent connections per host",
+    )
+    max_keepalive_connections: int = Field(
+        default=constants.DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        description="Maximum number of idle keep-alive connections per host",
+    )
+    keepalive_expiry: float = Field(
+        default=constants.DEFAULT_KEEPALIVE_EXPIRY,
+        description="Seconds an idle keep-alive connection is kept open",
+    )
+    http2: bool = Field(default=False, description="Negotiate HTTP/2 when the backend supports it")
+
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    @classmethod
+    def from_model_config(cls, model_config: Dict[str, Any]) -> "ConnectionPoolConfig":
+        """
+        Build the pool configuration from the `connection_pool` section of a model config.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            ConnectionPoolConfig for the model
+        """
+        return cls(**(model_config.get("connection_pool") or {}))
+
+
+PoolKey = Tuple[Any, ...]
+
+
+class HttpConnectionPool:
+    """
+    Process-wide registry of keep-alive HTTP connection pools, one per endpoint.
+
+    Every model client (OpenAI/vLLM, Azure OpenAI, Mistral, Ollama and the generic HttpClient used by
+    TGI, Azure, Triton and the proxy models) fetches its transport from here instead of opening a new
+    one per request, so TCP/TLS connections are reused across records and across model instances
+    pointing to the same host.
+
+    Async transports are bound to the event loop they were created in, so pools are additionally keyed
+    by the running loop; pools of loops that have been closed are dropped on the next lookup.
+    """
+
+    _lock = threading.Lock()
+    _httpx_transports: Dict[PoolKey, Tuple[Optional[asyncio.AbstractEventLoop], Any]] = {}
+    _httpx_clients: Dict[PoolKey, Tuple[Optional[asyncio.AbstractEventLoop], Any]] = {}
+    _aiohttp_sessions: Dict[PoolKey, Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        """Reduce a URL to scheme://host:port, the unit connections are pooled on."""
+        parts = urlsplit(url)
+        if not parts.scheme or not parts.netloc:
+            return url
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    @staticmethod
+    def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    @staticmethod
+    def _http2_available(pool_config: ConnectionPoolConfig) -> bool:
+        if not pool_config.http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "HTTP/2 requested in connection_pool config but the 'h2' package is not installed. "
+                "Falling back to HTTP/1.1."
+            )
+            return False
+        return True
+
+    @classmethod
+    def _purge_closed_loops(cls) -> None:
+        # must be called with cls._lock held
+        for registry in (cls._httpx_transports, cls._httpx_clients, cls._aiohttp_sessions):
+            stale = [
+                k for k, (loop, _) in registry.items() if loop is not None and loop.is_closed()
+            ]
+            for k in stale:
+                del registry[k]
+
+    @classmethod
+    def get_httpx_transport(
+        cls,
+        url: str,
+        async_client: bool = True,
+        ssl_verify: bool = True,
+        ssl_cert: Optional[str] = None,
+        pool_config: Optional[ConnectionPoolConfig] = None,
+    ) -> Union[httpx.AsyncHTTPTransport, httpx.HTTPTransport]:
+        """
+        Get the shared httpx transport (connection pool) for an endpoint.
+
+        Args:
+            url: Endpoint URL; connections are pooled per scheme, host and port
+            async_client: Whether an async transport is required
+            ssl_verify: Verify SSL certificate
+            ssl_cert: Path to SSL certificate file
+            pool_config: Connection pool limits, defaults are used when not provided
+
+        Returns:
+            An httpx transport shared by all clients of this endpoint
+        """
+        pool_config = pool_config or ConnectionPoolConfig()
+        loop = cls._current_loop() if async_client else None
+        key = (id(loop), async_client, cls._origin(url), ssl_verify, ssl_cert, pool_config)
+        with cls._lock:
+            cls._purge_closed_loops()
+            entry = cls._httpx_transports.get(key)
+            if entry is not None:
+                existing: Union[httpx.AsyncHTTPTransport, httpx.HTTPTransport] = entry[1]
+                return existing
+
+            limits = httpx.Limits(
+                max_connections=pool_config.max_connections,
+                max_keepalive_connections=pool_config.max_keepalive_connections,
+                keepalive_expiry=pool_config.keepalive_expiry,
+            )
+            transport_cls = httpx.AsyncHTTPTransport if async_client else httpx.HTTPTransport
+            transport = transport_cls(
+                verify=ssl_verify,
+                cert=ssl_cert,
+                limits=limits,
+                http1=True,
+                http2=cls._http2_available(pool_config),
+            )
+            cls._httpx_transports[key] = (loop, transport)
+            logger.debug(f"Created pooled HTTP transport for {cls._origin(url)}")
+            return transport
+
+    @classmethod
+    def get_httpx_client(
+        cls,
+        url: str,
+        async_client: bool = True,
+        ssl_verify: bool = True,
+        ssl_cert: Optional[str] = None,
+        pool_config: Optional[ConnectionPoolConfig] = None,
+        timeout: Optional[float] = None,
+    ) -> Union[httpx.AsyncClient, httpx.Client]:
+        """
+        Get the shared httpx client for an endpoint, backed by its pooled transport.
+
+        Args:
+            url: Endpoint URL; connections are pooled per scheme, host and port
+            async_client: Whether an async client is required
+            ssl_verify: Verify SSL certificate
+            ssl_cert: Path to SSL certificate file
+            pool_config: Connection pool limits, defaults are used when not provided
+            timeout: Default request timeout in seconds for the client, httpx default if None
+
+        Returns:
+            An httpx client shared by all model clients of this endpoint
+        """
+        pool_config = pool_config or ConnectionPoolConfig()
+        transport = cls.get_httpx_transport(url, async_client, ssl_verify, ssl_cert, pool_config)
+        loop = cls._current_loop() if async_client else None
+        key = (id(loop), async_client, cls._origin(url), ssl_verify, ssl_cert, pool_config, timeout)
+        with cls._lock:
+            entry = cls._httpx_clients.get(key)
+            if entry is not None:
+                existing: Union[httpx.AsyncClient, httpx.Client] = entry[1]
+                return existing
+
+            client_kwargs: Dict[str, Any] = {"transport": transport}
+            if timeout is not None:
+                client_kwargs["timeout"] = httpx.Timeout(timeout=timeout)
+            client = (
+                httpx.AsyncClient(**client_kwargs)
+                if async_client
+                else httpx.Client(**client_kwargs)
+            )
+            cls._httpx_clients[key] = (loop, client)
+            return client
+
+    @classmethod
+    def get_aiohttp_session(
+        cls,
+        url: str,
+        pool_config: Optional[ConnectionPoolConfig] = None,
+    ) -> aiohttp.ClientSession:
+        """
+        Get the shared aiohttp session for an endpoint. Must be called from a running event loop.
+
+        SSL verification stays a per-request setting in aiohttp, so it is not part of the pool key.
+
+        Args:
+            url: Endpoint URL; connections are pooled per scheme, host and port
+            pool_config: Connection pool limits, defaults are used when not provided
+
+        Returns:
+            An aiohttp session shared by all HTTP clients of this endpoint on the running loop
+        """
+        pool_config = pool_config or ConnectionPoolConfig()
+        loop = asyncio.get_running_loop()
+        key = (id(loop), cls._origin(url), pool_config)
+        with cls._lock:
+            cls._purge_closed_loops()
+            entry = cls._aiohttp_sessions.get(key)
+            if entry is not None and not entry[1].closed:
+                return entry[1]
+
+            connector = aiohttp.TCPConnector(
+                limit=pool_config.max_connections,
+                limit_per_host=pool_config.max_connections,
+                keepalive_timeout=pool_config.keepalive_expiry,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            cls._aiohttp_sessions[key] = (loop, session)
+            logger.debug(f"Created pooled HTTP session for {cls._origin(url)}")
+            return session
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close every pool owned by the running event loop."""
+        loop = asyncio.get_running_loop()
+        with cls._lock:
+            for k in [k for k, (lp, _) in cls._httpx_clients.items() if lp is loop]:
+                del cls._httpx_clients[k]
+            transport_keys = [k for k, (lp, _) in cls._httpx_transports.items() if lp is loop]
+            transports = [cls._httpx_transports.pop(k)[1] for k in transport_keys]
+            session_keys = [k for k, (lp, _) in cls._aiohttp_sessions.items() if lp is loop]
+            sessions = [cls._aiohttp_sessions.pop(k)[1] for k in session_keys]
+        # clients wrap the shared transports, closing the transports releases the connections
+        for transport in transports:
+            await transport.aclose()
+        for session in sessions:
+            await session.close()
+
+    @classmethod
+    def close(cls) -> None:
+        """Close the synchronous pools and forget every pool, e.g. at process shutdown."""
+        with cls._lock:
+            transports = [
+                t for (_, t) in cls._httpx_transports.values() if isinstance(t, httpx.HTTPTransport)
+            ]
+            cls._httpx_transports.clear()
+            cls._httpx_clients.clear()
+            cls._aiohttp_sessions.clear()
+        for transport in transports:
+            transport.close()
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Return the number of pools currently registered, for logging and tests."""
+        with cls._lock:
+            return {
+                "httpx_transports": len(cls._httpx_transports),
+                "httpx_clients": len(cls._httpx_clients),
+                "aiohttp_sessions": len(cls._aiohttp_sessions),
+            }
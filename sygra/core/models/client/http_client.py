@@ -2,12 +2,12 @@ import json
 from types import SimpleNamespace
 from typing import Any, Dict, List, Optional, Sequence
 
-import aiohttp
 import requests  # type: ignore[import-untyped]
 from langchain_core.messages import BaseMessage
 from pydantic import BaseModel, ConfigDict, Field
 
 from sygra.core.models.client.base_client import BaseClient
+from sygra.core.models.client.connection_pool import ConnectionPoolConfig, HttpConnectionPool
 from sygra.logger.logger_config import logger
 from sygra.utils import constants
 
@@ -28,6 +28,10 @@ class HttpClientConfig(BaseModel):
     json_payload: Optional[bool] = Field(
         default=False, description="Payload is sent as JSON data if true"
     )
+    connection_pool: ConnectionPoolConfig = Field(
+        default_factory=ConnectionPoolConfig,
+        description="Limits of the shared connection pool used for this endpoint",
+    )
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -65,6 +69,7 @@ class HttpClient(BaseClient):
         self.verify_cert = validated_config.ssl_cert
         self.stop = stop
         self.json_payload = validated_config.json_payload
+        self.connection_pool = validated_config.connection_pool
 
     def build_request(
         self,
@@ -159,7 +164,9 @@ class HttpClient(BaseClient):
         """
         Send an HTTP request to the API endpoint.
 
-        This method sends the actual request using aiohttp and returns the response text and status.
+        This method sends the actual request using the aiohttp session shared by all clients of
+        the same endpoint, so connections are kept alive across requests, and returns the response
+        text and status.
 
         Args:
             payload (Dict[str, Any]): The payload to send to the API.
@@ -191,18 +198,19 @@ class HttpClient(BaseClient):
                     "ssl": self.verify_ssl,
                 }
 
-            # Send request using aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.base_url, **inference_args) as resp:
-                    # Read the body text to ensure the content is consumed before returning
-                    body_text = await resp.text()
-                    # Return a lightweight object mirroring requests.Response essentials
-                    return SimpleNamespace(
-                        text=body_text,
-                        status=resp.status,
-                        status_code=resp.status,
-                        headers=dict(resp.headers),
-                    )
+            # Send request using the pooled aiohttp session for this endpoint
+            session = HttpConnectionPool.get_aiohttp_session(self.base_url, self.connection_pool)
+            async with session.post(self.base_url, **inference_args) as resp:
+                # Read the body text to ensure the content is consumed before returning
+                # and the connection is released back to the pool
+                body_text = await resp.text()
+                # Return a lightweight object mirroring requests.Response essentials
+                return SimpleNamespace(
+                    text=body_text,
+                    status=resp.status,
+                    status_code=resp.status,
+                    headers=dict(resp.headers),
+                )
         except Exception as e:
             logger.error(f"Error sending request: {e}")
             return ""
@@ -20,7 +20,7 @@ class AzureClientConfig(BaseModel):
         default=httpx.AsyncClient(http1=True), description="HTTP client to use"
     )
     default_headers: Dict[str, str] = Field(
-        default={"Connection": "close"}, description="Default headers for API requests"
+        default_factory=dict, description="Default headers for API requests"
     )
     timeout: int = Field(
         default=constants.DEFAULT_TIMEOUT, description="Request timeout in seconds"
@@ -6,7 +6,6 @@ import json
 import os
 import random
 import re
-import sys
 import time
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
@@ -26,19 +25,30 @@ from tenacity import (
     RetryError,
     retry_if_result,
     stop_after_attempt,
+    wait_fixed,
     wait_random_exponential,
 )
 from transformers import AutoTokenizer
 
 import sygra.utils.constants as constants
+from sygra.core.models.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from sygra.core.models.circuit_breaker import CircuitBreaker, CircuitOpenError
 from sygra.core.models.client.base_client import BaseClient
 from sygra.core.models.client.client_factory import ClientFactory
 from sygra.core.models.client.http_client import HttpClient
 from sygra.core.models.client.openai_client import OpenAIClient
+from sygra.core.models.load_balancer import Endpoint, LoadBalancer
 from sygra.core.models.model_response import ModelResponse
+from sygra.core.models.pricing import ModelPricing
+from sygra.core.models.rate_limiter import RateLimiter
+from sygra.core.models.response_cache import ResponseCache
 from sygra.core.models.structured_output.structured_output_config import StructuredOutputConfig
 from sygra.logger.logger_config import logger
-from sygra.metadata.metadata_integration import track_model_request
+from sygra.metadata.metadata_integration import (
+    set_request_usage,
+    track_model_request,
+    untracked_requests,
+)
 from sygra.utils import audio_utils, image_utils, utils
 from sygra.utils.model_utils import (
     is_gpt4o_audio_model,
@@ -60,8 +70,6 @@ class BaseCustomModel(ABC):
         self.model_config = model_config
         self.model_name: str = self.model_config.get("model", self.name())
         self._structured_output_lock: Optional[asyncio.Lock] = None
-        # Store last request token usage for metadata collection
-        self._last_request_usage: Optional[dict[str, int]] = None
 
         # Initialize structured output configuration
         structured_output_raw = model_config.get("structured_output")
@@ -74,7 +82,9 @@ class BaseCustomModel(ABC):
 
         self.structured_output = StructuredOutputConfig(self.structured_output_config, key_present)
 
-        # sleep before every call - in ms
+        # opt-in client-side quota of requests and tokens per minute, shared by all clients
+        self._rate_limiter: Optional[RateLimiter] = RateLimiter.from_model_config(model_config)
+        # minimum wait before a retry - in ms, added to the exponential backoff
         self.delay = model_config.get("delay", 100)
         # max_wait for 8 attempts = 2^(8-1) = 128 secs
         self.retry_attempts = model_config.get("retry_attempts", 8)
@@ -87,8 +97,22 @@ class BaseCustomModel(ABC):
         self.call_count = 0
         # track the number of requests per url for least_requests load balancing; see "_get_model_url"
         self.url_reqs_count: DefaultDict[str, int] = collections.defaultdict(int)
-        # store the timestamps to check if server is down
-        self.model_failed_response_timestamp: list[float] = []
+        # opt-in response cache, see "response_cache" in the model config
+        self._response_cache: Optional[ResponseCache] = ResponseCache.from_model_config(
+            model_config
+        )
+        # opt-in AIMD limit of concurrent requests, shared by all clients of this model
+        self._concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = (
+            AdaptiveConcurrencyLimiter.from_model_config(model_config)
+        )
+        # opt-in health- and latency-aware choice among several urls, shared by all clients
+        self._load_balancer: Optional[LoadBalancer] = LoadBalancer.from_model_config(
+            model_config, probe=self._probe_url
+        )
+        # token prices, from the "pricing" section of the model config or the pricing tables
+        self.pricing: Optional[ModelPricing] = ModelPricing.from_model_config(
+            model_config, self.model_name
+        )
         self._client: BaseClient
 
     def _set_client(self, url: str, auth_token: Optional[str] = None, async_client: bool = True):
@@ -145,7 +169,8 @@ class BaseCustomModel(ABC):
 
     def _extract_token_usage(self, response: Any) -> None:
         """
-        Extract and store token usage from API response for metadata collection.
+        Extract token usage from API response and attribute it to the current request, for
+        metadata collection and the returned ModelResponse.
         """
         # When usage stats are present in the response, extract from the response
         if hasattr(response, "usage") and response.usage:
@@ -155,7 +180,7 @@ class BaseCustomModel(ABC):
                 "total_tokens": getattr(response.usage, "total_tokens", 0),
             }
 
-            self._last_request_usage = usage_dict
+            set_request_usage(usage_dict)
 
         # When usage stats are not present in the response, try to extract from model_extra
         elif hasattr(response, "model_extra") and response.model_extra.get("usage"):
@@ -166,7 +191,7 @@ class BaseCustomModel(ABC):
                 "total_tokens": getattr(usage, "total_tokens", 0),
             }
 
-            self._last_request_usage = usage_dict
+            set_request_usage(usage_dict)
 
     def _set_chat_template(self):
         """
@@ -188,31 +213,109 @@ class BaseCustomModel(ABC):
             )
 
     async def __call__(self, input: ChatPromptValue, **kwargs: Any) -> Any:
-        # model_url = self._get_model_url()
-        model_params = self._get_model_params()
-        model_url = model_params.url
-
         # Handle structured output
         use_structured_output = (
             self.structured_output_config is not None and self.structured_output.enabled
         )
 
-        logger.debug(
-            f"[{self.name()}][{model_url}] REQUEST: {utils.convert_messages_from_langchain_to_chat_format(input.messages)}"
-        )
-        model_response: ModelResponse = await self._call_with_retry(
-            input, model_params, use_structured_output, **kwargs
-        )
+        # serve from the response cache before picking a url, so hits skip retries and metadata
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = self._get_cache_key(input, use_structured_output, **kwargs)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"[{self.name()}] Response served from cache")
+                ResponseCache.record_hit(self.model_name, self.model_config)
+                return ModelResponse.model_validate_json(cached)
+
+        limiter = self._concurrency_limiter
+        in_flight = await limiter.acquire() if limiter is not None else 0
+        start_time = time.time()
+        response_code: Optional[int] = None
+        endpoint: Optional[Endpoint] = None
+        breaker: Optional[CircuitBreaker] = None
+        trial = False
+        try:
+            # model_url = self._get_model_url()
+            if self._load_balancer is not None:
+                endpoint = self._load_balancer.acquire()
+                model_params = ModelParams(endpoint.url, endpoint.auth_token)
+            else:
+                model_params = self._get_model_params()
+            model_url = model_params.url
+
+            # raises CircuitOpenError, without sending the request, while the url is down
+            breaker = CircuitBreaker.for_endpoint(self.model_config, model_url)
+            try:
+                trial = breaker.before_request() if breaker is not None else False
+            except CircuitOpenError:
+                if self._load_balancer is None:
+                    self.url_reqs_count[model_url] -= 1
+                raise
+
+            logger.debug(
+                f"[{self.name()}][{model_url}] REQUEST: {utils.convert_messages_from_langchain_to_chat_format(input.messages)}"
+            )
+            model_response: ModelResponse = await self._call_with_retry(
+                input, model_params, use_structured_output, **kwargs
+            )
+            response_code = model_response.response_code
+        finally:
+            if limiter is not None:
+                limiter.release(in_flight, time.time() - start_time, response_code)
+            if endpoint is not None and self._load_balancer is not None:
+                self._load_balancer.release(endpoint, time.time() - start_time, response_code)
+            if breaker is not None:
+                self._handle_server_down(breaker, response_code, trial)
 
         # Apply common finalization logic
-        return self._finalize_response(model_response, model_url)
+        model_response = self._finalize_response(model_response, model_url)
+        if cache_key is not None and model_response.response_code == 200:
+            self._store_in_cache(cache_key, model_response)
+        return model_response
+
+    def _get_cache_key(
+        self, input: ChatPromptValue, use_structured_output: bool, **kwargs: Any
+    ) -> str:
+        """Build the response cache key from the normalised request."""
+        try:
+            messages: list[Any] = [_convert_message_to_dict(m) for m in input.messages]
+        except Exception:
+            messages = [m.model_dump() for m in input.messages]
+        return ResponseCache.build_key(
+            {
+                "model": self.name(),
+                "model_name": self.model_name,
+                "model_type": self.model_type(),
+                "generation_params": self.generation_params,
+                # the pydantic model is serialized as its JSON schema
+                "structured_output": (
+                    self.structured_output.get_pydantic_model() if use_structured_output else None
+                ),
+                "completions_api": self.model_config.get("completions_api", False),
+                "post_process": self.model_config.get("post_process"),
+                "messages": messages,
+                "kwargs": kwargs,
+            }
+        )
+
+    def _store_in_cache(self, cache_key: str, model_response: ModelResponse) -> None:
+        if self._response_cache is None:
+            return
+        try:
+            # the usage belongs to the request that produced the response, not to cache hits
+            self._response_cache.set(
+                cache_key, model_response.model_dump_json(exclude={"token_usage"})
+            )
+        except Exception as e:
+            logger.warning(f"[{self.name()}] Response could not be cached: {e}")
 
     def _finalize_response(self, model_response: ModelResponse, model_url: str) -> ModelResponse:
         """Common response finalization logic"""
         self._update_model_stats(model_response.llm_response, model_response.response_code)
-        self._handle_server_down(model_response.response_code)
-        # reduce the count of requests for the url to handle least_requests load balancing
-        self.url_reqs_count[model_url] -= 1
+        if self._load_balancer is None:
+            # reduce the count of requests for the url to handle least_requests load balancing
+            self.url_reqs_count[model_url] -= 1
         logger.debug(f"[{self.name()}][{model_url}] RESPONSE: {model_response.llm_response}")
         model_response.llm_response = self._replace_special_tokens(model_response.llm_response)
         model_response.llm_response = self._post_process_for_model(model_response.llm_response)
@@ -308,6 +411,7 @@ class BaseCustomModel(ABC):
                 llm_response=parsed_output.model_dump_json(),
                 response_code=200,
                 tool_calls=model_response.tool_calls,
+                token_usage=model_response.token_usage,
             )
         except Exception as e:
             logger.warning(f"[{self.name()}] Failed to parse structured output: {e}")
@@ -479,6 +583,17 @@ class BaseCustomModel(ABC):
                 model_response = loop.run_until_complete(self._generate_response(msg, model_param))
         return model_response.response_code
 
+    async def _probe_url(self, url: str, auth_token: str) -> int:
+        """Health probe of one url for the load balancer: the ping message, returns the http code
+
+        Probes are not model requests of the run, they are not recorded in the metadata.
+        """
+        msg = utils.backend_factory.get_test_message(model_config=self.model_config)
+        model_params = ModelParams(url=url, auth_token=auth_token)
+        with untracked_requests():
+            model_response: ModelResponse = await self._generate_response(msg, model_params)
+        return model_response.response_code
+
     def ping(self) -> int:
         """
         Ping the model with a hello message and return http code
@@ -582,16 +697,22 @@ class BaseCustomModel(ABC):
         result: ModelResponse = ModelResponse(
             llm_response=f"{constants.ERROR_PREFIX} All retry attempts failed", response_code=999
         )
+        tokens = (
+            RateLimiter.estimate_tokens(input.messages, self.generation_params)
+            if self._rate_limiter is not None
+            else 0
+        )
         try:
             async for attempt in AsyncRetrying(
                 retry=retry_if_result(self._is_retryable_error),
-                wait=wait_random_exponential(multiplier=1),
+                wait=wait_fixed(self.delay / 1000) + wait_random_exponential(multiplier=1),
                 stop=stop_after_attempt(self.retry_attempts),
                 before_sleep=self._log_before_retry,
             ):
                 with attempt:
-                    # initial delay for each call (in ms)
-                    await asyncio.sleep(self.delay / 1000)
+                    # pace the calls only when the model has a rate limit
+                    if self._rate_limiter is not None:
+                        await self._rate_limiter.acquire(tokens)
 
                     # Call the appropriate method based on the flag
                     if use_structured_output:
@@ -612,6 +733,9 @@ class BaseCustomModel(ABC):
                         # Regular text generation
                         result = await self._generate_response(input, model_params, **kwargs)
 
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.settle(tokens, result.token_usage)
+
                     # Apply post-processing if defined
                     post_proc = self._get_post_processor()
                     if post_proc is not None:
@@ -648,42 +772,25 @@ class BaseCustomModel(ABC):
         post_proc = self.model_config.get("post_process")
         return utils.get_func_from_str(post_proc) if post_proc else None
 
-    def _handle_server_down(self, resp_status: int):
+    def _handle_server_down(
+        self, breaker: CircuitBreaker, resp_status: Optional[int], trial: bool
+    ) -> None:
         """
-        When the server is down, we check if we receive server down status(404, 500-503)
-        if the failure count is 10(MAX_FAILED_ERROR) within 30(MODEL_FAILURE_WINDOW_IN_SEC) seconds
-        shutdown the process, we need to fix the model first
+        Record the outcome of a request on the circuit breaker of its url.
+
+        Repeated server down statuses (404, 500-503) open the circuit of the url instead of
+        stopping the process: requests to it raise CircuitOpenError until a trial request
+        succeeds, and the dataset processor parks their records meanwhile.
         """
-        if not constants.HANDLE_SERVER_DOWN:
-            # no need to handle this, user has disabled the feature
-            return
-        if resp_status in constants.SERVER_DOWN_ERROR_CODE:
-            # append the current timestamp for this error
-            self.model_failed_response_timestamp.append(time.time())
-            # if storage is full, pop the first in
-            if len(self.model_failed_response_timestamp) > constants.MAX_FAILED_ERROR:
-                self.model_failed_response_timestamp.pop(0)
-
-            total_in_queue = len(self.model_failed_response_timestamp)
-            # if total count is more than maximum error to handle, than only do the validation
-            if total_in_queue >= constants.MAX_FAILED_ERROR:
-                # when MAX_FAILED_ERROR = 10
-                # if 100 in total, check time diff of 91st(old) and 100th(new)
-                # if 10 in total, check time diff of 1st(old) and 10th(new)
-                oldest_timestamp = self.model_failed_response_timestamp[
-                    total_in_queue - constants.MAX_FAILED_ERROR
-                ]
-                newest_timestamp = self.model_failed_response_timestamp[total_in_queue - 1]
-                time_gap_in_sec = newest_timestamp - oldest_timestamp
-                logger.warning(
-                    f"Server failure count: {constants.MAX_FAILED_ERROR} in {time_gap_in_sec} seconds."
-                )
-                # last n(MAX_FAILED_ERROR) failures within t(MODEL_FAILURE_WINDOW_IN_SEC) seconds
-                if time_gap_in_sec < constants.MODEL_FAILURE_WINDOW_IN_SEC:
-                    logger.error(
-                        f"SYSTEM EXITING as the dependant model({self.name()}) is down for longer period."
-                    )
-                    sys.exit()
+        if (
+            not trial
+            and resp_status in constants.SERVER_DOWN_ERROR_CODE
+            and self._load_balancer is not None
+            and self._load_balancer.has_available_endpoint()
+        ):
+            # the failing url is ejected by the load balancer while the other urls keep serving
+            resp_status = None
+        breaker.after_request(resp_status, trial)
 
     def _get_status_from_body(self, response: Any) -> Optional[int]:
         """
@@ -928,11 +1035,13 @@ class CustomTGI(BaseCustomModel):
             total_tokens = prompt_tokens + completion_tokens
 
             # Store in the standard format
-            self._last_request_usage = {
-                "prompt_tokens": prompt_tokens,
-                "completion_tokens": completion_tokens,
-                "total_tokens": total_tokens,
-            }
+            set_request_usage(
+                {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": total_tokens,
+                }
+            )
 
             logger.debug(
                 f"[{self.name()}] Extracted token usage from TGI: "
@@ -1210,8 +1319,8 @@ class CustomVLLM(BaseCustomModel):
         model_url = model_params.url
         tool_calls = None
         try:
-            # create vllm client for every request otherwise it starts failing set header to close connection
-            # otherwise spurious event loop errors show up -
+            # the client wrapper is cheap; connections come from the shared pool of this endpoint,
+            # which is scoped per event loop to avoid spurious event loop errors -
             # https://github.com/encode/httpx/discussions/2959#discussioncomment-7665278
             self._set_client(model_url, model_params.auth_token)
             if self.model_config.get("completions_api", False):
@@ -1396,8 +1505,9 @@ class CustomOpenAI(BaseCustomModel):
         model_url = model_params.url
         tool_calls = None
         try:
-            # create azure openai client for every request otherwise it starts failing
-            # set header to close connection otherwise spurious event loop errors show up - https://github.com/encode/httpx/discussions/2959#discussioncomment-7665278
+            # the client wrapper is cheap; connections come from the shared pool of this endpoint,
+            # which is scoped per event loop to avoid spurious event loop errors -
+            # https://github.com/encode/httpx/discussions/2959#discussioncomment-7665278
             self._set_client(model_url, model_params.auth_token)
             if self.model_config.get("completions_api", False):
                 formatted_prompt = self.get_chat_formatted_text(
@@ -2173,12 +2283,14 @@ class CustomOllama(BaseCustomModel):
             if isinstance(completion, dict) and (
                 "prompt_eval_count" in completion or "eval_count" in completion
             ):
-                self._last_request_usage = {
-                    "prompt_tokens": completion.get("prompt_eval_count", 0),
-                    "completion_tokens": completion.get("eval_count", 0),
-                    "total_tokens": completion.get("prompt_eval_count", 0)
-                    + completion.get("eval_count", 0),
-                }
+                set_request_usage(
+                    {
+                        "prompt_tokens": completion.get("prompt_eval_count", 0),
+                        "completion_tokens": completion.get("eval_count", 0),
+                        "total_tokens": completion.get("prompt_eval_count", 0)
+                        + completion.get("eval_count", 0),
+                    }
+                )
 
             if self.model_config.get("completions_api", False):
                 resp_text = completion["response"]
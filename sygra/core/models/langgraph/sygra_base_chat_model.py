@@ -1,9 +1,7 @@
-import asyncio
 import collections
 import json
 import os
 import random
-import sys
 import time
 from abc import abstractmethod
 from typing import Any, Callable, DefaultDict, Dict, List, Literal, Optional, Sequence, Tuple, Union
@@ -28,13 +26,19 @@ from tenacity import (
     Retrying,
     retry_if_result,
     stop_after_attempt,
+    wait_fixed,
     wait_random_exponential,
 )
 from transformers import AutoTokenizer
 
+from sygra.core.models.adaptive_concurrency import AdaptiveConcurrencyLimiter
+from sygra.core.models.circuit_breaker import CircuitBreaker, CircuitOpenError
 from sygra.core.models.client.base_client import BaseClient
 from sygra.core.models.client.client_factory import ClientFactory
 from sygra.core.models.custom_models import ModelParams
+from sygra.core.models.load_balancer import Endpoint, LoadBalancer
+from sygra.core.models.rate_limiter import RateLimiter
+from sygra.core.models.response_cache import ResponseCache
 from sygra.logger.logger_config import logger
 from sygra.utils import constants, utils
 
@@ -56,7 +60,9 @@ class SygraBaseChatModel(BaseChatModel):
         super().__init__()
         utils.validate_required_keys(["name", "parameters"], model_config, "model")
         self._config = model_config
-        # sleep before every call - in ms
+        # opt-in client-side quota of requests and tokens per minute, shared by all clients
+        self._rate_limiter: Optional[RateLimiter] = RateLimiter.from_model_config(model_config)
+        # minimum wait before a retry - in ms, added to the exponential backoff
         self._delay = model_config.get("delay", 100)
         # max_wait for 8 attempts = 2^(8-1) = 128 secs
         self._retry_attempts = model_config.get("retry_attempts", 8)
@@ -74,11 +80,21 @@ class SygraBaseChatModel(BaseChatModel):
         self._call_count = 0
         # track the number of requests per url for least_requests load balancing; see "_get_model_url"
         self._url_reqs_count: DefaultDict[str, int] = collections.defaultdict(int)
-        # store the timestamps to check if server is down
-        self._model_failed_response_timestamp: list[float] = []
         if self._get_name() in constants.COMPLETION_ONLY_MODELS:
             self._config["completions_api"] = True
         self._validate_completions_api_support()
+        # opt-in response cache, see "response_cache" in the model config
+        self._response_cache: Optional[ResponseCache] = ResponseCache.from_model_config(
+            model_config
+        )
+        # opt-in AIMD limit of concurrent requests, shared by all clients of this model
+        self._concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = (
+            AdaptiveConcurrencyLimiter.from_model_config(model_config)
+        )
+        # opt-in health- and latency-aware choice among several urls, shared by all clients
+        self._load_balancer: Optional[LoadBalancer] = LoadBalancer.from_model_config(
+            model_config, probe=self._probe_url
+        )
         self._client: BaseClient
 
     def _validate_completions_api_support(self) -> None:
@@ -126,22 +142,27 @@ class SygraBaseChatModel(BaseChatModel):
                 f"Environment variable {env_var} not set, but override_tokenizer is True."
             )
 
-    def _get_model_params(self) -> ModelParams:
+    def _get_model_params(self, endpoint: Optional[Endpoint] = None) -> ModelParams:
         """
         Get the model parameters.
 
         Returns the model parameters based on the `url` and `auth_token` configuration.
+        If an endpoint was chosen by the load balancer, it returns its url and auth token.
         If `url` is a string, it returns it directly. If `url` is a list, it implements
         load balancing based on the `load_balancing` configuration. If it is "round_robin",
         it returns the model parameters for the current index in the list. If it is "least_requests",
         it returns the model parameters for the URL with the least number of requests so far.
 
         Args:
-            None
+            endpoint (Optional[Endpoint]): Endpoint chosen by the load balancer, if any.
 
         Returns:
             ModelParams: The model parameters.
         """
+        if endpoint is not None:
+            self._call_count += 1
+            return ModelParams(endpoint.url, endpoint.auth_token)
+
         url = self._config["url"]
         auth_token = self._config["auth_token"]
 
@@ -181,6 +202,50 @@ class SygraBaseChatModel(BaseChatModel):
         self._call_count += 1
         return ModelParams(return_url, return_auth_token)
 
+    def _acquire_endpoint(self) -> Optional[Endpoint]:
+        """
+        Choose the url of a request with the load balancer, if the model has one.
+
+        Returns:
+            Optional[Endpoint]: The chosen endpoint, None without load balancer.
+        """
+        if self._load_balancer is None:
+            return None
+        return self._load_balancer.acquire()
+
+    def _release_endpoint(
+        self, endpoint: Optional[Endpoint], latency: float, response_code: Optional[int]
+    ) -> None:
+        """
+        Record the outcome of a request on the url chosen by the load balancer.
+
+        Args:
+            endpoint (Optional[Endpoint]): Endpoint of the request, None without load balancer.
+            latency (float): Latency of the request in seconds.
+            response_code (Optional[int]): Response code, None if the request raised an exception.
+
+        Returns:
+            None
+        """
+        if endpoint is not None and self._load_balancer is not None:
+            self._load_balancer.release(endpoint, latency, response_code)
+
+    async def _probe_url(self, url: str, auth_token: str) -> int:
+        """
+        Health probe of one url for the load balancer, with a hello message.
+
+        Args:
+            url (str): The url to probe.
+            auth_token (str): The auth token of the url.
+
+        Returns:
+            int: The http status code.
+        """
+        _, response_code = await self._generate_response(
+            [HumanMessage(content="hello")], ModelParams(url, auth_token)
+        )
+        return response_code
+
     def _update_model_stats(
         self, response: Union[Completion, ChatCompletion], resp_status: int
     ) -> None:
@@ -228,50 +293,61 @@ class SygraBaseChatModel(BaseChatModel):
 
             logger.info(f"[{self._get_name()}] Model Stats: {temp_model_stats}")
 
-    def _handle_server_down(self, resp_status: int):
+    def _check_circuit(
+        self, model_url: str, endpoint: Optional[Endpoint]
+    ) -> Tuple[Optional[CircuitBreaker], bool]:
+        """
+        Check the circuit breaker of a url before sending a request to it.
+
+        Args:
+            model_url (str): The url of the request.
+            endpoint (Optional[Endpoint]): Endpoint chosen by the load balancer, if any.
+
+        Returns:
+            Tuple[Optional[CircuitBreaker], bool]: The circuit breaker of the url, None if server
+            down handling is disabled, and whether the request is a trial request.
+
+        Raises:
+            CircuitOpenError: The circuit of the url is open, the request must not be sent.
+        """
+        breaker = CircuitBreaker.for_endpoint(self._config, model_url)
+        if breaker is None:
+            return None, False
+        try:
+            return breaker, breaker.before_request()
+        except CircuitOpenError:
+            if endpoint is None:
+                self._url_reqs_count[model_url] -= 1
+            raise
+
+    def _handle_server_down(
+        self, breaker: CircuitBreaker, resp_status: Optional[int], trial: bool
+    ) -> None:
         """
         Handle server down situation.
 
-        If the server is down, we check if we receive server down status(404, 500-503)
-        if the failure count is 10(MAX_FAILED_ERROR) within 30(MODEL_FAILURE_WINDOW_IN_SEC) seconds
-        shutdown the process, we need to fix the model first
+        Records the outcome of a request on the circuit breaker of its url. Repeated server down
+        statuses (404, 500-503) open the circuit of the url instead of stopping the process:
+        requests to it raise CircuitOpenError until a trial request succeeds, and the dataset
+        processor parks their records meanwhile.
 
         Args:
-            resp_status (int): The status code of the response.
+            breaker (CircuitBreaker): The circuit breaker of the url of the request.
+            resp_status (Optional[int]): The status code of the response, None on an exception.
+            trial (bool): Whether the request was a trial request of a half-open circuit.
 
         Returns:
             None
         """
-        if not constants.HANDLE_SERVER_DOWN:
-            # no need to handle this, user has disabled the feature
-            return
-        if resp_status in constants.SERVER_DOWN_ERROR_CODE:
-            # append the current timestamp for this error
-            self._model_failed_response_timestamp.append(time.time())
-            # if storage is full, pop the first in
-            if len(self._model_failed_response_timestamp) > constants.MAX_FAILED_ERROR:
-                self._model_failed_response_timestamp.pop(0)
-
-            total_in_queue = len(self._model_failed_response_timestamp)
-            # if total count is more than maximum error to handle, than only do the validation
-            if total_in_queue >= constants.MAX_FAILED_ERROR:
-                # when MAX_FAILED_ERROR = 10
-                # if 100 in total, check time diff of 91st(old) and 100th(new)
-                # if 10 in total, check time diff of 1st(old) and 10th(new)
-                oldest_timestamp = self._model_failed_response_timestamp[
-                    total_in_queue - constants.MAX_FAILED_ERROR
-                ]
-                newest_timestamp = self._model_failed_response_timestamp[total_in_queue - 1]
-                time_gap_in_sec = newest_timestamp - oldest_timestamp
-                logger.warning(
-                    f"Server failure count: {constants.MAX_FAILED_ERROR} in {time_gap_in_sec} seconds."
-                )
-                # last n(MAX_FAILED_ERROR) failures within t(MODEL_FAILURE_WINDOW_IN_SEC) seconds
-                if time_gap_in_sec < constants.MODEL_FAILURE_WINDOW_IN_SEC:
-                    logger.error(
-                        f"SYSTEM EXITING as the dependant model({self._get_name()}) is down for longer period."
-                    )
-                    sys.exit()
+        if (
+            not trial
+            and resp_status in constants.SERVER_DOWN_ERROR_CODE
+            and self._load_balancer is not None
+            and self._load_balancer.has_available_endpoint()
+        ):
+            # the failing url is ejected by the load balancer while the other urls keep serving
+            resp_status = None
+        breaker.after_request(resp_status, trial)
 
     def _is_retryable_error(self, result: tuple[Any, int]) -> bool:
         """
@@ -407,16 +483,18 @@ class SygraBaseChatModel(BaseChatModel):
         :return: The response text and status code
         """
         result = None
+        tokens = self._estimate_tokens(messages)
         try:
             async for attempt in AsyncRetrying(
                 retry=retry_if_result(self._is_retryable_error),
-                wait=wait_random_exponential(multiplier=1),
+                wait=wait_fixed(self._delay / 1000) + wait_random_exponential(multiplier=1),
                 stop=stop_after_attempt(self._retry_attempts),
                 before_sleep=self._log_before_retry,
             ):  # Configure retry logic
                 with attempt:
-                    # Initial delay
-                    await asyncio.sleep(self._delay / 1000)
+                    # pace the calls only when the model has a rate limit
+                    if self._rate_limiter is not None:
+                        await self._rate_limiter.acquire(tokens)
                     response, response_code = await self._generate_response(
                         messages, model_params, async_client, **kwargs
                     )
@@ -450,16 +528,18 @@ class SygraBaseChatModel(BaseChatModel):
         :return: The response text and status code
         """
         result = None
+        tokens = self._estimate_tokens(messages)
         try:
             for attempt in Retrying(
                 retry=retry_if_result(self._is_retryable_error),
-                wait=wait_random_exponential(multiplier=1),
+                wait=wait_fixed(self._delay / 1000) + wait_random_exponential(multiplier=1),
                 stop=stop_after_attempt(self._retry_attempts),
                 before_sleep=self._log_before_retry,
             ):  # Configure retry logic
                 with attempt:
-                    # Initial delay
-                    time.sleep(self._delay / 1000)
+                    # pace the calls only when the model has a rate limit
+                    if self._rate_limiter is not None:
+                        self._rate_limiter.acquire_sync(tokens)
                     response, response_code = self._sync_generate_response(
                         messages, model_params, async_client, **kwargs
                     )
@@ -474,6 +554,12 @@ class SygraBaseChatModel(BaseChatModel):
 
         return result
 
+    def _estimate_tokens(self, messages: List[BaseMessage]) -> int:
+        """Estimated tokens of a request for the rate limit, 0 when the model has none."""
+        if self._rate_limiter is None:
+            return 0
+        return RateLimiter.estimate_tokens(messages, self._generation_params)
+
     @abstractmethod
     async def _generate_response(
         self,
@@ -543,19 +629,41 @@ class SygraBaseChatModel(BaseChatModel):
             ChatResult: The generated chat result
         """
         generation_info = None
-        model_params = self._get_model_params()
-        model_url = model_params.url
-        logger.debug(
-            f"[{self._get_name()}][{model_url}] REQUEST: {[_convert_message_to_dict(m) for m in messages]}"
-        )
+        cache_key = self._get_cache_key(messages, stop, **kwargs)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return await run_in_executor(None, self._create_chat_result, cached, generation_info)
+
+        limiter = self._concurrency_limiter
+        in_flight = await limiter.acquire() if limiter is not None else 0
+        start_time = time.time()
+        outcome_code: Optional[int] = None
+        endpoint = self._acquire_endpoint()
+        breaker: Optional[CircuitBreaker] = None
+        trial = False
+        try:
+            model_params = self._get_model_params(endpoint)
+            model_url = model_params.url
+            breaker, trial = self._check_circuit(model_url, endpoint)
+            logger.debug(
+                f"[{self._get_name()}][{model_url}] REQUEST: {[_convert_message_to_dict(m) for m in messages]}"
+            )
 
-        response, response_code = await self._generate_response_with_retry(
-            messages, model_params, **kwargs
-        )
+            response, response_code = await self._generate_response_with_retry(
+                messages, model_params, **kwargs
+            )
+            outcome_code = response_code
+        finally:
+            if limiter is not None:
+                limiter.release(in_flight, time.time() - start_time, outcome_code)
+            self._release_endpoint(endpoint, time.time() - start_time, outcome_code)
+            if breaker is not None:
+                self._handle_server_down(breaker, outcome_code, trial)
         self._update_model_stats(response, response_code)
-        self._handle_server_down(response_code)
-        # reduce the count of requests for the url to handle least_requests load balancing
-        self._url_reqs_count[model_url] -= 1
+        if endpoint is None:
+            # reduce the count of requests for the url to handle least_requests load balancing
+            self._url_reqs_count[model_url] -= 1
+        self._store_in_cache(cache_key, response, response_code)
         return await run_in_executor(None, self._create_chat_result, response, generation_info)
 
     def _generate(
@@ -578,21 +686,79 @@ class SygraBaseChatModel(BaseChatModel):
             ChatResult: The response text and status code
         """
         generation_info = None
-        model_params = self._get_model_params()
-        model_url = model_params.url
-        logger.debug(
-            f"[{self._get_name()}][{model_url}] REQUEST: {[_convert_message_to_dict(m) for m in messages]}"
-        )
+        cache_key = self._get_cache_key(messages, stop, **kwargs)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return self._create_chat_result(cached, generation_info)
+
+        endpoint = self._acquire_endpoint()
+        start_time = time.time()
+        response_code: Optional[int] = None
+        breaker: Optional[CircuitBreaker] = None
+        trial = False
+        try:
+            model_params = self._get_model_params(endpoint)
+            model_url = model_params.url
+            breaker, trial = self._check_circuit(model_url, endpoint)
+            logger.debug(
+                f"[{self._get_name()}][{model_url}] REQUEST: {[_convert_message_to_dict(m) for m in messages]}"
+            )
 
-        response, response_code = self._sync_generate_response_with_retry(
-            messages=messages, model_params=model_params, async_client=False, **kwargs
-        )
+            response, response_code = self._sync_generate_response_with_retry(
+                messages=messages, model_params=model_params, async_client=False, **kwargs
+            )
+        finally:
+            self._release_endpoint(endpoint, time.time() - start_time, response_code)
+            if breaker is not None:
+                self._handle_server_down(breaker, response_code, trial)
         self._update_model_stats(response, response_code)
-        self._handle_server_down(response_code)
-        # reduce the count of requests for the url to handle least_requests load balancing
-        self._url_reqs_count[model_url] -= 1
+        if endpoint is None:
+            # reduce the count of requests for the url to handle least_requests load balancing
+            self._url_reqs_count[model_url] -= 1
+        self._store_in_cache(cache_key, response, response_code)
         return self._create_chat_result(response, generation_info)
 
+    def _get_cache_key(
+        self, messages: List[BaseMessage], stop: Optional[List[str]], **kwargs: Any
+    ) -> Optional[str]:
+        """Build the response cache key from the normalised request, None if caching is off."""
+        if self._response_cache is None:
+            return None
+        return ResponseCache.build_key(
+            {
+                "model": self._get_name(),
+                "model_type": self._llm_type,
+                "generation_params": self._generation_params,
+                "post_process": self._config.get("post_process"),
+                "messages": [_convert_message_to_dict(m) for m in messages],
+                "stop": stop,
+                "kwargs": kwargs,
+            }
+        )
+
+    def _get_cached_response(self, cache_key: Optional[str]) -> Optional[ChatCompletion]:
+        """Return the cached chat completion for the key and record the hit, if any."""
+        if self._response_cache is None or cache_key is None:
+            return None
+        cached = self._response_cache.get(cache_key)
+        if cached is None:
+            return None
+        try:
+            response = ChatCompletion.model_validate_json(cached)
+        except Exception as e:
+            logger.warning(f"[{self._get_name()}] Ignoring unreadable cache entry: {e}")
+            return None
+        logger.debug(f"[{self._get_name()}] Response served from cache")
+        ResponseCache.record_hit(self._get_name(), self._config)
+        return response
+
+    def _store_in_cache(self, cache_key: Optional[str], response: Any, response_code: int) -> None:
+        if self._response_cache is None or cache_key is None:
+            return
+        if response_code != 200 or not isinstance(response, ChatCompletion):
+            return
+        self._response_cache.set(cache_key, response.model_dump_json())
+
     def _invoke_post_process(self, response: ChatCompletion) -> ChatCompletion:
         post_proc = self._get_post_processor()
         # if post_process is defined at models.yaml, process the output text
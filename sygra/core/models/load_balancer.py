@@ -0,0 +1,374 @@
+import asyncio
+import random
+import statistics
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from sygra.logger.logger_config import logger
+from sygra.utils import constants
+from sygra.utils.config_registry import ConfigRegistry
+
+# sends a health probe to a url with its auth token, returns the response code
+ProbeFunction = Callable[[str, str], Awaitable[int]]
+
+LOAD_BALANCING_STRATEGIES = ("round_robin", "least_requests", "power_of_two_choices")
+
+
+class LoadBalancerConfig(BaseModel):
+    """Configuration model for the health-aware load balancer of a model with several urls"""
+
+    enabled: bool = Field(default=False, description="Track the health of every url")
+    latency_alpha: float = Field(
+        default=0.3, gt=0, le=1, description="Smoothing of the latency and error rate averages"
+    )
+    consecutive_failures: int = Field(
+        default=5, ge=1, description="Eject a url after this many failures in a row"
+    )
+    max_error_rate: float = Field(
+        default=0.5, gt=0, le=1, description="Eject a url when its average error rate exceeds this"
+    )
+    latency_outlier_factor: Optional[float] = Field(
+        default=3.0,
+        gt=1,
+        description="Eject a url when its average latency exceeds the median of the other urls "
+        "by this factor, None to never eject slow urls",
+    )
+    min_requests: int = Field(
+        default=10, ge=1, description="Requests to a url before its error rate or latency counts"
+    )
+    base_ejection_time: float = Field(
+        default=30.0, gt=0, description="Ejection time in seconds, multiplied by the ejections"
+    )
+    max_ejection_time: float = Field(default=300.0, gt=0, description="Longest ejection")
+    max_ejection_percent: int = Field(
+        default=50, ge=0, le=100, description="Most urls ejected at the same time, in percent"
+    )
+    probe_interval: Optional[float] = Field(
+        default=None, gt=0, description="Seconds between active health probes, None to disable"
+    )
+
+    model_config = ConfigDict(extra="ignore")
+
+    @classmethod
+    def from_model_config(cls, model_config: Dict[str, Any]) -> "LoadBalancerConfig":
+        """
+        Build the load balancer configuration from the `load_balancer` section of a model config,
+        on top of the defaults in configuration.yaml.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            LoadBalancerConfig for the model
+        """
+        defaults = (
+            ConfigRegistry.load_yaml(constants.SYGRA_CONFIG)
+            .get("model_config", {})
+            .get("load_balancer")
+        )
+        return cls(**{**(defaults or {}), **(model_config.get("load_balancer") or {})})
+
+
+class Endpoint:
+    """Health of one url of a model, as observed from its responses."""
+
+    def __init__(self, url: str, auth_token: str):
+        self.url = url
+        self.auth_token = auth_token
+        self.in_flight = 0
+        self.requests = 0
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.consecutive_successes = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.last_probe = 0.0
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def score(self, default_latency: float) -> tuple[float, int]:
+        """
+        Expected wait on this url, lower is better, with the in flight requests to break ties.
+        Urls without latency yet are scored with the average latency of the other urls.
+        """
+        latency = self.latency if self.latency is not None else default_latency
+        return (self.in_flight + 1) * latency / max(1.0 - self.error_rate, 0.1), self.in_flight
+
+
+class LoadBalancer:
+    """
+    Health- and latency-aware choice of the url of a model with several urls.
+
+    Every response updates the health of its url: an average latency of the successful requests
+    and an average error rate, both exponentially weighted, and the number of failures in a row.
+    A url is ejected (outlier detection) when it fails `consecutive_failures` times in a row,
+    when its error rate exceeds `max_error_rate`, or when its latency exceeds the median latency
+    of the other urls by `latency_outlier_factor`. Ejected urls receive no requests for
+    `base_ejection_time` times the number of their ejections, up to `max_ejection_time`, and are
+    then re-admitted with a fresh history. At most `max_ejection_percent` of the urls are ejected
+    at the same time, and when every url is ejected the one re-admitted first is still used.
+
+    Requests go to the available urls in turn (`round_robin`), to the url with the fewest
+    requests in flight (`least_requests`), or to the better of two random urls, scored on their
+    requests in flight, latency and error rate (`power_of_two_choices`).
+
+    With `probe_interval`, the `probe` function is called on every url at that interval, from
+    the event loop of the requests. A successful probe re-admits an ejected url early and a failed
+    one counts as a failure.
+
+    Load balancers are shared process-wide per model name.
+
+    Args:
+        name: Model name
+        urls: Urls of the model
+        auth_tokens: Auth token of every url, or one token for all of them
+        strategy: round_robin, least_requests or power_of_two_choices
+        config: Load balancer configuration
+        probe: Function sending a health probe, needed for active health probes
+    """
+
+    _lock = threading.Lock()
+    _balancers: Dict[str, "LoadBalancer"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        urls: List[str],
+        auth_tokens: Any,
+        strategy: str,
+        config: LoadBalancerConfig,
+        probe: Optional[ProbeFunction] = None,
+    ):
+        if strategy not in LOAD_BALANCING_STRATEGIES:
+            raise ValueError(
+                f"Invalid load balancing type: {strategy}. Supported types are "
+                f"{', '.join(LOAD_BALANCING_STRATEGIES)}"
+            )
+        self.name = name
+        self.strategy = strategy
+        self.config = config
+        self.endpoints = [
+            Endpoint(url, auth_tokens[i] if isinstance(auth_tokens, list) else auth_tokens)
+            for i, url in enumerate(urls)
+        ]
+        self._probe = probe
+        self._probes: set[asyncio.Task] = set()
+        self._next = 0
+        self._endpoint_lock = threading.Lock()
+
+    @classmethod
+    def from_model_config(
+        cls, model_config: Dict[str, Any], probe: Optional[ProbeFunction] = None
+    ) -> Optional["LoadBalancer"]:
+        """
+        Get the shared load balancer of a model, or None if the model has a single url or the load
+        balancer is disabled. It is enabled by `load_balancer.enabled` or by the
+        `power_of_two_choices` load balancing type.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+            probe: Function sending a health probe, needed for active health probes
+
+        Returns:
+            LoadBalancer for the model, None when not used
+        """
+        urls = model_config.get("url")
+        if not isinstance(urls, list) or len(urls) < 2:
+            return None
+        strategy = model_config.get("load_balancing", "least_requests")
+        config = LoadBalancerConfig.from_model_config(model_config)
+        if not config.enabled and strategy != "power_of_two_choices":
+            return None
+        name = model_config.get("name", "")
+        with cls._lock:
+            balancer = cls._balancers.get(name)
+            if balancer is None:
+                balancer = cls(
+                    name,
+                    urls,
+                    model_config.get("auth_token", ""),
+                    strategy,
+                    config.model_copy(),
+                    probe,
+                )
+                balancer.config.enabled = True
+                cls._balancers[name] = balancer
+            elif balancer._probe is None:
+                balancer._probe = probe
+            return balancer
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget every load balancer."""
+        with cls._lock:
+            cls._balancers.clear()
+
+    def acquire(self) -> Endpoint:
+        """
+        Choose the url of a request and count the request in flight on it.
+
+        Returns:
+            Endpoint to send the request to, to be passed to release once it completes
+        """
+        now = time.time()
+        with self._endpoint_lock:
+            available = [e for e in self.endpoints if not self._readmit(e, now)]
+            if not available:
+                # every url is ejected, use the one coming back first rather than none
+                available = [min(self.endpoints, key=lambda e: e.ejected_until)]
+            endpoint = self._choose(available)
+            endpoint.in_flight += 1
+        self._schedule_probes(now)
+        return endpoint
+
+    def release(self, endpoint: Endpoint, latency: float, response_code: Optional[int]) -> None:
+        """
+        Record the outcome of a request on its url.
+
+        Args:
+            endpoint: Endpoint of the request, as returned by acquire
+            latency: Latency of the request in seconds
+            response_code: Response code of the request, None if it raised an exception
+        """
+        with self._endpoint_lock:
+            endpoint.in_flight -= 1
+            self._record(endpoint, latency, response_code)
+
+    def has_available_endpoint(self) -> bool:
+        """True while at least one url is not ejected."""
+        now = time.time()
+        with self._endpoint_lock:
+            return any(not e.is_ejected(now) for e in self.endpoints)
+
+    def _readmit(self, endpoint: Endpoint, now: float) -> bool:
+        """Re-admit the endpoint if its ejection is over; return True if it is still ejected."""
+        if endpoint.ejected_until == 0.0:
+            return False
+        if endpoint.is_ejected(now):
+            return True
+        endpoint.ejected_until = 0.0
+        endpoint.requests = 0
+        endpoint.latency = None
+        endpoint.error_rate = 0.0
+        endpoint.consecutive_failures = 0
+        endpoint.consecutive_successes = 0
+        logger.info(f"[{self.name}][{endpoint.url}] Re-admitted to the load balancer")
+        return False
+
+    def _choose(self, available: List[Endpoint]) -> Endpoint:
+        if len(available) == 1:
+            return available[0]
+        if self.strategy == "round_robin":
+            self._next += 1
+            return available[self._next % len(available)]
+        if self.strategy == "least_requests":
+            fewest = min(e.in_flight for e in available)
+            return random.choice([e for e in available if e.in_flight == fewest])
+        latencies = [e.latency for e in self.endpoints if e.latency is not None]
+        default_latency = sum(latencies) / len(latencies) if latencies else 0.0
+        first, second = random.sample(available, 2)
+        return first if first.score(default_latency) <= second.score(default_latency) else second
+
+    def _record(self, endpoint: Endpoint, latency: float, response_code: Optional[int]) -> None:
+        alpha = self.config.latency_alpha
+        failed = response_code is None or response_code in constants.LOAD_BALANCER_FAILURE_CODES
+        endpoint.requests += 1
+        endpoint.error_rate += alpha * (float(failed) - endpoint.error_rate)
+        if failed:
+            endpoint.consecutive_failures += 1
+            endpoint.consecutive_successes = 0
+        else:
+            endpoint.consecutive_failures = 0
+            endpoint.consecutive_successes += 1
+            if response_code == 200:
+                endpoint.latency = (
+                    latency
+                    if endpoint.latency is None
+                    else endpoint.latency + alpha * (latency - endpoint.latency)
+                )
+            if endpoint.consecutive_successes >= self.config.min_requests:
+                # a healthy stretch after a re-admission forgives the earlier ejections
+                endpoint.ejections = 0
+
+        if endpoint.ejected_until != 0.0:
+            return
+        reason = self._ejection_reason(endpoint)
+        if reason is not None:
+            self._eject(endpoint, reason)
+
+    def _ejection_reason(self, endpoint: Endpoint) -> Optional[str]:
+        config = self.config
+        if endpoint.consecutive_failures >= config.consecutive_failures:
+            return f"{endpoint.consecutive_failures} failures in a row"
+        if endpoint.requests < config.min_requests:
+            return None
+        if endpoint.error_rate > config.max_error_rate:
+            return f"error rate {endpoint.error_rate:.2f}"
+        if config.latency_outlier_factor is not None and endpoint.latency is not None:
+            others = [
+                e.latency
+                for e in self.endpoints
+                if e is not endpoint
+                and e.ejected_until == 0.0
+                and e.latency is not None
+                and e.requests >= config.min_requests
+            ]
+            if others:
+                median = statistics.median(others)
+                if endpoint.latency > config.latency_outlier_factor * median:
+                    return f"latency {endpoint.latency:.2f}s against a median of {median:.2f}s"
+        return None
+
+    def _eject(self, endpoint: Endpoint, reason: str) -> None:
+        now = time.time()
+        ejected = sum(1 for e in self.endpoints if e.is_ejected(now))
+        if (ejected + 1) * 100 > self.config.max_ejection_percent * len(self.endpoints):
+            return
+        endpoint.ejections += 1
+        duration = min(
+            self.config.base_ejection_time * endpoint.ejections, self.config.max_ejection_time
+        )
+        endpoint.ejected_until = now + duration
+        logger.warning(
+            f"[{self.name}][{endpoint.url}] Ejected from the load balancer for {duration:.0f}s: "
+            f"{reason}"
+        )
+
+    def _schedule_probes(self, now: float) -> None:
+        interval = self.config.probe_interval
+        if interval is None or self._probe is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        with self._endpoint_lock:
+            due = [e for e in self.endpoints if now - e.last_probe >= interval]
+            for endpoint in due:
+                endpoint.last_probe = now
+        for endpoint in due:
+            task = loop.create_task(self._run_probe(endpoint))
+            self._probes.add(task)
+            task.add_done_callback(self._probes.discard)
+
+    async def _run_probe(self, endpoint: Endpoint) -> None:
+        assert self._probe is not None
+        try:
+            response_code: Optional[int] = await self._probe(endpoint.url, endpoint.auth_token)
+        except Exception as e:
+            logger.debug(f"[{self.name}][{endpoint.url}] Health probe failed: {e}")
+            response_code = None
+        with self._endpoint_lock:
+            if response_code == 200:
+                if endpoint.is_ejected(time.time()):
+                    # the url answers again, re-admit it without waiting for its ejection to end
+                    endpoint.ejected_until = time.time()
+                    self._readmit(endpoint, time.time())
+            elif response_code is None or response_code in constants.LOAD_BALANCER_FAILURE_CODES:
+                # probes are not representative of the request latency, only failures count
+                self._record(endpoint, 0.0, response_code)
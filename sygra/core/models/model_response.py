@@ -13,6 +13,8 @@ class ModelResponse(BaseModel):
         reasoning_response (Optional[str]): The reasoning response from the model.
         finish_reason (Optional[str]): The finish reason from the model.
         tool_calls (Optional[list]): The tool calls from the model.
+        token_usage (Optional[dict[str, int]]): prompt_tokens, completion_tokens and total_tokens
+            of the request that produced this response, if the model reported them.
     """
 
     llm_response: Optional[str]
@@ -20,3 +22,4 @@ class ModelResponse(BaseModel):
     reasoning_response: Optional[str] = None
     finish_reason: Optional[str] = None
     tool_calls: Optional[list] = None
+    token_usage: Optional[dict[str, int]] = None
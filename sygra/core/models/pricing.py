@@ -0,0 +1,120 @@
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from sygra.logger.logger_config import logger
+
+
+class ModelPricing(BaseModel):
+    """Token prices of a model, in USD per 1000 tokens"""
+
+    input_cost_per_1k_tokens: float = Field(ge=0, description="USD per 1000 prompt tokens")
+    output_cost_per_1k_tokens: float = Field(ge=0, description="USD per 1000 completion tokens")
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """
+        Cost of a request.
+
+        Args:
+            prompt_tokens: Number of prompt tokens
+            completion_tokens: Number of completion tokens
+
+        Returns:
+            Cost of the request in USD
+        """
+        return self.input_cost_per_1k_tokens * (
+            prompt_tokens / 1000
+        ) + self.output_cost_per_1k_tokens * (completion_tokens / 1000)
+
+    @classmethod
+    def from_model_config(
+        cls, model_config: Dict[str, Any], model_name: str
+    ) -> Optional["ModelPricing"]:
+        """
+        Resolve the pricing of a model: the `pricing` section of its config if present (e.g. for
+        self-hosted endpoints), the public pricing tables otherwise.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+            model_name: Model name looked up in the pricing tables
+
+        Returns:
+            ModelPricing of the model, or None if its pricing is unknown
+        """
+        pricing = model_config.get("pricing")
+        if pricing:
+            return cls(**pricing)
+        return lookup_pricing(model_name)
+
+
+@lru_cache(maxsize=None)
+def lookup_pricing(model_name: str) -> Optional[ModelPricing]:
+    """
+    Look up the pricing of a model in LangChain Community's official pricing data, once per
+    model name.
+
+    Supports:
+    - OpenAI models (direct API)
+    - Azure OpenAI models (same pricing as OpenAI)
+    - Anthropic Claude on AWS Bedrock
+
+    Args:
+        model_name: Name of the model
+
+    Returns:
+        ModelPricing of the model, or None if pricing is not available (no fallback estimates
+        to avoid stale data)
+    """
+    try:
+        # This also works for Azure OpenAI since they use the same model names and pricing
+        from langchain_community.callbacks.openai_info import (
+            TokenType,
+            get_openai_token_cost_for_model,
+        )
+
+        try:
+            return ModelPricing(
+                input_cost_per_1k_tokens=get_openai_token_cost_for_model(
+                    model_name, 1000, token_type=TokenType.PROMPT
+                ),
+                output_cost_per_1k_tokens=get_openai_token_cost_for_model(
+                    model_name, 1000, token_type=TokenType.COMPLETION
+                ),
+            )
+        except (KeyError, ValueError):
+            # Not an OpenAI/Azure model or not in pricing table
+            pass
+
+        # Try Bedrock Anthropic models (Claude on AWS)
+        from langchain_community.callbacks.bedrock_anthropic_callback import (
+            _get_anthropic_claude_token_cost,
+        )
+
+        if "claude" in model_name.lower() or "anthropic" in model_name.lower():
+            try:
+                return ModelPricing(
+                    input_cost_per_1k_tokens=_get_anthropic_claude_token_cost(1000, 0, model_name),
+                    output_cost_per_1k_tokens=_get_anthropic_claude_token_cost(0, 1000, model_name),
+                )
+            except (KeyError, ValueError, IndexError):
+                # Claude model but not in Bedrock pricing table
+                pass
+
+    except ImportError:
+        logger.warning(
+            "langchain-community not available for cost calculation. "
+            "Install with: pip install langchain-community"
+        )
+        return None
+
+    # No pricing available - log and return None
+    logger.debug(
+        f"No pricing information available for model '{model_name}'. "
+        f"Cost will be reported as $0.00. "
+        f"Supported models: OpenAI (GPT-4, GPT-3.5, etc.), Azure OpenAI and Anthropic Claude on "
+        f"Bedrock, or set `pricing` in the model config."
+    )
+    return None
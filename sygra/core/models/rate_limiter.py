@@ -0,0 +1,260 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel, ConfigDict, Field
+
+from sygra.logger.logger_config import logger
+from sygra.utils import constants
+from sygra.utils.config_registry import ConfigRegistry
+
+
+class RateLimitConfig(BaseModel):
+    """Configuration model for the client-side rate limit of a model"""
+
+    requests_per_minute: Optional[float] = Field(
+        default=None, gt=0, description="Requests sent per minute, None for no request quota"
+    )
+    tokens_per_minute: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Estimated prompt and completion tokens sent per minute, None for no token "
+        "quota",
+    )
+    burst_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        description="Seconds of quota a bucket holds, i.e. the largest burst sent at once",
+    )
+
+    model_config = ConfigDict(extra="ignore")
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute is not None or self.tokens_per_minute is not None
+
+    @classmethod
+    def from_model_config(cls, model_config: Dict[str, Any]) -> "RateLimitConfig":
+        """
+        Build the rate limit configuration from the `rate_limit` section of a model config, on top
+        of the defaults in configuration.yaml.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            RateLimitConfig for the model
+        """
+        defaults = (
+            ConfigRegistry.load_yaml(constants.SYGRA_CONFIG)
+            .get("model_config", {})
+            .get("rate_limit")
+        )
+        return cls(**{**(defaults or {}), **(model_config.get("rate_limit") or {})})
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` units per second, holding at most `capacity` units.
+
+    Units are reserved up front: a reservation larger than the units in the bucket leaves it in
+    debt, and the reservation waits for the debt to be refilled. Later reservations wait behind
+    the debt, so the units go out at exactly the refill rate, in the order they were reserved.
+
+    Args:
+        rate: Units refilled per second
+        capacity: Largest number of units held by the bucket
+        clock: Monotonic clock in seconds
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float]):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._units = capacity
+        self._updated = clock()
+
+    @property
+    def units(self) -> float:
+        self._refill()
+        return self._units
+
+    def reserve(self, units: float) -> float:
+        """
+        Take units from the bucket.
+
+        Args:
+            units: Units to take
+
+        Returns:
+            Seconds to wait before the units are available
+        """
+        self._refill()
+        self._units -= units
+        return max(0.0, -self._units / self.rate)
+
+    def give_back(self, units: float) -> None:
+        """Return units to the bucket, or take more of them if negative."""
+        self._refill()
+        self._units = min(self.capacity, self._units + units)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._units = min(self.capacity, self._units + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """
+    Client-side limit on the requests and estimated tokens sent per minute to a model.
+
+    Every request takes one unit from the request bucket and its estimated tokens (prompt
+    characters / CHARS_PER_TOKEN plus the max tokens of the completion) from the token bucket,
+    and waits until both are available. Once the model reports the actual token usage, the
+    difference with the estimate is settled on the token bucket. Requests therefore go out at the
+    quota rate instead of running into throttling errors and backing off.
+
+    Limiters are shared process-wide per model name, so all nodes using a model share its quota.
+    The clock and sleep functions can be replaced for tests.
+
+    Args:
+        name: Model name
+        config: Rate limit configuration
+        clock: Monotonic clock in seconds
+        sleep: Coroutine function sleeping for a number of seconds
+        sync_sleep: Function sleeping for a number of seconds, for synchronous requests
+    """
+
+    _lock = threading.Lock()
+    _limiters: Dict[str, "RateLimiter"] = {}
+
+    # rough number of characters per token of a prompt
+    CHARS_PER_TOKEN = 4
+
+    def __init__(
+        self,
+        name: str,
+        config: RateLimitConfig,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        sync_sleep: Callable[[float], Any] = time.sleep,
+    ):
+        self.name = name
+        self.config = config
+        self._sleep = sleep
+        self._sync_sleep = sync_sleep
+        self._bucket_lock = threading.Lock()
+        self._requests = self._bucket(config.requests_per_minute, clock)
+        self._tokens = self._bucket(config.tokens_per_minute, clock)
+
+    def _bucket(
+        self, per_minute: Optional[float], clock: Callable[[], float]
+    ) -> Optional[TokenBucket]:
+        if per_minute is None:
+            return None
+        rate = per_minute / 60
+        return TokenBucket(rate, max(1.0, rate * self.config.burst_seconds), clock)
+
+    @classmethod
+    def from_model_config(cls, model_config: Dict[str, Any]) -> Optional["RateLimiter"]:
+        """
+        Get the shared rate limiter of a model, or None if it has no rate limit.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            RateLimiter for the model, None without rate limit
+        """
+        config = RateLimitConfig.from_model_config(model_config)
+        if not config.enabled:
+            return None
+        name = model_config.get("name", "")
+        with cls._lock:
+            limiter = cls._limiters.get(name)
+            if limiter is None:
+                limiter = cls(name, config)
+                cls._limiters[name] = limiter
+            return limiter
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget every limiter."""
+        with cls._lock:
+            cls._limiters.clear()
+
+    @classmethod
+    def estimate_tokens(
+        cls, messages: Sequence[BaseMessage], parameters: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Estimate the tokens of a request from its messages and generation parameters.
+
+        Args:
+            messages: Messages of the request
+            parameters: Generation parameters, for the max tokens of the completion
+
+        Returns:
+            Estimated prompt and completion tokens
+        """
+        chars = sum(len(str(message.content)) for message in messages)
+        parameters = parameters or {}
+        completion = (
+            parameters.get("max_tokens")
+            or parameters.get("max_completion_tokens")
+            or parameters.get("max_new_tokens")
+            or 0
+        )
+        return chars // cls.CHARS_PER_TOKEN + int(completion)
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve one request and its estimated tokens.
+
+        Args:
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        with self._bucket_lock:
+            wait = 0.0
+            if self._requests is not None:
+                wait = self._requests.reserve(1)
+            if self._tokens is not None and tokens:
+                wait = max(wait, self._tokens.reserve(tokens))
+        if wait > 0:
+            logger.debug(f"[{self.name}] Rate limited, sending the request in {wait:.2f}s")
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until one request and its estimated tokens fit in the quota.
+
+        Args:
+            tokens: Estimated tokens of the request
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await self._sleep(wait)
+
+    def acquire_sync(self, tokens: int = 0) -> None:
+        """Blocking version of acquire, for synchronous requests."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._sync_sleep(wait)
+
+    def settle(self, estimated: int, token_usage: Optional[Dict[str, int]]) -> None:
+        """
+        Correct the token bucket with the actual token usage of a request.
+
+        Args:
+            estimated: Tokens reserved for the request
+            token_usage: Token usage reported by the model, with total_tokens
+        """
+        if self._tokens is None or not token_usage or not token_usage.get("total_tokens"):
+            return
+        with self._bucket_lock:
+            self._tokens.give_back(estimated - token_usage["total_tokens"])
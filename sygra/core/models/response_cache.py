@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Literal, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from sygra.logger.logger_config import logger
+from sygra.metadata.metadata_collector import get_metadata_collector
+from sygra.utils import constants
+from sygra.utils.config_registry import ConfigRegistry
+
+
+class ResponseCacheConfig(BaseModel):
+    """Configuration model for the LLM response cache of a model or node"""
+
+    enabled: bool = Field(default=False, description="Enable the response cache")
+    backend: Literal["sqlite", "disk"] = Field(
+        default="sqlite", description="Storage backend: a SQLite file or a directory of entries"
+    )
+    path: Optional[str] = Field(
+        default=None, description="Cache location, defaults to a backend specific path"
+    )
+    ttl: Optional[float] = Field(
+        default=None, description="Seconds a cached response stays valid, never expires if None"
+    )
+    mode: Literal["read_write", "read_only", "write_only"] = Field(
+        default="read_write",
+        description="read_only never stores new responses, write_only refreshes the cache",
+    )
+
+    model_config = ConfigDict(extra="ignore")
+
+    @property
+    def resolved_path(self) -> str:
+        if self.path:
+            return self.path
+        if self.backend == "sqlite":
+            return constants.DEFAULT_RESPONSE_CACHE_SQLITE_PATH
+        return constants.DEFAULT_RESPONSE_CACHE_DISK_PATH
+
+    @classmethod
+    def from_model_config(cls, model_config: Dict[str, Any]) -> "ResponseCacheConfig":
+        """
+        Build the cache configuration from the `response_cache` section of a model config,
+        on top of the defaults in configuration.yaml.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            ResponseCacheConfig for the model
+        """
+        defaults = (
+            ConfigRegistry.load_yaml(constants.SYGRA_CONFIG)
+            .get("model_config", {})
+            .get("response_cache")
+        )
+        return cls(**{**(defaults or {}), **(model_config.get("response_cache") or {})})
+
+
+class CacheBackend(ABC):
+    """Key-value storage for serialized responses."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[str, float, Optional[float]]]:
+        """Return (value, created_at, expires_at) for a key, or None if it is not cached."""
+
+    @abstractmethod
+    def set(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        """Store a value for a key, replacing any previous value."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a key if it is cached."""
+
+    def close(self) -> None:
+        """Release the resources held by the backend."""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache entries stored in a single SQLite table, safe to share between threads."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[str, float, Optional[float]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1], row[2]) if row else None
+
+    def set(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, time.time(), expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class DiskCacheBackend(CacheBackend):
+    """
+    Cache entries stored as one JSON file per key in a sharded directory.
+
+    Keys are content hashes, so the first two characters are used as shard directory to keep
+    directory sizes small. Entries are written to a temporary file and renamed into place, so
+    concurrent readers never observe a partial entry.
+    """
+
+    def __init__(self, path: str):
+        self._root = path
+        os.makedirs(self._root, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._root, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[str, float, Optional[float]]]:
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return entry["value"], entry["created_at"], entry.get("expires_at")
+
+    def set(self, key: str, value: str, expires_at: Optional[float]) -> None:
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        temp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"value": value, "created_at": time.time(), "expires_at": expires_at},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(temp_path, entry_path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+
+
+def _to_jsonable(obj: Any) -> Any:
+    """Fallback serializer used to normalise request objects into the cache key."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, type) and issubclass(obj, BaseModel):
+        return obj.model_json_schema()
+    try:
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+
+        return convert_to_openai_tool(obj)
+    except Exception:
+        return str(obj)
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of model responses.
+
+    Responses are keyed on a hash of the normalised request: the model identity, its generation
+    parameters and structured output configuration, the request messages and any call arguments
+    such as tools. Backends are shared process-wide per (backend, path), so all models and nodes
+    configured with the same location share one cache.
+    """
+
+    _lock = threading.Lock()
+    _backends: Dict[Tuple[str, str], CacheBackend] = {}
+
+    def __init__(self, config: ResponseCacheConfig, backend: CacheBackend):
+        self.config = config
+        self.backend = backend
+
+    @classmethod
+    def from_model_config(cls, model_config: Dict[str, Any]) -> Optional["ResponseCache"]:
+        """
+        Create the response cache for a model, or None if caching is disabled for it.
+
+        Args:
+            model_config: Dictionary containing model configuration parameters
+
+        Returns:
+            ResponseCache for the model, None when disabled
+        """
+        config = ResponseCacheConfig.from_model_config(model_config)
+        if not config.enabled:
+            return None
+        return cls(config, cls._get_backend(config))
+
+    @classmethod
+    def _get_backend(cls, config: ResponseCacheConfig) -> CacheBackend:
+        path = config.resolved_path
+        key = (config.backend, os.path.abspath(path))
+        with cls._lock:
+            backend = cls._backends.get(key)
+            if backend is None:
+                backend_cls = SQLiteCacheBackend if config.backend == "sqlite" else DiskCacheBackend
+                backend = backend_cls(path)
+                cls._backends[key] = backend
+                logger.info(f"Using {config.backend} LLM response cache at {path}")
+            return backend
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every open cache backend."""
+        with cls._lock:
+            backends = list(cls._backends.values())
+            cls._backends.clear()
+        for backend in backends:
+            backend.close()
+
+    @staticmethod
+    def build_key(request: Dict[str, Any]) -> str:
+        """
+        Build the content address of a normalised request.
+
+        Args:
+            request: Request description, any JSON serializable structure
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            request,
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=_to_jsonable,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached value of a key if present and still valid under this cache's TTL.
+
+        Args:
+            key: Request key from build_key
+
+        Returns:
+            The serialized response, None on a miss
+        """
+        if self.config.mode == "write_only":
+            return None
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+        if entry is None:
+            return None
+
+        value, created_at, expires_at = entry
+        now = time.time()
+        if (expires_at is not None and now >= expires_at) or (
+            self.config.ttl is not None and now - created_at >= self.config.ttl
+        ):
+            return None
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a serialized response for a key.
+
+        Args:
+            key: Request key from build_key
+            value: Serialized response
+        """
+        if self.config.mode == "read_only":
+            return
+        expires_at = time.time() + self.config.ttl if self.config.ttl is not None else None
+        try:
+            self.backend.set(key, value, expires_at)
+        except Exception as e:
+            logger.warning(f"Failed to store response in cache: {e}")
+
+    @staticmethod
+    def record_hit(model_name: str, model_config: Optional[Dict[str, Any]] = None) -> None:
+        """Record a cache hit for the model in the metadata collector."""
+        get_metadata_collector().record_cache_hit(model_name, model_config)
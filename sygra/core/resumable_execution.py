@@ -1,16 +1,18 @@
 import atexit
-import hashlib
+import bisect
 import json
 import os
 import signal
 import time
 from collections import deque
-from typing import Any, Deque, Dict, Optional, Set
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set
 
 import datasets  # type: ignore[import-untyped]
 
+from sygra.core.dataset import sampler_source
+from sygra.core.dataset.record_id import record_id
 from sygra.logger.logger_config import logger
-from sygra.utils import constants, utils
+from sygra.utils import constants
 
 
 class DatasetPositionTracker:
@@ -115,9 +117,98 @@ class StreamingPositionTracker(DatasetPositionTracker):
         return self.position_to_record_id.get(position)
 
 
+class ProcessedRecordSet:
+    """
+    Compact set of processed record IDs.
+
+    Index-like IDs (non-negative integers without leading zeros) are stored as sorted, disjoint
+    inclusive ranges, so a run over sequential IDs needs a handful of ranges instead of one entry
+    per record. Any other ID (explicit string IDs, content hashes) is kept in a regular set.
+    """
+
+    def __init__(self, record_ids: Optional[Iterable[str]] = None):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._range_count = 0
+        self._other_ids: Set[str] = set()
+        if record_ids is not None:
+            self.update(record_ids)
+
+    @staticmethod
+    def _as_int(record_id: str) -> Optional[int]:
+        if (
+            record_id.isascii()
+            and record_id.isdigit()
+            and (record_id == "0" or record_id[0] != "0")
+        ):
+            return int(record_id)
+        return None
+
+    def add(self, record_id: str) -> bool:
+        """Add a record ID, returns False if it was already present."""
+        value = self._as_int(record_id)
+        if value is None:
+            if record_id in self._other_ids:
+                return False
+            self._other_ids.add(record_id)
+            return True
+        return self.add_range(value, value) > 0
+
+    def add_range(self, start: int, end: int) -> int:
+        """Add the inclusive range of integer IDs [start, end], returns the number of new IDs."""
+        # existing ranges overlapping or adjacent to [start, end] are merged into one range
+        lo = bisect.bisect_left(self._ends, start - 1)
+        hi = bisect.bisect_right(self._starts, end + 1)
+        merged = sum(e - s + 1 for s, e in zip(self._starts[lo:hi], self._ends[lo:hi]))
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+        added = (end - start + 1) - merged
+        self._range_count += added
+        return added
+
+    def update(self, record_ids: Iterable[str]) -> None:
+        for rid in record_ids:
+            self.add(str(rid))
+
+    def ranges(self) -> List[List[int]]:
+        """Return the integer IDs as a list of inclusive [start, end] ranges."""
+        return [[s, e] for s, e in zip(self._starts, self._ends)]
+
+    def other_ids(self) -> List[str]:
+        """Return the IDs that are not stored as integer ranges."""
+        return list(self._other_ids)
+
+    def __contains__(self, record_id: object) -> bool:
+        if not isinstance(record_id, str):
+            return False
+        value = self._as_int(record_id)
+        if value is None:
+            return record_id in self._other_ids
+        i = bisect.bisect_right(self._starts, value) - 1
+        return i >= 0 and self._ends[i] >= value
+
+    def __len__(self) -> int:
+        return self._range_count + len(self._other_ids)
+
+    def __iter__(self) -> Iterator[str]:
+        for s, e in zip(self._starts, self._ends):
+            for value in range(s, e + 1):
+                yield str(value)
+        yield from self._other_ids
+
+
 class ResumableExecutionManager:
     """
     Manages resumable execution with support for both in-memory and streaming datasets.
+
+    State is persisted as a metadata snapshot (metadata.json) plus an append-only journal
+    (metadata.journal) holding the records processed since the snapshot. Regular saves only
+    append the new records to the journal; the journal is compacted into a new snapshot once it
+    grows as large as the snapshot, and on completion. Loading replays the journal on top of the
+    snapshot.
     """
 
     def __init__(self, task_name: str, output_file: str, window_size: int = 1000):
@@ -127,17 +218,24 @@ class ResumableExecutionManager:
         self.output_dir = os.path.dirname(output_file)
 
         self.metadata_file = os.path.join(self.output_dir, "metadata.json")
-        self.processed_records: Set[str] = set()
+        self.journal_file = os.path.join(self.output_dir, constants.META_JOURNAL_FILE)
+        self.processed_records = ProcessedRecordSet()
         self.in_process_records: Set[str] = set()
         self.last_save_time = time.time()
         self.save_interval = 10
         self.window_size = window_size
         self.metadata_initialized = False
 
+        # positions of the most recently processed records, bounded by window_size
         self.record_id_to_position: Dict[str, int] = {}
 
         self.total_records_processed = 0
 
+        # records processed since the last save, and journal bookkeeping
+        self._pending_records: List[str] = []
+        self._journal_records = 0
+        self._save_seq = 0
+
         self.in_memory_tracker = InMemoryPositionTracker()
         self.streaming_tracker = StreamingPositionTracker(window_size)
         self.position_tracker: Optional[DatasetPositionTracker] = None
@@ -195,13 +293,55 @@ class ResumableExecutionManager:
     def get_record_id(record: dict[str, Any]) -> str:
         """
         Compute a stable ID for a record.
-        We check for explicit ID first, then compute a content hash if needed.
+        The id assigned when the dataset was loaded is used; a content hash only if it has none.
+        """
+        return record_id(record)
+
+    def _read_journal(self, snapshot_seq: int) -> List[dict[str, Any]]:
+        """
+        Read the journal entries written after the snapshot with the given save sequence number.
+
+        A partially written last line (e.g. after a crash) is ignored.
+        """
+        entries: List[dict[str, Any]] = []
+        if not os.path.exists(self.journal_file):
+            return entries
+
+        with open(self.journal_file, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring incomplete entry in journal {self.journal_file}")
+                    continue
+                if entry.get(constants.META_SAVE_SEQ, 0) > snapshot_seq:
+                    entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _apply_journal(metadata: dict[str, Any], entries: List[dict[str, Any]]) -> List[str]:
         """
-        if "id" in record and record["id"]:
-            return str(record["id"])
+        Apply journal entries to snapshot metadata in place.
 
-        record_str = json.dumps(record, sort_keys=True)
-        return hashlib.sha256(record_str.encode()).hexdigest()
+        Returns:
+            The record IDs processed according to the journal
+        """
+        journal_records: List[str] = []
+        record_positions = metadata.setdefault(constants.META_RECORD_POSITIONS, {})
+        for entry in entries:
+            journal_records.extend(entry.get(constants.META_PROCESSED_RECORDS, []))
+            record_positions.update(entry.get(constants.META_RECORD_POSITIONS, {}))
+            for key in (
+                constants.META_POSITION,
+                constants.META_LAST_POSITION,
+                constants.META_HIGHEST_POSITION,
+                constants.META_SAMPLER_CACHE,
+                constants.META_SAVE_SEQ,
+                constants.META_TIMESTAMP,
+            ):
+                if key in entry:
+                    metadata[key] = entry[key]
+        return journal_records
 
     def load_state(self, dataset_type: str = "auto") -> bool:
         """Load the execution state if it exists and is valid."""
@@ -216,14 +356,15 @@ class ResumableExecutionManager:
             logger.warning(f"Metadata file {self.metadata_file} is corrupted, starting fresh")
             return False
 
+        journal = self._read_journal(metadata.get(constants.META_SAVE_SEQ, 0))
+        journal_records = self._apply_journal(metadata, journal)
+
         # load the sampler pointers during resume of the process
         sampler_key_pointer = metadata.get(constants.META_SAMPLER_CACHE)
         # it can be None for old metadata
         if sampler_key_pointer:
-            for k, v in sampler_key_pointer.items():
-                logger.info(f"Loading sampler pointer for data source {k}: {v}")
-                # set dataset object as None, this will be filled at utils.fetch_next_record()
-                utils.sampler_cache[k] = (None, v)
+            # data sources are loaded again on their first sample
+            sampler_source.restore_pointers(sampler_key_pointer)
 
         if metadata.get(constants.META_TASK_NAME) != self.task_name:
             logger.warning("Metadata file is for a different task, starting fresh")
@@ -253,19 +394,20 @@ class ResumableExecutionManager:
             logger.info(f"Found alternative output file {found_file} instead of {prev_output_file}")
             prev_output_file = found_file
 
-            metadata[constants.META_OUTPUT_FILE] = prev_output_file
-            with open(self.metadata_file, "w") as f:
-                json.dump(metadata, f, indent=2)
-
         if prev_output_file != self.output_file:
             logger.info(f"Output file has changed from {prev_output_file} to {self.output_file}")
-            metadata[constants.META_OUTPUT_FILE] = self.output_file
-            with open(self.metadata_file, "w") as f:
-                json.dump(metadata, f, indent=2)
 
-        self.processed_records = set(metadata.get(constants.META_PROCESSED_RECORDS, []))
+        self.processed_records = ProcessedRecordSet(
+            metadata.get(constants.META_PROCESSED_RECORDS, [])
+        )
+        for start, end in metadata.get(constants.META_PROCESSED_RANGES, []):
+            self.processed_records.add_range(start, end)
+        self.processed_records.update(journal_records)
         self.total_records_processed = len(self.processed_records)
-        position = metadata.get(constants.META_LAST_POSITION, 0)
+        self._save_seq = metadata.get(constants.META_SAVE_SEQ, 0)
+        position = metadata.get(
+            constants.META_LAST_POSITION, metadata.get(constants.META_POSITION, 0)
+        )
 
         if constants.META_RECORD_POSITIONS in metadata:
             self.record_id_to_position = metadata[constants.META_RECORD_POSITIONS]
@@ -283,11 +425,23 @@ class ResumableExecutionManager:
             self.position_tracker = self.in_memory_tracker
 
         self.position_tracker.mark_position(position)
+        if getattr(self.position_tracker, "highest_seen_position", 0) < metadata.get(
+            constants.META_HIGHEST_POSITION, 0
+        ):
+            setattr(
+                self.position_tracker,
+                "highest_seen_position",
+                metadata[constants.META_HIGHEST_POSITION],
+            )
+
+        # fold the replayed journal (and a changed output file) into a fresh snapshot
+        if journal or metadata.get(constants.META_OUTPUT_FILE) != self.output_file:
+            self._write_snapshot(completed=metadata.get(constants.META_COMPLETED, False))
         self.metadata_initialized = True
 
         logger.info(
-            f"Loaded resume state with {len(self.processed_records)} processed records, "
-            f"position {position}, using {dataset_type} mode"
+            f"Loaded resume state with {len(self.processed_records)} processed records "
+            f"({len(journal_records)} from journal), position {position}, using {dataset_type} mode"
         )
         return True
 
@@ -302,74 +456,110 @@ class ResumableExecutionManager:
 
     def _mark_as_complete(self) -> None:
         """
-        Mark the execution as complete. This updates the metadata file directly.
+        Mark the execution as complete by compacting the journal into a completed snapshot.
         """
         try:
-            if os.path.exists(self.metadata_file):
-                with open(self.metadata_file, "r") as f:
-                    metadata = json.load(f)
-            else:
-                metadata = self._build_current_metadata()
-
-            metadata[constants.META_COMPLETED] = True
-            metadata[constants.META_TIMESTAMP] = time.strftime(
-                "%Y-%m-%d %H:%M:%S %z", time.localtime(time.time())
-            )
-
-            # Write the updated metadata to a temporary file
-            temp_file = f"{self.metadata_file}.tmp"
-            with open(temp_file, "w") as f:
-                json.dump(metadata, f, indent=2)
-                f.flush()
-                os.fsync(f.fileno())
-
-            # Atomically rename to ensure consistency
-            os.replace(temp_file, self.metadata_file)
-
-            try:
-                with open(self.metadata_file, "r") as f:
-                    verified_metadata = json.load(f)
-                    if not verified_metadata.get("completed", False):
-                        logger.warning("Failed to verify completed status in metadata file")
-                    else:
-                        logger.info("Execution marked as complete and verified")
-            except Exception as e:
-                logger.warning(f"Could not verify metadata file after write: {e}")
-
+            self._write_snapshot(completed=True)
+            logger.info("Execution marked as complete")
         except Exception as e:
             logger.error(f"Error marking execution as complete: {e}")
 
-    def _build_current_metadata(self) -> dict:
-        """Build metadata from the current state."""
+    def _current_positions(self) -> tuple[int, int]:
+        """Return the current and highest seen dataset positions."""
         if not self.position_tracker:
-            position = 0
-            highest_position = 0
-        else:
-            position = self.position_tracker.get_current_position()
-            highest_position = getattr(self.position_tracker, "highest_seen_position", position)
+            return 0, 0
+        position = self.position_tracker.get_current_position()
+        return position, getattr(self.position_tracker, "highest_seen_position", position)
+
+    @staticmethod
+    def _sampler_key_pointer() -> dict[str, Any]:
+        return sampler_source.get_pointers()
+
+    def _build_current_metadata(self) -> dict:
+        """Build the snapshot metadata from the current state."""
+        position, highest_position = self._current_positions()
 
-        # Create record positions mapping
-        record_positions = {}
-        if hasattr(self, "record_id_to_position"):
+        record_positions: Dict[str, int] = {}
+        if isinstance(self.position_tracker, StreamingPositionTracker):
+            for pos, record_id in self.position_tracker.position_to_record_id.items():
+                if record_id in self.processed_records:
+                    record_positions[record_id] = pos
+        else:
             record_positions = self.record_id_to_position
 
         return {
             constants.META_TASK_NAME: self.task_name,
             constants.META_OUTPUT_FILE: self.output_file,
-            constants.META_PROCESSED_RECORDS: list(self.processed_records),
+            constants.META_PROCESSED_RECORDS: self.processed_records.other_ids(),
+            constants.META_PROCESSED_RANGES: self.processed_records.ranges(),
+            constants.META_POSITION: position,
             constants.META_LAST_POSITION: position,
             constants.META_HIGHEST_POSITION: highest_position,
             constants.META_DATASET_TYPE: (
                 self.position_tracker.dataset_type if self.position_tracker else "in_memory"
             ),
             constants.META_TOTAL_PROCESSED: len(self.processed_records),
+            constants.META_SAMPLER_CACHE: self._sampler_key_pointer(),
             constants.META_COMPLETED: False,  # Default to false, will be set to true in _mark_as_complete
             constants.META_RECORD_POSITIONS: record_positions,
+            constants.META_SAVE_SEQ: self._save_seq,
             constants.META_TIMESTAMP: time.strftime(
                 "%Y-%m-%d %H:%M:%S %z", time.localtime(time.time())
             ),
         }
 
+    def _write_snapshot(self, completed: bool = False) -> None:
+        """Atomically write a full metadata snapshot and truncate the journal."""
+        self._save_seq += 1
+        metadata = self._build_current_metadata()
+        metadata[constants.META_COMPLETED] = completed
+
+        temp_file = f"{self.metadata_file}.tmp"
+        with open(temp_file, "w") as f:
+            json.dump(metadata, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_file, self.metadata_file)
+
+        # entries older than the snapshot would be skipped on load anyway, drop them
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self._pending_records = []
+        self._journal_records = 0
+        self.metadata_initialized = True
+        logger.debug(f"Saved metadata snapshot to {self.metadata_file}")
+
+    def _append_journal(self) -> None:
+        """Append the records processed since the last save to the journal."""
+        self._save_seq += 1
+        position, highest_position = self._current_positions()
+        pending = self._pending_records
+        entry = {
+            constants.META_SAVE_SEQ: self._save_seq,
+            constants.META_PROCESSED_RECORDS: pending,
+            constants.META_RECORD_POSITIONS: {
+                record_id: self.record_id_to_position[record_id]
+                for record_id in pending
+                if record_id in self.record_id_to_position
+            },
+            constants.META_POSITION: position,
+            constants.META_LAST_POSITION: position,
+            constants.META_HIGHEST_POSITION: highest_position,
+            constants.META_SAMPLER_CACHE: self._sampler_key_pointer(),
+            constants.META_TIMESTAMP: time.strftime(
+                "%Y-%m-%d %H:%M:%S %z", time.localtime(self.last_save_time)
+            ),
+        }
+        with open(self.journal_file, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._journal_records += len(pending)
+        self._pending_records = []
+        logger.debug(f"Appended {len(pending)} records to journal {self.journal_file}")
+
     def force_save_state(self, is_final=False) -> None:
         """
         Force immediate save of the execution state.
@@ -380,51 +570,7 @@ class ResumableExecutionManager:
         """
         if is_final:
             try:
-                # initialize the sampler cache
-                sampler_key_pointer = (
-                    {k: v[1] for k, v in utils.sampler_cache.items()}
-                    if len(utils.sampler_cache) > 0
-                    else {}
-                )
-
-                if os.path.exists(self.metadata_file):
-                    with open(self.metadata_file, "r") as f:
-                        metadata = json.load(f)
-                        # overwrite old pointer values
-                        metadata[constants.META_SAMPLER_CACHE] = sampler_key_pointer
-                else:
-                    metadata = {
-                        constants.META_TASK_NAME: self.task_name,
-                        constants.META_OUTPUT_FILE: self.output_file,
-                        constants.META_PROCESSED_RECORDS: list(self.processed_records),
-                        constants.META_LAST_POSITION: (
-                            self.position_tracker.get_current_position()
-                            if self.position_tracker
-                            else 0
-                        ),
-                        constants.META_HIGHEST_POSITION: (
-                            getattr(self.position_tracker, "highest_seen_position", 0)
-                            if self.position_tracker
-                            else 0
-                        ),
-                        constants.META_DATASET_TYPE: (
-                            self.position_tracker.dataset_type
-                            if self.position_tracker
-                            else "in_memory"
-                        ),
-                        constants.META_TOTAL_PROCESSED: len(self.processed_records),
-                        constants.META_SAMPLER_CACHE: sampler_key_pointer,
-                    }
-
-                metadata[constants.META_COMPLETED] = True
-                metadata[constants.META_TIMESTAMP] = time.strftime(
-                    "%Y-%m-%d %H:%M:%S %z", time.localtime(time.time())
-                )
-
-                with open(self.metadata_file, "w") as f:
-                    json.dump(metadata, f, indent=2)
-                    f.flush()
-                    os.fsync(f.fileno())
+                self._write_snapshot(completed=True)
 
                 try:
                     with open(self.metadata_file, "r") as f:
@@ -442,52 +588,20 @@ class ResumableExecutionManager:
             self._do_save_state()
 
     def _do_save_state(self) -> None:
-        """Perform the actual state saving."""
+        """
+        Perform the actual state saving.
+
+        Appends the records processed since the last save to the journal, or writes a new
+        snapshot when there is none yet or the journal has grown as large as the snapshot.
+        """
         if not self.processed_records:
+            logger.debug("No records processed yet, skipping metadata save")
             return
 
         if not self.position_tracker:
             logger.warning("Cannot save state: no position tracker initialized")
             return
 
-        position = self.position_tracker.get_current_position()
-        highest_position = getattr(self.position_tracker, "highest_seen_position", position)
-
-        record_positions = {}
-        if isinstance(self.position_tracker, StreamingPositionTracker):
-            for pos, record_id in self.position_tracker.position_to_record_id.items():
-                if record_id in self.processed_records:
-                    record_positions[record_id] = pos
-        else:
-            record_positions = self.record_id_to_position
-
-        # initialize the sampler cache
-        sampler_key_pointer = (
-            {k: v[1] for k, v in utils.sampler_cache.items()}
-            if len(utils.sampler_cache) > 0
-            else {}
-        )
-
-        metadata = {
-            constants.META_TASK_NAME: self.task_name,
-            constants.META_OUTPUT_FILE: self.output_file,
-            constants.META_PROCESSED_RECORDS: list(self.processed_records),
-            constants.META_POSITION: position,
-            constants.META_HIGHEST_POSITION: highest_position,
-            constants.META_DATASET_TYPE: self.position_tracker.dataset_type,
-            constants.META_TOTAL_PROCESSED: len(self.processed_records),
-            constants.META_SAMPLER_CACHE: sampler_key_pointer,
-            constants.META_COMPLETED: False,
-            constants.META_RECORD_POSITIONS: record_positions,
-            constants.META_TIMESTAMP: time.strftime(
-                "%Y-%m-%d %H:%M:%S %z", time.localtime(self.last_save_time)
-            ),
-        }
-
-        if not metadata[constants.META_PROCESSED_RECORDS]:
-            logger.debug("No records processed yet, skipping metadata save")
-            return
-
         if not os.path.exists(self.output_file):
             logger.debug(
                 f"Output file {self.output_file} doesn't exist yet, skipping metadata save"
@@ -495,21 +609,19 @@ class ResumableExecutionManager:
             return
 
         try:
-            temp_file = f"{self.metadata_file}.tmp"
-            with open(temp_file, "w") as f:
-                json.dump(metadata, f, indent=2)
-                f.flush()
-                os.fsync(f.fileno())
-
-            os.replace(temp_file, self.metadata_file)
-
-            self.metadata_initialized = True
-            logger.debug(f"Saved metadata to {self.metadata_file}")
+            journal_records = self._journal_records + len(self._pending_records)
+            if not os.path.exists(self.metadata_file) or journal_records >= max(
+                constants.META_JOURNAL_COMPACTION_MIN,
+                len(self.processed_records) - journal_records,
+            ):
+                self._write_snapshot()
+            else:
+                self._append_journal()
         except Exception as e:
             logger.error(f"Error saving metadata: {e}")
 
     def get_metadata(self) -> dict[str, Any]:
-        """Get the current metadata state."""
+        """Get the current metadata state (snapshot with the journal replayed on top)."""
         if not self.metadata_initialized:
             logger.warning("Metadata not initialized, returning empty state")
             return {}
@@ -517,7 +629,10 @@ class ResumableExecutionManager:
         try:
             with open(self.metadata_file, "r") as f:
                 metadata: dict[str, Any] = json.load(f)
-                logger.info(f"Loaded metadata from {self.metadata_file}")
+            journal = self._read_journal(metadata.get(constants.META_SAVE_SEQ, 0))
+            journal_records = self._apply_journal(metadata, journal)
+            metadata.setdefault(constants.META_PROCESSED_RECORDS, []).extend(journal_records)
+            logger.info(f"Loaded metadata from {self.metadata_file}")
             return metadata
 
         except Exception as e:
@@ -552,12 +667,15 @@ class ResumableExecutionManager:
     def mark_record_processed(self, record: dict[str, Any], position: Optional[int] = None) -> None:
         """Mark a record as processed and optionally update position."""
         record_id = self.get_record_id(record)
-        self.processed_records.add(record_id)
+        if self.processed_records.add(record_id):
+            self._pending_records.append(record_id)
         self.in_process_records.discard(record_id)
         self.total_records_processed += 1
 
         if position is not None:
             self.record_id_to_position[record_id] = position
+            if len(self.record_id_to_position) > self.window_size:
+                del self.record_id_to_position[next(iter(self.record_id_to_position))]
 
             if self.position_tracker:
                 self.position_tracker.mark_position(position, record_id)
@@ -566,5 +684,4 @@ class ResumableExecutionManager:
                     if position > self.position_tracker.highest_seen_position:
                         self.position_tracker.highest_seen_position = position
 
-        if self.total_records_processed % 1 == 0:
-            self.save_state()
+        self.save_state()
@@ -2,26 +2,37 @@ import json
 import os
 import statistics
 import subprocess
+import threading
+import time
 from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from threading import Lock
-from typing import Any, Optional, Union
+from typing import Any, Iterator, Optional, Union
 
 from sygra.logger.logger_config import logger
+from sygra.metadata.sketch import QuantileSketch
+from sygra.utils import constants
 
 
-def calculate_latency_statistics(latency_samples: list[float]) -> dict[str, float]:
+def calculate_latency_statistics(
+    latency_samples: Union[list[float], QuantileSketch],
+) -> dict[str, float]:
     """
     Calculate latency statistics including percentiles.
 
     Args:
-        latency_samples: List of latency values in seconds
+        latency_samples: List of latency values in seconds, or a sketch of them
 
     Returns:
         Dictionary with min, max, mean, median, std_dev, p50, p95, p99
     """
+    if isinstance(latency_samples, QuantileSketch):
+        return latency_samples.statistics()
+
     n = len(latency_samples)
 
     # Handle empty or single sample cases
@@ -48,6 +59,14 @@ def calculate_latency_statistics(latency_samples: list[float]) -> dict[str, floa
     }
 
 
+def _percentiles(sketch: QuantileSketch, digits: int) -> dict[str, float]:
+    """p50, p95 and p99 of a sketch, rounded."""
+    return {
+        key: round(sketch.quantile(q), digits)
+        for key, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+    }
+
+
 @dataclass
 class TokenStatistics:
     """Token usage statistics."""
@@ -110,10 +129,13 @@ class ModelMetrics:
     num_requests: int = 0
     num_retries: int = 0
     num_failures: int = 0
+    num_cache_hits: int = 0
     response_codes: dict[int, int] = field(default_factory=lambda: defaultdict(int))
 
-    # Latency tracking for percentile calculations
-    latency_samples: list[float] = field(default_factory=list)
+    # Latency, tokens and cost distributions for percentile calculations, in bounded memory
+    latency_samples: QuantileSketch = field(default_factory=QuantileSketch)
+    token_samples: QuantileSketch = field(default_factory=QuantileSketch)
+    cost_samples: QuantileSketch = field(default_factory=QuantileSketch)
 
     # Cost tracking
     total_cost_usd: float = 0.0
@@ -137,7 +159,7 @@ class ModelMetrics:
         self.response_codes[response_code] = self.response_codes.get(response_code, 0) + 1
 
         # Track latency sample for percentile calculations
-        self.latency_samples.append(latency)
+        self.latency_samples.add(latency)
 
         if is_retry:
             self.num_retries += 1
@@ -150,9 +172,32 @@ class ModelMetrics:
 
         # Track cost
         self.total_cost_usd += cost_usd
+        if cost_usd > 0:
+            self.cost_samples.add(cost_usd)
 
         # Always call add_usage - it will filter out requests with no tokens internally
         self.token_stats.add_usage(prompt_tokens, completion_tokens, total_tokens)
+        if total_tokens:
+            self.token_samples.add(int(total_tokens))
+
+    def merge(self, other: "ModelMetrics") -> None:
+        """Add the metrics of the same model collected by another shard or process."""
+        self.token_stats.total_prompt_tokens += other.token_stats.total_prompt_tokens
+        self.token_stats.total_completion_tokens += other.token_stats.total_completion_tokens
+        self.token_stats.total_tokens += other.token_stats.total_tokens
+        self.token_stats.num_requests_with_tokens += other.token_stats.num_requests_with_tokens
+        self.total_latency_seconds += other.total_latency_seconds
+        self.successful_request_latency += other.successful_request_latency
+        self.num_requests += other.num_requests
+        self.num_retries += other.num_retries
+        self.num_failures += other.num_failures
+        self.num_cache_hits += other.num_cache_hits
+        for code, count in other.response_codes.items():
+            self.response_codes[code] = self.response_codes.get(code, 0) + count
+        self.latency_samples.merge(other.latency_samples)
+        self.token_samples.merge(other.token_samples)
+        self.cost_samples.merge(other.cost_samples)
+        self.total_cost_usd += other.total_cost_usd
 
     def get_average_latency(self) -> float:
         """Calculate average latency per request."""
@@ -175,11 +220,13 @@ class ModelMetrics:
                 "total_completion_tokens": self.token_stats.total_completion_tokens,
                 "total_tokens": self.token_stats.total_tokens,
                 **self.token_stats.get_average_tokens(),
+                "total_tokens_percentiles": _percentiles(self.token_samples, 1),
             },
             "performance": {
                 "total_requests": self.num_requests,
                 "total_retries": self.num_retries,
                 "total_failures": self.num_failures,
+                "total_cache_hits": self.num_cache_hits,
                 "failure_rate": (
                     self.num_failures / self.num_requests if self.num_requests > 0 else 0.0
                 ),
@@ -196,6 +243,7 @@ class ModelMetrics:
                 "average_cost_per_request": round(
                     self.total_cost_usd / self.num_requests if self.num_requests > 0 else 0.0, 6
                 ),
+                "cost_per_request_percentiles": _percentiles(self.cost_samples, 6),
             },
             "response_code_distribution": dict(self.response_codes),
             "parameters": self.parameters,
@@ -214,8 +262,8 @@ class NodeMetrics:
     total_failures: int = 0
     total_latency_seconds: float = 0.0
 
-    # Latency tracking for percentile calculations
-    latency_samples: list[float] = field(default_factory=list)
+    # Latency tracking for percentile calculations, in bounded memory
+    latency_samples: QuantileSketch = field(default_factory=QuantileSketch)
 
     # Token statistics for this node
     token_stats: TokenStatistics = field(default_factory=TokenStatistics)
@@ -235,7 +283,7 @@ class NodeMetrics:
         """Record a node execution with optional token usage and cost."""
         self.total_executions += 1
         self.total_latency_seconds += latency
-        self.latency_samples.append(latency)
+        self.latency_samples.add(latency)
         self.total_cost_usd += cost_usd
 
         if not success:
@@ -245,6 +293,18 @@ class NodeMetrics:
         if prompt_tokens > 0 or completion_tokens > 0 or total_tokens > 0:
             self.token_stats.add_usage(prompt_tokens, completion_tokens, total_tokens)
 
+    def merge(self, other: "NodeMetrics") -> None:
+        """Add the metrics of the same node collected by another shard or process."""
+        self.total_executions += other.total_executions
+        self.total_failures += other.total_failures
+        self.total_latency_seconds += other.total_latency_seconds
+        self.latency_samples.merge(other.latency_samples)
+        self.token_stats.total_prompt_tokens += other.token_stats.total_prompt_tokens
+        self.token_stats.total_completion_tokens += other.token_stats.total_completion_tokens
+        self.token_stats.total_tokens += other.token_stats.total_tokens
+        self.token_stats.num_requests_with_tokens += other.token_stats.num_requests_with_tokens
+        self.total_cost_usd += other.total_cost_usd
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
         avg_latency = (
@@ -429,6 +489,26 @@ class ExecutionContext:
         }
 
 
+@dataclass
+class _MetricsBuffer:
+    """Metrics recorded in one context, merged into the collector by the thread that owns it."""
+
+    generation: int
+    owner_thread: int = field(default_factory=threading.get_ident)
+    model_metrics: dict[str, ModelMetrics] = field(default_factory=dict)
+    node_metrics: dict[str, NodeMetrics] = field(default_factory=dict)
+    records_processed: int = 0
+    records_failed: int = 0
+    pending_events: int = 0
+    last_flush: float = field(default_factory=time.monotonic)
+
+
+# buffer of the current task, set by MetadataCollector.buffered and inherited by child tasks
+_metrics_buffer: ContextVar[Optional[_MetricsBuffer]] = ContextVar(
+    "sygra_metrics_buffer", default=None
+)
+
+
 class MetadataCollector:
     """
     Central metadata collector for Sygra runs.
@@ -439,7 +519,8 @@ class MetadataCollector:
     - Dataset information
     - Execution context and versioning
 
-    Thread-safe singleton implementation.
+    Thread-safe singleton implementation. Inside `buffered()` the metrics of the current task are
+    recorded without taking the collector lock and merged periodically.
 
     Metadata collection can be disabled globally by setting the environment variable:
         SYGRA_DISABLE_METADATA=1
@@ -481,6 +562,9 @@ class MetadataCollector:
         self.total_records_processed = 0
         self.total_records_failed = 0
 
+        # Incremented by reset(), so that buffers filled before a reset are discarded
+        self._generation = 0
+
         if self._enabled:
             logger.debug("MetadataCollector initialized (enabled)")
         else:
@@ -512,8 +596,82 @@ class MetadataCollector:
             self.execution_context = ExecutionContext(task_name="unknown")
             self.total_records_processed = 0
             self.total_records_failed = 0
+            self._generation += 1
             logger.debug("MetadataCollector reset")
 
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """
+        Record the metrics of the current task in a private buffer.
+
+        Within the block, and in the asyncio tasks started from it, model requests, node
+        executions and processed records are added to a buffer of the current context without
+        taking the collector lock. The buffer is merged into the collector every
+        METADATA_FLUSH_EVENTS events or METADATA_FLUSH_INTERVAL_SECONDS seconds, when a summary
+        is requested from the same task, and when the block exits. Metrics recorded from other
+        threads are added to the collector directly.
+        """
+        buffer = _MetricsBuffer(generation=self._generation)
+        token = _metrics_buffer.set(buffer)
+        try:
+            yield
+        finally:
+            _metrics_buffer.reset(token)
+            self._merge_buffer(buffer)
+
+    def flush(self):
+        """Merge the metrics buffered by the current task into the collector."""
+        buffer = self._current_buffer()
+        if buffer is not None:
+            self._merge_buffer(buffer)
+
+    def _current_buffer(self) -> Optional[_MetricsBuffer]:
+        """Buffer of the current task, if it is owned by the current thread."""
+        buffer = _metrics_buffer.get()
+        if buffer is None or buffer.owner_thread != threading.get_ident():
+            return None
+        if buffer.generation != self._generation:
+            # recorded before a reset
+            self._clear_buffer(buffer)
+        return buffer
+
+    def _buffered_event(self, buffer: _MetricsBuffer):
+        """Count an event added to a buffer, and merge the buffer when it is due."""
+        buffer.pending_events += 1
+        if (
+            buffer.pending_events >= constants.METADATA_FLUSH_EVENTS
+            or time.monotonic() - buffer.last_flush >= constants.METADATA_FLUSH_INTERVAL_SECONDS
+        ):
+            self._merge_buffer(buffer)
+
+    def _merge_buffer(self, buffer: _MetricsBuffer):
+        """Add the metrics of a buffer to the collector and empty the buffer."""
+        with self._lock:
+            if buffer.generation == self._generation:
+                for name, model_metrics in buffer.model_metrics.items():
+                    if name in self.model_metrics:
+                        self.model_metrics[name].merge(model_metrics)
+                    else:
+                        self.model_metrics[name] = model_metrics
+                for name, node_metrics in buffer.node_metrics.items():
+                    if name in self.node_metrics:
+                        self.node_metrics[name].merge(node_metrics)
+                    else:
+                        self.node_metrics[name] = node_metrics
+                self.total_records_processed += buffer.records_processed
+                self.total_records_failed += buffer.records_failed
+        self._clear_buffer(buffer)
+
+    def _clear_buffer(self, buffer: _MetricsBuffer):
+        """Empty a buffer, after its metrics were merged or discarded."""
+        buffer.generation = self._generation
+        buffer.model_metrics = {}
+        buffer.node_metrics = {}
+        buffer.records_processed = 0
+        buffer.records_failed = 0
+        buffer.pending_events = 0
+        buffer.last_flush = time.monotonic()
+
     def set_execution_context(
         self,
         task_name: str,
@@ -700,40 +858,66 @@ class MetadataCollector:
         if not self._enabled:
             return
 
-        with self._lock:
-            # Initialize model metrics if needed
-            if model_name not in self.model_metrics:
-                model_type = "unknown"
-                model_url = None
-                parameters = {}
-
-                if model_config:
-                    model_type = model_config.get("type", "unknown")
-                    model_url = model_config.get("url")
-                    parameters = model_config.get("parameters", {})
-
-                self.model_metrics[model_name] = ModelMetrics(
-                    model_name=model_name,
-                    model_type=model_type,
-                    model_url=model_url,
-                    parameters=parameters,
+        request = (latency, response_code, prompt_tokens, completion_tokens, total_tokens)
+        buffer = self._current_buffer()
+        if buffer is None:
+            with self._lock:
+                self._get_model_metrics(self.model_metrics, model_name, model_config).add_request(
+                    *request, is_retry=is_retry, cost_usd=cost_usd
                 )
-
-            # Record the request
-            self.model_metrics[model_name].add_request(
-                latency=latency,
-                response_code=response_code,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
-                is_retry=is_retry,
-                cost_usd=cost_usd,
+        else:
+            self._get_model_metrics(buffer.model_metrics, model_name, model_config).add_request(
+                *request, is_retry=is_retry, cost_usd=cost_usd
             )
+            self._buffered_event(buffer)
 
-            logger.debug(
-                f"Recorded model request: {model_name} (node: {node_name}, "
-                f"tokens: {total_tokens}, latency: {latency:.3f}s, cost: ${cost_usd:.6f}, code: {response_code})"
+        logger.debug(
+            f"Recorded model request: {model_name} (node: {node_name}, "
+            f"tokens: {total_tokens}, latency: {latency:.3f}s, cost: ${cost_usd:.6f}, code: {response_code})"
+        )
+
+    @staticmethod
+    def _get_model_metrics(
+        model_metrics: dict[str, ModelMetrics],
+        model_name: str,
+        model_config: Optional[dict[str, Any]],
+    ) -> ModelMetrics:
+        """Metrics of a model, created from its configuration on first use."""
+        metrics = model_metrics.get(model_name)
+        if metrics is None:
+            model_config = model_config or {}
+            metrics = model_metrics[model_name] = ModelMetrics(
+                model_name=model_name,
+                model_type=model_config.get("type", "unknown"),
+                model_url=model_config.get("url"),
+                parameters=model_config.get("parameters", {}),
             )
+        return metrics
+
+    def record_cache_hit(self, model_name: str, model_config: Optional[dict[str, Any]] = None):
+        """
+        Record a model request served from the response cache.
+
+        Cache hits are counted separately and do not contribute to requests, latency, tokens or cost.
+
+        Args:
+            model_name: Name of the model used
+            model_config: Model configuration dict
+        """
+        if not self._enabled:
+            return
+
+        buffer = self._current_buffer()
+        if buffer is None:
+            with self._lock:
+                self._get_model_metrics(
+                    self.model_metrics, model_name, model_config
+                ).num_cache_hits += 1
+        else:
+            self._get_model_metrics(
+                buffer.model_metrics, model_name, model_config
+            ).num_cache_hits += 1
+            self._buffered_event(buffer)
 
     def record_node_execution(
         self,
@@ -751,27 +935,50 @@ class MetadataCollector:
         if not self._enabled:
             return
 
-        with self._lock:
-            if node_name not in self.node_metrics:
-                self.node_metrics[node_name] = NodeMetrics(
-                    node_name=node_name,
-                    node_type=node_type,
-                    model_name=model_name,
-                )
-
-            self.node_metrics[node_name].record_execution(
-                latency, success, prompt_tokens, completion_tokens, total_tokens, cost_usd
+        execution = (latency, success, prompt_tokens, completion_tokens, total_tokens, cost_usd)
+        buffer = self._current_buffer()
+        if buffer is None:
+            with self._lock:
+                self._get_node_metrics(
+                    self.node_metrics, node_name, node_type, model_name
+                ).record_execution(*execution)
+        else:
+            self._get_node_metrics(
+                buffer.node_metrics, node_name, node_type, model_name
+            ).record_execution(*execution)
+            self._buffered_event(buffer)
+
+    @staticmethod
+    def _get_node_metrics(
+        node_metrics: dict[str, NodeMetrics],
+        node_name: str,
+        node_type: str,
+        model_name: Optional[str],
+    ) -> NodeMetrics:
+        """Metrics of a node, created on first use."""
+        metrics = node_metrics.get(node_name)
+        if metrics is None:
+            metrics = node_metrics[node_name] = NodeMetrics(
+                node_name=node_name, node_type=node_type, model_name=model_name
             )
+        return metrics
 
     def record_processed_record(self, success: bool = True):
         """Record that a record was processed."""
         if not self._enabled:
             return
 
-        with self._lock:
-            self.total_records_processed += 1
+        buffer = self._current_buffer()
+        if buffer is None:
+            with self._lock:
+                self.total_records_processed += 1
+                if not success:
+                    self.total_records_failed += 1
+        else:
+            buffer.records_processed += 1
             if not success:
-                self.total_records_failed += 1
+                buffer.records_failed += 1
+            self._buffered_event(buffer)
 
     def finalize_execution(self):
         """Finalize the execution and compute final statistics."""
@@ -793,6 +1000,7 @@ class MetadataCollector:
         Returns:
             Dictionary containing all metadata organized by category
         """
+        self.flush()
         with self._lock:
             # Aggregate token statistics across all models
             total_prompt_tokens = sum(
@@ -807,6 +1015,7 @@ class MetadataCollector:
             total_requests = sum(m.num_requests for m in self.model_metrics.values())
             total_retries = sum(m.num_retries for m in self.model_metrics.values())
             total_failures = sum(m.num_failures for m in self.model_metrics.values())
+            total_cache_hits = sum(m.num_cache_hits for m in self.model_metrics.values())
 
             # Aggregate cost statistics
             total_cost = sum(m.total_cost_usd for m in self.model_metrics.values())
@@ -836,6 +1045,7 @@ class MetadataCollector:
                         "total_requests": total_requests,
                         "total_retries": total_retries,
                         "total_failures": total_failures,
+                        "total_cache_hits": total_cache_hits,
                         "retry_rate": total_retries / total_requests if total_requests > 0 else 0.0,
                         "failure_rate": (
                             total_failures / total_requests if total_requests > 0 else 0.0
@@ -1,12 +1,143 @@
 import copy
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import wraps
-from typing import Callable
+from typing import Any, Callable, Iterator, Optional
 
 from sygra.core.graph.langgraph.langchain_callback import calculate_cost
 from sygra.core.models.model_response import ModelResponse
+from sygra.core.models.pricing import ModelPricing
 from sygra.metadata.metadata_collector import get_metadata_collector
 
+_SNAPSHOT_ATTRIBUTE = "_metadata_model_config"
+
+# token usage of the model request running in the current context: set by the model while it
+# handles the request, read by track_model_request once the request completes
+_request_usage: ContextVar[Optional[dict[str, int]]] = ContextVar(
+    "sygra_request_usage", default=None
+)
+
+
+# set while the model requests of the current context are not recorded, e.g. health probes
+_untracked: ContextVar[bool] = ContextVar("sygra_untracked_requests", default=False)
+
+
+@contextmanager
+def untracked_requests() -> Iterator[None]:
+    """
+    Make model requests which are not recorded in the metadata collector, such as the health
+    probes of the load balancer: they are not part of the run and must not count as requests,
+    tokens or cost.
+    """
+    token = _untracked.set(True)
+    try:
+        yield
+    finally:
+        _untracked.reset(token)
+
+
+def set_request_usage(usage: Optional[dict[str, int]]) -> None:
+    """
+    Attribute token usage to the model request running in the current context.
+
+    Concurrent requests run in their own asyncio tasks, so the usage of one request is never
+    attributed to another, even when they are made with the same model instance.
+
+    Args:
+        usage: prompt_tokens, completion_tokens and total_tokens of the request
+    """
+    _request_usage.set(usage)
+
+
+def _model_config_snapshot(model: Any) -> Optional[dict[str, Any]]:
+    """
+    Model configuration reported to the metadata collector.
+
+    The configuration is copied and enhanced with the model type once per model instance, so
+    requests do not pay for a deep copy of it.
+
+    Args:
+        model: Model instance the request was made with
+
+    Returns:
+        Optional[dict[str, Any]]: configuration snapshot, or None if the model has none
+    """
+    cached: Optional[tuple[Optional[dict[str, Any]]]] = getattr(model, _SNAPSHOT_ATTRIBUTE, None)
+    if cached is not None:
+        return cached[0]
+
+    model_config = getattr(model, "model_config", None) or getattr(model, "_config", None)
+    # Enhance model config with additional metadata (use deep copy to avoid modifying original)
+    if model_config:
+        model_config = copy.deepcopy(model_config) if isinstance(model_config, dict) else {}
+
+        # Add model type if available
+        if hasattr(model, "model_type"):
+            if callable(model.model_type):
+                model_config["type"] = model.model_type()
+            else:
+                model_config["type"] = model.model_type
+
+        # Ensure api_version is in parameters if it exists in config
+        if "api_version" in model_config:
+            if "parameters" not in model_config:
+                model_config["parameters"] = {}
+            if "api_version" not in model_config["parameters"]:
+                model_config["parameters"]["api_version"] = model_config["api_version"]
+
+    try:
+        setattr(model, _SNAPSHOT_ATTRIBUTE, (model_config,))
+    except AttributeError:
+        pass
+    return model_config
+
+
+def _record_request(
+    model: Any,
+    model_name: str,
+    latency: float,
+    response_code: int,
+    usage: Optional[dict[str, int]] = None,
+):
+    """Record a completed model request with its token usage."""
+    prompt_tokens = 0
+    completion_tokens = 0
+    total_tokens = 0
+
+    if usage:
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+        total_tokens = usage.get("total_tokens", 0)
+
+    # Calculate cost, with the pricing resolved when the model was created if it has one
+    pricing: Optional[ModelPricing] = getattr(model, "pricing", None)
+    if pricing is not None:
+        cost_usd = pricing.cost(prompt_tokens, completion_tokens)
+    else:
+        cost_usd = calculate_cost(model_name, prompt_tokens, completion_tokens)
+
+    # Record the request with token usage
+    collector = get_metadata_collector()
+    collector.record_model_request(
+        model_name=model_name,
+        latency=latency,
+        response_code=response_code,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=total_tokens,
+        is_retry=False,
+        model_config=_model_config_snapshot(model),
+        cost_usd=cost_usd,
+    )
+
+
+def _attach_usage(model_response: Any, usage: Optional[dict[str, int]]) -> None:
+    """Return the usage of a request with its response, for the node that made it."""
+    if usage is not None and isinstance(model_response, ModelResponse):
+        if model_response.token_usage is None:
+            model_response.token_usage = dict(usage)
+
 
 def track_model_request(func: Callable) -> Callable:
     """
@@ -25,61 +156,20 @@ def track_model_request(func: Callable) -> Callable:
     @wraps(func)
     async def async_wrapper(self, *args, **kwargs):
         start_time = time.time()
+        # a new request in this context, it must not report the usage of a previous one
+        _request_usage.set(None)
+        if _untracked.get():
+            return await func(self, *args, **kwargs)
 
         try:
             # Call original function
             model_response: ModelResponse = await func(self, *args, **kwargs)
             latency = time.time() - start_time
 
-            # Extract model name and config
+            usage = _request_usage.get()
+            _attach_usage(model_response, usage)
             model_name = getattr(self, "model_name", "unknown")
-            model_config = getattr(self, "model_config", None) or getattr(self, "_config", None)
-
-            # Enhance model config with additional metadata (use deep copy to avoid modifying original)
-            if model_config:
-                model_config = copy.deepcopy(model_config) if isinstance(model_config, dict) else {}
-
-                # Add model type if available
-                if hasattr(self, "model_type"):
-                    if callable(self.model_type):
-                        model_config["type"] = self.model_type()
-                    else:
-                        model_config["type"] = self.model_type
-
-                # Ensure api_version is in parameters if it exists in config
-                if "api_version" in model_config:
-                    if "parameters" not in model_config:
-                        model_config["parameters"] = {}
-                    if "api_version" not in model_config["parameters"]:
-                        model_config["parameters"]["api_version"] = model_config["api_version"]
-
-            # Extract token usage from model instance if available
-            last_usage = getattr(self, "_last_request_usage", None)
-            prompt_tokens = 0
-            completion_tokens = 0
-            total_tokens = 0
-
-            if last_usage:
-                prompt_tokens = last_usage.get("prompt_tokens", 0)
-                completion_tokens = last_usage.get("completion_tokens", 0)
-                total_tokens = last_usage.get("total_tokens", 0)
-
-            # Calculate cost
-            cost_usd = calculate_cost(model_name, prompt_tokens, completion_tokens)
-
-            # Record the request with token usage
-            collector = get_metadata_collector()
-            collector.record_model_request(
-                model_name=model_name,
-                latency=latency,
-                response_code=model_response.response_code,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
-                is_retry=False,
-                model_config=model_config,
-                cost_usd=cost_usd,
-            )
+            _record_request(self, model_name, latency, model_response.response_code, usage)
 
             return model_response
 
@@ -100,61 +190,19 @@ def track_model_request(func: Callable) -> Callable:
     @wraps(func)
     def sync_wrapper(self, *args, **kwargs):
         start_time = time.time()
+        _request_usage.set(None)
+        if _untracked.get():
+            return func(self, *args, **kwargs)
 
         try:
             # Call original function
             model_response: ModelResponse = func(self, *args, **kwargs)
             latency = time.time() - start_time
 
-            # Extract model name and config
+            usage = _request_usage.get()
+            _attach_usage(model_response, usage)
             model_name = getattr(self, "name", lambda: "unknown")()
-            model_config = getattr(self, "model_config", None) or getattr(self, "_config", None)
-
-            # Enhance model config with additional metadata (use deep copy to avoid modifying original)
-            if model_config:
-                model_config = copy.deepcopy(model_config) if isinstance(model_config, dict) else {}
-
-                # Add model type if available
-                if hasattr(self, "model_type"):
-                    if callable(self.model_type):
-                        model_config["type"] = self.model_type()
-                    else:
-                        model_config["type"] = self.model_type
-
-                # Ensure api_version is in parameters if it exists in config
-                if "api_version" in model_config:
-                    if "parameters" not in model_config:
-                        model_config["parameters"] = {}
-                    if "api_version" not in model_config["parameters"]:
-                        model_config["parameters"]["api_version"] = model_config["api_version"]
-
-            # Extract token usage from model instance if available
-            last_usage = getattr(self, "_last_request_usage", None)
-            prompt_tokens = 0
-            completion_tokens = 0
-            total_tokens = 0
-
-            if last_usage:
-                prompt_tokens = last_usage.get("prompt_tokens", 0)
-                completion_tokens = last_usage.get("completion_tokens", 0)
-                total_tokens = last_usage.get("total_tokens", 0)
-
-            # Calculate cost
-            cost_usd = calculate_cost(model_name, prompt_tokens, completion_tokens)
-
-            # Record the request with token usage
-            collector = get_metadata_collector()
-            collector.record_model_request(
-                model_name=model_name,
-                latency=latency,
-                response_code=model_response.response_code,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                total_tokens=total_tokens,
-                is_retry=False,
-                model_config=model_config,
-                cost_usd=cost_usd,
-            )
+            _record_request(self, model_name, latency, model_response.response_code, usage)
 
             return model_response
 
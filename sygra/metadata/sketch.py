@@ -0,0 +1,211 @@
+"""Mergeable streaming quantile sketch for the metadata collector.
+
+The sketch keeps non-negative values in logarithmic buckets, so every quantile it reports is
+within a configurable relative error of the exact one, whatever the number of values. Count, sum,
+min, max, mean and standard deviation are kept exactly. The number of buckets grows with the
+logarithm of the value range, not with the number of values, and is capped: when the cap is
+reached the lowest buckets are folded together, which only loses precision on the smallest
+values. Sketches with the same precision are merged by adding their bucket counts, so statistics
+of shards and processes can be combined exactly as if the values had been recorded in one sketch.
+"""
+
+import math
+import os
+from typing import Any, Optional
+
+from sygra.utils import constants
+
+# values below this are counted in the zero bucket
+_MIN_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """Streaming sketch of a distribution of non-negative values.
+
+    Args:
+        relative_accuracy (Optional[float]): Maximum relative error of the reported quantiles.
+            Defaults to the SYGRA_METADATA_SKETCH_ACCURACY environment variable, or 1%.
+        max_buckets (int): Maximum number of buckets kept.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: Optional[float] = None,
+        max_buckets: int = constants.METADATA_SKETCH_MAX_BUCKETS,
+    ):
+        if relative_accuracy is None:
+            relative_accuracy = float(
+                os.getenv(
+                    "SYGRA_METADATA_SKETCH_ACCURACY", constants.METADATA_SKETCH_RELATIVE_ACCURACY
+                )
+            )
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1), got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max(1, max_buckets)
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._inverse_log_gamma = 1 / math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        # running mean and sum of squared differences from it (Welford), for the std deviation
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def add(self, value: float) -> None:
+        """Add a value to the sketch. Negative values are counted as zero.
+
+        Args:
+            value (float): Value to add.
+        """
+        value = float(value)
+        if value < 0:
+            value = 0.0
+        self.count += 1
+        self.sum += value
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value < _MIN_VALUE:
+            self._zero_count += 1
+            return
+        index = math.ceil(math.log(value) * self._inverse_log_gamma)
+        buckets = self._buckets
+        if index in buckets:
+            buckets[index] += 1
+        else:
+            buckets[index] = 1
+            if len(buckets) > self.max_buckets:
+                self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the values of another sketch with the same precision to this one.
+
+        Args:
+            other (QuantileSketch): Sketch to merge.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f"Cannot merge sketches of relative accuracy {other.relative_accuracy} "
+                f"into {self.relative_accuracy}"
+            )
+        if not other.count:
+            return
+        # parallel variance (Chan et al.)
+        delta = other.mean - self.mean
+        count = self.count + other.count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.sum += other.sum
+        self._mean = self.sum / count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._zero_count += other._zero_count
+        for index, bucket_count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + bucket_count
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile of the values.
+
+        Args:
+            q (float): Quantile, between 0 and 1.
+
+        Returns:
+            float: Estimated quantile, 0.0 for an empty sketch.
+        """
+        if not self.count:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return self.min
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if rank < seen:
+                # middle of the bucket (gamma^(i-1), gamma^i], in relative terms
+                value = 2 * self._gamma**index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def statistics(self) -> dict[str, float]:
+        """
+        Summary statistics of the values.
+
+        Returns:
+            dict[str, float]: min, max, mean, median, std_dev, p50, p95 and p99
+        """
+        keys = ["min", "max", "mean", "median", "std_dev", "p50", "p95", "p99"]
+        if self.count == 0:
+            return dict.fromkeys(keys, 0.0)
+        if self.count == 1:
+            return dict.fromkeys(keys, self.min)
+        median = self.quantile(0.5)
+        return {
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "median": median,
+            "std_dev": math.sqrt(max(self._m2, 0.0) / (self.count - 1)),
+            "p50": median,
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the sketch, to merge it in another process."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "m2": self._m2,
+            "zero_count": self._zero_count,
+            "buckets": {str(index): count for index, count in self._buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        """Rebuild a sketch serialized with to_dict."""
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = math.inf if data["min"] is None else data["min"]
+        sketch.max = -math.inf if data["max"] is None else data["max"]
+        sketch._mean = sketch.sum / sketch.count if sketch.count else 0.0
+        sketch._m2 = data["m2"]
+        sketch._zero_count = data["zero_count"]
+        sketch._buckets = {int(index): count for index, count in data["buckets"].items()}
+        return sketch
+
+    def copy(self) -> "QuantileSketch":
+        return self.from_dict(self.to_dict())
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets together to get back under max_buckets."""
+        indices = sorted(self._buckets)
+        excess = len(indices) - self.max_buckets
+        self._buckets[indices[excess]] += sum(self._buckets.pop(i) for i in indices[:excess])
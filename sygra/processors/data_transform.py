@@ -2,22 +2,57 @@
 
 This module provides abstract and concrete classes for transforming data records.
 Transformations can be applied to lists of dictionaries, allowing for data manipulation operations.
+
+Record transforms (`RecordTransform`) read a stream of records and yield the transformed records,
+so a `TransformPipeline` chains the transforms of a data source into a single pass over the
+records, without copying the dataset in between. Transforms written against the list API of
+`DataTransform` run in a pipeline through `LegacyTransform`.
 """
 
+import math
 import os
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Union
+from collections import deque
+from functools import partial
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional, Union
 
 from sygra.logger.logger_config import logger
-from sygra.utils.audio_utils import get_audio_fields, get_audio_url, load_audio
+from sygra.utils import utils
+from sygra.utils.asset_loader import AssetLoader
+from sygra.utils.audio_utils import (
+    audio_data_url_encoding,
+    encode_audio_asset,
+    get_audio_fields,
+    get_audio_url,
+    load_audio,
+)
 from sygra.utils.image_utils import (
+    IMAGE_DATA_URL_ENCODING,
+    encode_image_asset,
     get_image_fields,
     get_image_url,
     is_data_url,
     load_image,
 )
 
+# records read ahead by the media transforms, whose remote assets are fetched concurrently
+DEFAULT_PREFETCH_RECORDS = 64
+
+
+def _batches(records: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _remote_urls(value: Any) -> Iterator[str]:
+    """HTTP(S) URLs in a field value or in the items of a list value."""
+    for item in value if isinstance(value, list) else [value]:
+        if isinstance(item, str) and item.startswith(("http://", "https://")):
+            yield item
+
 
 class DataTransform(ABC):
     """Abstract base class for data transformation operations.
@@ -54,7 +89,169 @@ class DataTransform(ABC):
         pass
 
 
-class SkipRecords(DataTransform):
+class RecordTransform(DataTransform):
+    """Base class for transformations applied to a stream of records.
+
+    Subclasses implement `transform_record` for one-to-one transformations, or override `stream`
+    to drop, combine or reorder records; a subclass overriding neither fails when it is defined.
+    Records read from the stream are never modified in place: a changed record is a new
+    dictionary, so no copy of the dataset is needed to protect it.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # intermediate base classes declaring abstract methods of their own are not checked
+        if any(getattr(value, "__isabstractmethod__", False) for value in vars(cls).values()):
+            return
+        if (
+            cls.stream is RecordTransform.stream
+            and cls.transform_record is RecordTransform.transform_record
+        ):
+            raise TypeError(f"{cls.__name__} must implement either transform_record or stream")
+
+    def stream(
+        self, records: Iterator[dict[str, Any]], params: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        """Apply the transformation to a stream of records.
+
+        Args:
+            records (Iterator[dict[str, Any]]): Records to transform, read once.
+            params (dict[str, Any]): Parameters controlling the transformation.
+
+        Returns:
+            Iterator[dict[str, Any]]: Transformed records.
+        """
+        for record in records:
+            yield self.transform_record(record, params)
+
+    def transform_record(self, record: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
+        """Apply the transformation to a single record.
+
+        Args:
+            record (dict[str, Any]): Record to transform.
+            params (dict[str, Any]): Parameters controlling the transformation.
+
+        Returns:
+            dict[str, Any]: Transformed record.
+        """
+        # unreachable: subclasses which do not override stream override this method
+        raise NotImplementedError(type(self).__name__)
+
+    def transform(
+        self, data: list[dict[str, Any]], params: Optional[dict[str, Any]] = None
+    ) -> list[dict[str, Any]]:
+        """Apply the transformation to a list of records.
+
+        Args:
+            data (list[dict[str, Any]]): List of dictionary records to transform.
+            params (Optional[dict[str, Any]]): Parameters controlling the transformation.
+
+        Returns:
+            list[dict[str, Any]]: Transformed list of dictionary records.
+        """
+        return list(self.stream(iter(data), params or {}))
+
+
+class LegacyTransform(RecordTransform):
+    """Adapter running a transformation written against the list API in a pipeline.
+
+    The wrapped transformation gets the whole stream as one list, or one record at a time with
+    `per_record` (for streaming datasets, which cannot be read at once).
+
+    Args:
+        transform (DataTransform): Transformation implementing `transform(data, params)`.
+        per_record (bool): Whether to call the transformation once per record.
+    """
+
+    def __init__(self, transform: DataTransform, per_record: bool = False):
+        self.wrapped = transform
+        self.per_record = per_record
+
+    @property
+    def name(self) -> str:
+        return self.wrapped.name
+
+    def stream(
+        self, records: Iterator[dict[str, Any]], params: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        if self.per_record:
+            for record in records:
+                yield from self.wrapped.transform([record], params)
+        else:
+            yield from self.wrapped.transform(list(records), params)
+
+
+class TransformPipeline:
+    """Sequence of transformations fused into a single pass over the records.
+
+    Each transformation reads the records yielded by the previous one, so records flow through
+    all of them one at a time and no intermediate dataset is built (except by transformations
+    which need the whole dataset, like legacy ones).
+
+    Args:
+        transforms (list[tuple[RecordTransform, dict[str, Any]]]): Transformations and their
+            parameters, in order.
+    """
+
+    def __init__(self, transforms: list[tuple[RecordTransform, dict[str, Any]]]):
+        self.transforms = transforms
+
+    @classmethod
+    def from_config(
+        cls, transform_cfgs: list[dict[str, Any]], streaming: bool = False
+    ) -> "TransformPipeline":
+        """Build the pipeline of a list of transformation configs.
+
+        Args:
+            transform_cfgs (list[dict[str, Any]]): Configs with the `transform` class path and
+                optional `params`.
+            streaming (bool): Whether the records come from a streaming dataset, in which case
+                legacy transformations are applied one record at a time.
+
+        Returns:
+            TransformPipeline: Pipeline of the transformations.
+        """
+        transforms: list[tuple[RecordTransform, dict[str, Any]]] = []
+        for cfg in transform_cfgs:
+            if "transform" not in cfg:
+                raise ValueError(f"Missing 'transform' key in transformation config: {cfg}")
+            instance = utils.get_func_from_str(cfg["transform"])()
+            if not isinstance(instance, RecordTransform):
+                instance = LegacyTransform(instance, per_record=streaming)
+            logger.info(f"Applying transform: {instance.name}")
+            transforms.append((instance, cfg.get("params") or {}))
+        return cls(transforms)
+
+    def __len__(self) -> int:
+        return len(self.transforms)
+
+    def stream(self, records: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Lazily apply the transformations to records.
+
+        Args:
+            records (Iterable[dict[str, Any]]): Records to transform.
+
+        Returns:
+            Iterator[dict[str, Any]]: Transformed records.
+        """
+        stream = iter(records)
+        for instance, params in self.transforms:
+            stream = instance.stream(stream, params)
+        return stream
+
+    def apply(self, data: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Apply the transformations to records, in one pass.
+
+        Args:
+            data (Iterable[dict[str, Any]]): Records to transform.
+
+        Returns:
+            list[dict[str, Any]]: Transformed records.
+        """
+        return list(self.stream(data))
+
+
+class SkipRecords(RecordTransform):
     """
     Skip records based on variables
     Example:
@@ -76,64 +273,81 @@ class SkipRecords(DataTransform):
         """
         return "skip_records"
 
-    def transform(self, data: list[dict[str, Any]], params: dict[str, Any]) -> list[dict[str, Any]]:
+    def stream(
+        self, records: Iterator[dict[str, Any]], params: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
         """Skip records based on params.
 
         Args:
-            data (list[dict[str, Any]]): List of dictionary records to transform.
+            records (Iterator[dict[str, Any]]): Records to transform.
             params (dict[str, Any]): Parameters containing:
                 - skip_type: range or count (default:range)
                 - range: range based python like syntax
                 - count : Number of records to skip from begin and end using from_start/from_end key
 
         Returns:
-            list[dict[str, Any]]: Transformed records.
+            Iterator[dict[str, Any]]: Remaining records.
         """
-        # first read the dataset (needed for iterator/stream)
-        dataset = [r for r in data]
         skip_type = params.get("skip_type", "range")
-        ds_len = len(dataset)
         if skip_type == "count":
-            skip_count = params.get("count", {})
-            # skip number of records from beginning (useful during pdf ebooks)
-            skip_begin = skip_count.get("from_start", 0)
-            start = int(skip_begin)
-            # skip number of records from end, also consider the combine count(as it cant happen in last element)
-            skip_end = skip_count.get("from_end", 0)
-            end = len(dataset) - int(skip_end)
-            new_dataset = dataset[start:end]
+            return self._skip_count(records, params.get("count", {}))
         elif skip_type == "range":
-            skip_range = params.get("range", "")
-            ranges_str = skip_range.split(",")
-            ranges = {}
-            # build skip ranges from string parsing
-            for r in ranges_str:
-                res = re.findall(r"\[(.*)]", r)
-                if len(res) == 0:
-                    continue
-                rng = res[0].split(":")
-                start = 0 if len(rng[0]) == 0 else int(rng[0])
-                end = ds_len if len(rng[1]) == 0 else int(rng[1])
-                if start < 0:
-                    start = ds_len + start
-                if end < 0:
-                    end = ds_len + end
-                ranges[start] = end
-
-            # build a set of skip indices
-            skip_indices: set[int] = set()
-            for s, e in ranges.items():
-                skip_indices.update(range(s, e))
-            # build new dataset by skipping the data
-            new_dataset = [record for i, record in enumerate(dataset) if i not in skip_indices]
+            return self._skip_range(records, params.get("range", ""))
         else:
             raise Exception(f"Unknown skip type '{skip_type}'")
 
-        # return the newly created dataset
-        return new_dataset
+    @staticmethod
+    def _skip_count(
+        records: Iterator[dict[str, Any]], skip_count: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        # skip number of records from beginning (useful during pdf ebooks)
+        start = int(skip_count.get("from_start", 0))
+        # skip number of records from end: hold them back until the end of the stream
+        skip_end = int(skip_count.get("from_end", 0))
+        held: deque[tuple[int, dict[str, Any]]] = deque()
+        for i, record in enumerate(records):
+            held.append((i, record))
+            if len(held) > skip_end:
+                index, kept = held.popleft()
+                if index >= start:
+                    yield kept
+
+    @staticmethod
+    def _skip_range(records: Iterator[dict[str, Any]], skip_range: str) -> Iterator[dict[str, Any]]:
+        bounds = []
+        # build skip ranges from string parsing
+        for r in skip_range.split(","):
+            res = re.findall(r"\[(.*)]", r)
+            if len(res) == 0:
+                continue
+            rng = res[0].split(":")
+            bounds.append((rng[0], rng[1]))
+
+        # negative indices count from the end, the length of the dataset is needed for them
+        ds_len: Optional[int] = None
+        if any(bound.strip().startswith("-") for pair in bounds for bound in pair):
+            dataset = list(records)
+            ds_len = len(dataset)
+            records = iter(dataset)
+
+        ranges: dict[int, float] = {}
+        for start_str, end_str in bounds:
+            start = 0 if len(start_str) == 0 else int(start_str)
+            end: float = (
+                (math.inf if ds_len is None else ds_len) if len(end_str) == 0 else int(end_str)
+            )
+            if ds_len is not None and start < 0:
+                start = ds_len + start
+            if ds_len is not None and end < 0:
+                end = ds_len + end
+            ranges[start] = end
+
+        for i, record in enumerate(records):
+            if not any(s <= i < e for s, e in ranges.items()):
+                yield record
 
 
-class CombineRecords(DataTransform):
+class CombineRecords(RecordTransform):
     """
     Combine records based on variables
     Example:
@@ -178,11 +392,13 @@ class CombineRecords(DataTransform):
             replace_string = replace_string.replace(f"${record_index}", str(records[i][col]))
         return replace_string
 
-    def transform(self, data: list[dict[str, Any]], params: dict[str, Any]) -> list[dict[str, Any]]:
+    def stream(
+        self, records: Iterator[dict[str, Any]], params: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
         """Combine records based on params.
 
         Args:
-            data (list[dict[str, Any]]): List of dictionary records to transform.
+            records (Iterator[dict[str, Any]]): Records to transform.
             params (dict[str, Any]): Parameters containing:
                 - skip.from_beginning: skip number of records from beginning, needed specially to skip introduction pages in an ebook
                 - skip.from_end: skip number of records from end, needed to skip index pages from an ebook
@@ -192,42 +408,39 @@ class CombineRecords(DataTransform):
                       id : "$1-$2"  it means join 2 ids with a dash
 
         Returns:
-            list[dict[str, Any]]: Transformed records.
+            Iterator[dict[str, Any]]: Combined records.
         """
-        # first read the dataset (needed for iterator/stream)
-        dataset = [r for r in data]
         # how many records to combine, 2 means current plus next, 0 or 1 means nothing to combine(return as it is)
         combine = int(params.get("combine", 1))
         if combine < 2:
-            return dataset
+            yield from records
+            return
         # if shift is 2, after combining (1,2,3), it will do (3,4,5), next (5,6,7)
         shift = int(params.get("shift", 1))
         # skip number of records from beginning (useful during pdf ebooks)
-        skip_begin = params.get("skip", {}).get("from_beginning", 0)
-        start = int(skip_begin)
+        start = int(params.get("skip", {}).get("from_beginning", 0))
         # skip number of records from end, also consider the combine count(as it cant happen in last element)
-        skip_end = params.get("skip", {}).get("from_end", 0)
-        end = len(dataset) - int(skip_end) - combine
+        skip_end = int(params.get("skip", {}).get("from_end", 0))
         # columns to join and corresponding regex string
         join_column = params.get("join_column", {})
-        # storage for new dataset
-        new_dataset = []
-        # iterate the original dataset starting from 'start' till 'end', by moving 'shift'
-        for i in range(start, end, shift):
+        # a window starting at record i is combined once record i + combine + skip_end is read,
+        # keep the records from i to there
+        window: deque[dict[str, Any]] = deque(maxlen=combine + skip_end + 1)
+        for j, record in enumerate(records):
+            window.append(record)
+            i = j - combine - skip_end
+            if i < start or (i - start) % shift:
+                continue
             # get records to join
-            records = dataset[i : i + combine]
-            # storage for the new record
-            new_record = {}
+            combined = [window[k] for k in range(combine)]
             # fetch each column rule, execute and save
-            for col, rule in join_column.items():
-                new_record[col] = self._replace_build_data(rule, records, col)
-            # finally store the new record
-            new_dataset.append(new_record)
-        # return the newly created dataset
-        return new_dataset
+            yield {
+                col: self._replace_build_data(rule, combined, col)
+                for col, rule in join_column.items()
+            }
 
 
-class RenameFieldsTransform(DataTransform):
+class RenameFieldsTransform(RecordTransform):
     """Transformer for renaming fields in dictionary records.
 
     This transformer allows renaming of dictionary keys based on a provided mapping.
@@ -243,19 +456,19 @@ class RenameFieldsTransform(DataTransform):
         """
         return "rename_fields"
 
-    def transform(self, data: list[dict[str, Any]], params: dict[str, Any]) -> list[dict[str, Any]]:
-        """Rename fields in each record according to the provided mapping.
+    def transform_record(self, record: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
+        """Rename fields in a record according to the provided mapping.
 
         Args:
-            data (list[dict[str, Any]]): List of dictionary records to transform.
+            record (dict[str, Any]): Dictionary record to transform.
             params (dict[str, Any]): Parameters containing:
                 - mapping (dict[str, str]): Old field name to new field name mapping
                 - overwrite (bool): Whether to overwrite existing fields
 
         Returns:
-            list[dict[str, Any]]: Transformed records with renamed fields.
+            dict[str, Any]: Transformed record with renamed fields.
         """
-        return [self._rename_fields(record, params) for record in data]
+        return self._rename_fields(record, params)
 
     @staticmethod
     def _rename_fields(record: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
@@ -280,7 +493,7 @@ class RenameFieldsTransform(DataTransform):
         return new_record
 
 
-class AddNewFieldTransform(DataTransform):
+class AddNewFieldTransform(RecordTransform):
     """Transformer for adding new fields to dictionary records.
 
     This transformer allows adding new fields to each record based on a provided mapping.
@@ -296,18 +509,18 @@ class AddNewFieldTransform(DataTransform):
         """
         return "add_new_field"
 
-    def transform(self, data: list[dict[str, Any]], params: dict[str, Any]) -> list[dict[str, Any]]:
-        """Add new fields to each record according to the provided mapping.
+    def transform_record(self, record: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
+        """Add new fields to a record according to the provided mapping.
 
         Args:
-            data (list[dict[str, Any]]): List of dictionary records to transform.
+            record (dict[str, Any]): Dictionary record to transform.
             params (dict[str, Any]): Parameters containing:
                 - mapping (dict[str, str]): New field name to value mapping
 
         Returns:
-            list[dict[str, Any]]: Transformed records with added fields.
+            dict[str, Any]: Transformed record with added fields.
         """
-        return [self._add_new_fields(record, params) for record in data]
+        return self._add_new_fields(record, params)
 
     def _add_new_fields(self, record: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
         """Add new fields to a single record.
@@ -328,7 +541,7 @@ class AddNewFieldTransform(DataTransform):
         return new_record
 
 
-class CreateImageUrlTransform(DataTransform):
+class CreateImageUrlTransform(RecordTransform):
     @property
     def name(self) -> str:
         """Get the name of the create image URL transformation.
@@ -337,37 +550,60 @@ class CreateImageUrlTransform(DataTransform):
         """
         return "create_image_url"
 
-    def transform(self, data: list[dict[str, Any]], params: dict[str, Any]) -> list[dict[str, Any]]:
+    def stream(
+        self, records: Iterator[dict[str, Any]], params: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
         """Transform image fields in each record to base64-encoded data URLs.
+        The image fields are detected on the first record.
         Args:
-            data (list[dict[str, Any]]): List of dictionary records to transform.
+            records (Iterator[dict[str, Any]]): Records to transform.
             params (dict[str, Any]): Parameters controlling the transformation.
         Returns:
-            list[dict[str, Any]]: Transformed records with image URLs.
+            Iterator[dict[str, Any]]: Transformed records with image URLs.
         """
-        if not data:
+        image_fields: Optional[list[str]] = None
+        loader = AssetLoader.shared(params.get("asset_loader"))
+        for batch in _batches(records, params.get("prefetch_records", DEFAULT_PREFETCH_RECORDS)):
+            if image_fields is None:
+                image_fields = get_image_fields(batch[0])
+            # fetch the remote images of the batch concurrently, once per URL
+            fetched = loader.encode_many(
+                (url for r in batch for f in image_fields for url in _remote_urls(r.get(f))),
+                IMAGE_DATA_URL_ENCODING,
+                encode_image_asset,
+            )
+            for record in batch:
+                new_record = record
+                for field in image_fields:
+                    image_data = record.get(field)
+                    if image_data is None:
+                        continue
+                    if new_record is record:
+                        new_record = record.copy()
+                    new_record[field] = self.process_image_data(image_data, fetched)
+                yield new_record
+
+        if image_fields is None:
             logger.warning("No data provided for image URL transformation.")
-            return data
-
-        image_fields = get_image_fields(data[0])
-
-        for record in data:
-            for field in image_fields:
-                image_data = record.get(field)
-                if image_data is None:
-                    continue
-                record[field] = self.process_image_data(image_data)
 
-        return data
+    def process_image_data(
+        self, image_data: Any, fetched: Optional[dict[str, Optional[str]]] = None
+    ) -> Any:
+        """Process and convert image(s) to base64-encoded data URLs.
 
-    def process_image_data(self, image_data: Any) -> Any:
-        """Process and convert image(s) to base64-encoded data URLs."""
+        Args:
+            image_data (Any): Image, or list of images, to convert.
+            fetched (Optional[dict[str, Optional[str]]]): Data URLs of prefetched image URLs.
+        """
+        fetched = fetched or {}
 
         if isinstance(image_data, list):
             result = []
             for item in image_data:
                 if is_data_url(item):
                     result.append(item)
+                elif isinstance(item, str) and item in fetched:
+                    result.append(fetched[item])
                 else:
                     try:
                         img = load_image(item)
@@ -379,6 +615,8 @@ class CreateImageUrlTransform(DataTransform):
 
         if is_data_url(image_data):
             return image_data
+        if isinstance(image_data, str) and image_data in fetched:
+            return fetched[image_data]
 
         try:
             img = load_image(image_data)
@@ -388,50 +626,75 @@ class CreateImageUrlTransform(DataTransform):
             return None
 
 
-class CreateAudioUrlTransform(DataTransform):
+class CreateAudioUrlTransform(RecordTransform):
     """DataTransform that replaces audio fields with base64-data URLs."""
 
     @property
     def name(self) -> str:
         return "create_audio_url"
 
-    def transform(
-        self,
-        data: list[dict[str, Any]],
-        params: Optional[dict[str, Any]] = None,
-    ) -> list[dict[str, Any]]:
-        if not data:
-            logger.warning("No data provided to CreateAudioUrlTransform")
-            return data
-
-        params = params or {}
+    def stream(
+        self, records: Iterator[dict[str, Any]], params: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
         output_field_map = params.get("output_fields", {})  # e.g., { "audio": "audio_base64" }
-        audio_fields = get_audio_fields(data[0])
+        # audio fields are detected on the first record
+        audio_fields: Optional[list[str]] = None
+        loader = AssetLoader.shared(params.get("asset_loader"))
+        for batch in _batches(records, params.get("prefetch_records", DEFAULT_PREFETCH_RECORDS)):
+            if audio_fields is None:
+                audio_fields = get_audio_fields(batch[0])
+            fetched = self._prefetch(loader, batch, audio_fields)
+            for record in batch:
+                new_record = record
+                record_id = record.get("id", "<no-id>")
+                for field in audio_fields:
+                    raw = record.get(field)
+                    if raw is None:
+                        logger.debug(f"Record {record_id}: No data in field '{field}'")
+                        continue
+
+                    processed = self._process_field(raw, field, fetched)
+                    if processed is not None:
+                        if new_record is record:
+                            new_record = record.copy()
+                        new_record[output_field_map.get(field, field)] = processed
+                    else:
+                        logger.warning(
+                            f"Record {record_id}: Failed to process audio field '{field}'"
+                        )
+                yield new_record
+
+        if audio_fields is None:
+            logger.warning("No data provided to CreateAudioUrlTransform")
 
-        for record in data:
-            record_id = record.get("id", "<no-id>")
+    def _prefetch(
+        self, loader: AssetLoader, batch: list[dict[str, Any]], audio_fields: list[str]
+    ) -> dict[str, Optional[str]]:
+        """Fetch the remote audio of a batch of records concurrently, once per URL."""
+        urls_by_mime: dict[str, list[str]] = {}
+        for record in batch:
             for field in audio_fields:
-                raw = record.get(field)
-                if raw is None:
-                    logger.debug(f"Record {record_id}: No data in field '{field}'")
-                    continue
-
-                processed = self._process_field(raw, field)
-                if processed is not None:
-                    out_field = output_field_map.get(field, field)
-                    record[out_field] = processed
-                else:
-                    logger.warning(f"Record {record_id}: Failed to process audio field '{field}'")
-
-        return data
-
-    def _process_field(self, value: Any, field: str) -> Any:
+                for url in _remote_urls(record.get(field)):
+                    urls_by_mime.setdefault(self._guess_mime(url), []).append(url)
+        fetched: dict[str, Optional[str]] = {}
+        for mime, urls in urls_by_mime.items():
+            encoder = partial(encode_audio_asset, mime=mime)
+            fetched.update(loader.encode_many(urls, audio_data_url_encoding(mime), encoder))
+        return fetched
+
+    def _process_field(
+        self, value: Any, field: str, fetched: Optional[dict[str, Optional[str]]] = None
+    ) -> Any:
         """Handle list or single-item audio values."""
         if isinstance(value, list):
-            return [self._process_single(item, field) for item in value if item is not None]
-        return self._process_single(value, field)
-
-    def _process_single(self, item: Any, field: str) -> Union[str, None]:
+            return [
+                self._process_single(item, field, fetched) for item in value if item is not None
+            ]
+        return self._process_single(value, field, fetched)
+
+    def _process_single(
+        self, item: Any, field: str, fetched: Optional[dict[str, Optional[str]]] = None
+    ) -> Union[str, None]:
         """Convert one audio-like item to a base64 data URL."""
         if not item:
             return None
@@ -440,6 +703,10 @@ class CreateAudioUrlTransform(DataTransform):
         if isinstance(item, str) and is_data_url(item):
             return item
 
+        # Prefetched remote audio
+        if fetched and isinstance(item, str) and item in fetched:
+            return fetched[item]
+
         try:
             audio_bytes = load_audio(item)
         except Exception as e:
@@ -476,7 +743,7 @@ class CreateAudioUrlTransform(DataTransform):
         return "audio/wav"  # Default fallback
 
 
-class AddRetryFieldsTransform(DataTransform):
+class AddRetryFieldsTransform(RecordTransform):
     """Transformer for adding retry-related fields to dictionary records.
 
     This transformer adds curr_retries and max_retries fields to each record
@@ -492,31 +759,31 @@ class AddRetryFieldsTransform(DataTransform):
         """
         return "add_retry_fields"
 
-    def transform(self, data: list[dict[str, Any]], params: dict[str, Any]) -> list[dict[str, Any]]:
+    def stream(
+        self, records: Iterator[dict[str, Any]], params: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
         """Add retry fields to each record.
 
         Args:
-            data (list[dict[str, Any]]): List of dictionary records to transform.
+            records (Iterator[dict[str, Any]]): Records to transform.
             params (dict[str, Any]): Parameters containing:
                 - max_retries (int): Maximum number of retries (default: 3)
                 - initial_retry_count (int): Initial retry count (default: 0)
 
         Returns:
-            list[dict[str, Any]]: Transformed records with retry fields added.
+            Iterator[dict[str, Any]]: Transformed records with retry fields added.
         """
         max_retries = params.get("max_retries", 3)
         initial_retry_count = params.get("initial_retry_count", 0)
         original_current_user_text = params.get("original_current_user_text", "")
         logger.info(
-            f"AddRetryFieldsTransform: Adding max_retries={max_retries}, curr_retries={initial_retry_count} to {len(data)} records"
+            f"AddRetryFieldsTransform: Adding max_retries={max_retries}, curr_retries={initial_retry_count} to records"
         )
 
-        return [
-            self._add_retry_fields(
+        for record in records:
+            yield self._add_retry_fields(
                 record, max_retries, initial_retry_count, original_current_user_text
             )
-            for record in data
-        ]
 
     def _add_retry_fields(
         self,
@@ -0,0 +1,426 @@
+"""
+Asynchronous loader of remote multimodal assets (images, audio) referenced by URL.
+
+Datasets often reference the same asset URL from thousands of records. The loader fetches every URL
+once: concurrent requests for a URL are coalesced into a single download, downloads share the pooled
+HTTP clients of `HttpConnectionPool` and are bounded by a concurrency limit, and fetched content and
+its encodings (e.g. base64 data URLs) are kept in a local content-addressed disk cache, so later
+records and later runs read them from disk instead of downloading and encoding them again.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+import httpx
+import xxhash
+from pydantic import BaseModel, ConfigDict, Field
+
+from sygra.core.models.client.connection_pool import HttpConnectionPool
+from sygra.logger.logger_config import logger
+from sygra.utils import constants
+from sygra.utils.config_registry import ConfigRegistry
+
+T = TypeVar("T")
+
+
+class AssetLoaderConfig(BaseModel):
+    """Configuration model for the loader of remote multimodal assets"""
+
+    max_concurrency: int = Field(default=32, description="Maximum number of concurrent downloads")
+    timeout: float = Field(default=30.0, description="Timeout of a download in seconds")
+    ssl_verify: bool = Field(default=True, description="Verify SSL certificates")
+    cache: bool = Field(default=True, description="Keep fetched and encoded assets on disk")
+    cache_dir: Optional[str] = Field(
+        default=None, description="Location of the disk cache, defaults to .sygra_cache/assets"
+    )
+    ttl: Optional[float] = Field(
+        default=None, description="Seconds a fetched URL stays valid, never expires if None"
+    )
+    memory_items: int = Field(
+        default=256, description="Number of encoded assets also kept in memory"
+    )
+
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    @property
+    def resolved_cache_dir(self) -> str:
+        return self.cache_dir or constants.DEFAULT_ASSET_CACHE_PATH
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> "AssetLoaderConfig":
+        """
+        Build the loader configuration from an `asset_loader` section, on top of the defaults in
+        configuration.yaml.
+
+        Args:
+            config: Overrides of the defaults, e.g. the `asset_loader` parameter of a transform
+
+        Returns:
+            AssetLoaderConfig
+        """
+        defaults = ConfigRegistry.load_yaml(constants.SYGRA_CONFIG).get("asset_loader")
+        return cls(**{**(defaults or {}), **(config or {})})
+
+
+class Asset(NamedTuple):
+    """Content of a fetched asset and its content type, if the server sent one."""
+
+    content: bytes
+    content_type: Optional[str]
+
+
+def _digest(data: bytes) -> str:
+    return xxhash.xxh3_128_hexdigest(data)
+
+
+class AssetStore:
+    """
+    Content-addressed disk cache of assets.
+
+    Contents are stored once per content hash, URLs point to the hash of their content, and
+    encodings of a content are stored next to it under the name of the encoding. Entries are
+    sharded on the first two characters of their hash and written to a temporary file renamed into
+    place, so concurrent readers never observe a partial entry.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self._root = path
+        self._ttl = ttl
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self._root, kind, key[:2], key)
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _read(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def content_hash(self, url: str) -> Optional[Tuple[str, Optional[str]]]:
+        """Return (content hash, content type) of a fetched URL, None if unknown or expired."""
+        data = self._read(self._path("urls", _digest(url.encode("utf-8"))))
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+        if self._ttl is not None and time.time() - entry["fetched_at"] >= self._ttl:
+            return None
+        return entry["content"], entry.get("content_type")
+
+    def get(self, url: str) -> Optional[Asset]:
+        """Return the cached asset of a URL."""
+        entry = self.content_hash(url)
+        if entry is None:
+            return None
+        content = self._read(self._path("contents", entry[0]))
+        return Asset(content, entry[1]) if content is not None else None
+
+    def set(self, url: str, asset: Asset) -> str:
+        """Store the asset of a URL and return its content hash."""
+        content_hash = _digest(asset.content)
+        content_path = self._path("contents", content_hash)
+        if not os.path.exists(content_path):
+            self._write(content_path, asset.content)
+        entry = {
+            "content": content_hash,
+            "content_type": asset.content_type,
+            "fetched_at": time.time(),
+        }
+        self._write(self._path("urls", _digest(url.encode("utf-8"))), json.dumps(entry).encode())
+        return content_hash
+
+    def get_encoded(self, content_hash: str, encoding: str) -> Optional[str]:
+        """Return a stored encoding of a content."""
+        data = self._read(self._path("encoded", f"{content_hash}.{encoding}"))
+        return data.decode("utf-8") if data is not None else None
+
+    def set_encoded(self, content_hash: str, encoding: str, value: str) -> None:
+        """Store an encoding of a content."""
+        self._write(self._path("encoded", f"{content_hash}.{encoding}"), value.encode("utf-8"))
+
+
+class AssetLoader:
+    """
+    Loader of remote assets with request coalescing, a concurrency limit and a disk cache.
+
+    Loaders are shared process-wide per configuration (see `shared`). Async callers await `fetch`
+    and `encode`; synchronous callers such as dataset transforms use `fetch_sync` and `encode_many`,
+    which run on a background event loop owned by the loader, so they never block on one download
+    at a time.
+    """
+
+    _lock = threading.Lock()
+    _loaders: Dict[AssetLoaderConfig, "AssetLoader"] = {}
+
+    def __init__(self, config: Optional[AssetLoaderConfig] = None):
+        self.config = config or AssetLoaderConfig()
+        self.store = (
+            AssetStore(self.config.resolved_cache_dir, self.config.ttl)
+            if self.config.cache
+            else None
+        )
+        self._state_lock = threading.Lock()
+        # in-flight downloads and encodings, and the concurrency limit, per event loop
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._semaphores: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+        self._encoded: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+        self._runner: Optional[Tuple[asyncio.AbstractEventLoop, threading.Thread]] = None
+        self.downloads = 0
+
+    @classmethod
+    def shared(cls, config: Optional[Dict[str, Any]] = None) -> "AssetLoader":
+        """
+        Get the process-wide loader of a configuration.
+
+        Args:
+            config: Overrides of the `asset_loader` defaults in configuration.yaml
+
+        Returns:
+            AssetLoader shared by all callers with the same configuration
+        """
+        loader_config = AssetLoaderConfig.from_config(config)
+        with cls._lock:
+            loader = cls._loaders.get(loader_config)
+            if loader is None:
+                loader = cls(loader_config)
+                cls._loaders[loader_config] = loader
+            return loader
+
+    @classmethod
+    def reset(cls) -> None:
+        """Close and forget every shared loader."""
+        with cls._lock:
+            loaders = list(cls._loaders.values())
+            cls._loaders.clear()
+        for loader in loaders:
+            loader.close()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            entry = self._semaphores.get(id(loop))
+            if entry is None or entry[0] is not loop:
+                entry = (loop, asyncio.Semaphore(self.config.max_concurrency))
+                self._semaphores[id(loop)] = entry
+            return entry[1]
+
+    async def _coalesce(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Run `factory` once for concurrent calls with the same key on the running loop."""
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        with self._state_lock:
+            future = self._inflight.get(inflight_key)
+            owner = future is None
+            if owner:
+                future = loop.create_future()
+                self._inflight[inflight_key] = future
+        assert future is not None
+        if not owner:
+            return await asyncio.shield(future)
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # the exception is raised to this caller, waiters may not exist
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._state_lock:
+                self._inflight.pop(inflight_key, None)
+
+    async def _download(self, url: str) -> Asset:
+        async with self._semaphore():
+            client = cast(
+                httpx.AsyncClient,
+                HttpConnectionPool.get_httpx_client(
+                    url,
+                    async_client=True,
+                    ssl_verify=self.config.ssl_verify,
+                    timeout=self.config.timeout,
+                ),
+            )
+            response = await client.get(url, follow_redirects=True)
+            response.raise_for_status()
+            self.downloads += 1
+            return Asset(response.content, response.headers.get("content-type"))
+
+    async def _fetch(self, url: str, cache: bool) -> Asset:
+        store = self.store if cache else None
+        if store is not None:
+            cached = await asyncio.to_thread(store.get, url)
+            if cached is not None:
+                return cached
+        asset = await self._download(url)
+        if store is not None:
+            await asyncio.to_thread(store.set, url, asset)
+        return asset
+
+    async def fetch(self, url: str, cache: bool = True) -> Asset:
+        """
+        Fetch the content of a URL, from the disk cache if it was fetched before.
+
+        Args:
+            url: HTTP(S) URL of the asset
+            cache: Use the disk cache, e.g. False for single-use URLs of generated assets
+
+        Returns:
+            The fetched asset
+
+        Raises:
+            httpx.HTTPError: If the download fails
+        """
+        return await self._coalesce(f"fetch:{url}", lambda: self._fetch(url, cache))
+
+    def _remember(self, key: Tuple[str, str], value: Optional[str]) -> None:
+        with self._state_lock:
+            self._encoded[key] = value
+            self._encoded.move_to_end(key)
+            while len(self._encoded) > self.config.memory_items:
+                self._encoded.popitem(last=False)
+
+    async def _encode(
+        self, url: str, encoding: str, encoder: Callable[[Asset], Optional[str]]
+    ) -> Optional[str]:
+        content_hash = None
+        if self.store is not None:
+            entry = await asyncio.to_thread(self.store.content_hash, url)
+            if entry is not None:
+                content_hash = entry[0]
+                value = await asyncio.to_thread(self.store.get_encoded, content_hash, encoding)
+                if value is not None:
+                    return value
+        asset = await self.fetch(url)
+        # decoding and re-encoding media is CPU bound, keep it off the event loop
+        value = await asyncio.to_thread(encoder, asset)
+        if self.store is not None and value is not None:
+            content_hash = content_hash or _digest(asset.content)
+            await asyncio.to_thread(self.store.set_encoded, content_hash, encoding, value)
+        return value
+
+    async def encode(
+        self, url: str, encoding: str, encoder: Callable[[Asset], Optional[str]]
+    ) -> Optional[str]:
+        """
+        Fetch a URL and encode its content, e.g. as a base64 data URL, once per URL and encoding.
+
+        Args:
+            url: HTTP(S) URL of the asset
+            encoding: Name of the encoding, the cache key of the encoded content
+            encoder: Function encoding the fetched asset
+
+        Returns:
+            The encoded asset
+
+        Raises:
+            httpx.HTTPError: If the download fails
+        """
+        key = (encoding, url)
+        with self._state_lock:
+            if key in self._encoded:
+                self._encoded.move_to_end(key)
+                return self._encoded[key]
+        value = await self._coalesce(
+            f"encode:{encoding}:{url}", lambda: self._encode(url, encoding, encoder)
+        )
+        self._remember(key, value)
+        return value
+
+    def _loop(self) -> asyncio.AbstractEventLoop:
+        with self._state_lock:
+            # the loop thread does not survive a fork, e.g. into a dataset map worker
+            if self._runner is None or not self._runner[1].is_alive():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="sygra-asset-loader", daemon=True
+                )
+                thread.start()
+                self._runner = (loop, thread)
+            return self._runner[0]
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the background loop of the loader and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop()).result()
+
+    def fetch_sync(self, url: str) -> Asset:
+        """Blocking `fetch`, for synchronous callers."""
+        return self.run(self.fetch(url))
+
+    def encode_many(
+        self, urls: Iterable[str], encoding: str, encoder: Callable[[Asset], Optional[str]]
+    ) -> Dict[str, Optional[str]]:
+        """
+        Concurrently fetch and encode URLs, for synchronous callers.
+
+        Args:
+            urls: HTTP(S) URLs of the assets, duplicates are fetched once
+            encoding: Name of the encoding, the cache key of the encoded content
+            encoder: Function encoding a fetched asset
+
+        Returns:
+            Encoded asset per URL, None for the URLs that could not be fetched or encoded
+        """
+        unique = list(dict.fromkeys(urls))
+        if not unique:
+            return {}
+
+        async def encode_one(url: str) -> Optional[str]:
+            try:
+                return await self.encode(url, encoding, encoder)
+            except Exception as e:
+                logger.warning(f"Failed to load asset from {url}: {e}")
+                return None
+
+        async def encode_all() -> list[Optional[str]]:
+            return await asyncio.gather(*(encode_one(url) for url in unique))
+
+        return dict(zip(unique, self.run(encode_all())))
+
+    def close(self) -> None:
+        """Stop the background loop and release its connections."""
+        with self._state_lock:
+            runner, self._runner = self._runner, None
+            self._encoded.clear()
+        if runner is None:
+            return
+        loop, thread = runner
+        try:
+            asyncio.run_coroutine_threadsafe(HttpConnectionPool.aclose(), loop).result(timeout=5)
+        except Exception as e:
+            logger.debug(f"Failed to close asset loader connections: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
@@ -3,10 +3,9 @@ import io
 import os
 import re
 from pathlib import Path
-from typing import Any, Tuple, Union, cast
+from typing import Any, Optional, Tuple, Union
 
 import numpy as np
-import requests  # type: ignore[import-untyped]
 
 try:
     import soundfile as sf  # type: ignore[import-untyped]
@@ -18,9 +17,25 @@ except ModuleNotFoundError:
 
 
 from sygra.logger.logger_config import logger
+from sygra.utils.asset_loader import Asset, AssetLoader
 
 SUPPORTED_AUDIO_EXTENSIONS = (".wav", ".mp3", ".ogg", ".flac", ".aac", ".m4a", ".aiff")
 
+# file extensions of audio MIME types, the subtype is used for other types
+AUDIO_MIME_EXTENSIONS = {
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/opus": "opus",
+    "audio/aac": "aac",
+    "audio/flac": "flac",
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/pcm": "pcm",
+    "audio/ogg": "ogg",
+    "audio/m4a": "m4a",
+    "audio/aiff": "aiff",
+}
+
 
 def is_data_url(val: Any) -> bool:
     """
@@ -132,7 +147,7 @@ def is_audio_like(val: Any) -> bool:
     )
 
 
-def load_audio(data: Any, timeout: float = 5.0) -> Union[bytes, None]:
+def load_audio(data: Any, timeout: Optional[float] = None) -> Union[bytes, None]:
     """
     Load audio from:
       - raw bytes
@@ -142,7 +157,7 @@ def load_audio(data: Any, timeout: float = 5.0) -> Union[bytes, None]:
 
     Args:
         data (Any): The audio data to load.
-        timeout (float): Timeout for network requests, if applicable.
+        timeout (Optional[float]): Timeout for network requests, the asset loader default if None.
 
     Returns:
         bytes or None: The loaded audio data as raw bytes, or None if loading fails.
@@ -183,9 +198,8 @@ def load_audio(data: Any, timeout: float = 5.0) -> Union[bytes, None]:
         # 3. Remote URL
         if isinstance(data, str) and data.startswith(("http://", "https://")):
             try:
-                response = requests.get(data, timeout=timeout)
-                response.raise_for_status()
-                return cast(bytes, response.content)
+                loader = AssetLoader.shared({"timeout": timeout} if timeout else None)
+                return loader.fetch_sync(data).content
             except Exception:
                 return None
 
@@ -219,6 +233,25 @@ def get_audio_url(audio_bytes: bytes, mime: str = "audio/wav") -> str:
     return f"data:{mime};base64,{b64}"
 
 
+def audio_data_url_encoding(mime: str) -> str:
+    """Name of the data URL encoding of fetched audio of a MIME type, in the asset cache."""
+    return "audio_data_url." + mime.replace("/", "_")
+
+
+def encode_audio_asset(asset: Asset, mime: str = "audio/wav") -> str:
+    """
+    Encode fetched audio as a base64 data URL.
+
+    Args:
+        asset (Asset): The fetched audio.
+        mime (str): The MIME type of the audio data (default is "audio/wav").
+
+    Returns:
+        str: A base64-encoded data URL representing the audio.
+    """
+    return get_audio_url(asset.content, mime=mime)
+
+
 def get_audio_fields(sample_record: dict[str, Any]) -> list[str]:
     """
     Identify audio-like fields in a sample record.
@@ -266,6 +299,19 @@ def expand_audio_item(item: dict[str, Any], state: dict[str, Any]) -> list[dict[
     return expanded
 
 
+def audio_file_extension(mime_type: str) -> str:
+    """
+    File extension of an audio MIME type.
+
+    Args:
+        mime_type (str): The MIME type, e.g. "audio/wav".
+
+    Returns:
+        str: The file extension, without dot.
+    """
+    return AUDIO_MIME_EXTENSIONS.get(mime_type, mime_type.split("/")[-1])
+
+
 def parse_audio_data_url(data_url: str) -> Tuple[str, str, bytes]:
     """
     Parse an audio data URL and extract MIME type, extension, and decoded content.
@@ -295,24 +341,7 @@ def parse_audio_data_url(data_url: str) -> Tuple[str, str, bytes]:
     except Exception as e:
         raise ValueError(f"Failed to decode base64 data: {e}")
 
-    # Determine file extension from MIME type
-    mime_to_ext = {
-        "audio/mpeg": "mp3",
-        "audio/mp3": "mp3",
-        "audio/opus": "opus",
-        "audio/aac": "aac",
-        "audio/flac": "flac",
-        "audio/wav": "wav",
-        "audio/wave": "wav",
-        "audio/pcm": "pcm",
-        "audio/ogg": "ogg",
-        "audio/m4a": "m4a",
-        "audio/aiff": "aiff",
-    }
-
-    file_extension = mime_to_ext.get(mime_type, mime_type.split("/")[-1])
-
-    return mime_type, file_extension, decoded_bytes
+    return mime_type, audio_file_extension(mime_type), decoded_bytes
 
 
 def save_audio_data_url(
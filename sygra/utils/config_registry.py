@@ -0,0 +1,107 @@
+"""
+Process-wide cache of parsed configuration files.
+
+YAML configuration (models.yaml, configuration.yaml, graph_config.yaml of a task) is read by
+every model instance and node of a graph. The registry parses each file once per process and
+hands out immutable views of it; an entry is rebuilt when the stamp it was built for (modification
+time and size of its files) changes, so edits on disk are still picked up.
+"""
+
+import os
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+import yaml  # type: ignore[import-untyped]
+
+
+def freeze(value: Any) -> Any:
+    """Immutable view of a parsed configuration: mappings become read-only, lists tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a frozen configuration, with dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+def file_stamp(filepath: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Modification time (ns) and size of a file, None if it does not exist."""
+    if not filepath:
+        return None
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ConfigRegistry:
+    """
+    Cache of configuration values built from files, keyed by a name and the stamp of their inputs.
+
+    Values are frozen (see `freeze`) as they are shared by every caller; use `thaw` for a copy to
+    modify.
+    """
+
+    _lock = threading.Lock()
+    _entries: Dict[Hashable, Tuple[Hashable, Any]] = {}
+
+    @classmethod
+    def get(cls, key: Hashable, stamp: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Get the cached value of a key, building it if missing or built for another stamp.
+
+        Args:
+            key: Name of the value
+            stamp: Stamp of the inputs of the value, e.g. the file_stamp of its files
+            build: Function building the value from its inputs
+
+        Returns:
+            Frozen value
+        """
+        with cls._lock:
+            entry = cls._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        # concurrent misses may build twice, the value is the same
+        value = freeze(build())
+        with cls._lock:
+            cls._entries[key] = (stamp, value)
+        return value
+
+    @classmethod
+    def load_yaml(cls, filepath: str) -> Any:
+        """
+        Parsed content of a YAML file, parsed again only once the file changes.
+
+        Args:
+            filepath: Path of the YAML file
+
+        Returns:
+            Frozen content of the file
+
+        Raises:
+            FileNotFoundError: The file does not exist
+        """
+        path = os.path.abspath(filepath)
+
+        def parse() -> Any:
+            with open(path) as f:
+                return yaml.safe_load(f)
+
+        return cls.get(("yaml", path), file_stamp(path), parse)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget every cached value."""
+        with cls._lock:
+            cls._entries.clear()
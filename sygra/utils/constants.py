@@ -5,6 +5,15 @@ import sys
 MIXTRAL_API_RATE_LIMIT_ERROR = "rate limit"
 MIXTRAL_API_MODEL_OVERLOAD_ERROR = "model has no capacity"
 INTERMEDIATE = "_intermediate."
+# number of output checkpoints between two fsyncs of the output file (0: fsync only on close)
+DEFAULT_OUTPUT_FSYNC_INTERVAL = 1
+# checkpoints queued for the checkpoint writer before record processing waits for it
+CHECKPOINT_WRITER_MAX_PENDING = 2
+# threads writing the media files extracted from output records, and base64 characters decoded at once
+MEDIA_WRITER_MAX_WORKERS = 4
+MEDIA_DECODE_CHUNK_SIZE = 1 << 20
+# content hashes of written media remembered to link identical media instead of writing them again
+MEDIA_DEDUP_MAX_ENTRIES = 100_000
 
 BACKEND = "langgraph"
 SYGRA_START = sys.intern("__start__")
@@ -57,14 +66,19 @@ CUSTOM_MODELS_CONFIG_YAML = os.environ.get(
     os.path.join(os.path.dirname(ROOT_DIR), "studio", "config", "custom_models.yaml"),
 )
 
-# model failure handling - shutdown the process after some try
+# model failure handling - open the circuit of an endpoint which keeps failing, see circuit_breaker
 HANDLE_SERVER_DOWN = True
 # list of error code to handle - service is down or unavailable
 SERVER_DOWN_ERROR_CODE = [404, 500, 501, 502, 503]
 # validation for last n errors
 MAX_FAILED_ERROR = 10
-# if last n error occurs within t time, action to take(shut down)
+# if last n error occurs within t time, action to take(open the circuit of the endpoint)
 MODEL_FAILURE_WINDOW_IN_SEC = 30
+# circuit openings allowed in a run before it stops (override with circuit_breaker.budget in
+# the model_config section of configuration.yaml)
+CIRCUIT_BREAKER_BUDGET = 10
+# shortest wait of a record parked because of an open circuit, in seconds
+CIRCUIT_BREAKER_MIN_PARK_SECONDS = 1.0
 
 # retry the request for below http errors
 RETRYABLE_HTTP_ERROR = [408, 429, 599, 444]
@@ -82,10 +96,49 @@ META_SAMPLER_CACHE = "sampler_cache"
 META_COMPLETED = "completed"
 META_RECORD_POSITIONS = "record_positions"
 META_TIMESTAMP = "timestamp"
+META_PROCESSED_RANGES = "processed_record_ranges"
+META_SAVE_SEQ = "save_seq"
+# append-only journal of state changes since the last metadata snapshot
+META_JOURNAL_FILE = "metadata.journal"
+# journal is compacted into the snapshot once it holds as many records as the snapshot
+# (and at least this many), which keeps the total cost of saving state linear in run length
+META_JOURNAL_COMPACTION_MIN = 10000
 
 # model request default timeout in seconds
 DEFAULT_TIMEOUT = 120
 
+# shared HTTP connection pool defaults, per endpoint (override with connection_pool in models.yaml)
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# default locations of the opt-in LLM response cache (override with response_cache.path)
+DEFAULT_RESPONSE_CACHE_SQLITE_PATH = os.path.join(".sygra_cache", "llm_responses.sqlite")
+DEFAULT_RESPONSE_CACHE_DISK_PATH = os.path.join(".sygra_cache", "llm_responses")
+
+# default location of the content-addressed cache of fetched media (override with asset_loader.cache_dir)
+DEFAULT_ASSET_CACHE_PATH = os.path.join(".sygra_cache", "assets")
+
+# response codes showing an overloaded model, which lower its adaptive concurrency limit
+# (999 is returned when all retry attempts failed)
+ADAPTIVE_CONCURRENCY_OVERLOAD_CODES = [408, 429, 444, 502, 503, 504, 599, 999]
+
+# response codes counted as failures of a url by the load balancer of a model with several urls
+LOAD_BALANCER_FAILURE_CODES = [404, 500, 501, 502, 503, 504, 599, 999]
+
+# precision of the latency, token and cost sketches of the metadata collector: maximum relative
+# error of the reported percentiles, and maximum number of buckets per sketch
+METADATA_SKETCH_RELATIVE_ACCURACY = 0.01
+METADATA_SKETCH_MAX_BUCKETS = 2048
+
+# metrics buffered by a task (MetadataCollector.buffered) are merged into the collector after this
+# many events or seconds
+METADATA_FLUSH_EVENTS = 1000
+METADATA_FLUSH_INTERVAL_SECONDS = 5.0
+
+# maximum number of records a weighted sampler buffers from a streaming data source
+SAMPLER_STREAM_BUFFER_SIZE = 100000
+
 # separator for list values in environment variables
 LIST_SEPARATOR = "|"
 
@@ -5,6 +5,7 @@ from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph.state import CompiledStateGraph
 
+from sygra.core.models.circuit_breaker import CircuitOpenError
 from sygra.logger.logger_config import logger
 
 if TYPE_CHECKING:
@@ -53,6 +54,9 @@ async def execute_graph(
 
     Returns:
         Graph execution result or error dict.
+
+    Raises:
+        CircuitOpenError: A model of the graph has an open circuit, the record can be retried later.
     """
     if input_record_generator is not None:
         record = input_record_generator(record)
@@ -79,6 +83,9 @@ async def execute_graph(
 
     try:
         return await graph.ainvoke(record, debug=debug, config=config)
+    except CircuitOpenError:
+        # the record is retried once the model endpoint is back, see DatasetProcessor
+        raise
     except Exception as e:
         logger.error(
             f"Exception occured when executing graph for record id {record.get('id', None)}: {e}"
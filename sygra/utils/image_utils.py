@@ -5,11 +5,10 @@ import re
 from pathlib import Path
 from typing import Any, Optional, Tuple
 
-import httpx
-import requests  # type: ignore[import-untyped]
 from PIL import Image
 
 from sygra.logger.logger_config import logger
+from sygra.utils.asset_loader import Asset, AssetLoader
 
 # Curated list of common user-facing image file extensions
 SUPPORTED_IMAGE_EXTENSIONS = (
@@ -25,6 +24,23 @@ SUPPORTED_IMAGE_EXTENSIONS = (
     ".apng",
 )
 
+# file extensions of image MIME types, the subtype is used for other types
+IMAGE_MIME_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/jpg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/bmp": "bmp",
+    "image/tiff": "tiff",
+    "image/tif": "tif",
+    "image/webp": "webp",
+    "image/ico": "ico",
+    "image/apng": "apng",
+}
+
+# name of the data URL encoding of fetched images in the asset cache
+IMAGE_DATA_URL_ENCODING = "image_data_url"
+
 
 def load_image(data: Any) -> Optional[Image.Image]:
     """
@@ -45,9 +61,7 @@ def load_image(data: Any) -> Optional[Image.Image]:
             return Image.open(io.BytesIO(data))
         if isinstance(data, str):
             if data.startswith("http"):
-                response = requests.get(data, timeout=5)
-                response.raise_for_status()
-                return Image.open(io.BytesIO(response.content))
+                return Image.open(io.BytesIO(AssetLoader.shared().fetch_sync(data).content))
             if os.path.exists(data):
                 return Image.open(data)
         logger.warning(f"Unsupported image data format: {type(data)}")
@@ -57,6 +71,20 @@ def load_image(data: Any) -> Optional[Image.Image]:
         return None
 
 
+def encode_image_asset(asset: Asset) -> Optional[str]:
+    """
+    Encode a fetched image as a base64 data URL, the way `get_image_url` encodes loaded images.
+
+    Args:
+        asset (Asset): The fetched image.
+
+    Returns:
+        Optional[str]: The data URL, or None if the content is not a valid image.
+    """
+    image = load_image(asset.content)
+    return get_image_url(image) if image else None
+
+
 def get_image_fields(record: dict[str, Any]) -> list[str]:
     """
     Identify keys in a record that likely contain image data.
@@ -210,6 +238,19 @@ def expand_image_item(item: dict[str, Any], state: dict[str, Any]) -> list[dict[
     return expanded
 
 
+def image_file_extension(mime_type: str) -> str:
+    """
+    File extension of an image MIME type.
+
+    Args:
+        mime_type (str): The MIME type, e.g. "image/png".
+
+    Returns:
+        str: The file extension, without dot.
+    """
+    return IMAGE_MIME_EXTENSIONS.get(mime_type, mime_type.split("/")[-1])
+
+
 def parse_image_data_url(data_url: str) -> Tuple[str, str, bytes]:
     """
     Parse an image data URL and extract MIME type, extension, and decoded content.
@@ -239,23 +280,7 @@ def parse_image_data_url(data_url: str) -> Tuple[str, str, bytes]:
     except Exception as e:
         raise ValueError(f"Failed to decode base64 data: {e}")
 
-    # Determine file extension from MIME type
-    mime_to_ext = {
-        "image/jpeg": "jpg",
-        "image/jpg": "jpg",
-        "image/png": "png",
-        "image/gif": "gif",
-        "image/bmp": "bmp",
-        "image/tiff": "tiff",
-        "image/tif": "tif",
-        "image/webp": "webp",
-        "image/ico": "ico",
-        "image/apng": "apng",
-    }
-
-    file_extension = mime_to_ext.get(mime_type, mime_type.split("/")[-1])
-
-    return mime_type, file_extension, decoded_bytes
+    return mime_type, image_file_extension(mime_type), decoded_bytes
 
 
 def save_image_data_url(
@@ -315,22 +340,21 @@ async def url_to_data_url(url: str, model_name: str = "image_model") -> str:
         str: Base64-encoded data URL
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            image_bytes = response.content
-
-            # Convert to base64
-            b64_encoded = base64.b64encode(image_bytes).decode("utf-8")
-
-            # Determine format from content-type or default to png
-            content_type = response.headers.get("content-type", "image/png")
-            if "image/" in content_type:
-                image_format = content_type.split("/")[-1]
-            else:
-                image_format = "png"
+        # generated images have single-use URLs, they are not kept in the asset cache
+        asset = await AssetLoader.shared().fetch(url, cache=False)
+        image_bytes = asset.content
+
+        # Convert to base64
+        b64_encoded = base64.b64encode(image_bytes).decode("utf-8")
+
+        # Determine format from content-type or default to png
+        content_type = asset.content_type or "image/png"
+        if "image/" in content_type:
+            image_format = content_type.split("/")[-1]
+        else:
+            image_format = "png"
 
-            return f"data:image/{image_format};base64,{b64_encoded}"
+        return f"data:image/{image_format};base64,{b64_encoded}"
     except Exception as e:
         logger.error(f"[{model_name}] Failed to fetch image from URL {url}: {e}")
         # Return original URL as fallback
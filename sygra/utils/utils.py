@@ -4,7 +4,6 @@ import importlib
 import json
 import os
 import re
-import threading
 from pathlib import Path
 from typing import Any, Callable, Optional, Sequence, Union, cast
 
@@ -24,6 +23,7 @@ from sygra.core.dataset.huggingface_handler import HuggingFaceHandler
 from sygra.data_mapper.helper import JSONEncoder
 from sygra.logger.logger_config import logger
 from sygra.utils import constants
+from sygra.utils.config_registry import ConfigRegistry, file_stamp, thaw
 
 
 def load_model_config(config_path: Optional[str] = None, include_custom: bool = True) -> Any:
@@ -42,6 +42,9 @@ def load_model_config(config_path: Optional[str] = None, include_custom: bool =
       Example: "http://url1.com|http://url2.com|http://url3.com"
     - SYGRA_{MODEL_NAME}_TOKEN: Authentication token or API key for the model
 
+    The combined configurations are cached in the ConfigRegistry, and only built again once one of
+    the files or the SYGRA_ environment variables change.
+
     Args:
         config_path: Optional path to additional custom config file.
                      Custom configs override default models.yaml values.
@@ -53,9 +56,33 @@ def load_model_config(config_path: Optional[str] = None, include_custom: bool =
     """
     from sygra.utils.dotenv import load_dotenv
 
-    # Load environment variables from .env file
-    load_dotenv(dotenv_path=".env", override=True)
+    # Load environment variables from .env file, once per change of the file
+    ConfigRegistry.get(
+        ("dotenv", os.path.abspath(".env")),
+        file_stamp(".env"),
+        lambda: load_dotenv(dotenv_path=".env", override=True),
+    )
+
+    # a single pass over the environment, instead of one per model
+    env_vars = tuple(sorted((k, v) for k, v in os.environ.items() if k.startswith("SYGRA_")))
+    stamp = (
+        file_stamp(constants.MODEL_CONFIG_YAML),
+        file_stamp(constants.CUSTOM_MODELS_CONFIG_YAML) if include_custom else None,
+        file_stamp(config_path),
+        env_vars,
+    )
+    configs = ConfigRegistry.get(
+        ("model_config", config_path, include_custom),
+        stamp,
+        lambda: _build_model_config(config_path, include_custom, dict(env_vars)),
+    )
+    return thaw(configs)
+
 
+def _build_model_config(
+    config_path: Optional[str], include_custom: bool, env_vars: dict[str, str]
+) -> Any:
+    """Combine the model configuration files with the SYGRA_ environment variables."""
     # Load base configurations from models.yaml (builtin SyGra models)
     base_configs = load_yaml_file(constants.MODEL_CONFIG_YAML)
 
@@ -79,7 +106,7 @@ def load_model_config(config_path: Optional[str] = None, include_custom: bool =
 
         # Iterate over all env vars for this model
         prefix_with_underscore = f"{env_prefix}_"
-        for env_key, env_val in os.environ.items():
+        for env_key, env_val in env_vars.items():
             if not env_key.startswith(prefix_with_underscore):
                 continue
 
@@ -218,7 +245,7 @@ def get_updated_model_config(model_config: dict) -> dict:
     Returns:
         Updated dictionary containing model configuration parameters
     """
-    config = load_yaml_file(constants.SYGRA_CONFIG)
+    config = ConfigRegistry.load_yaml(constants.SYGRA_CONFIG)
     default_model_config = config.get("model_config", {})
     if "ssl_verify" not in model_config:
         model_config["ssl_verify"] = default_model_config.get("ssl_verify", True)
@@ -226,6 +253,8 @@ def get_updated_model_config(model_config: dict) -> dict:
         ssl_cert = default_model_config.get("ssl_cert", None)
         ssl_cert = ssl_cert if ssl_cert and ssl_cert != "None" else None
         model_config["ssl_cert"] = ssl_cert
+    if "connection_pool" not in model_config and default_model_config.get("connection_pool"):
+        model_config["connection_pool"] = dict(default_model_config["connection_pool"])
     return model_config
 
 
@@ -542,16 +571,25 @@ def get_models_used(task: str):
     return used_model_config
 
 
+# graph factories are stateless, one instance per backend
+_graph_factories: dict[str, Any] = {}
+
+
 def get_graph_factory(backend: str):
+    factory = _graph_factories.get(backend)
+    if factory is not None:
+        return factory
     if backend == "langgraph":
         from sygra.core.graph.langgraph.langgraph_factory import LangGraphFactory
 
-        return LangGraphFactory()
+        factory = _graph_factories[backend] = LangGraphFactory()
+        return factory
     else:
         raise ValueError(f"{backend} is not a supported backend.")
 
 
-def get_graph_properties(task_name: Optional[str] = None) -> Any:
+def _frozen_graph_properties(task_name: Optional[str] = None) -> Any:
+    """Read-only view of the graph properties of a task, parsed once per change of the file."""
     task = task_name or current_task
     if not task:
         logger.error("Current task name is not initialized.")
@@ -565,17 +603,25 @@ def get_graph_properties(task_name: Optional[str] = None) -> Any:
         logger.debug(f"No graph_config.yaml found for task '{task}', using empty graph properties")
         return {}
 
-    yaml_config = load_yaml_file(path)
+    yaml_config = ConfigRegistry.load_yaml(path)
     return yaml_config.get("graph_config", {}).get("graph_properties", {})
 
 
+def get_graph_properties(task_name: Optional[str] = None) -> Any:
+    """
+    Get the graph properties of a task, as a mutable dict
+    If task_name is None, returns the properties of current task
+    """
+    return thaw(_frozen_graph_properties(task_name))
+
+
 def get_graph_property(key: str, default_value: Any, task_name: Optional[str] = None) -> Any:
     """
     Get the graph property value
     If task_name is None, returns the property value from current task
     """
-    props = get_graph_properties(task_name)
-    return props.get(key, default_value)
+    props = _frozen_graph_properties(task_name)
+    return thaw(props[key]) if key in props else default_value
 
 
 def get_dataset(datasrc: dict) -> Union[list[dict[str, Any]], IterableDataset]:
@@ -595,65 +641,14 @@ def get_dataset(datasrc: dict) -> Union[list[dict[str, Any]], IterableDataset]:
     return dataset
 
 
-# Fetch next record from the data source, also maintain sequential call to keep the moving pointer
-# this is used in weighted sampler, to read a column values from datasource dynamically in a sequence
-
-# sampler_cache stores the dataset and pointer to read next record
-# key is the datasource dictionary in string format to make it unique
-# {key: (dataset, pointer)}
-sampler_cache: dict[
-    str,
-    tuple[Union[IterableDataset, list[dict[str, Any]]], int],
-] = {}
-cache_lock = threading.Lock()
-
-
 def fetch_next_record(datasrc: dict, column: str):
-    key = str(datasrc)
-    record: Any = None
-    with cache_lock:
-        if key in sampler_cache:
-            dataset, pointer = sampler_cache[key]
-            # during resume, we store only pointer not dataset object
-            if dataset is None:
-                logger.info(f"Loading dataset again for resume function: {datasrc}")
-                dataset = get_dataset(datasrc)
-            # read the record
-            logger.info(f"Reading {pointer}th index record for sampler.")
-            if isinstance(dataset, IterableDataset):
-                # NOTE: Avoid using stream in sampler, it will be slow
-                index = 0
-                for data in dataset:
-                    if pointer == index:
-                        record = data.get(column)
-                        break
-                    index += 1
-            else:
-                # if pointer reached the end, reset to start
-                # this is only for full dataset or disk based, cant check with stream
-                if pointer >= len(dataset):
-                    logger.info(f"Index {pointer} is out of range, resetting to 0.")
-                    pointer = 0
-                record = dataset[pointer][column]
-            # point to next record
-            pointer = pointer + 1
-        else:
-            dataset = get_dataset(datasrc)
+    """
+    Fetch the next value of a column from a data source, moving sequentially over its records.
+    This is used in weighted sampler, to read a column values from datasource dynamically.
+    """
+    from sygra.core.dataset import sampler_source
 
-            # read first record
-            if isinstance(dataset, IterableDataset):
-                for data in dataset:
-                    record = data.get(column)
-                    break
-            else:
-                record = dataset[0][column]
-            # store next record pointer
-            pointer = 1
-            logger.info("Reading first record(index=0) for sampler.")
-        # save the dataset and updated next pointer
-        sampler_cache[key] = (dataset, pointer)
-    # task is complete, unlock the threads and return
-    return record
+    return sampler_source.fetch_next_value(datasrc, column)
 
 
 def get_class_from(cpath: str) -> Any:
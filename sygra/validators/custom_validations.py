@@ -12,7 +12,7 @@ def validate_is_greater_than(self, field_name: str, other: Any) -> bool:
             )
             return False
         else:
-            logger.info(f"is_greater_than validation passed for field '{field_name}'.")
+            logger.debug(f"is_greater_than validation passed for field '{field_name}'.")
         return True
     except Exception as e:
         logger.error(f"Error during 'is_greater_than' validation for field '{field_name}': {e}")
@@ -28,7 +28,7 @@ def validate_is_equal_to(self, field_name: str, other: Any) -> bool:
             )
             return False
         else:
-            logger.info(f"is_equal_to validation passed for field '{field_name}'.")
+            logger.debug(f"is_equal_to validation passed for field '{field_name}'.")
         return True
     except Exception as e:
         logger.error(f"Error during 'is_equal_to' validation for field '{field_name}': {e}")
@@ -44,7 +44,7 @@ def validate_is_less_than(self, field_name: str, other: Any) -> bool:
             )
             return False
         else:
-            logger.info(f"is_less_than validation passed for field '{field_name}'.")
+            logger.debug(f"is_less_than validation passed for field '{field_name}'.")
         return True
     except Exception as e:
         logger.error(f"Error during 'is_less_than' validation for field '{field_name}': {e}")
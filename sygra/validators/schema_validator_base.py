@@ -1,6 +1,8 @@
+from functools import lru_cache
 from typing import Any, Optional, Type
 
 from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing_extensions import TypedDict
 
 from sygra.core.graph.graph_config import GraphConfig
 from sygra.logger.logger_config import logger
@@ -8,29 +10,36 @@ from sygra.validators import custom_validations as custom_validations
 from sygra.validators.yaml_loader import process_custom_fields, resolve_schema_class
 
 
-class SchemaValidator:
-    _instance = None
+@lru_cache(maxsize=None)
+def get_type_adapter(expected_type: Any) -> TypeAdapter:
+    """
+    Get the pydantic TypeAdapter of a type, built once per type.
 
-    def __new__(cls, *args, **kwargs):
-        """
-        This method is used to create a single instance of SchemaValidator.
-        If an instance already exists, it returns the same instance.
-        """
-        if cls._instance is None:
-            # Create the instance and store it in _instance
-            cls._instance = super(SchemaValidator, cls).__new__(cls)
-        return cls._instance
+    Args:
+        expected_type: Type to validate values against
 
+    Returns:
+        TypeAdapter of the type
+    """
+    return TypeAdapter(expected_type)
+
+
+class SchemaValidator:
     def __init__(self, graph_config: GraphConfig):
         """
         Initializes the SchemaValidator with the given GraphConfig Object.
+
+        The schema is compiled once into a pydantic TypeAdapter validating whole records (and one
+        validating lists of records), so validating a record does not build any validator.
+        Create one validator per run and reuse it for every record.
         """
-        # Avoid reinitializing the object if it's already been initialized
-        if hasattr(self, "initialized") and self.initialized:
-            return
         self.config = graph_config
         self.schema_class: Optional[Type[BaseModel]] = None
         self.fields: list[dict[str, Any]] = []
+        self._record_adapter: Optional[TypeAdapter] = None
+        self._batch_adapter: Optional[TypeAdapter] = None
+        # fields with additional rules, the only ones checked after type validation
+        self._rule_fields: list[dict[str, Any]] = []
 
         # Access schema config from graphConfig object
         schema_config = self.config.schema_config
@@ -56,17 +65,37 @@ class SchemaValidator:
             else:
                 raise RuntimeError("Empty schema config")
         else:
-            logger.warn("Schema config not defined. Running without validation.")
+            logger.warning("Schema config not defined. Running without validation.")
+
+        self._compile()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a schema is configured, without one every record is valid."""
+        return self._record_adapter is not None
+
+    def _compile(self) -> None:
+        """Build the record and batch adapters of the configured schema."""
+        record_type: Any
+        if self.schema_class:
+            record_type = self.schema_class
+        elif self.fields:
+            # a TypedDict checks the presence and type of every field, and ignores other keys
+            fields = {field["name"]: field["type"] for field in self.fields}
+            record_type = TypedDict("SchemaRecord", fields)  # type: ignore[misc, no-redef]
+            self._rule_fields = [field for field in self.fields if set(field) - {"name", "type"}]
+        else:
+            return
+        self._record_adapter = TypeAdapter(record_type)
+        self._batch_adapter = TypeAdapter(list[record_type])
 
     def validate_type(self, field_name: str, field_value, expected_type) -> bool:
         """
         Validate that the field's type matches the expected type using Pydantic.
         """
         try:
-            # Dynamically create a Pydantic model with the field name and expected type
-            # Use TypeAdapter (Pydantic v2) to validate a single value against the expected type
-            adapter = TypeAdapter(expected_type)
-            adapter.validate_python(field_value)
+            # Validate the single value with the cached TypeAdapter of the expected type
+            get_type_adapter(expected_type).validate_python(field_value)
 
             # If validation succeeds, it means the field_value is valid
             return True
@@ -149,22 +178,58 @@ class SchemaValidator:
 
     def validate(self, data: dict) -> bool:
         """
-        Validate the data against the selected schema.
+        Validates the provided data based on the schema class or custom fields.
+        Returns True if valid or if there is no schema, False otherwise.
         """
-        # Override to disable validation check
+        return self.validate_batch([data])[0]
+
+    def validate_batch(self, records: list[dict]) -> list[bool]:
         """
-           Validates the provided data based on the schema class or custom fields.
-           Returns True if valid or if there is no schema, False otherwise.
+        Validate a batch of records against the schema in a single pydantic call.
+
+        Args:
+            records: Records to validate
+
+        Returns:
+            Validity of each record, all True if there is no schema
         """
-        if not (self.schema_class or self.fields):
+        if self._batch_adapter is None:
             logger.debug("Skipping validation, schema_config not defined.")
-            return True
-        if not self.schema_class:
-            logger.info("YAML file based validation triggered. Routing to validateYAML.")
-            return self.validateYAML(data)
+            return [True] * len(records)
+
+        valid = [True] * len(records)
         try:
-            self.schema_class(**data)  # Validate data using the selected schema
-            return True
+            self._batch_adapter.validate_python(records)
         except ValidationError as e:
-            print("Validation Error:", e)  # Raise error if output data didn't match chosen schema
+            record_errors: dict[int, list[str]] = {}
+            for error in e.errors():
+                index, *location = error["loc"]
+                record_errors.setdefault(int(index), []).append(
+                    f"{'.'.join(map(str, location)) or 'record'}: {error['msg']}"
+                )
+            for index, errors in record_errors.items():
+                valid[index] = False
+                logger.error(f"Output record {index} failed schema validation: {'; '.join(errors)}")
+        except Exception as e:
+            # validators of a custom schema may raise more than ValidationError
+            logger.error(f"Error during schema validation of the batch, validating records: {e}")
+            valid = [self._validate_record(record) for record in records]
+
+        if self._rule_fields:
+            for index, record in enumerate(records):
+                if valid[index]:
+                    valid[index] = all(
+                        self.validate_additional_rules(field["name"], field, record[field["name"]])
+                        for field in self._rule_fields
+                    )
+        return valid
+
+    def _validate_record(self, data: dict) -> bool:
+        """Validate the types of a single record with the record adapter."""
+        assert self._record_adapter is not None
+        try:
+            self._record_adapter.validate_python(data)
+            return True
+        except Exception as e:
+            logger.error(f"Output record failed schema validation: {e}")
             return False
@@ -621,6 +621,13 @@ class Workflow:
         self._config["data_config"]["id_column"] = column
         return self
 
+    def id_fields(self, fields: list[str]) -> "Workflow":
+        """Set the fields hashed into the id of records without one."""
+        if "data_config" not in self._config:
+            self._config["data_config"] = {}
+        self._config["data_config"]["id_fields"] = fields
+        return self
+
     def transformations(self, transforms: list[dict[str, Any]]) -> "Workflow":
         """Add data transformations."""
         if "data_config" not in self._config:
@@ -850,6 +857,7 @@ class Workflow:
             output_dir=output_dir,
             batch_size=kwargs.get("batch_size", 50),
             checkpoint_interval=kwargs.get("checkpoint_interval", 100),
+            fsync_interval=kwargs.get("fsync_interval", constants.DEFAULT_OUTPUT_FSYNC_INTERVAL),
             debug=kwargs.get("debug", False),
             resume=kwargs.get("resume", False),
             output_with_ts=kwargs.get("output_with_ts", False),
@@ -909,6 +917,9 @@ class Workflow:
                 output_dir=output_dir or task_name,
                 batch_size=kwargs.get("batch_size", 50),
                 checkpoint_interval=kwargs.get("checkpoint_interval", 100),
+                fsync_interval=kwargs.get(
+                    "fsync_interval", constants.DEFAULT_OUTPUT_FSYNC_INTERVAL
+                ),
                 debug=kwargs.get("debug", False),
                 resume=kwargs.get(
                     "resume",
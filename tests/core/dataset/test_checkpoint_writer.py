@@ -0,0 +1,211 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from sygra.core.dataset.checkpoint_writer import CheckpointWriter
+from sygra.core.dataset.dataset_processor import DatasetProcessor
+
+
+class TestCheckpointWriter(unittest.TestCase):
+    def test_jobs_run_in_order_off_the_event_loop(self):
+        writer = CheckpointWriter(max_pending=4)
+        runs: list[tuple[int, str]] = []
+
+        def job(index: int):
+            time.sleep(0.01 * (5 - index))
+            runs.append((index, threading.current_thread().name))
+            return index
+
+        async def scenario():
+            futures = [await writer.submit(job, i) for i in range(5)]
+            await writer.drain()
+            return [f.result() for f in futures]
+
+        self.assertEqual(asyncio.run(scenario()), list(range(5)))
+        writer.shutdown()
+        self.assertEqual([index for index, _ in runs], list(range(5)))
+        self.assertTrue(all(name.startswith("sygra-checkpoint-writer") for _, name in runs))
+
+    def test_event_loop_keeps_running_during_a_write(self):
+        writer = CheckpointWriter()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        async def scenario():
+            task = asyncio.create_task(ticker())
+            future = await writer.submit(time.sleep, 0.2)
+            await future
+            task.cancel()
+
+        asyncio.run(scenario())
+        writer.shutdown()
+        self.assertGreater(ticks, 10)
+
+    def test_submit_waits_when_the_writer_is_behind(self):
+        writer = CheckpointWriter(max_pending=2)
+        release = threading.Event()
+
+        async def scenario():
+            await writer.submit(release.wait)
+            await writer.submit(lambda: None)
+            third = asyncio.create_task(writer.submit(lambda: None))
+            await asyncio.sleep(0.05)
+            self.assertFalse(third.done())
+            release.set()
+            await third
+            await writer.drain()
+
+        asyncio.run(scenario())
+        writer.shutdown()
+        self.assertEqual(writer.pending, 0)
+
+    def test_drain_keeps_job_errors_on_their_futures(self):
+        writer = CheckpointWriter()
+
+        def fail():
+            raise RuntimeError("disk full")
+
+        async def scenario():
+            future = await writer.submit(fail)
+            await writer.drain()
+            return future
+
+        future = asyncio.run(scenario())
+        writer.shutdown()
+        self.assertIsInstance(future.exception(), RuntimeError)
+
+
+class TestDatasetProcessorCheckpoints(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.tmp_dir.name, "output.jsonl")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _processor(
+        self, records: list[dict[str, Any]], schema_config: Optional[dict] = None
+    ) -> DatasetProcessor:
+        graph_config = MagicMock()
+        graph_config.oasst_mapper = {"required": "no"}
+        graph_config.config = {}
+        graph_config.schema_config = schema_config
+        return DatasetProcessor(
+            records,
+            graph=MagicMock(),
+            graph_config=graph_config,
+            output_file=self.output_file,
+            num_records_total=len(records),
+            batch_size=2,
+            checkpoint_interval=4,
+        )
+
+    @staticmethod
+    async def _execute_graph(record: dict, *args, **kwargs) -> dict:
+        return {"id": record["id"], "answer": f"answer {record['id']}"}
+
+    def test_checkpoints_are_written_off_the_event_loop(self):
+        records = [{"id": i} for i in range(1, 11)]
+        processor = self._processor(records)
+        loop_thread = threading.get_ident()
+        write_threads = set()
+        write = processor._write_checkpoint_records
+
+        def recording_write(*args):
+            write_threads.add(threading.get_ident())
+            return write(*args)
+
+        with (
+            patch("sygra.utils.graph_utils.execute_graph", self._execute_graph),
+            patch.object(processor, "_write_checkpoint_records", recording_write),
+        ):
+            processor.process_and_store_results()
+
+        with open(self.output_file) as f:
+            written = [json.loads(line)["id"] for line in f]
+        self.assertEqual(sorted(written), list(range(1, 11)))
+        self.assertNotIn(loop_thread, write_threads)
+
+    def test_records_failing_schema_validation_are_skipped(self):
+        schema_config = {
+            "fields": [{"name": "id", "type": "int"}, {"name": "answer", "type": "str"}]
+        }
+        processor = self._processor([{"id": i} for i in range(1, 11)], schema_config)
+
+        async def execute_graph(record: dict, *args, **kwargs) -> dict:
+            # even records miss their answer
+            return {"id": record["id"], "answer": None if record["id"] % 2 == 0 else "answer"}
+
+        with patch("sygra.utils.graph_utils.execute_graph", execute_graph):
+            processor.process_and_store_results()
+
+        with open(self.output_file) as f:
+            written = [json.loads(line)["id"] for line in f]
+        self.assertEqual(sorted(written), [1, 3, 5, 7, 9])
+        self.assertEqual((processor.num_records_processed, processor.failed_records), (5, 5))
+
+    def test_resumable_records_are_marked_after_their_checkpoint(self):
+        processor = self._processor([{"id": i} for i in range(4)])
+        processor.resumable = True
+        resume_manager = processor.resume_manager = MagicMock()
+        resume_manager.get_record_id.side_effect = lambda record: str(record["id"])
+        release = threading.Event()
+        write = processor._write_checkpoint_records
+
+        def slow_write(*args):
+            release.wait()
+            return write(*args)
+
+        async def scenario():
+            with patch.object(processor, "_write_checkpoint_records", slow_write):
+                for i in range(4):
+                    processor.graph_results.append({"id": i})
+                    processor._checkpoint_records.append(({"id": i}, i))
+                await processor._write_checkpoint(False)
+                await asyncio.sleep(0.05)
+                resume_manager.mark_record_processed.assert_not_called()
+                release.set()
+                await processor._checkpoint_writer.drain()
+
+        asyncio.run(scenario())
+        processor._close_output_writers()
+        self.assertEqual(resume_manager.mark_record_processed.call_count, 4)
+        resume_manager.force_save_state.assert_called()
+
+    def test_failed_checkpoint_records_are_not_marked(self):
+        processor = self._processor([{"id": 0}])
+        processor.resumable = True
+        resume_manager = processor.resume_manager = MagicMock()
+
+        async def scenario():
+            with patch.object(
+                processor, "_write_checkpoint_records", side_effect=OSError("disk full")
+            ):
+                processor.graph_results.append({"id": 0})
+                processor._checkpoint_records.append(({"id": 0}, 0))
+                await processor._write_checkpoint(False)
+                await processor._checkpoint_writer.drain()
+
+        asyncio.run(scenario())
+        processor._close_output_writers()
+        resume_manager.mark_record_processed.assert_not_called()
+        resume_manager.in_process_records.discard.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from sygra.core.dataset.output_writer import (
+    JsonArrayOutputWriter,
+    JsonlOutputWriter,
+    get_output_writer,
+)
+
+
+class TestOutputWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_get_output_writer_by_extension(self):
+        self.assertIsInstance(get_output_writer(self._path("out.jsonl")), JsonlOutputWriter)
+        self.assertIsInstance(get_output_writer(self._path("out.json")), JsonArrayOutputWriter)
+
+    def test_json_array_is_valid_after_every_append(self):
+        path = self._path("out.json")
+        records = [{"id": i, "text": f"héllo\n{i}", "nested": {"a": [i]}} for i in range(7)]
+        with JsonArrayOutputWriter(path) as writer:
+            writer.append(records[:3])
+            with open(path) as f:
+                self.assertEqual(json.load(f), records[:3])
+            writer.append([])
+            writer.append(records[3:])
+            with open(path) as f:
+                self.assertEqual(json.load(f), records)
+        # same layout as a single json.dump of the whole list
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), json.dumps(records, indent=4, ensure_ascii=False))
+
+    def test_json_array_resumes_existing_file(self):
+        path = self._path("out.json")
+        with open(path, "w") as f:
+            json.dump([{"id": 0}], f, indent=4)
+            f.write("\n\n")
+        with JsonArrayOutputWriter(path) as writer:
+            writer.append([{"id": 1}])
+        with open(path) as f:
+            self.assertEqual(json.load(f), [{"id": 0}, {"id": 1}])
+
+        empty_path = self._path("empty.json")
+        with open(empty_path, "w") as f:
+            f.write("[ ]")
+        with JsonArrayOutputWriter(empty_path) as writer:
+            writer.append([{"id": 1}])
+        with open(empty_path) as f:
+            self.assertEqual(json.load(f), [{"id": 1}])
+
+    def test_json_array_rejects_non_array_file(self):
+        path = self._path("out.json")
+        with open(path, "w") as f:
+            json.dump({"id": 0}, f)
+        with self.assertRaises(ValueError):
+            JsonArrayOutputWriter(path).append([{"id": 1}])
+
+    def test_json_array_only_writes_the_new_batch(self):
+        path = self._path("out.json")
+        with JsonArrayOutputWriter(path) as writer:
+            writer.append([{"id": i, "payload": "x" * 100} for i in range(1000)])
+            size_before = os.path.getsize(path)
+            with patch("builtins.open", side_effect=AssertionError("file reopened")):
+                writer.append([{"id": 1000}])
+            batch_bytes = os.path.getsize(path) - size_before
+        self.assertLess(batch_bytes, 50)
+
+    def test_jsonl_append(self):
+        path = self._path("out.jsonl")
+        with JsonlOutputWriter(path) as writer:
+            writer.append([{"id": 0}, {"id": 1}])
+        with JsonlOutputWriter(path) as writer:
+            writer.append([{"id": 2}])
+        with open(path) as f:
+            self.assertEqual([json.loads(line) for line in f], [{"id": i} for i in range(3)])
+
+    def test_fsync_cadence(self):
+        path = self._path("out.jsonl")
+        with patch("sygra.core.dataset.output_writer.os.fsync") as mock_fsync:
+            writer = JsonlOutputWriter(path, fsync_interval=3)
+            for i in range(7):
+                writer.append([{"id": i}])
+            self.assertEqual(mock_fsync.call_count, 2)
+            writer.close()
+            self.assertEqual(mock_fsync.call_count, 3)
+            self.assertTrue(writer.closed)
+
+        with patch("sygra.core.dataset.output_writer.os.fsync") as mock_fsync:
+            with JsonlOutputWriter(path, fsync_interval=0) as writer:
+                writer.append([{"id": 0}])
+                mock_fsync.assert_not_called()
+            mock_fsync.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import math
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+import numpy as np
+from PIL import Image
+
+from sygra.core.dataset.record_id import content_id, has_id, record_id
+
+
+class TestRecordId(unittest.TestCase):
+    def test_content_id_ignores_field_order_and_id(self):
+        record = {"a": 1, "b": {"x": [1, 2], "y": "text"}}
+        same = {"b": {"y": "text", "x": [1, 2]}, "a": 1, "id": None}
+        self.assertEqual(content_id(record), content_id(same))
+        self.assertEqual(len(content_id(record)), 32)
+
+    def test_content_id_distinguishes_types_and_structure(self):
+        ids = {
+            content_id({"a": value})
+            for value in (1, 1.0, "1", True, None, [1], (1, 1), b"1", np.int32(2))
+        }
+        self.assertEqual(len(ids), 9)
+        self.assertNotEqual(content_id({"a": ["b", "c"]}), content_id({"a": ["bc"]}))
+        self.assertNotEqual(content_id({"a": "b"}), content_id({"ab": ""}))
+        self.assertEqual(content_id({"a": math.nan}), content_id({"a": float("nan")}))
+
+    def test_content_id_of_binary_values(self):
+        array = np.arange(6, dtype=np.float32)
+        self.assertEqual(content_id({"a": array}), content_id({"a": array.copy()}))
+        self.assertNotEqual(content_id({"a": array}), content_id({"a": array.reshape(2, 3)}))
+        self.assertNotEqual(content_id({"a": array}), content_id({"a": array.astype(np.float64)}))
+
+        black = Image.new("RGB", (2, 2))
+        self.assertEqual(content_id({"img": black}), content_id({"img": Image.new("RGB", (2, 2))}))
+        self.assertNotEqual(
+            content_id({"img": black}), content_id({"img": Image.new("RGB", (2, 2), "white")})
+        )
+
+    def test_id_fields(self):
+        first = {"question": "q", "image": b"\x00" * 1024}
+        second = {"question": "q", "image": b"\x01" * 1024}
+        self.assertNotEqual(content_id(first), content_id(second))
+        self.assertEqual(content_id(first, ["question"]), content_id(second, ["question"]))
+
+    def test_records_without_id_fields_are_hashed_whole(self):
+        self.assertNotEqual(content_id({"a": 1, "b": 2}, ["x"]), content_id({"a": 3}, ["x"]))
+        self.assertNotEqual(
+            content_id({"a": 1, "x": None}, ["x"]), content_id({"a": 3, "x": None}, ["x"])
+        )
+        self.assertEqual(content_id({"a": 1}, ["x"]), content_id({"a": 1}))
+        # records with some of the id fields are hashed on those
+        self.assertEqual(
+            content_id({"a": 1, "x": 5}, ["x", "y"]), content_id({"a": 2, "x": 5}, ["x", "y"])
+        )
+
+    def test_record_id_prefers_explicit_id(self):
+        self.assertTrue(has_id({"id": 0}))
+        self.assertFalse(has_id({"id": ""}))
+        self.assertEqual(record_id({"id": 0, "a": 1}), "0")
+        self.assertEqual(record_id({"id": None, "a": 1}), content_id({"a": 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from datasets import IterableDataset
+
+from sygra.core.dataset import sampler_source
+from sygra.core.dataset.sampler_source import ColumnStore, SamplerSource
+from sygra.core.graph.nodes.weighted_sampler_node import WeightedSamplerNode
+
+DATASRC = {"type": "disk", "file_path": "personas.jsonl"}
+RECORDS = [{"persona": f"persona {i}", "meta": {"id": i}} for i in range(5)]
+
+
+class TestColumnStore(unittest.TestCase):
+    def test_random_access(self):
+        values = ["text", {"nested": [1, 2]}, None, 3.5, "ünïcode"]
+        store = ColumnStore(values)
+        self.assertEqual(len(store), len(values))
+        self.assertEqual([store[i] for i in (4, 0, 2, 1, 3)], [values[i] for i in (4, 0, 2, 1, 3)])
+        with self.assertRaises(IndexError):
+            store[len(values)]
+        store.close()
+
+    def test_empty_column(self):
+        store = ColumnStore([])
+        self.assertEqual(len(store), 0)
+        with self.assertRaises(IndexError):
+            store[0]
+        store.close()
+
+
+class TestSamplerSource(unittest.TestCase):
+    def setUp(self):
+        sampler_source.reset()
+
+    def tearDown(self):
+        sampler_source.reset()
+
+    @patch("sygra.utils.utils.get_dataset", return_value=RECORDS)
+    def test_sequential_values_loop_back(self, mock_get_dataset):
+        values = [sampler_source.fetch_next_value(DATASRC, "persona") for _ in range(7)]
+        self.assertEqual(values, [f"persona {i}" for i in (0, 1, 2, 3, 4, 0, 1)])
+        # a second column shares the cursor and the loaded dataset
+        self.assertEqual(sampler_source.fetch_next_value(DATASRC, "meta"), {"id": 2})
+        mock_get_dataset.assert_called_once_with(DATASRC)
+
+    def test_stream_source_is_buffered(self):
+        def generate():
+            for i in range(1000):
+                yield {"persona": f"persona {i}"}
+
+        with patch(
+            "sygra.utils.utils.get_dataset",
+            return_value=IterableDataset.from_generator(generate),
+        ):
+            source = SamplerSource(DATASRC, buffer_size=3)
+            values = [source.next_value("persona") for _ in range(4)]
+        self.assertEqual(values, ["persona 0", "persona 1", "persona 2", "persona 0"])
+
+    @patch("sygra.utils.utils.get_dataset", return_value=RECORDS)
+    def test_restore_pointers(self, mock_get_dataset):
+        sampler_source.fetch_next_value(DATASRC, "persona")
+        other = {"type": "disk", "file_path": "other.jsonl"}
+        sampler_source.restore_pointers({str(other): 4})
+        self.assertEqual(sampler_source.get_pointers(), {str(DATASRC): 1, str(other): 4})
+
+        sampler_source.reset()
+        sampler_source.restore_pointers({str(DATASRC): 3})
+        self.assertEqual(sampler_source.fetch_next_value(DATASRC, "persona"), "persona 3")
+        self.assertEqual(sampler_source.get_pointers(), {str(DATASRC): 4})
+
+
+class TestWeightedSamplerNode(unittest.TestCase):
+    def setUp(self):
+        sampler_source.reset()
+
+    def tearDown(self):
+        sampler_source.reset()
+
+    def _node(self, seed=None):
+        return WeightedSamplerNode(
+            "sampler",
+            {
+                "node_type": "weighted_sampler",
+                "seed": seed,
+                "attributes": {
+                    "tone": {"values": ["formal", "casual", "friendly"], "weights": [5, 0, 1]},
+                    "role": {"values": {"column": ["persona"], "source": DATASRC}},
+                },
+            },
+        )
+
+    @patch("sygra.utils.utils.get_dataset", return_value=RECORDS)
+    def test_seeded_sampling_is_reproducible(self, mock_get_dataset):
+        attributes = self._node().node_config["attributes"]
+        node_a, node_b = self._node(seed=7), self._node(seed=7)
+        tones_a = [node_a._weighted_sampler(attributes, {})["tone"] for _ in range(20)]
+        tones_b = [node_b._weighted_sampler(attributes, {})["tone"] for _ in range(20)]
+        self.assertEqual(tones_a, tones_b)
+        # zero weight values are never sampled
+        self.assertNotIn("casual", tones_a)
+
+    @patch("sygra.utils.utils.get_dataset", return_value=RECORDS)
+    def test_data_source_attribute(self, mock_get_dataset):
+        node = self._node()
+        roles = [
+            node._weighted_sampler(node.node_config["attributes"], {})["role"] for _ in range(3)
+        ]
+        self.assertEqual(roles, ["persona 0", "persona 1", "persona 2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
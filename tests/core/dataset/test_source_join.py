@@ -0,0 +1,137 @@
+import random
+import sys
+import tracemalloc
+import unittest
+from itertools import islice
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from datasets import IterableDataset
+
+from sygra.core.dataset.source_join import (
+    SecondarySource,
+    alias_record,
+    join_sources,
+    joined_size,
+    lazy_dataset,
+    stacked_size,
+    vstack_sources,
+)
+
+STUDENTS = [{"roll": 1, "name": "John"}, {"roll": 2, "name": "Johny"}, {"roll": 3, "name": "Jo"}]
+
+
+def join(secondary: SecondarySource, primary=STUDENTS) -> list[dict]:
+    return list(join_sources(primary, "student", [secondary]))
+
+
+class TestSourceJoin(unittest.TestCase):
+    def test_alias_record(self):
+        self.assertEqual(alias_record({"roll": 1}, "student"), {"student->roll": 1})
+        # already aliased records are kept as they are
+        record = {"student->roll": 1, "name": "John"}
+        self.assertIs(alias_record(record, "student"), record)
+
+    def test_sequential_join_loops_back_or_truncates(self):
+        classes = SecondarySource([{"class": 5}, {"class": 6}], "class", "sequential")
+        self.assertEqual([r["class->class"] for r in join(classes)], [5, 6, 5])
+        self.assertEqual(
+            join(classes)[0], {"student->roll": 1, "student->name": "John", "class->class": 5}
+        )
+
+        classes = SecondarySource([{"class": c} for c in range(5, 10)], "class", "sequential")
+        self.assertEqual([r["class->class"] for r in join(classes)], [5, 6, 7])
+
+    def test_random_join_uses_every_record_once_first(self):
+        sports = [{"sport": s} for s in ("cricket", "football")]
+        source = SecondarySource(sports, "sport", "random", rng=random.Random(0))
+        joined = [r["sport->sport"] for r in join(source)]
+        self.assertEqual(len(joined), 3)
+        self.assertEqual(sorted(joined[:2]), ["cricket", "football"])
+        self.assertIn(joined[2], ("cricket", "football"))
+
+        source = SecondarySource([{"n": n} for n in range(10)], "n", "random")
+        self.assertEqual(len(set(r["n->n"] for r in join(source))), 3)
+
+    def test_cross_join(self):
+        source = SecondarySource([{"class": 5}, {"class": 6}], "class", "cross")
+        joined = [(r["student->roll"], r["class->class"]) for r in join(source)]
+        self.assertEqual(joined, [(1, 5), (1, 6), (2, 5), (2, 6), (3, 5), (3, 6)])
+
+    def test_column_join_is_a_left_join(self):
+        marks = [
+            {"roll": 2, "marks": 10},
+            {"roll": 3, "marks": 20},
+            {"roll": 2, "marks": 30},
+        ]
+        source = SecondarySource(marks, "marks", "column", primary_key="roll", join_key="roll")
+        joined = [(r["student->roll"], r["marks->marks"]) for r in join(source)]
+        self.assertEqual(joined, [(1, None), (2, 10), (2, 30), (3, 20)])
+
+    def test_joins_apply_in_order(self):
+        classes = SecondarySource([{"class": 5}, {"class": 6}], "class", "cross")
+        teams = SecondarySource([{"team": t} for t in "abc"], "team", "sequential")
+        joined = list(join_sources(STUDENTS[:2], "student", [classes, teams]))
+        # the sequential join runs over the records of the cross join
+        self.assertEqual([r["team->team"] for r in joined], ["a", "b", "c", "a"])
+
+    def test_empty_secondary(self):
+        with self.assertRaises(ValueError):
+            SecondarySource([], "class", "sequential")
+        with self.assertRaises(ValueError):
+            SecondarySource([{"class": 5}], "class", "unknown")
+        self.assertEqual(join(SecondarySource([], "class", "cross")), [])
+
+    def test_vstack_keeps_common_fields(self):
+        def generate():
+            yield {"a": 5, "c": 6}
+
+        stream = IterableDataset.from_generator(generate)
+        stacked = list(vstack_sources([[{"a": 1, "b": 2}, {"a": 3}], stream]))
+        self.assertEqual(stacked, [{"a": 1}, {"a": 3}, {"a": 5}])
+
+    def test_joined_size_counts_without_joining(self):
+        marks = [{"roll": 2, "marks": 10}, {"roll": 3, "marks": 20}, {"roll": 2, "marks": 30}]
+        secondaries = [
+            SecondarySource(marks, "marks", "column", primary_key="roll", join_key="roll"),
+            SecondarySource([{"class": 5}, {"class": 6}], "class", "cross"),
+            SecondarySource([{"team": "a"}], "team", "sequential"),
+        ]
+        joined = list(join_sources(STUDENTS, "student", secondaries))
+        self.assertEqual(joined_size(STUDENTS, "student", secondaries), len(joined))
+        self.assertEqual(joined_size(STUDENTS, "student", secondaries[1:]), 6)
+
+        stream = IterableDataset.from_generator(lambda: iter(STUDENTS))
+        self.assertIsNone(joined_size(stream, "student", secondaries))
+        self.assertEqual(stacked_size([STUDENTS, marks]), 6)
+        self.assertIsNone(stacked_size([STUDENTS, stream]))
+
+    def test_lazy_dataset_iterates_again(self):
+        dataset = lazy_dataset(join_sources, primary=STUDENTS, primary_alias="s", secondaries=[])
+        self.assertEqual(list(dataset), list(dataset))
+        self.assertEqual(next(iter(dataset.skip(2))), {"s->roll": 3, "s->name": "Jo"})
+
+    def test_cross_join_memory_is_bounded(self):
+        size = 100_000
+
+        def records(prefix: str):
+            for i in range(size):
+                yield {"id": i, "text": f"{prefix} record {i} " + "x" * 64}
+
+        tracemalloc.start()
+        try:
+            secondary = SecondarySource(records("secondary"), "b", "cross")
+            joined = join_sources(records("primary"), "a", [secondary])
+            count = sum(1 for _ in islice(joined, 2 * size))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            secondary.close()
+        self.assertEqual(count, 2 * size)
+        # the 2 * 10^5 joined records take ~90MB as a list, the join itself under 1MB
+        self.assertLess(peak, 8 * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
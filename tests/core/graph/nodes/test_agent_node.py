@@ -0,0 +1,92 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langgraph.prebuilt import create_react_agent
+
+from sygra.core.graph.nodes.agent_node import AgentNode
+
+
+class RecordingChatModel(BaseChatModel):
+    """Fake chat model which records the messages of every request."""
+
+    requests: list = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "RecordingChatModel":
+        return self
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.requests.append(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("done"))])
+
+
+class TestAgentNodeGraphReuse(unittest.TestCase):
+    """Unit tests for the reuse of compiled agent graphs in AgentNode"""
+
+    def setUp(self):
+        with (
+            patch.object(AgentNode, "_initialize_model"),
+            patch("sygra.core.graph.nodes.llm_node.utils.get_graph_properties", return_value={}),
+        ):
+            self.node = AgentNode(
+                "agent_node",
+                {
+                    "node_type": "agent",
+                    "model": {},
+                    "prompt": [{"system": "You are a {persona}."}, {"user": "{question}"}],
+                },
+            )
+        self.node.model = RecordingChatModel(requests=[])
+
+    def _run(self, persona: str, agent_name: Optional[str] = None) -> dict[str, Any]:
+        state = {"persona": persona, "question": "Why?", "messages": []}
+        if agent_name:
+            state["_agent_name"] = agent_name
+        with patch.object(AgentNode, "_record_execution_metadata"):
+            return asyncio.run(self.node._exec_wrapper(state))
+
+    @patch("sygra.core.graph.nodes.agent_node.create_react_agent", wraps=create_react_agent)
+    def test_agent_graph_is_compiled_once(self, mock_create_agent):
+        outputs = [self._run("teacher"), self._run("pirate")]
+
+        mock_create_agent.assert_called_once()
+        self.assertEqual([o["messages"][0].content for o in outputs], ["done", "done"])
+        # each record still gets its own system prompt
+        self.assertEqual(
+            [[(type(m), m.content) for m in request] for request in self.node.model.requests],
+            [
+                [(SystemMessage, "You are a teacher."), (HumanMessage, "Why?")],
+                [(SystemMessage, "You are a pirate."), (HumanMessage, "Why?")],
+            ],
+        )
+
+    @patch("sygra.core.graph.nodes.agent_node.create_react_agent", wraps=create_react_agent)
+    def test_agent_graph_per_agent_name(self, mock_create_agent):
+        self._run("teacher", agent_name="first")
+        self._run("teacher", agent_name="second")
+        self._run("pirate", agent_name="first")
+
+        self.assertEqual(mock_create_agent.call_count, 2)
+        self.assertEqual(set(self.node._agents), {"first", "second"})
+
+
+if __name__ == "__main__":
+    unittest.main()
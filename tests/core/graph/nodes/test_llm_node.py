@@ -3,6 +3,8 @@ import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+from langchain_core.messages import HumanMessage, SystemMessage
+
 # Ensure project root is on sys.path similar to other tests
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
@@ -70,5 +72,68 @@ class TestLLMNodeToolsInitialization(unittest.TestCase):
         self.assertEqual(node.tools, [])
 
 
+class TestLLMNodePromptCompilation(unittest.TestCase):
+    """Unit tests for the precompiled prompt templates of LLMNode"""
+
+    @patch("sygra.core.graph.nodes.llm_node.LLMNode._initialize_model")
+    def _node(self, prompt, mock_init_model):
+        return LLMNode("llm_node", {"node_type": "llm", "model": {}, "prompt": prompt})
+
+    def test_prompt_is_compiled_once(self):
+        node = self._node(
+            [{"system": "You are a {persona}"}, {"user": "Question: {question}"}],
+        )
+        state = {"persona": "tutor", "question": "why?", "messages": [], "unused": "x" * 100}
+
+        self.assertIsNone(node._prompt_tmpl)
+        self.assertIs(node._generate_prompt(state), node._generate_prompt({**state}))
+        self.assertEqual(
+            set(node._prompt_tmpl.input_variables), {"persona", "question", "messages"}
+        )
+        with patch.object(
+            type(node._prompt_tmpl), "invoke", autospec=True, return_value=None
+        ) as mock_invoke:
+            node._format_prompt(state)
+        mock_invoke.assert_called_once_with(
+            node._prompt_tmpl, {"persona": "tutor", "question": "why?", "messages": []}
+        )
+
+        prompt = node._format_prompt({**state, "messages": [HumanMessage("follow up")]})
+        self.assertEqual(
+            prompt.to_messages(),
+            [
+                SystemMessage("You are a tutor"),
+                HumanMessage("Question: why?"),
+                HumanMessage("follow up"),
+            ],
+        )
+
+    def test_missing_variable_raises(self):
+        node = self._node([{"user": "Question: {question}"}])
+        with self.assertRaises(KeyError):
+            node._format_prompt({"messages": []})
+
+    def test_multimodal_prompt_is_expanded_per_record(self):
+        node = self._node(
+            [
+                {
+                    "user": [
+                        {"type": "text", "text": "Describe {subject}"},
+                        {"type": "image_url", "image_url": "{images}"},
+                    ]
+                }
+            ],
+        )
+
+        for images in (["http://a.png", "http://b.png"], ["http://c.png"]):
+            prompt = node._format_prompt({"subject": "cats", "images": images, "messages": []})
+            content = prompt.to_messages()[0].content
+            self.assertEqual(content[0], {"type": "text", "text": "Describe cats"})
+            self.assertEqual([item["image_url"]["url"] for item in content[1:]], images)
+        self.assertIsNone(node._prompt_tmpl)
+        # the node's prompt config is left untouched by the expansion
+        self.assertEqual(node._prompt_messages[0]["content"][1]["image_url"], "{images}")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from sygra.core.graph.nodes.multi_llm_node import MultiLLMNode
+
+
+class FakeLLMNode:
+    """LLM node stand-in which answers after the latency configured for its model."""
+
+    def __init__(self, node_name: str, config: dict):
+        self.latency: float = config["model"]["latency"]
+        self.error: Optional[str] = config["model"].get("error")
+        self.label: str = config["model"]["name"]
+        self.cancelled = False
+
+    async def _exec_wrapper(self, state: dict[str, Any]) -> dict[str, Any]:
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise RuntimeError(self.error)
+        return {"messages": f"{self.label} answer"}
+
+
+class TestMultiLLMNodeFanOut(unittest.TestCase):
+    """Unit tests for the concurrent execution of the models of a MultiLLMNode"""
+
+    LATENCIES = {"fast": 0.05, "medium": 0.1, "slow": 0.2}
+
+    def _node(self, latencies: Optional[dict[str, float]] = None, **config) -> MultiLLMNode:
+        models = {
+            label: {"name": label, "latency": latency}
+            for label, latency in (latencies or self.LATENCIES).items()
+        }
+        with patch("sygra.core.graph.nodes.multi_llm_node.LLMNode", FakeLLMNode):
+            return MultiLLMNode(
+                "multi_llm",
+                {"node_type": "multi_llm", "prompt": [], "models": models, **config},
+            )
+
+    def _run(self, node: MultiLLMNode) -> tuple[dict[str, Any], float]:
+        start = time.perf_counter()
+        with patch.object(MultiLLMNode, "_record_execution_metadata"):
+            result = asyncio.run(node._exec_wrapper({}))
+        return result, time.perf_counter() - start
+
+    def test_latency_is_close_to_the_slowest_model(self):
+        result, elapsed = self._run(self._node())
+
+        self.assertEqual(
+            result,
+            {"messages": [{label: f"{label} answer" for label in self.LATENCIES}]},
+        )
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, sum(self.LATENCIES.values()))
+
+    def test_max_concurrency(self):
+        _, elapsed = self._run(self._node({"a": 0.1, "b": 0.1, "c": 0.1}, max_concurrency=1))
+        self.assertGreaterEqual(elapsed, 0.3)
+
+    def test_first_k(self):
+        node = self._node(completion_policy="first_k", k=2)
+        result, elapsed = self._run(node)
+
+        self.assertEqual(list(result["messages"][0]), ["fast", "medium"])
+        self.assertLess(elapsed, 0.2)
+        self.assertTrue(node.llm_dict["slow"].cancelled)
+
+    def test_quorum_skips_failed_models(self):
+        latencies = {"broken": 0.01, "fast": 0.05, "slow": 0.2}
+        node = self._node(latencies, completion_policy="quorum")
+        node.llm_dict["broken"].error = "model down"
+        result, _ = self._run(node)
+        self.assertEqual(list(result["messages"][0]), ["fast", "slow"])
+
+        node = self._node(latencies, completion_policy="quorum", k=3)
+        node.llm_dict["broken"].error = "model down"
+        with self.assertRaisesRegex(RuntimeError, "model down"):
+            self._run(node)
+
+    def test_wait_all_timeout_returns_partial_result(self):
+        result, elapsed = self._run(self._node(timeout=0.15))
+        self.assertEqual(list(result["messages"][0]), ["fast", "medium"])
+        self.assertLess(elapsed, 0.2)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self._run(self._node(timeout=0.01))
+
+    def test_wait_all_fails_on_model_error(self):
+        node = self._node()
+        node.llm_dict["fast"].error = "model down"
+        with self.assertRaisesRegex(RuntimeError, "model down"):
+            self._run(node)
+        self.assertTrue(node.llm_dict["slow"].cancelled)
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            self._node(completion_policy="fastest")
+        with self.assertRaises(ValueError):
+            self._node(completion_policy="first_k")
+        with self.assertRaises(ValueError):
+            self._node(completion_policy="quorum", k=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# Add the parent directory to sys.path to import the necessary modules
+sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent))
+
+from sygra.core.models.client.connection_pool import ConnectionPoolConfig, HttpConnectionPool
+from sygra.core.models.client.http_client import HttpClient
+
+
+class CountingHttpServer:
+    """Minimal keep-alive HTTP/1.1 server that counts accepted TCP connections"""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/generate"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                content_length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode().partition(":")
+                    if name.strip().lower() == "content-length":
+                        content_length = int(value.strip())
+                if content_length:
+                    await reader.readexactly(content_length)
+                self.requests += 1
+                body = b'{"generated_text": "ok"}'
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+class TestConnectionPoolConfig(unittest.TestCase):
+    def test_defaults(self):
+        config = ConnectionPoolConfig()
+        self.assertEqual(config.max_connections, 100)
+        self.assertEqual(config.max_keepalive_connections, 20)
+        self.assertFalse(config.http2)
+
+    def test_from_model_config(self):
+        config = ConnectionPoolConfig.from_model_config(
+            {"name": "m", "connection_pool": {"max_connections": 8, "http2": True}}
+        )
+        self.assertEqual(config.max_connections, 8)
+        self.assertTrue(config.http2)
+        self.assertEqual(
+            ConnectionPoolConfig.from_model_config({"name": "m"}), ConnectionPoolConfig()
+        )
+
+
+class TestHttpConnectionPool(unittest.TestCase):
+    def tearDown(self):
+        HttpConnectionPool.close()
+
+    def test_same_endpoint_shares_transport(self):
+        async def run():
+            first = HttpConnectionPool.get_httpx_client("http://host-a:8000/v1")
+            second = HttpConnectionPool.get_httpx_client("http://host-a:8000/v1/chat")
+            other = HttpConnectionPool.get_httpx_client("http://host-b:8000/v1")
+            self.assertIs(first, second)
+            self.assertIsNot(first, other)
+            await HttpConnectionPool.aclose()
+
+        asyncio.run(run())
+
+    def test_pools_are_scoped_per_event_loop(self):
+        async def get_client():
+            return HttpConnectionPool.get_httpx_client("http://host-a:8000/v1")
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+        self.assertIsNot(first, second)
+        # the pool of the first (closed) loop is dropped on lookup
+        self.assertEqual(HttpConnectionPool.stats()["httpx_clients"], 1)
+
+    def test_http_client_reuses_connections(self):
+        async def run():
+            server = CountingHttpServer()
+            url = await server.start()
+            try:
+                client = HttpClient(base_url=url, timeout=10)
+                for _ in range(20):
+                    resp = await client.async_send_request({"inputs": "hi"})
+                    self.assertEqual(resp.status_code, 200)
+                # a second client for the same endpoint shares the pool
+                other = HttpClient(base_url=url, timeout=10)
+                await other.async_send_request({"inputs": "hi"})
+            finally:
+                await HttpConnectionPool.aclose()
+                await server.stop()
+            self.assertEqual(server.requests, 21)
+            self.assertEqual(server.connections, 1)
+
+        asyncio.run(run())
+
+    def test_httpx_client_reuses_connections(self):
+        async def run():
+            server = CountingHttpServer()
+            url = await server.start()
+            try:
+                client = HttpConnectionPool.get_httpx_client(url, timeout=10)
+                for _ in range(10):
+                    resp = await client.post(url, json={"inputs": "hi"})
+                    self.assertEqual(resp.status_code, 200)
+            finally:
+                await HttpConnectionPool.aclose()
+                await server.stop()
+            self.assertEqual(server.requests, 10)
+            self.assertEqual(server.connections, 1)
+
+        asyncio.run(run())
+
+    def test_concurrent_requests_respect_max_connections(self):
+        async def run():
+            server = CountingHttpServer()
+            url = await server.start()
+            try:
+                client = HttpClient(
+                    base_url=url,
+                    timeout=10,
+                    connection_pool=ConnectionPoolConfig(max_connections=4),
+                )
+                await asyncio.gather(
+                    *[client.async_send_request({"inputs": "hi"}) for _ in range(40)]
+                )
+            finally:
+                await HttpConnectionPool.aclose()
+                await server.stop()
+            self.assertEqual(server.requests, 40)
+            self.assertLessEqual(server.connections, 4)
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -59,7 +59,8 @@ class TestOpenaiAzureClient(unittest.TestCase):
         self.assertEqual(kwargs["api_key"], "test-api-key")
         self.assertEqual(kwargs["timeout"], 90)
         self.assertEqual(kwargs["max_retries"], 2)
-        self.assertEqual(kwargs["default_headers"], {"Connection": "close"})
+        # connections are kept alive and reused through the shared connection pool
+        self.assertEqual(kwargs["default_headers"], {})
 
     @patch("sygra.core.models.client.openai_azure_client.AzureOpenAI")
     def test_init_sync_client(self, mock_openai):
@@ -344,7 +345,7 @@ class TestOpenaiAzureClient(unittest.TestCase):
         # Verify default values are set correctly
         self.assertEqual(config.timeout, 120)
         self.assertEqual(config.max_retries, 3)
-        self.assertEqual(config.default_headers, {"Connection": "close"})
+        self.assertEqual(config.default_headers, {})
 
         # Test with custom values
         config = AzureClientConfig(
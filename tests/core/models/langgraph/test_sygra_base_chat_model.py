@@ -2,7 +2,7 @@ import os
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 from openai.types.chat.chat_completion import Choice
 
@@ -13,6 +13,7 @@ from langchain_core.messages import HumanMessage
 from openai.types.chat import ChatCompletion, ChatCompletionMessage
 
 import sygra.utils.constants as constants
+from sygra.core.models.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
 from sygra.core.models.custom_models import ModelParams
 from sygra.core.models.langgraph.sygra_base_chat_model import SygraBaseChatModel
 
@@ -22,6 +23,7 @@ class TestBaseChatModel(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures before each test method"""
+        CircuitBreaker.reset()
         # Store original constants to restore after tests
         self.original_completion_only_models = (
             constants.COMPLETION_ONLY_MODELS.copy()
@@ -90,6 +92,7 @@ class TestBaseChatModel(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after each test method"""
+        CircuitBreaker.reset()
         # Restore original constants
         constants.COMPLETION_ONLY_MODELS = self.original_completion_only_models
         constants.RETRYABLE_HTTP_ERROR = self.original_retryable_http_error
@@ -444,95 +447,68 @@ class TestBaseChatModel(unittest.TestCase):
         self.assertEqual(model._model_stats["resp_code_dist"][413], 1)
         self.assertEqual(model._model_stats["errors"]["tokens_exceeded"], 1)
 
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.sys.exit")
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.logger")
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.ClientFactory")
-    def test_handle_server_down_disabled(self, mock_client_factory, mock_logger, mock_exit):
-        """Test _handle_server_down when server down handling is disabled"""
-        # Set HANDLE_SERVER_DOWN to False for this test
+    def test_handle_server_down_disabled(self, mock_client_factory):
+        """Test that no circuit breaker is used when server down handling is disabled"""
         constants.HANDLE_SERVER_DOWN = False
 
         model = self.TestChatModel(self.base_config)
 
-        # Call with a server down error code
-        model._handle_server_down(500)
-
-        # Verify that exit was not called and timestamps were not recorded
-        mock_exit.assert_not_called()
-        self.assertEqual(len(model._model_failed_response_timestamp), 0)
-
-        # Restore HANDLE_SERVER_DOWN
-        constants.HANDLE_SERVER_DOWN = True
+        breaker, trial = model._check_circuit("http://test-model.com", None)
+        self.assertIsNone(breaker)
+        self.assertFalse(trial)
 
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.sys.exit")
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.logger")
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.ClientFactory")
-    def test_handle_server_down_normal_operation(self, mock_client_factory, mock_logger, mock_exit):
-        """Test _handle_server_down with normal operation"""
+    def test_handle_server_down_normal_operation(self, mock_client_factory):
+        """Test _handle_server_down with errors below the failure threshold"""
         constants.HANDLE_SERVER_DOWN = True
         constants.SERVER_DOWN_ERROR_CODE = [404, 500, 501, 502, 503]
         model = self.TestChatModel(self.base_config)
+        breaker, trial = model._check_circuit("http://test-model.com", None)
 
-        # Call with non-server down error code
-        model._handle_server_down(400)
-
-        # Verify that no timestamps were recorded
-        self.assertEqual(len(model._model_failed_response_timestamp), 0)
-
-        # Call with server down error code
-        model._handle_server_down(500)
+        model._handle_server_down(breaker, 400, trial)
+        model._handle_server_down(breaker, 500, trial)
 
-        # Verify that timestamp was recorded
-        self.assertEqual(len(model._model_failed_response_timestamp), 1)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertEqual(len(breaker._failures), 1)
 
-        # Verify that exit was not called since we don't have enough errors
-        mock_exit.assert_not_called()
-
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.time")
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.sys.exit")
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.logger")
+    @patch("sygra.core.models.circuit_breaker.time")
+    @patch("sygra.core.models.circuit_breaker.logger")
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.ClientFactory")
-    def test_handle_server_down_critical(
-        self, mock_client_factory, mock_logger, mock_exit, mock_time
-    ):
-        """Test _handle_server_down with critical server down detection"""
+    def test_handle_server_down_critical(self, mock_client_factory, mock_logger, mock_time):
+        """Test that errors within the failure window open the circuit instead of exiting"""
         constants.HANDLE_SERVER_DOWN = True
         constants.SERVER_DOWN_ERROR_CODE = [404, 500, 501, 502, 503]
         constants.MAX_FAILED_ERROR = 5
         constants.MODEL_FAILURE_WINDOW_IN_SEC = 30
 
         model = self.TestChatModel(self.base_config)
+        breaker, _ = model._check_circuit("http://test-model.com", None)
 
-        # Set up mock time to return increasing timestamps
-        # First errors happen within short time window (10 seconds)
-        start_time = 1000.0
-        mock_time.time.side_effect = [
-            start_time,
-            start_time + 2.0,
-            start_time + 4.0,
-            start_time + 6.0,
-            start_time + 8.0,
-        ]
-
-        # Trigger MAX_FAILED_ERROR server down errors
+        # First errors happen within short time window (8 seconds)
         for i in range(constants.MAX_FAILED_ERROR):
-            model._handle_server_down(500)
-
-        # Verify that exit was called since we had enough errors in a short window
-        mock_exit.assert_called_once()
-        mock_logger.error.assert_called_once()
+            mock_time.time.return_value = 1000.0 + 2 * i
+            model._handle_server_down(breaker, 500, False)
 
-        # Verify warning message was logged
+        self.assertEqual(breaker.state, CircuitState.OPEN)
         warning_message = mock_logger.warning.call_args[0][0]
-        self.assertIn(f"Server failure count: {constants.MAX_FAILED_ERROR}", warning_message)
+        self.assertIn(f"{constants.MAX_FAILED_ERROR} server errors", warning_message)
 
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.time")
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.sys.exit")
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.logger")
+        # requests are rejected until the open timeout elapses
+        with self.assertRaises(CircuitOpenError) as ctx:
+            model._check_circuit("http://test-model.com", None)
+        self.assertEqual(ctx.exception.retry_after, 1008.0 + breaker.config.open_timeout)
+
+        # then a successful trial request closes the circuit
+        mock_time.time.return_value = 1008.0 + breaker.config.open_timeout
+        breaker, trial = model._check_circuit("http://test-model.com", None)
+        self.assertTrue(trial)
+        model._handle_server_down(breaker, 200, trial)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    @patch("sygra.core.models.circuit_breaker.time")
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.ClientFactory")
-    def test_handle_server_down_spread_out(
-        self, mock_client_factory, mock_logger, mock_exit, mock_time
-    ):
+    def test_handle_server_down_spread_out(self, mock_client_factory, mock_time):
         """Test _handle_server_down with errors spread out over time"""
         constants.HANDLE_SERVER_DOWN = True
         constants.SERVER_DOWN_ERROR_CODE = [404, 500, 501, 502, 503]
@@ -540,36 +516,19 @@ class TestBaseChatModel(unittest.TestCase):
         constants.MODEL_FAILURE_WINDOW_IN_SEC = 30
 
         model = self.TestChatModel(self.base_config)
+        breaker, _ = model._check_circuit("http://test-model.com", None)
 
-        # Set up mock time to return increasing timestamps
         # Errors happen over a longer time window (60 seconds, which is > MODEL_FAILURE_WINDOW_IN_SEC)
-        start_time = 1000.0
-        mock_time.time.side_effect = [
-            start_time,
-            start_time + 10.0,
-            start_time + 20.0,
-            start_time + 40.0,
-            start_time
-            + 60.0,  # Last error is 60 seconds after first, exceeding the 30 second window
-        ]
+        for timestamp in [1000.0, 1010.0, 1020.0, 1040.0, 1060.0]:
+            mock_time.time.return_value = timestamp
+            model._handle_server_down(breaker, 500, False)
 
-        # Trigger MAX_FAILED_ERROR server down errors spread over time
-        for i in range(constants.MAX_FAILED_ERROR):
-            model._handle_server_down(500)
+        self.assertEqual(len(breaker._failures), constants.MAX_FAILED_ERROR)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
 
-        # Verify that timestamps were recorded
-        self.assertEqual(len(model._model_failed_response_timestamp), constants.MAX_FAILED_ERROR)
-
-        # Verify that exit was NOT called since errors are spread out over time
-        mock_exit.assert_not_called()
-
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.time")
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.sys.exit")
-    @patch("sygra.core.models.langgraph.sygra_base_chat_model.logger")
+    @patch("sygra.core.models.circuit_breaker.time")
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.ClientFactory")
-    def test_handle_server_down_max_queue(
-        self, mock_client_factory, mock_logger, mock_exit, mock_time
-    ):
+    def test_handle_server_down_max_queue(self, mock_client_factory, mock_time):
         """Test _handle_server_down with more errors than MAX_FAILED_ERROR"""
         constants.HANDLE_SERVER_DOWN = True
         constants.SERVER_DOWN_ERROR_CODE = [404, 500, 501, 502, 503]
@@ -577,23 +536,18 @@ class TestBaseChatModel(unittest.TestCase):
         constants.MODEL_FAILURE_WINDOW_IN_SEC = 30
 
         model = self.TestChatModel(self.base_config)
+        breaker, _ = model._check_circuit("http://test-model.com", None)
 
-        # Set up mock time to return increasing timestamps
-        # Generate MAX_FAILED_ERROR + 3 timestamps with enough spread
-        start_time = 1000.0
-        timestamps = [start_time + i * 10 for i in range(constants.MAX_FAILED_ERROR + 3)]
-        mock_time.time.side_effect = timestamps
-
-        # Trigger more than MAX_FAILED_ERROR server down errors
-        for i in range(constants.MAX_FAILED_ERROR + 3):
-            model._handle_server_down(500)
-
-        # Verify that only MAX_FAILED_ERROR timestamps are kept
-        self.assertEqual(len(model._model_failed_response_timestamp), constants.MAX_FAILED_ERROR)
+        timestamps = [1000.0 + i * 10 for i in range(constants.MAX_FAILED_ERROR + 3)]
+        for timestamp in timestamps:
+            mock_time.time.return_value = timestamp
+            model._handle_server_down(breaker, 500, False)
 
-        # The queue should have the most recent timestamps
-        self.assertEqual(model._model_failed_response_timestamp[0], timestamps[3])
-        self.assertEqual(model._model_failed_response_timestamp[-1], timestamps[-1])
+        # Only the most recent MAX_FAILED_ERROR failures are kept
+        self.assertEqual(len(breaker._failures), constants.MAX_FAILED_ERROR)
+        self.assertEqual(breaker._failures[0], timestamps[3])
+        self.assertEqual(breaker._failures[-1], timestamps[-1])
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
 
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.ClientFactory")
     def test_is_retryable_error(self, mock_client_factory):
@@ -749,10 +703,14 @@ class TestBaseChatModel(unittest.TestCase):
         # Verify that AsyncRetrying was initialized correctly
         mock_async_retrying.assert_called_once_with(
             retry=mock_retry_if_result.return_value,
-            wait=mock_wait_random_exponential.return_value,
+            wait=ANY,
             stop=mock_stop_after_attempt.return_value,
             before_sleep=model._log_before_retry,
         )
+        # the delay is the minimum wait before a retry, added to the exponential backoff
+        wait = mock_async_retrying.call_args.kwargs["wait"]
+        self.assertEqual(wait.wait_funcs[0].wait_fixed, model._delay / 1000)
+        self.assertIs(wait.wait_funcs[1], mock_wait_random_exponential.return_value)
 
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.AsyncRetrying")
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.wait_random_exponential")
@@ -857,10 +815,14 @@ class TestBaseChatModel(unittest.TestCase):
         # Verify that AsyncRetrying was initialized correctly
         mock_retrying.assert_called_once_with(
             retry=mock_retry_if_result.return_value,
-            wait=mock_wait_random_exponential.return_value,
+            wait=ANY,
             stop=mock_stop_after_attempt.return_value,
             before_sleep=model._log_before_retry,
         )
+        # the delay is the minimum wait before a retry, added to the exponential backoff
+        wait = mock_retrying.call_args.kwargs["wait"]
+        self.assertEqual(wait.wait_funcs[0].wait_fixed, model._delay / 1000)
+        self.assertIs(wait.wait_funcs[1], mock_wait_random_exponential.return_value)
 
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.Retrying")
     @patch("sygra.core.models.langgraph.sygra_base_chat_model.wait_random_exponential")
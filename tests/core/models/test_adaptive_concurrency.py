@@ -0,0 +1,164 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from sygra.core.dataset.dataset_processor import DatasetProcessor
+from sygra.core.models.adaptive_concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyLimiter,
+)
+
+
+class DegradingServer:
+    """In-process stand-in for a model server which slows down and throttles under load."""
+
+    def __init__(self, capacity: int, base_latency: float = 0.005):
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.throttled = 0
+
+    async def request(self) -> int:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.in_flight > 2 * self.capacity:
+                self.throttled += 1
+                await asyncio.sleep(self.base_latency / 10)
+                return 429
+            # queueing: latency grows with the load above capacity
+            overload = max(0, self.in_flight - self.capacity) / self.capacity
+            await asyncio.sleep(self.base_latency * (1 + 4 * overload))
+            return 200
+        finally:
+            self.in_flight -= 1
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    def setUp(self):
+        AdaptiveConcurrencyLimiter.reset()
+
+    def tearDown(self):
+        AdaptiveConcurrencyLimiter.reset()
+
+    def _limiter(self, **config) -> AdaptiveConcurrencyLimiter:
+        return AdaptiveConcurrencyLimiter(
+            "model", AdaptiveConcurrencyConfig(enabled=True, **config)
+        )
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(AdaptiveConcurrencyLimiter.from_model_config({"name": "model"}))
+        self.assertIsNone(AdaptiveConcurrencyLimiter.total_limit())
+
+    def test_limiters_are_shared_per_model(self):
+        config = {"adaptive_concurrency": {"enabled": True, "initial_limit": 4}}
+        first = AdaptiveConcurrencyLimiter.from_model_config({"name": "a", **config})
+        self.assertIs(AdaptiveConcurrencyLimiter.from_model_config({"name": "a", **config}), first)
+        AdaptiveConcurrencyLimiter.from_model_config({"name": "b", **config})
+        self.assertEqual(AdaptiveConcurrencyLimiter.total_limit(), 8)
+
+    def test_additive_increase_when_saturated(self):
+        limiter = self._limiter(initial_limit=4)
+        for _ in range(6):
+            limiter._in_flight += 1
+            limiter.release(4, 0.1, 200)
+        self.assertEqual(limiter.limit, 5)
+
+        # an unused limit does not grow
+        for _ in range(20):
+            limiter._in_flight += 1
+            limiter.release(1, 0.1, 200)
+        self.assertEqual(limiter.limit, 5)
+
+    def test_multiplicative_decrease_once_per_window(self):
+        limiter = self._limiter(initial_limit=20, decrease_factor=0.5)
+        for _ in range(10):
+            limiter._in_flight += 1
+            limiter.release(20, 0.1, 429)
+        self.assertEqual(limiter.limit, 10)
+
+        limiter._in_flight += 1
+        limiter.release(10, 0.1, 503)
+        self.assertEqual(limiter.limit, 5)
+
+        # exceptions are neither a success nor an overload signal
+        limiter._in_flight += 1
+        limiter.release(10, 0.1, None)
+        self.assertEqual(limiter.limit, 5)
+
+    def test_latency_increase_is_overload(self):
+        limiter = self._limiter(initial_limit=10, decrease_factor=0.5, latency_tolerance=2.0)
+        for _ in range(50):
+            limiter._in_flight += 1
+            limiter.release(1, 0.1, 200)
+        self.assertEqual(limiter.limit, 10)
+        for _ in range(5):
+            limiter._in_flight += 1
+            limiter.release(1, 1.0, 200)
+        self.assertEqual(limiter.limit, 5)
+
+    def test_acquire_waits_for_a_free_slot(self):
+        limiter = self._limiter(initial_limit=2)
+
+        async def scenario():
+            await limiter.acquire()
+            await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            cancelled = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            limiter.release(2, 0.1, None)
+            await asyncio.sleep(0)
+            self.assertTrue(waiter.done())
+            self.assertEqual(limiter.in_flight, 2)
+
+        asyncio.run(scenario())
+
+    def test_converges_on_a_degrading_server(self):
+        server = DegradingServer(capacity=8)
+        limiter = self._limiter(initial_limit=32, max_limit=64)
+
+        async def worker(requests: int):
+            for _ in range(requests):
+                in_flight = await limiter.acquire()
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                code = await server.request()
+                limiter.release(in_flight, loop.time() - start, code)
+
+        async def run():
+            await asyncio.gather(*(worker(20) for _ in range(64)))
+
+        asyncio.run(run())
+        # the limit settles around the capacity instead of the 64 requesting workers
+        self.assertLessEqual(limiter.limit, 3 * server.capacity)
+        self.assertGreaterEqual(limiter.limit, server.capacity // 4)
+        self.assertLessEqual(server.max_in_flight, 32)
+
+
+class TestDatasetProcessorConcurrencyLimit(unittest.TestCase):
+    def tearDown(self):
+        AdaptiveConcurrencyLimiter.reset()
+
+    def test_pool_follows_model_limits(self):
+        processor = MagicMock(batch_size=50)
+        self.assertEqual(DatasetProcessor._get_concurrency_limit(processor), 50)
+
+        config = {"adaptive_concurrency": {"enabled": True, "initial_limit": 8}}
+        AdaptiveConcurrencyLimiter.from_model_config({"name": "a", **config})
+        AdaptiveConcurrencyLimiter.from_model_config({"name": "b", **config})
+        self.assertEqual(DatasetProcessor._get_concurrency_limit(processor), 16)
+
+        processor.batch_size = 10
+        self.assertEqual(DatasetProcessor._get_concurrency_limit(processor), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
+
+from sygra.core.dataset.dataset_processor import DatasetProcessor
+from sygra.core.models.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBudgetExhaustedError,
+    CircuitOpenError,
+    CircuitState,
+)
+from sygra.core.models.custom_models import BaseCustomModel, ModelParams
+from sygra.core.models.model_response import ModelResponse
+from sygra.utils import constants
+
+
+class FlakyServer:
+    """In-process stand-in for a model server which is down for its first requests."""
+
+    def __init__(self, down_for: int):
+        self.down_for = down_for
+        self.requests = 0
+
+    async def request(self) -> int:
+        self.requests += 1
+        await asyncio.sleep(0.001)
+        return 503 if self.requests <= self.down_for else 200
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+    def setUp(self):
+        CircuitBreaker.reset()
+        self.original_handle_server_down = constants.HANDLE_SERVER_DOWN
+        constants.HANDLE_SERVER_DOWN = True
+
+    def tearDown(self):
+        CircuitBreaker.reset()
+        constants.HANDLE_SERVER_DOWN = self.original_handle_server_down
+
+    @staticmethod
+    def _model_config(name: str = "model", **circuit_breaker) -> dict[str, Any]:
+        return {
+            "name": name,
+            "url": "http://model",
+            "circuit_breaker": {"failure_threshold": 2, "open_timeout": 0.05, **circuit_breaker},
+        }
+
+
+class TestCircuitBreaker(CircuitBreakerTestCase):
+    def test_config_defaults(self):
+        config = CircuitBreakerConfig.from_model_config({"name": "model"})
+        self.assertEqual(config.failure_threshold, constants.MAX_FAILED_ERROR)
+        self.assertEqual(config.failure_window, constants.MODEL_FAILURE_WINDOW_IN_SEC)
+        self.assertEqual((config.open_timeout, config.half_open_requests), (30, 1))
+        self.assertEqual(CircuitBreaker.budget(), 10)
+
+    def test_shared_per_model_endpoint(self):
+        first = CircuitBreaker.for_endpoint(self._model_config(), "http://a")
+        self.assertIs(first, CircuitBreaker.for_endpoint(self._model_config(), "http://a"))
+        self.assertIsNot(first, CircuitBreaker.for_endpoint(self._model_config(), "http://b"))
+        self.assertIsNot(first, CircuitBreaker.for_endpoint(self._model_config("b"), "http://a"))
+
+        constants.HANDLE_SERVER_DOWN = False
+        self.assertIsNone(CircuitBreaker.for_endpoint(self._model_config(), "http://a"))
+
+    def test_open_half_open_closed(self):
+        breaker = CircuitBreaker.for_endpoint(self._model_config(), "http://a")
+
+        # errors which do not mean the server is down leave the circuit closed
+        for code in [200, 429, 400, 503, 200]:
+            breaker.after_request(code, breaker.before_request())
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+        breaker.after_request(503, breaker.before_request())
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        with self.assertRaises(CircuitOpenError) as ctx:
+            breaker.before_request()
+        self.assertGreater(ctx.exception.retry_after, time.time())
+
+        # a failed trial request opens the circuit again
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.before_request())
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        breaker.after_request(502, True)
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        # a successful one closes it
+        time.sleep(0.06)
+        trial = breaker.before_request()
+        breaker.after_request(200, trial)
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+        self.assertFalse(breaker.before_request())
+        self.assertEqual(CircuitBreaker._trips, 2)
+
+    def test_trial_without_response_code_frees_its_slot(self):
+        breaker = CircuitBreaker.for_endpoint(self._model_config(), "http://a")
+        breaker.after_request(500)
+        breaker.after_request(500)
+        time.sleep(0.06)
+        breaker.after_request(None, breaker.before_request())
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.before_request())
+
+    def test_budget_exhausted(self):
+        CircuitBreaker._budget = 1
+        first = CircuitBreaker.for_endpoint(self._model_config(), "http://a")
+        second = CircuitBreaker.for_endpoint(self._model_config(), "http://b")
+        for breaker in [first, second]:
+            breaker.after_request(500)
+            breaker.after_request(500)
+            self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        self.assertTrue(CircuitBreaker.budget_exhausted())
+        third = CircuitBreaker.for_endpoint(self._model_config(), "http://c")
+        with self.assertRaises(CircuitOpenError) as ctx:
+            third.before_request()
+        self.assertIsNone(ctx.exception.retry_after)
+
+
+class DownModel(BaseCustomModel):
+    """Sends requests to the flaky server of the model."""
+
+    server = FlakyServer(down_for=0)
+
+    async def _generate_response(
+        self, input: ChatPromptValue, model_params: ModelParams, **kwargs: Any
+    ) -> ModelResponse:
+        code = await self.server.request()
+        return ModelResponse(llm_response="ok" if code == 200 else "error", response_code=code)
+
+
+class TestModelCircuitBreaker(CircuitBreakerTestCase):
+    def test_model_raises_while_circuit_is_open(self):
+        DownModel.server = FlakyServer(down_for=2)
+        model = DownModel(
+            {
+                **self._model_config("down"),
+                "auth_token": "token",
+                "parameters": {},
+                "retry_attempts": 1,
+            }
+        )
+        prompt = ChatPromptValue(messages=[HumanMessage(content="hello")])
+
+        async def run():
+            codes = [(await model(prompt)).response_code for _ in range(2)]
+            with self.assertRaises(CircuitOpenError):
+                await model(prompt)
+            await asyncio.sleep(0.06)
+            codes.append((await model(prompt)).response_code)
+            return codes
+
+        self.assertEqual(asyncio.run(run()), [503, 503, 200])
+        self.assertEqual(DownModel.server.requests, 3)
+        breaker = CircuitBreaker.for_endpoint(model.model_config, "http://model")
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+
+class TestDatasetProcessorParking(CircuitBreakerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.output_file = os.path.join(self.tmp_dir.name, "output.jsonl")
+
+    def tearDown(self):
+        super().tearDown()
+        self.tmp_dir.cleanup()
+
+    def _processor(self, records: list[dict[str, Any]]) -> DatasetProcessor:
+        graph_config = MagicMock()
+        graph_config.oasst_mapper = {"required": "no"}
+        graph_config.config = {}
+        graph_config.schema_config = None
+        return DatasetProcessor(
+            records,
+            graph=MagicMock(),
+            graph_config=graph_config,
+            output_file=self.output_file,
+            num_records_total=len(records),
+            batch_size=4,
+            checkpoint_interval=100,
+        )
+
+    def _execute_graph(self, server: FlakyServer, calls: Optional[list] = None):
+        async def execute_graph(record: dict, *args, **kwargs) -> dict:
+            if calls is not None:
+                calls.append((record["id"], kwargs["record_index"]))
+            breaker = CircuitBreaker.for_endpoint(self._model_config(), "http://model")
+            trial = breaker.before_request()
+            code = await server.request()
+            breaker.after_request(code, trial)
+            answer = "answer" if code == 200 else f"{constants.ERROR_PREFIX} {code}"
+            return {"id": record["id"], "answer": answer}
+
+        return execute_graph
+
+    def _written(self) -> list[int]:
+        if not os.path.exists(self.output_file):
+            return []
+        with open(self.output_file) as f:
+            return sorted(json.loads(line)["id"] for line in f)
+
+    def test_records_are_parked_until_the_circuit_closes(self):
+        server = FlakyServer(down_for=4)
+        processor = self._processor([{"id": i} for i in range(1, 21)])
+        calls: list[tuple[int, int]] = []
+
+        with patch("sygra.utils.graph_utils.execute_graph", self._execute_graph(server, calls)):
+            with patch.object(constants, "CIRCUIT_BREAKER_MIN_PARK_SECONDS", 0.01):
+                processor.process_and_store_results()
+
+        # the records sent while the server was down fail, the ones parked are retried
+        self.assertEqual(processor.failed_records, 4)
+        self.assertEqual(processor.num_records_processed, 16)
+        self.assertEqual(len(self._written()), 16)
+        self.assertEqual(server.requests, 20)
+        self.assertEqual(processor._parked_records, [])
+        # parked records are retried with their own dataset index and counted once
+        self.assertGreater(len(calls), 20)
+        self.assertTrue(all(index == record_id - 1 for record_id, index in calls))
+        self.assertEqual(processor.pbar.n, 20)
+
+    def test_run_stops_once_the_budget_is_exhausted(self):
+        server = FlakyServer(down_for=1000)
+        processor = self._processor([{"id": i} for i in range(1, 41)])
+        execute_graph = self._execute_graph(server)
+        CircuitBreaker._budget = 2
+
+        async def first_records_succeed(record: dict, *args, **kwargs) -> dict:
+            if record["id"] <= 4:
+                return {"id": record["id"], "answer": "answer"}
+            return await execute_graph(record)
+
+        with patch("sygra.utils.graph_utils.execute_graph", first_records_succeed):
+            with patch.object(constants, "CIRCUIT_BREAKER_MIN_PARK_SECONDS", 0.01):
+                with self.assertRaises(CircuitBudgetExhaustedError):
+                    processor.process_and_store_results()
+
+        # the results before the stop are flushed although the run is not resumable
+        self.assertEqual(self._written(), [1, 2, 3, 4])
+        self.assertLess(server.requests, 20)
+        self.assertTrue(processor._parked_records)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,24 @@
+import asyncio
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import call, patch
+from unittest.mock import AsyncMock, call, patch
 
 # Add the parent directory to sys.path to import the necessary modules
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
+from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
+
 import sygra.utils.constants as constants
 from sygra.core.models.custom_models import (
     BaseCustomModel,
     CustomOllama,
     CustomOpenAI,
     CustomVLLM,
+    ModelParams,
 )
+from sygra.core.models.model_response import ModelResponse
 
 
 class TestValidateCompletionApiSupport(unittest.TestCase):
@@ -232,5 +238,43 @@ class TestConvertToolsToModelFormat(unittest.TestCase):
         mock_convert.assert_has_calls([call(tool1, strict=True), call(tool2, strict=True)])
 
 
+class TestCallWithRetryPacing(unittest.TestCase):
+    """Unit tests for the waits of _call_with_retry"""
+
+    def setUp(self):
+        class TestBaseModel(BaseCustomModel):
+            def _generate_response(self, input, model_params, **kwargs):
+                pass
+
+        self.model = TestBaseModel(
+            {"name": "test_model", "parameters": {}, "delay": 100, "retry_attempts": 3}
+        )
+        self.input = ChatPromptValue(messages=[HumanMessage(content="hello")])
+        self.params = ModelParams(url="http://test", auth_token="token")
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    def test_successful_call_is_not_delayed(self, mock_sleep):
+        self.model._generate_response = AsyncMock(
+            return_value=ModelResponse(llm_response="ok", response_code=200)
+        )
+        result = asyncio.run(self.model._call_with_retry(self.input, self.params))
+        self.assertEqual(result.response_code, 200)
+        mock_sleep.assert_not_called()
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    def test_delay_is_the_minimum_backoff_after_a_failure(self, mock_sleep):
+        self.model._generate_response = AsyncMock(
+            side_effect=[
+                ModelResponse(llm_response="throttled", response_code=429),
+                ModelResponse(llm_response="ok", response_code=200),
+            ]
+        )
+        result = asyncio.run(self.model._call_with_retry(self.input, self.params))
+        self.assertEqual(result.response_code, 200)
+        # only the retry waits, at least the configured delay
+        mock_sleep.assert_called_once()
+        self.assertGreaterEqual(mock_sleep.call_args[0][0], 0.1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,277 @@
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
+
+from sygra.core.models.circuit_breaker import CircuitBreaker
+from sygra.core.models.custom_models import BaseCustomModel, ModelParams
+from sygra.core.models.load_balancer import LoadBalancer, LoadBalancerConfig
+from sygra.core.models.model_response import ModelResponse
+from sygra.utils import constants
+
+
+class MockServer:
+    """In-process stand-in for a model replica with a fixed latency and failure mode."""
+
+    def __init__(self, latency: float = 0.002, fail_with: Optional[int] = None):
+        self.latency = latency
+        self.fail_with = fail_with
+        self.requests = 0
+
+    async def request(self) -> int:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return self.fail_with or 200
+
+
+async def send(
+    balancer: LoadBalancer, servers: dict[str, MockServer], requests: int, concurrency: int = 1
+) -> None:
+    """Send the requests through the balancer, `concurrency` at a time."""
+
+    async def one():
+        endpoint = balancer.acquire()
+        start = time.time()
+        code = await servers[endpoint.url].request()
+        balancer.release(endpoint, time.time() - start, code)
+
+    for _ in range(0, requests, concurrency):
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+
+
+class TestLoadBalancer(unittest.TestCase):
+    def setUp(self):
+        LoadBalancer.reset()
+
+    def tearDown(self):
+        LoadBalancer.reset()
+
+    def _balancer(
+        self, servers: dict[str, MockServer], strategy: str = "power_of_two_choices", **config
+    ) -> LoadBalancer:
+        return LoadBalancer(
+            "model",
+            list(servers),
+            "token",
+            strategy,
+            LoadBalancerConfig(enabled=True, **config),
+        )
+
+    def test_disabled_by_default(self):
+        urls = {"name": "model", "url": ["http://a", "http://b"]}
+        self.assertIsNone(LoadBalancer.from_model_config(urls))
+        single = {"name": "model", "url": "http://a", "load_balancing": "power_of_two_choices"}
+        self.assertIsNone(LoadBalancer.from_model_config(single))
+
+    def test_enabled_and_shared_per_model(self):
+        config = {"url": ["http://a", "http://b"], "auth_token": ["ta", "tb"]}
+        first = LoadBalancer.from_model_config(
+            {"name": "a", "load_balancing": "power_of_two_choices", **config}
+        )
+        second = LoadBalancer.from_model_config(
+            {"name": "a", "load_balancing": "power_of_two_choices", **config}
+        )
+        other = LoadBalancer.from_model_config(
+            {"name": "b", "load_balancer": {"enabled": True}, **config}
+        )
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual([e.auth_token for e in other.endpoints], ["ta", "tb"])
+        self.assertEqual(other.strategy, "least_requests")
+
+    def test_invalid_strategy(self):
+        with self.assertRaises(ValueError):
+            self._balancer({"http://a": MockServer()}, strategy="random")
+
+    def test_power_of_two_choices_avoids_slow_replica(self):
+        servers = {
+            "http://fast1": MockServer(latency=0.001),
+            "http://fast2": MockServer(latency=0.001),
+            "http://slow": MockServer(latency=0.05),
+        }
+        balancer = self._balancer(servers, latency_outlier_factor=None)
+
+        asyncio.run(send(balancer, servers, 200, concurrency=10))
+        self.assertLess(servers["http://slow"].requests, 0.15 * 200)
+
+    def test_failing_replica_is_ejected_and_readmitted(self):
+        servers = {
+            "http://good": MockServer(),
+            "http://down": MockServer(fail_with=503),
+        }
+        balancer = self._balancer(
+            servers, strategy="round_robin", consecutive_failures=3, base_ejection_time=0.2
+        )
+        down = balancer.endpoints[1]
+
+        asyncio.run(send(balancer, servers, 20))
+        self.assertEqual(servers["http://down"].requests, 3)
+        self.assertTrue(down.is_ejected(time.time()))
+        self.assertTrue(balancer.has_available_endpoint())
+
+        # re-admitted after its ejection with a fresh history, then ejected again for longer
+        time.sleep(0.25)
+        asyncio.run(send(balancer, servers, 20))
+        self.assertEqual(servers["http://down"].requests, 6)
+        self.assertEqual(down.ejections, 2)
+        self.assertGreater(down.ejected_until - time.time(), 0.2)
+
+    def test_error_rate_ejection(self):
+        flaky = MockServer(fail_with=500)
+        servers = {"http://good": MockServer(), "http://flaky": flaky}
+        balancer = self._balancer(
+            servers, strategy="round_robin", consecutive_failures=100, max_error_rate=0.5
+        )
+        endpoint = balancer.endpoints[1]
+        for i in range(10):
+            balancer.release(endpoint, 0.01, 500 if i % 4 else 200)
+        self.assertTrue(endpoint.is_ejected(time.time()))
+
+    def test_latency_outlier_ejection(self):
+        servers = {f"http://fast{i}": MockServer(latency=0.001) for i in range(3)}
+        servers["http://slow"] = MockServer(latency=0.03)
+        balancer = self._balancer(
+            servers, strategy="round_robin", min_requests=3, latency_outlier_factor=3.0
+        )
+        asyncio.run(send(balancer, servers, 40, concurrency=4))
+        slow = balancer.endpoints[3]
+        self.assertTrue(slow.is_ejected(time.time()))
+        self.assertFalse(any(e.is_ejected(time.time()) for e in balancer.endpoints[:3]))
+
+    def test_max_ejection_percent(self):
+        servers = {"http://a": MockServer(fail_with=502), "http://b": MockServer(fail_with=502)}
+        balancer = self._balancer(servers, strategy="round_robin", consecutive_failures=2)
+        asyncio.run(send(balancer, servers, 20))
+        now = time.time()
+        self.assertEqual(sum(e.is_ejected(now) for e in balancer.endpoints), 1)
+        self.assertTrue(balancer.has_available_endpoint())
+
+    def test_every_replica_ejected_still_serves(self):
+        servers = {"http://a": MockServer(), "http://b": MockServer()}
+        balancer = self._balancer(servers, max_ejection_percent=100)
+        now = time.time()
+        balancer.endpoints[0].ejected_until = now + 10
+        balancer.endpoints[1].ejected_until = now + 5
+        self.assertFalse(balancer.has_available_endpoint())
+        self.assertEqual(balancer.acquire().url, "http://b")
+
+    def test_active_probe_readmits_early(self):
+        probed = []
+
+        async def probe(url: str, auth_token: str) -> int:
+            probed.append(url)
+            return 200
+
+        servers = {"http://a": MockServer(), "http://b": MockServer()}
+        balancer = LoadBalancer(
+            "model",
+            list(servers),
+            "",
+            "least_requests",
+            LoadBalancerConfig(enabled=True, probe_interval=0.05, base_ejection_time=60),
+            probe,
+        )
+        balancer.endpoints[1].ejected_until = time.time() + 60
+
+        async def run():
+            balancer.release(balancer.acquire(), 0.01, 200)
+            await asyncio.sleep(0.01)
+
+        asyncio.run(run())
+        self.assertEqual(sorted(probed), ["http://a", "http://b"])
+        self.assertFalse(balancer.endpoints[1].is_ejected(time.time()))
+
+
+class ReplicatedModel(BaseCustomModel):
+    """Sends requests to the mock server of the url chosen for them."""
+
+    servers: dict[str, MockServer] = {}
+
+    async def _generate_response(
+        self, input: ChatPromptValue, model_params: ModelParams, **kwargs: Any
+    ) -> ModelResponse:
+        code = await self.servers[model_params.url].request()
+        return ModelResponse(llm_response="ok" if code == 200 else "error", response_code=code)
+
+
+class TestModelLoadBalancing(unittest.TestCase):
+    def setUp(self):
+        LoadBalancer.reset()
+        CircuitBreaker.reset()
+        self.original_handle_server_down = constants.HANDLE_SERVER_DOWN
+        constants.HANDLE_SERVER_DOWN = True
+
+    def tearDown(self):
+        LoadBalancer.reset()
+        CircuitBreaker.reset()
+        constants.HANDLE_SERVER_DOWN = self.original_handle_server_down
+
+    def _model(self, **config) -> ReplicatedModel:
+        return ReplicatedModel(
+            {
+                "name": "replicated",
+                "url": list(ReplicatedModel.servers),
+                "auth_token": "token",
+                "parameters": {},
+                "delay": 0,
+                "retry_attempts": 1,
+                **config,
+            }
+        )
+
+    def _run(self, model: ReplicatedModel, requests: int = 200) -> list[ModelResponse]:
+        prompt = ChatPromptValue(messages=[HumanMessage(content="hello")])
+
+        async def run():
+            responses = []
+            for _ in range(0, requests, 5):
+                responses += await asyncio.gather(*(model(prompt) for _ in range(5)))
+            return responses
+
+        return asyncio.run(run())
+
+    def test_down_replica_is_ejected_without_stopping_the_run(self):
+        ReplicatedModel.servers = {
+            "http://a": MockServer(),
+            "http://b": MockServer(),
+            "http://down": MockServer(fail_with=503),
+        }
+        model = self._model(load_balancing="round_robin", load_balancer={"enabled": True})
+
+        with patch.object(constants, "MAX_FAILED_ERROR", 3):
+            responses = self._run(model)
+
+        self.assertEqual(CircuitBreaker._trips, 0)
+        failed = sum(1 for r in responses if r.response_code != 200)
+        self.assertEqual(failed, ReplicatedModel.servers["http://down"].requests)
+        self.assertLessEqual(failed, 6)
+        self.assertTrue(model._load_balancer.endpoints[2].is_ejected(time.time()))
+
+    def test_power_of_two_choices_spares_slow_and_failing_replicas(self):
+        ReplicatedModel.servers = {
+            "http://a": MockServer(latency=0.001),
+            "http://b": MockServer(latency=0.001),
+            "http://slow": MockServer(latency=0.03),
+            "http://down": MockServer(fail_with=500),
+        }
+        model = self._model(
+            load_balancing="power_of_two_choices", load_balancer={"latency_outlier_factor": None}
+        )
+
+        responses = self._run(model)
+
+        self.assertEqual(CircuitBreaker._trips, 0)
+        self.assertLess(sum(1 for r in responses if r.response_code != 200), 20)
+        self.assertLess(ReplicatedModel.servers["http://slow"].requests, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from langchain_community.callbacks.bedrock_anthropic_callback import (
+    _get_anthropic_claude_token_cost,
+)
+from langchain_community.callbacks.openai_info import TokenType, get_openai_token_cost_for_model
+from pydantic import ValidationError
+
+from sygra.core.graph.langgraph.langchain_callback import calculate_cost
+from sygra.core.models import pricing
+from sygra.core.models.custom_models import CustomOpenAI
+from sygra.core.models.pricing import ModelPricing, lookup_pricing
+from sygra.metadata.metadata_collector import get_metadata_collector
+from sygra.metadata.metadata_integration import _record_request
+
+
+def per_request_cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Cost as calculate_cost computed it on every request before pricing was memoised."""
+    try:
+        return get_openai_token_cost_for_model(
+            model_name, prompt_tokens, token_type=TokenType.PROMPT
+        ) + get_openai_token_cost_for_model(
+            model_name, completion_tokens, token_type=TokenType.COMPLETION
+        )
+    except (KeyError, ValueError):
+        pass
+    if "claude" in model_name.lower() or "anthropic" in model_name.lower():
+        try:
+            return _get_anthropic_claude_token_cost(prompt_tokens, completion_tokens, model_name)
+        except (KeyError, ValueError, IndexError):
+            pass
+    return 0.0
+
+
+MODEL_NAMES = [
+    "gpt-4o",
+    "GPT-4o-mini",
+    "gpt-4",
+    "gpt-3.5-turbo",
+    "gpt-35-turbo",
+    "o1-mini",
+    "text-embedding-ada-002",
+    "ft:gpt-3.5-turbo-0613:org::id",
+    "anthropic.claude-3-sonnet-20240229-v1:0",
+    "us.anthropic.claude-3-5-sonnet-20240620-v1:0",
+    "claude",
+    "llama-3-70b",
+    "unknown",
+]
+
+
+class TestPricing(unittest.TestCase):
+    def setUp(self):
+        lookup_pricing.cache_clear()
+
+    def test_costs_match_per_request_lookup(self):
+        for model_name in MODEL_NAMES:
+            for prompt_tokens, completion_tokens in [(0, 0), (1, 1), (123, 456), (98765, 4321)]:
+                self.assertEqual(
+                    calculate_cost(model_name, prompt_tokens, completion_tokens),
+                    per_request_cost(model_name, prompt_tokens, completion_tokens),
+                    (model_name, prompt_tokens, completion_tokens),
+                )
+
+    def test_pricing_is_looked_up_once_per_model(self):
+        with patch.object(pricing, "ModelPricing", wraps=ModelPricing) as model_pricing:
+            for _ in range(100):
+                calculate_cost("gpt-4o", 100, 50)
+                calculate_cost("llama-3-70b", 100, 50)
+        # one ModelPricing for the priced model, whatever the number of requests
+        self.assertEqual(model_pricing.call_count, 1)
+        self.assertEqual(lookup_pricing.cache_info().misses, 2)
+
+    def test_pricing_from_model_config(self):
+        model_pricing = ModelPricing.from_model_config(
+            {"pricing": {"input_cost_per_1k_tokens": 0.002, "output_cost_per_1k_tokens": 0.004}},
+            "llama-3-70b",
+        )
+        assert model_pricing is not None
+        self.assertAlmostEqual(model_pricing.cost(1500, 500), 0.005)
+        self.assertEqual(ModelPricing.from_model_config({}, "gpt-4o"), lookup_pricing("gpt-4o"))
+        self.assertIsNone(ModelPricing.from_model_config({}, "llama-3-70b"))
+        with self.assertRaises(ValidationError):
+            ModelPricing.from_model_config({"pricing": {"input_cost_per_1k_tokens": 1}}, "m")
+
+    def test_model_resolves_pricing_at_construction(self):
+        config = {
+            "name": "self_hosted",
+            "model": "llama-3-70b",
+            "url": "http://localhost:8000/v1",
+            "auth_token": "token",
+            "api_version": "2024-02-01",
+            "parameters": {},
+            "pricing": {"input_cost_per_1k_tokens": 0.001, "output_cost_per_1k_tokens": 0.002},
+        }
+        model = CustomOpenAI(config)
+        self.assertEqual(model.pricing, ModelPricing(**config["pricing"]))
+        self.assertIsNotNone(CustomOpenAI({**config, "model": "gpt-4o", "pricing": None}).pricing)
+
+        collector = get_metadata_collector()
+        collector.reset()
+        collector.set_enabled(True)
+        usage = {"prompt_tokens": 1000, "completion_tokens": 500, "total_tokens": 1500}
+        with patch("sygra.metadata.metadata_integration.calculate_cost") as calculate:
+            _record_request(model, "llama-3-70b", 0.1, 200, usage)
+        calculate.assert_not_called()
+        self.assertAlmostEqual(collector.model_metrics["llama-3-70b"].total_cost_usd, 0.002)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from typing import Any
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
+
+from sygra.core.models.custom_models import BaseCustomModel, ModelParams
+from sygra.core.models.model_response import ModelResponse
+from sygra.core.models.rate_limiter import RateLimitConfig, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Clock which only moves when the code under test sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sync_sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def sleep(self, seconds: float) -> None:
+        self.sync_sleep(seconds)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_reserve_and_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=4.0, clock=clock)
+
+        self.assertEqual([bucket.reserve(1) for _ in range(4)], [0.0] * 4)
+        # in debt: each further unit waits half a second more
+        self.assertEqual(bucket.reserve(1), 0.5)
+        self.assertEqual(bucket.reserve(1), 1.0)
+
+        clock.now = 10.0
+        self.assertEqual(bucket.units, 4.0)
+
+    def test_give_back(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=10.0, clock=clock)
+        bucket.reserve(8)
+        bucket.give_back(5)
+        self.assertEqual(bucket.units, 7.0)
+        bucket.give_back(-9)
+        self.assertEqual(bucket.reserve(0), 2.0)
+        bucket.give_back(100)
+        self.assertEqual(bucket.units, 10.0)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        RateLimiter.reset()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        RateLimiter.reset()
+
+    def _limiter(self, **config) -> RateLimiter:
+        return RateLimiter(
+            "model",
+            RateLimitConfig(**config),
+            clock=self.clock,
+            sleep=self.clock.sleep,
+            sync_sleep=self.clock.sync_sleep,
+        )
+
+    def test_disabled_by_default_and_shared_per_model(self):
+        self.assertIsNone(RateLimiter.from_model_config({"name": "a"}))
+        config = {"rate_limit": {"requests_per_minute": 60}}
+        first = RateLimiter.from_model_config({"name": "a", **config})
+        self.assertIs(first, RateLimiter.from_model_config({"name": "a", **config}))
+        self.assertIsNot(first, RateLimiter.from_model_config({"name": "b", **config}))
+
+    def test_requests_go_out_at_the_quota_rate(self):
+        limiter = self._limiter(requests_per_minute=600)
+
+        async def send(count: int) -> list[float]:
+            sent = []
+
+            async def one():
+                await limiter.acquire()
+                sent.append(self.clock.now)
+
+            await asyncio.gather(*(one() for _ in range(count)))
+            return sent
+
+        sent = asyncio.run(send(50))
+        # the bucket holds one second of quota, then one request every 0.1s
+        self.assertEqual(sum(1 for t in sent if t == 0), 10)
+        self.assertAlmostEqual(max(sent), 4.0)
+        self.assertAlmostEqual(50 / (max(sent) + 1), 10.0)
+
+    def test_tokens_per_minute(self):
+        limiter = self._limiter(tokens_per_minute=6000, burst_seconds=1)
+        # 100 tokens per second: a request of 300 tokens waits for its debt
+        self.assertEqual(limiter.reserve(100), 0.0)
+        self.assertAlmostEqual(limiter.reserve(300), 3.0)
+
+        # the actual usage settles the estimate
+        limiter.settle(300, {"total_tokens": 100})
+        self.assertAlmostEqual(limiter.reserve(0), 0.0)
+        self.assertAlmostEqual(limiter.reserve(100), 2.0)
+
+    def test_requests_and_tokens_wait_for_the_longest(self):
+        limiter = self._limiter(requests_per_minute=60, tokens_per_minute=600)
+        self.assertEqual(limiter.reserve(10), 0.0)
+        self.assertAlmostEqual(limiter.reserve(5), 1.0)
+        self.assertAlmostEqual(limiter.reserve(50), 5.5)
+
+    def test_acquire_sync(self):
+        limiter = self._limiter(requests_per_minute=120)
+        for _ in range(4):
+            limiter.acquire_sync()
+        # the first two fit in the bucket, then one request every 0.5s
+        self.assertEqual(self.clock.sleeps, [0.5, 0.5])
+        self.assertEqual(self.clock.now, 1.0)
+
+    def test_estimate_tokens(self):
+        messages = [HumanMessage(content="x" * 400)]
+        self.assertEqual(RateLimiter.estimate_tokens(messages), 100)
+        self.assertEqual(RateLimiter.estimate_tokens(messages, {"max_tokens": 50}), 150)
+        self.assertEqual(RateLimiter.estimate_tokens(messages, {"max_new_tokens": 20}), 120)
+
+
+class CountingModel(BaseCustomModel):
+    """Answers every request, recording the fake time it was sent at."""
+
+    async def _generate_response(
+        self, input: ChatPromptValue, model_params: ModelParams, **kwargs: Any
+    ) -> ModelResponse:
+        self.sent.append(self.clock.now)
+        return ModelResponse(
+            llm_response="ok",
+            response_code=200,
+            token_usage={"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+        )
+
+
+class TestModelRateLimit(unittest.TestCase):
+    def setUp(self):
+        RateLimiter.reset()
+
+    def tearDown(self):
+        RateLimiter.reset()
+
+    def test_rate_limit_paces_the_requests(self):
+        config = {
+            "name": "limited",
+            "url": "http://model",
+            "auth_token": "token",
+            "parameters": {"max_tokens": 100},
+        }
+        self.assertIsNone(CountingModel(config)._rate_limiter)
+
+        config["rate_limit"] = {"requests_per_minute": 60, "tokens_per_minute": 60000}
+        clock = FakeClock()
+        limiter = RateLimiter(
+            "limited",
+            RateLimitConfig(**config["rate_limit"]),
+            clock=clock,
+            sleep=clock.sleep,
+        )
+        RateLimiter._limiters["limited"] = limiter
+        model = CountingModel(config)
+        model.clock, model.sent = clock, []
+        self.assertIs(model._rate_limiter, limiter)
+
+        prompt = ChatPromptValue(messages=[HumanMessage(content="hello")])
+
+        async def run():
+            for _ in range(3):
+                await model(prompt)
+
+        asyncio.run(run())
+        self.assertEqual(model.sent, [0.0, 1.0, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
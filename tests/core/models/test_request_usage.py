@@ -0,0 +1,86 @@
+import asyncio
+import random
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from langchain_core.messages import HumanMessage
+from langchain_core.prompt_values import ChatPromptValue
+
+from sygra.core.models.custom_models import BaseCustomModel, ModelParams
+from sygra.core.models.model_response import ModelResponse
+from sygra.metadata.metadata_collector import get_metadata_collector
+from sygra.metadata.metadata_integration import track_model_request
+
+
+class InterleavingModel(BaseCustomModel):
+    """Reports usage depending on the request, then yields to the other requests."""
+
+    @track_model_request
+    async def _generate_response(
+        self, input: ChatPromptValue, model_params: ModelParams, **kwargs: Any
+    ) -> ModelResponse:
+        i = int(str(input.messages[0].content))
+        await asyncio.sleep(random.random() / 1000)
+        usage = SimpleNamespace(prompt_tokens=i, completion_tokens=2 * i, total_tokens=3 * i)
+        self._extract_token_usage(SimpleNamespace(usage=usage))
+        # other requests on the same model report their usage before this one returns
+        await asyncio.sleep(random.random() / 1000)
+        return ModelResponse(llm_response=str(i), response_code=200)
+
+
+def prompt(i: int) -> ChatPromptValue:
+    return ChatPromptValue(messages=[HumanMessage(content=str(i))])
+
+
+class TestRequestUsage(unittest.TestCase):
+    def setUp(self):
+        self.model = InterleavingModel(
+            {"name": "usage_model", "url": "http://localhost:8000", "parameters": {}, "delay": 0}
+        )
+        self.collector = get_metadata_collector()
+        self.collector.reset()
+        self.collector.set_enabled(True)
+
+    def test_concurrent_requests_report_their_own_usage(self):
+        requests = 500
+
+        async def run():
+            return await asyncio.gather(*(self.model(prompt(i)) for i in range(1, requests + 1)))
+
+        responses = asyncio.run(run())
+
+        for response in responses:
+            i = int(response.llm_response)
+            self.assertEqual(
+                response.token_usage,
+                {"prompt_tokens": i, "completion_tokens": 2 * i, "total_tokens": 3 * i},
+            )
+        tokens = self.collector.model_metrics["usage_model"].token_stats
+        expected_prompt = requests * (requests + 1) // 2
+        self.assertEqual(tokens.total_prompt_tokens, expected_prompt)
+        self.assertEqual(tokens.total_completion_tokens, 2 * expected_prompt)
+        self.assertEqual(tokens.total_tokens, 3 * expected_prompt)
+        self.assertEqual(tokens.num_requests_with_tokens, requests)
+
+    def test_usage_is_not_carried_over_to_the_next_request(self):
+        class SilentModel(InterleavingModel):
+            @track_model_request
+            async def _generate_response(self, input, model_params, **kwargs):
+                return ModelResponse(llm_response="", response_code=200)
+
+        async def run():
+            await self.model(prompt(7))
+            silent = SilentModel(self.model.model_config)
+            return await silent(prompt(1))
+
+        self.assertIsNone(asyncio.run(run()).token_usage)
+        self.assertEqual(self.collector.model_metrics["usage_model"].token_stats.total_tokens, 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.prompt_values import ChatPromptValue
+
+from sygra.core.models.custom_models import BaseCustomModel
+from sygra.core.models.model_response import ModelResponse
+from sygra.core.models.response_cache import (
+    DiskCacheBackend,
+    ResponseCache,
+    ResponseCacheConfig,
+    SQLiteCacheBackend,
+)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        ResponseCache.close_all()
+        self.tmp_dir.cleanup()
+
+    def _cache(self, backend: str = "sqlite", **kwargs) -> ResponseCache:
+        path = os.path.join(self.tmp_dir.name, f"cache_{backend}")
+        cache = ResponseCache.from_model_config(
+            {"response_cache": {"enabled": True, "backend": backend, "path": path, **kwargs}}
+        )
+        assert cache is not None
+        return cache
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(ResponseCache.from_model_config({}))
+        self.assertFalse(ResponseCacheConfig.from_model_config({}).enabled)
+
+    def test_build_key_is_stable(self):
+        request = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "p": {"a": 1}}
+        reordered = {"p": {"a": 1}, "messages": [{"content": "hi", "role": "user"}], "model": "m"}
+        self.assertEqual(ResponseCache.build_key(request), ResponseCache.build_key(reordered))
+        self.assertNotEqual(
+            ResponseCache.build_key(request), ResponseCache.build_key({**request, "p": {"a": 2}})
+        )
+
+    def test_round_trip(self):
+        for backend, backend_cls in (("sqlite", SQLiteCacheBackend), ("disk", DiskCacheBackend)):
+            with self.subTest(backend=backend):
+                cache = self._cache(backend)
+                self.assertIsInstance(cache.backend, backend_cls)
+                key = ResponseCache.build_key({"backend": backend})
+                self.assertIsNone(cache.get(key))
+                cache.set(key, '{"llm_response": "héllo"}')
+                self.assertEqual(cache.get(key), '{"llm_response": "héllo"}')
+                # the backend is shared by every cache configured with the same location
+                self.assertIs(self._cache(backend).backend, cache.backend)
+                cache.backend.delete(key)
+                self.assertIsNone(cache.get(key))
+
+    def test_ttl_expiry(self):
+        cache = self._cache(ttl=10)
+        with patch("sygra.core.models.response_cache.time.time", return_value=1000.0):
+            cache.set("key", "value")
+        with patch("sygra.core.models.response_cache.time.time", return_value=1005.0):
+            self.assertEqual(cache.get("key"), "value")
+        with patch("sygra.core.models.response_cache.time.time", return_value=1010.0):
+            self.assertIsNone(cache.get("key"))
+
+    def test_modes(self):
+        writer = self._cache(mode="write_only")
+        writer.set("key", "value")
+        self.assertIsNone(writer.get("key"))
+
+        reader = self._cache(mode="read_only")
+        self.assertEqual(reader.get("key"), "value")
+        reader.set("other", "value")
+        self.assertIsNone(self._cache().get("other"))
+
+
+class TestBaseCustomModelResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        ResponseCache.close_all()
+        self.tmp_dir.cleanup()
+
+    @patch("sygra.core.models.custom_models.ClientFactory")
+    def _model(self, mock_client_factory):
+        class TestModel(BaseCustomModel):
+            async def _generate_response(self, input, model_params, **kwargs):
+                pass
+
+        return TestModel(
+            {
+                "name": "cached_model",
+                "model_type": "vllm",
+                "url": "http://test-url",
+                "auth_token": "test-token",
+                "parameters": {"temperature": 0.0},
+                "response_cache": {
+                    "enabled": True,
+                    "path": os.path.join(self.tmp_dir.name, "cache.sqlite"),
+                },
+            }
+        )
+
+    @patch("sygra.core.models.response_cache.get_metadata_collector")
+    def test_hit_skips_request(self, mock_get_collector):
+        model = self._model()
+        response = ModelResponse(llm_response="cached answer", response_code=200)
+        model._call_with_retry = AsyncMock(return_value=response)
+        model._finalize_response = MagicMock(side_effect=lambda r, url: r)
+        prompt = ChatPromptValue(messages=[SystemMessage("sys"), HumanMessage("question")])
+
+        first = asyncio.run(model(prompt))
+        second = asyncio.run(model(prompt))
+
+        self.assertEqual(first.llm_response, "cached answer")
+        self.assertEqual(second, first)
+        model._call_with_retry.assert_awaited_once()
+        mock_get_collector.return_value.record_cache_hit.assert_called_once_with(
+            "cached_model", model.model_config
+        )
+
+        # a different prompt is a miss
+        asyncio.run(model(ChatPromptValue(messages=[HumanMessage("other question")])))
+        self.assertEqual(model._call_with_retry.await_count, 2)
+
+    def test_failed_response_is_not_cached(self):
+        model = self._model()
+        model._call_with_retry = AsyncMock(
+            return_value=ModelResponse(llm_response="error", response_code=500)
+        )
+        model._finalize_response = MagicMock(side_effect=lambda r, url: r)
+        prompt = ChatPromptValue(messages=[HumanMessage("question")])
+
+        asyncio.run(model(prompt))
+        asyncio.run(model(prompt))
+        self.assertEqual(model._call_with_retry.await_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,19 @@
+import json
 import os
 import sys
 
 # Add project root to sys.path for relative imports to work
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-import hashlib
-import json
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
-import pandas as pd
+import numpy as np
 import pytest
+from datasets import IterableDataset
 
 from sygra.core.base_task_executor import BaseTaskExecutor
 from sygra.core.dataset.dataset_config import OutputType
+from sygra.core.dataset.record_id import content_id
 
 # ---------------------- Fixtures ----------------------
 
@@ -186,6 +187,7 @@ class DummyExecutor(BaseTaskExecutor):
     def __init__(self):
         # Minimal subclass for isolated utility method tests.
         self.id_column = None
+        self.id_fields = None
 
 
 def test_fetch_variable_value_basic():
@@ -247,10 +249,8 @@ def test_add_id_hashing_deterministic_and_presence():
     result = executor.add_id(input_record.copy())
     assert "id" in result and isinstance(result["id"], str)
 
-    expected_hash = hashlib.sha256(
-        json.dumps({"x": 123, "y": "abc"}, sort_keys=True).encode()
-    ).hexdigest()
-    assert result["id"] == expected_hash
+    assert result["id"] == content_id({"y": "abc", "x": 123})
+    assert len(result["id"]) == 32
 
 
 def test_add_id_from_column_present():
@@ -267,8 +267,19 @@ def test_add_id_from_column_missing():
     record = {"text": "hello"}
     result = executor.add_id(record.copy())
 
-    expected_hash = hashlib.sha256(json.dumps(record, sort_keys=True).encode()).hexdigest()
-    assert result["id"] == expected_hash
+    assert result["id"] == content_id(record)
+
+
+def test_add_id_from_id_column_and_id_fields():
+    """Uses the id_column when set, else the content id of the id_fields only."""
+    executor = DummyExecutor()
+    executor.id_column = "key"
+    assert executor.add_id({"key": 7, "text": "hello"})["id"] == 7
+
+    executor.id_fields = ["text"]
+    first = executor.add_id({"text": "hello", "image": b"\x00"})
+    second = executor.add_id({"text": "hello", "image": b"\x01"})
+    assert first["id"] == second["id"] == content_id({"text": "hello"})
 
 
 def test_assign_ids_flat_list():
@@ -833,76 +844,150 @@ def test_validate_data_config_rule2_vstack_failure(dummy_instance):
     assert not validated
 
 
-def test_rename_dataframe(dummy_instance):
-    test_df = pd.DataFrame(
-        [{"roll": 1, "name": "John", "marks": 123.5}, {"roll": 2, "name": "Johny", "marks": 152.5}]
-    )
-    final_df = dummy_instance._rename_dataframe(test_df, "student")
-    new_columns = list(final_df.columns)
-    assert (
-        "student->roll" in new_columns
-        and "student->name" in new_columns
-        and "student->marks" in new_columns
-    )
+def _multi_source(*confs):
+    return {
+        "source": [
+            {"type": "disk", "file_path": f"{conf['alias']}.jsonl", **conf} for conf in confs
+        ]
+    }
 
 
-def test_repeat_to_merge_sequentially(dummy_instance):
-    # horizontal merge with different columns
-    # test 1 : both df has same rows
-    primary_df = pd.DataFrame(
-        [{"roll": 1, "name": "John", "marks": 123.5}, {"roll": 2, "name": "Johny", "marks": 152.5}]
-    )
-    secondary_df = pd.DataFrame(
-        [{"class": 5, "sports": "cricket"}, {"class": 6, "sports": "football"}]
-    )
-    merged_df = dummy_instance._repeat_to_merge_sequentially(primary_df, secondary_df)
-    assert (
-        len(merged_df) == 2 and merged_df.iloc[0]["class"] == 5 and merged_df.iloc[1]["class"] == 6
+def test_load_source_data_joins_lazily(dummy_instance):
+    sources = {
+        "student.jsonl": [{"roll": 1, "name": "John"}, {"roll": 2, "name": "Johny"}],
+        "sport.jsonl": [{"roll": 2, "sports": "cricket"}, {"roll": 3, "sports": "football"}],
+        "class.jsonl": [{"class": 5}],
+    }
+    data_config = _multi_source(
+        {"alias": "student", "join_type": "primary"},
+        {"alias": "sport", "join_type": "column", "primary_key": "roll", "join_key": "roll"},
+        {"alias": "class", "join_type": "sequential"},
     )
+    with patch.object(
+        dummy_instance,
+        "_read_data",
+        side_effect=lambda reader, conf: sources[conf.file_path],
+    ):
+        data = dummy_instance._load_source_data(data_config)
 
-    # test 2 : secondary has less rows (need rotation with same data)
-    primary_df = pd.DataFrame(
-        [{"roll": 1, "name": "John", "marks": 123.5}, {"roll": 2, "name": "Johny", "marks": 152.5}]
-    )
-    secondary_df = pd.DataFrame([{"class": 5, "sports": "cricket"}])
-    merged_df = dummy_instance._repeat_to_merge_sequentially(primary_df, secondary_df)
-    assert (
-        len(merged_df) == 2 and merged_df.iloc[0]["class"] == 5 and merged_df.iloc[1]["class"] == 5
-    )
+    assert isinstance(data, IterableDataset)
+    assert list(data) == [
+        {
+            "student->roll": 1,
+            "student->name": "John",
+            "sport->roll": None,
+            "sport->sports": None,
+            "class->class": 5,
+        },
+        {
+            "student->roll": 2,
+            "student->name": "Johny",
+            "sport->roll": 2,
+            "sport->sports": "cricket",
+            "class->class": 5,
+        },
+    ]
 
-    # test 3 : secondary has more rows (truncation needed)
-    primary_df = pd.DataFrame(
-        [{"roll": 1, "name": "John", "marks": 123.5}, {"roll": 2, "name": "Johny", "marks": 152.5}]
-    )
-    secondary_df = pd.DataFrame(
-        [
-            {"class": 5, "sports": "cricket"},
-            {"class": 6, "sports": "football"},
-            {"class": 7, "sports": "tennis"},
-        ]
+
+@pytest.mark.parametrize("num_records", [None, 20])
+def test_execute_processes_every_joined_record(dummy_instance, tmp_path, num_records):
+    """A lazy join has a finite number of records, and its last partial checkpoint is written."""
+    sources = {
+        "student.jsonl": [{"roll": i} for i in range(7)],
+        "class.jsonl": [{"class": 5}, {"class": 6}],
+    }
+    dummy_instance.config["data_config"] = _multi_source(
+        {"alias": "student", "join_type": "primary"},
+        {"alias": "class", "join_type": "sequential"},
     )
-    merged_df = dummy_instance._repeat_to_merge_sequentially(primary_df, secondary_df)
-    assert (
-        len(merged_df) == 2 and merged_df.iloc[0]["class"] == 5 and merged_df.iloc[1]["class"] == 6
+    dummy_instance.args.num_records = num_records
+    dummy_instance.args.batch_size = dummy_instance.args.checkpoint_interval = 5
+    dummy_instance.args.output_dir = dummy_instance.output_dir = str(tmp_path)
+    dummy_instance.resumable = False
+    dummy_instance.output_config = None
+    dummy_instance.graph_config = MagicMock(
+        oasst_mapper={"required": "no"}, config={}, schema_config=None
     )
+    with patch.object(
+        dummy_instance,
+        "_read_data",
+        side_effect=lambda reader, conf: sources[conf.file_path],
+    ):
+        dummy_instance.dataset = dummy_instance.init_dataset()
+    assert isinstance(dummy_instance.dataset, IterableDataset)
 
+    async def execute_graph(record, *args, **kwargs):
+        return {"id": record["id"], "roll": record["student->roll"]}
 
-def test_shuffle_and_extend(dummy_instance):
-    # random merge from secondary by keeping primary rows same
-    primary_df = pd.DataFrame(
-        [{"roll": 1, "name": "John", "marks": 123.5}, {"roll": 2, "name": "Johny", "marks": 152.5}]
-    )
-    secondary_df = pd.DataFrame(
-        [
-            {"class": 5, "sports": "cricket"},
-            {"class": 6, "sports": "football"},
-            {"class": 7, "sports": "tennis"},
-        ]
+    with (
+        patch("sygra.core.base_task_executor.utils.get_file_in_task_dir", return_value=""),
+        patch("sygra.utils.graph_utils.execute_graph", execute_graph),
+    ):
+        dummy_instance.execute()
+
+    with open(tmp_path / "output.json") as f:
+        assert sorted(record["roll"] for record in json.load(f)) == list(range(7))
+
+
+def test_load_source_data_vstack(dummy_instance):
+    sources = {
+        "ds1.jsonl": [{"a": 1, "b": 2}],
+        "ds2.jsonl": [{"a": 3, "c": 4}],
+    }
+    data_config = _multi_source(
+        {"alias": "ds1", "join_type": "vstack"}, {"alias": "ds2", "join_type": "vstack"}
     )
-    merged_df = dummy_instance._shuffle_and_extend(primary_df, secondary_df)
-    # 2 records but new column can have value from any record(secondary)
-    assert len(merged_df) == 2 and (
-        merged_df.iloc[0]["class"] == 5
-        or merged_df.iloc[0]["class"] == 6
-        or merged_df.iloc[0]["class"] == 7
+    with patch.object(
+        dummy_instance,
+        "_read_data",
+        side_effect=lambda reader, conf: sources[conf.file_path],
+    ):
+        data = dummy_instance._load_source_data(data_config)
+    assert list(data) == [{"a": 1}, {"a": 3}]
+
+
+def test_process_feilds_keeps_streaming_dataset_lazy():
+    executor = BaseTaskExecutor.__new__(BaseTaskExecutor)
+    read = []
+
+    def generate():
+        for i in range(3):
+            read.append(i)
+            yield {"id": str(i), "a": np.arange(2), "b": i}
+
+    data = IterableDataset.from_generator(generate)
+    result = executor._process_feilds(data, select_columns=["a"])
+    assert isinstance(result, IterableDataset)
+    assert read == []
+    assert list(result) == [{"id": str(i), "a": [0, 1]} for i in range(3)]
+
+
+def test_apply_transforms_streams_iterable_dataset(dummy_instance):
+    from sygra.core.dataset.dataset_config import DataSourceConfig
+
+    source_config = DataSourceConfig.from_dict(
+        {
+            "type": "disk",
+            "file_path": "data.jsonl",
+            "transformations": [
+                {
+                    "transform": "sygra.processors.data_transform.RenameFieldsTransform",
+                    "params": {"mapping": {"name": "title"}},
+                }
+            ],
+        }
     )
+
+    def generate():
+        for i in range(3):
+            yield {"id": str(i), "name": f"name {i}"}
+
+    data = dummy_instance.apply_transforms(source_config, IterableDataset.from_generator(generate))
+    assert isinstance(data, IterableDataset)
+    assert list(data) == [{"id": str(i), "title": f"name {i}"} for i in range(3)]
+
+    records = [{"id": "0", "name": "name 0"}]
+    assert dummy_instance.apply_transforms(source_config, records) == [
+        {"id": "0", "title": "name 0"}
+    ]
+    assert records == [{"id": "0", "name": "name 0"}]
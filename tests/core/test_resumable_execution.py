@@ -10,6 +10,7 @@ from unittest.mock import mock_open, patch
 import pytest
 
 from sygra.core.resumable_execution import (
+    ProcessedRecordSet,
     ResumableExecutionManager,
     StreamingPositionTracker,
 )
@@ -31,7 +32,8 @@ def test_get_record_id_hash(temp_manager):
     record = {"name": "Alice", "value": 42}
     hashed = temp_manager.get_record_id(record)
     assert isinstance(hashed, str)
-    assert len(hashed) == 64
+    assert len(hashed) == 32
+    assert temp_manager.get_record_id({"value": 42, "name": "Alice"}) == hashed
 
 
 def test_get_record_id_direct(temp_manager):
@@ -149,3 +151,107 @@ def test_metadata_write_is_atomic(tmp_path):
 
     assert metadata["completed"] is False
     assert "finaltest" in metadata["processed_records"]
+
+
+def test_processed_record_set_merges_integer_ranges():
+    records = ProcessedRecordSet()
+    for record_id in ["3", "1", "2", "7", "5", "6", "abc", "007"]:
+        assert records.add(record_id)
+    assert not records.add("2")
+    assert not records.add("abc")
+    assert records.ranges() == [[1, 3], [5, 7]]
+    assert sorted(records.other_ids()) == ["007", "abc"]
+    assert len(records) == 8
+    assert "6" in records and "4" not in records and "7" not in ProcessedRecordSet(["07"])
+
+    assert records.add_range(0, 10) == 5
+    assert records.ranges() == [[0, 10]]
+    assert len(records) == 13
+    assert set(records) == {str(i) for i in range(11)} | {"abc", "007"}
+
+
+def test_saves_after_snapshot_append_to_journal(temp_manager):
+    temp_manager.mark_record_processed({"id": "a"}, position=0)
+    temp_manager.force_save_state()
+    with open(temp_manager.metadata_file) as f:
+        snapshot = f.read()
+
+    for i in range(1, 4):
+        temp_manager.mark_record_processed({"id": str(i)}, position=i)
+        temp_manager.force_save_state()
+
+    # the snapshot is untouched, the new records only went to the journal
+    with open(temp_manager.metadata_file) as f:
+        assert f.read() == snapshot
+    with open(temp_manager.journal_file) as f:
+        entries = [json.loads(line) for line in f]
+    assert [e["processed_records"] for e in entries] == [["1"], ["2"], ["3"]]
+
+    new_manager = ResumableExecutionManager("test_task", temp_manager.output_file)
+    assert new_manager.load_state()
+    assert all(r in new_manager.processed_records for r in ["a", "1", "2", "3"])
+    assert new_manager.position_tracker.get_current_position() == 3
+    # replayed journal is folded into a new snapshot
+    assert not os.path.exists(new_manager.journal_file)
+    with open(new_manager.metadata_file) as f:
+        meta = json.load(f)
+    assert meta["processed_record_ranges"] == [[1, 3]]
+    assert meta["processed_records"] == ["a"]
+
+
+def test_journal_is_compacted(temp_manager):
+    with patch("sygra.utils.constants.META_JOURNAL_COMPACTION_MIN", 3):
+        for i in range(6):
+            temp_manager.mark_record_processed({"id": str(i)}, position=i)
+            temp_manager.force_save_state()
+            if i == 2:
+                assert os.path.exists(temp_manager.journal_file)
+    # snapshot at 0, journal for 1..2, compaction at 3, journal for 4..5
+    with open(temp_manager.metadata_file) as f:
+        assert json.load(f)["processed_record_ranges"] == [[0, 3]]
+    with open(temp_manager.journal_file) as f:
+        assert len(f.readlines()) == 2
+
+
+def test_load_ignores_incomplete_journal_entry(temp_manager):
+    temp_manager.mark_record_processed({"id": "a"}, position=0)
+    temp_manager.force_save_state()
+    temp_manager.mark_record_processed({"id": "b"}, position=1)
+    temp_manager.force_save_state()
+    with open(temp_manager.journal_file, "a") as f:
+        f.write('{"save_seq": 99, "processed_records": ["c"')
+
+    new_manager = ResumableExecutionManager("test_task", temp_manager.output_file)
+    assert new_manager.load_state()
+    assert "b" in new_manager.processed_records
+    assert "c" not in new_manager.processed_records
+
+
+def test_load_legacy_metadata(temp_manager):
+    with open(temp_manager.metadata_file, "w") as f:
+        json.dump(
+            {
+                "task_name": "test_task",
+                "output_file": temp_manager.output_file,
+                "processed_records": ["1", "2", "x"],
+                "position": 2,
+                "dataset_type": "in_memory",
+            },
+            f,
+        )
+    assert temp_manager.load_state()
+    assert len(temp_manager.processed_records) == 3
+    assert temp_manager.processed_records.ranges() == [[1, 2]]
+
+
+def test_final_save_compacts_journal(temp_manager):
+    temp_manager.mark_record_processed({"id": "a"}, position=0)
+    temp_manager.force_save_state()
+    temp_manager.mark_record_processed({"id": "b"}, position=1)
+    temp_manager.force_save_state()
+    temp_manager.force_save_state(is_final=True)
+    assert not os.path.exists(temp_manager.journal_file)
+    with open(temp_manager.metadata_file) as f:
+        meta = json.load(f)
+    assert meta["completed"] is True
+    assert sorted(meta["processed_records"]) == ["a", "b"]
@@ -0,0 +1,128 @@
+"""
+Unit tests for task-buffered metrics in the MetadataCollector.
+
+Tests cover:
+- Lock-free recording inside MetadataCollector.buffered()
+- Periodic and final merging of the buffers
+- Metrics recorded from other threads and after a reset
+- Model config snapshots taken once per model by @track_model_request
+"""
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from sygra.core.models.model_response import ModelResponse
+from sygra.metadata import metadata_integration
+from sygra.metadata.metadata_collector import get_metadata_collector
+from sygra.metadata.metadata_integration import set_request_usage, track_model_request
+from sygra.utils import constants
+
+
+class MockModel:
+    def __init__(self):
+        self.model_name = "buffered_model"
+        self.model_type = "test"
+        self.model_config = {"type": "test", "parameters": {"temperature": 0.1}}
+
+    @track_model_request
+    async def generate(self):
+        set_request_usage({"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15})
+        await asyncio.sleep(0)
+        return ModelResponse(llm_response="ok", response_code=200)
+
+
+class TestBufferedMetrics:
+    def setup_method(self):
+        collector = get_metadata_collector()
+        collector.reset()
+        collector.set_enabled(True)
+
+    def test_buffered_metrics_are_merged_on_exit(self):
+        collector = get_metadata_collector()
+        with collector.buffered():
+            collector.record_model_request("model_a", latency=0.5, total_tokens=10)
+            collector.record_node_execution("node_a", "llm", latency=0.2, success=False)
+            collector.record_processed_record(success=False)
+            # recorded without touching the shared metrics
+            assert collector.model_metrics == {}
+            assert collector.total_records_processed == 0
+
+        assert collector.model_metrics["model_a"].num_requests == 1
+        assert collector.node_metrics["node_a"].total_failures == 1
+        assert (collector.total_records_processed, collector.total_records_failed) == (1, 1)
+
+    def test_summary_includes_metrics_of_the_current_task(self):
+        collector = get_metadata_collector()
+        with collector.buffered():
+            collector.record_model_request("model_a", latency=0.5)
+            summary = collector.get_metadata_summary()
+        assert summary["aggregate_statistics"]["requests"]["total_requests"] == 1
+
+    def test_concurrent_tasks_share_the_buffer(self):
+        collector = get_metadata_collector()
+        model = MockModel()
+
+        async def run():
+            await asyncio.gather(*(model.generate() for _ in range(200)))
+
+        with collector.buffered():
+            asyncio.run(run())
+            collector.record_model_request("buffered_model", latency=0.1)
+
+        metrics = collector.model_metrics["buffered_model"]
+        assert metrics.num_requests == 201
+        assert metrics.token_stats.total_tokens == 3000
+        assert metrics.parameters == {"temperature": 0.1}
+
+    def test_buffer_is_merged_periodically(self):
+        collector = get_metadata_collector()
+        with patch.object(constants, "METADATA_FLUSH_EVENTS", 3):
+            with collector.buffered():
+                for _ in range(7):
+                    collector.record_model_request("model_a", latency=0.1)
+                assert collector.model_metrics["model_a"].num_requests == 6
+        assert collector.model_metrics["model_a"].num_requests == 7
+
+    def test_other_threads_record_directly(self):
+        collector = get_metadata_collector()
+        with collector.buffered():
+            thread = threading.Thread(
+                target=collector.record_model_request, args=("model_a",), kwargs={"latency": 0.1}
+            )
+            thread.start()
+            thread.join()
+            assert collector.model_metrics["model_a"].num_requests == 1
+
+    def test_reset_discards_buffered_metrics(self):
+        collector = get_metadata_collector()
+        with collector.buffered():
+            collector.record_model_request("model_a", latency=0.1)
+            collector.reset()
+            collector.record_model_request("model_b", latency=0.1)
+        assert list(collector.model_metrics) == ["model_b"]
+
+
+class TestModelConfigSnapshot:
+    def setup_method(self):
+        collector = get_metadata_collector()
+        collector.reset()
+        collector.set_enabled(True)
+
+    @pytest.mark.asyncio
+    async def test_config_is_copied_once_per_model(self):
+        first, second = MockModel(), MockModel()
+        with patch.object(
+            metadata_integration.copy, "deepcopy", wraps=metadata_integration.copy.deepcopy
+        ) as deepcopy:
+            for _ in range(5):
+                await first.generate()
+                await second.generate()
+        assert deepcopy.call_count == 2
+        # the original configuration is left untouched
+        first.model_config["parameters"]["temperature"] = 0.9
+        assert get_metadata_collector().model_metrics["buffered_model"].parameters == {
+            "temperature": 0.1
+        }
@@ -10,7 +10,11 @@ import pytest
 
 from sygra.core.models.model_response import ModelResponse
 from sygra.metadata.metadata_collector import get_metadata_collector
-from sygra.metadata.metadata_integration import track_model_request
+from sygra.metadata.metadata_integration import (
+    set_request_usage,
+    track_model_request,
+    untracked_requests,
+)
 
 
 class MockModel:
@@ -23,7 +27,6 @@ class MockModel:
             "type": model_type,
             "parameters": {"temperature": 0.7, "max_tokens": 100},
         }
-        self._last_request_usage = None
 
     def name(self):
         """Return model name."""
@@ -37,22 +40,26 @@ class MockModel:
     async def async_generate(self, prompt):
         """Async method that generates a response."""
         # Simulate token usage
-        self._last_request_usage = {
-            "prompt_tokens": 100,
-            "completion_tokens": 50,
-            "total_tokens": 150,
-        }
+        set_request_usage(
+            {
+                "prompt_tokens": 100,
+                "completion_tokens": 50,
+                "total_tokens": 150,
+            }
+        )
         return ModelResponse(llm_response="Generated response", response_code=200)
 
     @track_model_request
     def sync_generate(self, prompt):
         """Sync method that generates a response."""
         # Simulate token usage
-        self._last_request_usage = {
-            "prompt_tokens": 100,
-            "completion_tokens": 50,
-            "total_tokens": 150,
-        }
+        set_request_usage(
+            {
+                "prompt_tokens": 100,
+                "completion_tokens": 50,
+                "total_tokens": 150,
+            }
+        )
         return ModelResponse(llm_response="Generated response", response_code=200)
 
     @track_model_request
@@ -191,6 +198,22 @@ class TestTrackModelRequestDecorator:
         # Should not have recorded anything
         assert len(collector.model_metrics) == 0
 
+    @pytest.mark.asyncio
+    async def test_untracked_requests_are_not_recorded(self):
+        """Test that requests made for health probes are not recorded."""
+        model = MockModel(model_name="gpt-4o")
+        collector = get_metadata_collector()
+
+        with untracked_requests():
+            model_response = await model.async_generate("ping")
+            model.sync_generate("ping")
+
+        assert model_response.response_code == 200
+        assert len(collector.model_metrics) == 0
+
+        await model.async_generate("test prompt")
+        assert collector.model_metrics["gpt-4o"].num_requests == 1
+
     @pytest.mark.asyncio
     async def test_decorator_with_no_token_usage(self):
         """Test decorator when model doesn't provide token usage."""
@@ -198,7 +221,7 @@ class TestTrackModelRequestDecorator:
         class ModelWithoutTokens(MockModel):
             @track_model_request
             async def async_generate(self, prompt):
-                # Don't set _last_request_usage
+                # Don't report token usage
                 return ModelResponse(llm_response="Generated response", response_code=200)
 
         model = ModelWithoutTokens(model_name="gpt-4o")
@@ -254,11 +277,13 @@ class TestTrackModelRequestDecorator:
 
             @track_model_request
             async def async_generate(self, prompt):
-                self._last_request_usage = {
-                    "prompt_tokens": 100,
-                    "completion_tokens": 50,
-                    "total_tokens": 150,
-                }
+                set_request_usage(
+                    {
+                        "prompt_tokens": 100,
+                        "completion_tokens": 50,
+                        "total_tokens": 150,
+                    }
+                )
                 return ModelResponse(llm_response="response", response_code=200)
 
         model = ModelWithAPIVersion()
@@ -287,7 +312,6 @@ class TestDecoratorEdgeCases:
 
         class ModelWithoutName:
             model_config = {}
-            _last_request_usage = None
 
             @track_model_request
             async def async_generate(self, prompt):
@@ -310,7 +334,6 @@ class TestDecoratorEdgeCases:
                 return self.model_name
 
             model_config = "not a dict"
-            _last_request_usage = None
 
             @track_model_request
             async def async_generate(self, prompt):
@@ -335,7 +358,7 @@ class TestDecoratorEdgeCases:
             @track_model_request
             async def async_generate(self, prompt):
                 # Only set some token fields
-                self._last_request_usage = {"prompt_tokens": 100}
+                set_request_usage({"prompt_tokens": 100})
                 return ModelResponse(llm_response="response", response_code=200)
 
         model = ModelWithPartialTokens(model_name="test_model", model_type="test")
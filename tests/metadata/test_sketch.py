@@ -0,0 +1,134 @@
+import json
+import math
+import random
+import statistics
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sygra.metadata.metadata_collector import ModelMetrics, NodeMetrics
+from sygra.metadata.sketch import QuantileSketch
+
+
+def exact_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[round(q * (len(ordered) - 1))]
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.values = [rng.lognormvariate(0, 1.5) for _ in range(50000)]
+
+    def test_quantiles_within_relative_accuracy(self):
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in self.values:
+            sketch.add(value)
+
+        for q in (0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 0.999):
+            exact = exact_quantile(self.values, q)
+            self.assertLessEqual(abs(sketch.quantile(q) - exact) / exact, 0.011, q)
+
+    def test_exact_moments(self):
+        sketch = QuantileSketch()
+        for value in self.values:
+            sketch.add(value)
+        stats = sketch.statistics()
+
+        self.assertEqual(len(sketch), len(self.values))
+        self.assertEqual(stats["min"], min(self.values))
+        self.assertEqual(stats["max"], max(self.values))
+        self.assertAlmostEqual(stats["mean"], statistics.mean(self.values))
+        self.assertAlmostEqual(stats["std_dev"], statistics.stdev(self.values))
+
+    def test_small_and_empty_sketches(self):
+        sketch = QuantileSketch()
+        self.assertEqual(set(sketch.statistics().values()), {0.0})
+        sketch.add(0.25)
+        self.assertEqual(set(sketch.statistics().values()), {0.25})
+        sketch.add(0)
+        sketch.add(-1)
+        self.assertEqual(sketch.quantile(0.5), 0.0)
+        self.assertEqual(sketch.statistics()["max"], 0.25)
+
+    def test_merge_matches_a_single_sketch(self):
+        single = QuantileSketch()
+        shards = [QuantileSketch() for _ in range(4)]
+        for i, value in enumerate(self.values):
+            single.add(value)
+            shards[i % 4].add(value)
+
+        merged = QuantileSketch()
+        for shard in shards:
+            merged.merge(shard)
+
+        self.assertEqual(len(merged), len(single))
+        for q in (0.5, 0.95, 0.99):
+            self.assertEqual(merged.quantile(q), single.quantile(q))
+        self.assertAlmostEqual(
+            merged.statistics()["std_dev"], single.statistics()["std_dev"], places=6
+        )
+        with self.assertRaises(ValueError):
+            merged.merge(QuantileSketch(relative_accuracy=0.05))
+
+    def test_serialized_sketches_merge_across_processes(self):
+        sketch = QuantileSketch()
+        for value in self.values[:1000]:
+            sketch.add(value)
+        restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+        self.assertEqual(restored.statistics(), sketch.statistics())
+
+        restored.merge(sketch)
+        self.assertEqual(len(restored), 2000)
+        self.assertEqual(QuantileSketch.from_dict(QuantileSketch().to_dict()).quantile(0.5), 0.0)
+
+    def test_memory_is_bounded(self):
+        sketch = QuantileSketch(relative_accuracy=0.01, max_buckets=64)
+        for exponent in range(-6, 6):
+            for mantissa in range(1, 100):
+                sketch.add(mantissa * 10.0**exponent)
+        self.assertLessEqual(len(sketch._buckets), 64)
+        # only the lowest values lose precision
+        self.assertAlmostEqual(sketch.quantile(1 - 1 / len(sketch)), 9.8e6, delta=9.8e4)
+
+    def test_precision_from_environment(self):
+        with patch.dict("os.environ", {"SYGRA_METADATA_SKETCH_ACCURACY": "0.05"}):
+            self.assertEqual(QuantileSketch().relative_accuracy, 0.05)
+
+
+class TestMetricsSketches(unittest.TestCase):
+    def test_model_metrics_distributions_and_merge(self):
+        first, second = ModelMetrics(model_name="m"), ModelMetrics(model_name="m")
+        for i in range(1, 101):
+            metrics = first if i % 2 else second
+            metrics.add_request(
+                latency=i / 100, response_code=200, total_tokens=i * 10, cost_usd=i * 1e-4
+            )
+        first.merge(second)
+        result = first.to_dict()
+
+        self.assertEqual(first.num_requests, 100)
+        latency = result["performance"]["latency_statistics"]
+        self.assertAlmostEqual(latency["p50"], 0.5, delta=0.01)
+        self.assertAlmostEqual(latency["p99"], 0.99, delta=0.02)
+        self.assertAlmostEqual(
+            result["token_statistics"]["total_tokens_percentiles"]["p95"], 950, delta=20
+        )
+        self.assertTrue(
+            math.isclose(result["cost"]["cost_per_request_percentiles"]["p50"], 0.005, rel_tol=0.02)
+        )
+
+    def test_node_metrics_merge(self):
+        first, second = NodeMetrics("node", "llm"), NodeMetrics("node", "llm")
+        first.record_execution(0.1, True)
+        second.record_execution(0.3, False)
+        first.merge(second)
+        self.assertEqual((first.total_executions, first.total_failures), (2, 1))
+        self.assertEqual(first.to_dict()["latency_statistics"]["max"], 0.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,9 +15,15 @@ from PIL import Image
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from sygra.processors.data_transform import (
+    CombineRecords,
     CreateAudioUrlTransform,
     CreateImageUrlTransform,
+    DataTransform,
+    LegacyTransform,
+    RecordTransform,
+    RenameFieldsTransform,
     SkipRecords,
+    TransformPipeline,
 )
 
 # -----------------------------
@@ -76,6 +82,147 @@ def test_skip_records_count():
     assert len(skip_dataset) == 100 and len(new_dataset) == 80 and new_dataset[0]["id"] == 10
 
 
+def test_skip_records_count_more_than_dataset():
+    params = {"skip_type": "count", "count": {"from_start": 60, "from_end": 60}}
+    assert SkipRecords().transform(skip_dataset, params) == []
+
+
+def test_skip_records_streams_without_negative_range():
+    read = []
+
+    def records():
+        for record in skip_dataset:
+            read.append(record["id"])
+            yield record
+
+    stream = SkipRecords().stream(records(), {"skip_type": "range", "range": "[:10],[20:]"})
+    assert next(stream)["id"] == 10
+    # records are read up to the first one kept
+    assert read == list(range(11))
+    assert [r["id"] for r in stream] == list(range(11, 20))
+
+
+# =============================================================================
+#                            COMBINE RECORDS TRANSFORM TESTS
+# =============================================================================
+
+combine_dataset = [{"page": i, "text": f"text {i}"} for i in range(10)]
+
+
+def test_combine_records():
+    params = {
+        "skip": {"from_beginning": 1, "from_end": 2},
+        "combine": 2,
+        "shift": 1,
+        "join_column": {"page": "$1-$2", "text": "$1 $2"},
+    }
+    combined = CombineRecords().transform(combine_dataset, params)
+    # the windows start from record 1 up to len - from_end - combine (excluded)
+    assert [r["page"] for r in combined] == ["1-2", "2-3", "3-4", "4-5", "5-6"]
+    assert combined[0]["text"] == "text 1 text 2"
+
+    params.update(shift=2, combine=3, join_column={"page": "$1-$3"})
+    combined = CombineRecords().transform(combine_dataset, params)
+    assert [r["page"] for r in combined] == ["1-3", "3-5"]
+
+    assert CombineRecords().transform(combine_dataset, {"combine": 1}) == combine_dataset
+
+
+# =============================================================================
+#                            TRANSFORM PIPELINE TESTS
+# =============================================================================
+
+
+class UpperNames(DataTransform):
+    """Transform written against the list API, recording the batches it gets."""
+
+    def __init__(self):
+        self.batches = []
+
+    @property
+    def name(self) -> str:
+        return "upper_names"
+
+    def transform(self, data, params):
+        self.batches.append(len(data))
+        for record in data:
+            record["name"] = record["name"].upper()
+        return data
+
+
+def test_pipeline_runs_transforms_in_one_pass():
+    pipeline = TransformPipeline.from_config(
+        [
+            {
+                "transform": "sygra.processors.data_transform.SkipRecords",
+                "params": {"skip_type": "count", "count": {"from_start": 90}},
+            },
+            {
+                "transform": "sygra.processors.data_transform.RenameFieldsTransform",
+                "params": {"mapping": {"name": "title"}},
+            },
+            {
+                "transform": "sygra.processors.data_transform.AddNewFieldTransform",
+                "params": {"mapping": {"source": "test"}},
+            },
+        ]
+    )
+    result = pipeline.apply(skip_dataset)
+    assert len(result) == 10
+    assert result[0] == {"id": 90, "title": "random_90", "source": "test"}
+    # the input records are not modified
+    assert skip_dataset[90] == {"id": 90, "name": "random_90"}
+
+
+def test_record_transform_must_implement_a_record_or_stream_method():
+    with pytest.raises(TypeError, match="transform_record or stream"):
+
+        class Incomplete(RecordTransform):
+            @property
+            def name(self) -> str:
+                return "incomplete"
+
+    class Upper(RecordTransform):
+        @property
+        def name(self) -> str:
+            return "upper"
+
+        def transform_record(self, record, params):
+            return {key: value.upper() for key, value in record.items()}
+
+    assert Upper().transform([{"a": "x"}]) == [{"a": "X"}]
+
+
+def test_legacy_transform_adapter():
+    data = [{"name": "a"}, {"name": "b"}, {"name": "c"}]
+    legacy = UpperNames()
+    pipeline = TransformPipeline(
+        [(LegacyTransform(legacy), {}), (RenameFieldsTransform(), {"mapping": {"name": "n"}})]
+    )
+    assert pipeline.apply([dict(r) for r in data]) == [{"n": "A"}, {"n": "B"}, {"n": "C"}]
+    assert legacy.batches == [3]
+
+    # streaming datasets give legacy transforms one record at a time
+    streaming = LegacyTransform(legacy, per_record=True)
+    assert [r["name"] for r in streaming.stream(iter([dict(r) for r in data]), {})] == list("ABC")
+    assert legacy.batches == [3, 1, 1, 1]
+
+    with patch("sygra.utils.utils.get_func_from_str", return_value=UpperNames):
+        pipeline = TransformPipeline.from_config([{"transform": "custom.UpperNames"}])
+    assert isinstance(pipeline.transforms[0][0], LegacyTransform)
+    assert pipeline.transforms[0][0].name == "upper_names"
+
+
+@patch("sygra.processors.data_transform.get_image_fields", return_value=["img"])
+@patch("sygra.processors.data_transform.is_data_url", return_value=True)
+def test_image_transform_does_not_modify_input(mock_is_data_url, mock_get_fields):
+    data = [{"img": "data:image/png;base64,abc", "n": 1}]
+    with patch.object(CreateImageUrlTransform, "process_image_data", return_value="converted"):
+        result = CreateImageUrlTransform().transform(data, {})
+    assert result == [{"img": "converted", "n": 1}]
+    assert data == [{"img": "data:image/png;base64,abc", "n": 1}]
+
+
 # =============================================================================
 #                            IMAGE TRANSFORM TESTS
 # =============================================================================
@@ -0,0 +1,173 @@
+import asyncio
+import functools
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from PIL import Image
+
+from sygra.core.models.client.connection_pool import HttpConnectionPool
+from sygra.processors.data_transform import CreateAudioUrlTransform, CreateImageUrlTransform
+from sygra.utils.asset_loader import AssetLoader, AssetLoaderConfig
+from sygra.utils.image_utils import get_image_url, load_image
+
+
+class StaticFileServer:
+    """Threaded static file server of a directory, counting requests and concurrent requests"""
+
+    def __init__(self, directory: str, delay: float = 0.0):
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+        lock = threading.Lock()
+        server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    server.requests += 1
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    time.sleep(delay)
+                    super().do_GET()
+                finally:
+                    with lock:
+                        server.active -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(Handler, directory=directory)
+        )
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestAssetLoader(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.files = os.path.join(self.temp_dir.name, "files")
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        os.makedirs(self.files)
+        image = Image.new("RGB", (4, 4), color="red")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        self.image_bytes = buffer.getvalue()
+        for name in ("a.png", "copy.png"):
+            with open(os.path.join(self.files, name), "wb") as f:
+                f.write(self.image_bytes)
+        with open(os.path.join(self.files, "clip.wav"), "wb") as f:
+            f.write(b"RIFF-audio")
+        self.server = StaticFileServer(self.files, delay=0.05)
+
+    def tearDown(self):
+        AssetLoader.reset()
+        HttpConnectionPool.close()
+        self.server.stop()
+        self.temp_dir.cleanup()
+
+    def _loader(self, **config) -> AssetLoader:
+        return AssetLoader(AssetLoaderConfig(cache_dir=self.cache_dir, **config))
+
+    def test_concurrent_fetches_of_a_url_are_coalesced(self):
+        loader = self._loader()
+        url = f"{self.server.url}/a.png"
+
+        async def fetch_all():
+            try:
+                return await asyncio.gather(*(loader.fetch(url) for _ in range(20)))
+            finally:
+                await HttpConnectionPool.aclose()
+
+        assets = asyncio.run(fetch_all())
+        self.assertTrue(all(asset.content == self.image_bytes for asset in assets))
+        self.assertEqual(assets[0].content_type, "image/png")
+        self.assertEqual(self.server.requests, 1)
+        self.assertEqual(loader.downloads, 1)
+
+    def test_downloads_are_bounded_by_max_concurrency(self):
+        loader = self._loader(max_concurrency=2, cache=False)
+        urls = [f"{self.server.url}/a.png?n={n}" for n in range(8)]
+        encoded = loader.encode_many(urls, "raw", lambda asset: asset.content_type)
+        loader.close()
+        self.assertEqual(set(encoded.values()), {"image/png"})
+        self.assertEqual(self.server.requests, 8)
+        self.assertLessEqual(self.server.max_active, 2)
+
+    def test_disk_cache_is_content_addressed_and_shared_across_loaders(self):
+        urls = [f"{self.server.url}/a.png", f"{self.server.url}/copy.png"]
+        first = self._loader()
+        self.assertEqual(first.fetch_sync(urls[0]).content, self.image_bytes)
+        self.assertEqual(first.fetch_sync(urls[1]).content, self.image_bytes)
+        first.close()
+        # both URLs have the same content, stored once
+        contents = [
+            f for _, _, files in os.walk(os.path.join(self.cache_dir, "contents")) for f in files
+        ]
+        self.assertEqual(len(contents), 1)
+
+        second = self._loader()
+        self.assertEqual(second.fetch_sync(urls[0]).content, self.image_bytes)
+        second.close()
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(second.downloads, 0)
+
+    def test_encode_many_deduplicates_and_reports_failures(self):
+        loader = self._loader()
+        url = f"{self.server.url}/a.png"
+        missing = f"{self.server.url}/missing.png"
+        calls = []
+
+        def encoder(asset):
+            calls.append(asset)
+            return "encoded"
+
+        encoded = loader.encode_many([url, missing, url], "test", encoder)
+        self.assertEqual(encoded, {url: "encoded", missing: None})
+        self.assertEqual(len(calls), 1)
+        loader.close()
+
+        # the encoding is read back from the disk cache, without download nor encoding
+        loader = self._loader()
+        self.assertEqual(loader.encode_many([url], "test", encoder), {url: "encoded"})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(loader.downloads, 0)
+        loader.close()
+
+    def test_image_transform_fetches_each_url_once(self):
+        url = f"{self.server.url}/a.png"
+        records = [{"id": n, "image": url} for n in range(50)]
+        params = {"asset_loader": {"cache_dir": self.cache_dir}, "prefetch_records": 16}
+
+        result = CreateImageUrlTransform().transform(records, params)
+
+        expected = get_image_url(load_image(self.image_bytes))
+        self.assertTrue(all(record["image"] == expected for record in result))
+        self.assertEqual(self.server.requests, 1)
+
+    def test_audio_transform_uses_mime_of_url(self):
+        url = f"{self.server.url}/clip.wav"
+        params = {"asset_loader": {"cache_dir": self.cache_dir}}
+        result = CreateAudioUrlTransform().transform([{"audio": url}, {"audio": [url]}], params)
+        self.assertTrue(result[0]["audio"].startswith("data:audio/wav;base64,"))
+        self.assertEqual(result[1]["audio"], [result[0]["audio"]])
+        self.assertEqual(self.server.requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sygra.utils import constants, utils
+from sygra.utils.config_registry import ConfigRegistry, freeze, thaw
+
+
+class TestConfigRegistry(unittest.TestCase):
+    def setUp(self):
+        ConfigRegistry.clear()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        ConfigRegistry.clear()
+        self.tmp_dir.cleanup()
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_freeze_and_thaw(self):
+        config = {"a": {"b": [1, {"c": 2}]}}
+        frozen = freeze(config)
+        with self.assertRaises(TypeError):
+            frozen["a"] = 1
+        with self.assertRaises(TypeError):
+            frozen["a"]["b"][1]["c"] = 3
+        self.assertEqual(frozen["a"]["b"][0], 1)
+
+        thawed = thaw(frozen)
+        self.assertEqual(thawed, config)
+        thawed["a"]["b"].append(3)
+        self.assertEqual(len(frozen["a"]["b"]), 2)
+
+    def test_load_yaml_is_parsed_once_per_change(self):
+        path = self._write("config.yaml", "model_config:\n  ssl_verify: true\n")
+        with patch(
+            "sygra.utils.config_registry.yaml.safe_load", wraps=utils.yaml.safe_load
+        ) as load:
+            first = ConfigRegistry.load_yaml(path)
+            self.assertIs(ConfigRegistry.load_yaml(path), first)
+            self.assertEqual(load.call_count, 1)
+
+            self._write("config.yaml", "model_config:\n  ssl_verify: false\n  extra: 1\n")
+            second = ConfigRegistry.load_yaml(path)
+            self.assertEqual(load.call_count, 2)
+        self.assertFalse(second["model_config"]["ssl_verify"])
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            ConfigRegistry.load_yaml(os.path.join(self.tmp_dir.name, "missing.yaml"))
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_model_config_is_built_once_per_change(self):
+        models = self._write("models.yaml", "model1:\n  model_type: vllm\n  parameters: {}\n")
+        with patch.object(constants, "MODEL_CONFIG_YAML", models):
+            with patch.object(constants, "CUSTOM_MODELS_CONFIG_YAML", models + ".missing"):
+                with patch("sygra.utils.utils.load_yaml_file", wraps=utils.load_yaml_file) as load:
+                    first = utils.load_model_config()
+                    # callers get their own copy to update
+                    first["model1"]["parameters"]["temperature"] = 0.1
+                    second = utils.load_model_config()
+                    self.assertEqual(second["model1"]["parameters"], {})
+                    self.assertEqual(load.call_count, 1)
+
+                    os.environ["SYGRA_MODEL1_URL"] = "http://model1"
+                    self.assertEqual(utils.load_model_config()["model1"]["url"], "http://model1")
+                    self.assertEqual(load.call_count, 2)
+
+    def test_graph_factory_is_reused(self):
+        factory = utils.get_graph_factory("langgraph")
+        self.assertIs(utils.get_graph_factory("langgraph"), factory)
+        with self.assertRaises(ValueError):
+            utils.get_graph_factory("unknown")
+
+    def test_graph_properties_are_mutable_copies(self):
+        task_dir = os.path.join(self.tmp_dir.name, "task")
+        os.makedirs(task_dir)
+        with open(os.path.join(task_dir, "graph_config.yaml"), "w") as f:
+            f.write(
+                "graph_config:\n  graph_properties:\n    chat_conversation: multiturn\n"
+                "    roles: [user, assistant]\n"
+            )
+
+        properties = utils.get_graph_properties(task_dir)
+        self.assertEqual(properties["chat_conversation"], "multiturn")
+        # callers get a mutable copy of the parsed config, with lists
+        self.assertIsInstance(properties, dict)
+        self.assertEqual(utils.get_graph_property("roles", [], task_dir), ["user", "assistant"])
+        properties["roles"].append("system")
+        self.assertEqual(len(utils.get_graph_properties(task_dir)["roles"]), 2)
+        self.assertEqual(utils.get_graph_property("missing", 5, task_dir), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
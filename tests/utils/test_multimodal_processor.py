@@ -1,14 +1,23 @@
 """Tests for multimodal_processor utility functions."""
 
+import base64
+import json
+import os
 import shutil
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 
+from sygra.utils import constants
 from sygra.utils.multimodal_processor import (
+    MediaExtractor,
     is_multimodal_data_url,
+    media_fields_from_graph_config,
     process_batch_multimodal_data,
 )
 
+PNG_DATA_URL = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
 
 class TestIsMultimodalDataURL:
     """Tests for is_multimodal_data_url function."""
@@ -181,3 +190,109 @@ class TestProcessBatchMultimodalData:
             assert isinstance(path, str)
             assert not path.startswith("data:")
             assert "image" in path
+
+
+class TestMediaExtractor:
+    """Tests for MediaExtractor."""
+
+    def setup_method(self):
+        """Create a temporary directory and an extractor for each test."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.output_dir = self.temp_dir / "multimodal_output"
+
+    def teardown_method(self):
+        """Clean up temporary directory after each test."""
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_identical_media_are_decoded_once_and_hard_linked(self):
+        """Test that identical media, within and across batches, share one file."""
+        extractor = MediaExtractor(self.output_dir, max_workers=2)
+        try:
+            first = extractor.process_batch(
+                [{"id": "1", "image": PNG_DATA_URL}, {"id": "2", "image": PNG_DATA_URL}]
+            )
+            second = extractor.process_batch([{"id": "3", "image": PNG_DATA_URL}])
+        finally:
+            extractor.close()
+
+        paths = [first[0]["image"], first[1]["image"], second[0]["image"]]
+        assert [Path(path).name for path in paths] == [
+            "1_image_0.png",
+            "2_image_0.png",
+            "3_image_0.png",
+        ]
+        assert len({os.stat(path).st_ino for path in paths}) == 1
+        assert Path(paths[0]).read_bytes() == base64.b64decode(PNG_DATA_URL.split(",")[1])
+        assert sorted(os.listdir(self.output_dir / "image")) == [Path(path).name for path in paths]
+
+    def test_payload_is_decoded_in_chunks(self, monkeypatch):
+        """Test that a payload decoded in many chunks gives the original bytes."""
+        monkeypatch.setattr(constants, "MEDIA_DECODE_CHUNK_SIZE", 8)
+        content = bytes(range(256)) * 5 + b"x"
+        data_url = "data:audio/wav;base64," + base64.b64encode(content).decode()
+
+        result = process_batch_multimodal_data([{"id": "a", "audio": data_url}], self.output_dir)
+
+        assert result[0]["audio"].endswith("a_audio_0.wav")
+        assert Path(result[0]["audio"]).read_bytes() == content
+
+    def test_invalid_payload_keeps_data_url(self):
+        """Test that a data URL which fails to decode is left in the record."""
+        data_url = "data:image/png;base64,iVBORw0KGgo!!!"
+
+        result = process_batch_multimodal_data([{"id": "1", "image": data_url}], self.output_dir)
+
+        assert result[0]["image"] == data_url
+        assert not list(self.output_dir.rglob("*.png"))
+
+    def test_only_media_fields_are_searched_deeply(self):
+        """Test that nested values and JSON strings of other fields are left as they are."""
+        json_array = json.dumps([PNG_DATA_URL])
+        record = {
+            "id": "1",
+            "images": json_array,
+            "metadata": {"thumbnail": PNG_DATA_URL},
+            "prompt": json_array,
+            "top_level": PNG_DATA_URL,
+        }
+
+        result = process_batch_multimodal_data([record], self.output_dir, media_fields=["images"])[
+            0
+        ]
+
+        assert Path(result["images"][0]).name == "1_images_0.png"
+        assert result["metadata"] == {"thumbnail": PNG_DATA_URL}
+        assert result["prompt"] == json_array
+        # top-level data URLs are saved in any field
+        assert Path(result["top_level"]).name == "1_top_level_0.png"
+        assert record["images"] == json_array
+
+    def test_media_fields_from_graph_config(self):
+        """Test that media fields come from output_type of models, output_map and media_fields."""
+        image_node = SimpleNamespace(
+            model=SimpleNamespace(model_config={"output_type": "image"}),
+            node_config={"output_keys": "generated_image"},
+        )
+        text_node = SimpleNamespace(
+            model=SimpleNamespace(model_config={}), node_config={"output_keys": "caption"}
+        )
+        graph_config = SimpleNamespace(
+            config={
+                "output_config": {
+                    "media_fields": ["speech"],
+                    "output_map": {
+                        "image": {"from": "generated_image"},
+                        "text": {"from": "caption"},
+                    },
+                }
+            },
+            get_nodes=lambda: {"draw": image_node, "describe": text_node},
+        )
+
+        assert media_fields_from_graph_config(graph_config) == {
+            "generated_image",
+            "image",
+            "speech",
+        }
+        assert media_fields_from_graph_config(SimpleNamespace(config={})) is None
@@ -0,0 +1,89 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from pydantic import BaseModel, field_validator
+
+from sygra.validators import schema_validator_base
+from sygra.validators.schema_validator_base import SchemaValidator
+
+
+class AnswerSchema(BaseModel):
+    id: int
+    answer: str
+
+    @field_validator("answer")
+    @classmethod
+    def not_blank(cls, value: str) -> str:
+        if not value.strip():
+            raise ValueError("answer is blank")
+        return value
+
+
+def graph_config(schema_config):
+    config = MagicMock()
+    config.schema_config = schema_config
+    return config
+
+
+FIELDS_CONFIG = {
+    "fields": [
+        {"name": "id", "type": "int"},
+        {"name": "tags", "type": "list[str]"},
+        {"name": "score", "type": "float", "is_greater_than": 0},
+    ]
+}
+
+
+class TestSchemaValidator(unittest.TestCase):
+    def test_without_schema_every_record_is_valid(self):
+        validator = SchemaValidator(graph_config(None))
+        self.assertFalse(validator.enabled)
+        self.assertEqual(validator.validate_batch([{}, {"a": 1}]), [True, True])
+        self.assertTrue(validator.validate({}))
+
+    def test_fields_batch_validation(self):
+        validator = SchemaValidator(graph_config(FIELDS_CONFIG))
+        records = [
+            {"id": 1, "tags": ["a"], "score": 0.5, "extra": "ignored"},
+            {"id": "one", "tags": ["a"], "score": 0.5},
+            {"id": 2, "tags": "a", "score": 0.5},
+            {"id": 3, "tags": [], "score": -1.0},
+            {"tags": ["a"], "score": 0.5},
+            {"id": "4", "tags": [], "score": 2},
+        ]
+        self.assertEqual(
+            validator.validate_batch(records), [True, False, False, False, False, True]
+        )
+        self.assertEqual(
+            [validator.validate(record) for record in records],
+            [True, False, False, False, False, True],
+        )
+
+    def test_schema_class_batch_validation(self):
+        with patch.object(schema_validator_base, "resolve_schema_class", return_value=AnswerSchema):
+            validator = SchemaValidator(graph_config({"schema": "tests.AnswerSchema"}))
+        records: list[dict] = [{"id": 1, "answer": "yes"}, {"id": 2, "answer": " "}, {"id": 3}]
+        self.assertEqual(validator.validate_batch(records), [True, False, False])
+
+    def test_schema_is_compiled_once(self):
+        validator = SchemaValidator(graph_config(FIELDS_CONFIG))
+        with patch.object(schema_validator_base, "TypeAdapter") as type_adapter:
+            validator.validate_batch([{"id": 1, "tags": [], "score": 1.0}] * 10)
+            validator.validate({"id": 1, "tags": [], "score": 1.0})
+        type_adapter.assert_not_called()
+
+    def test_validate_type_reuses_adapters(self):
+        validator = SchemaValidator(graph_config(None))
+        schema_validator_base.get_type_adapter.cache_clear()
+        for value in (["a"], ["b"], [1]):
+            validator.validate_type("tags", value, list[str])
+        self.assertEqual(schema_validator_base.get_type_adapter.cache_info().misses, 1)
+        self.assertFalse(validator.validate_type("tags", [{}], list[str]))
+
+
+if __name__ == "__main__":
+    unittest.main()